@@ -6,11 +6,13 @@
 使用者可以與水族箱區域進行互動（如投放飼料）。
 """
 
+import os
 import sys
-import random
+import copy
+import time
 import math
 from pathlib import Path
-from typing import Callable, Optional, List, Tuple, Dict
+from typing import Callable, Iterator, Optional, List, Tuple, Dict
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QPushButton, QVBoxLayout, QFrame,
     QMenu, QSizePolicy, QLabel, QSlider, QHBoxLayout,
@@ -18,13 +20,12 @@ from PyQt6.QtWidgets import (
     QMessageBox,
 )
 from PyQt6.QtCore import Qt, QRect, QPoint, QPointF, QTimer, pyqtSignal, QEvent
-from PyQt6.QtGui import QPainter, QPixmap, QColor, QMouseEvent, QPaintEvent, QRegion, QAction, QFont, QImage, QIcon, QPen
-from fish import Fish, load_swim_and_turn, load_fish_animation
+from PyQt6.QtGui import QPainter, QPixmap, QColor, QMouseEvent, QPaintEvent, QRegion, QAction, QFont, QImage, QIcon, QPen, QShortcut, QKeySequence
+from fish import Fish, load_fish_animation, fish_snapshot_to_dict
 from pet import Pet, LobsterPet, ChestMonsterPet, PatchworkFishPet, load_pet_animation
 from config import (
     FEED_GROWTH_POINTS,
     FEED_UNLOCK_CONFIG,
-    get_feed_counter_interval_sec,
     MONEY_VALUE,
     get_money_value,
     FEED_COST,
@@ -72,8 +73,118 @@ from config import (
     MONEY_COLLECT_ANIMATION_SPEED_MULTIPLIER,
     MONEY_COLLECT_VELOCITY_Y,
     SMALL_BETTA_COST,
+    ASSET_PLACEHOLDER_SIZE,
+    ASSET_PLACEHOLDER_COLOR,
+    ASSET_PRELOAD_UPGRADE_FRACTION,
+    ASSET_PRELOAD_CHECK_INTERVAL_SEC,
+    FISH_UPGRADE_THRESHOLDS,
+    GROWTH_STAGES,
+    TICK_PROFILER_ENABLED,
+    TICK_BUDGET_MS,
+    FRAME_DRIVER,
+    FRAME_INTERVAL_MS,
+    FRAME_MAX_CATCH_UP,
+    TICK_PROFILER_DUMP_SHORTCUT,
+    TICK_PROFILER_DUMP_FILENAME,
+    SAVE_LOAD_BATCH_SIZE,
+    PROFILE_CAPTURE_SHORTCUT,
+    PROFILE_CAPTURE_MODE,
+    PROFILE_SAMPLE_INTERVAL_MS,
+    PROFILE_CAPTURE_PREFIX,
+    MEMORY_TRACKER_ENABLED,
+    MEMORY_TRACKER_INTERVAL_SEC,
+    MEMORY_TRACKER_TOP_N,
+    MEMORY_TRACKER_TRACEBACK_FRAMES,
+    MEMORY_GROWTH_CHECKS,
+    MEMORY_GROWTH_MIN,
+    MEMORY_TRACKER_FILENAME,
+    LOG_CRASH_DUMP_FILENAME,
+    METRICS_ENABLED,
+    METRICS_EXPORT_FORMAT,
+    METRICS_EXPORT_INTERVAL_SEC,
+    METRICS_JSONL_FILENAME,
+    METRICS_PROMETHEUS_FILENAME,
+    SIM_RANDOM_SEED,
+    INPUT_RECORD_SHORTCUT,
+    INPUT_RECORD_FILENAME,
+)
+from game_state import load_streaming, commit, get_default_state, get_save_path
+from autosave import AutoSaveService, SaveWriter
+from world_state import (
+    WORLD_SNAPSHOT_VERSION, FISH_FIELDS, FEED_FIELDS, MONEY_FIELDS, PET_FIELDS, PET_EXTRA_FIELDS,
+    capture_fields, restore_fields, world_digest,
+)
+from tick_profiler import LatencyHistogram, TickProfiler
+from frame_pacing import FRAME_DRIVERS, FrameDriver, IntervalTracker, format_pacing_report
+from sim_random import WorldRandom, set_world_random, stream as sim_stream
+from input_record import InputRecorder, recorded_input
+from session_profiler import SessionProfiler
+from memory_tracker import GrowthDetector, MemoryTracker, register_size, track_instance
+from population import FishPopulation
+from feed_inventory import FeedInventory
+from unlock_rules import FEED_CHEAP_COUNT, UnlockRules, feed_counter, max_count_counter
+from game_log import get_logger, install_crash_dump
+from metrics import MetricsRegistry, MetricsExporter, Sample, EXPORT_FORMATS, collect_process_samples, PROCESS_HELP
+from asset_archive import resource_exists, resource_files, resource_is_dir, resource_is_file, resource_subdirs
+from asset_loader import (
+    get_asset_loader,
+    load_pixmap,
+    PRIORITY_VISIBLE,
+    PRIORITY_UPGRADE,
+    PRIORITY_CURRENT_FEED,
+    PRIORITY_SHOP,
+    PRIORITY_RARE,
 )
-from game_state import load, save, get_default_state
+
+
+_feed_machine_log = get_logger("投食機")
+_upgrade_log = get_logger("升級處理")
+_pet_log = get_logger("寵物")
+_unlock_log = get_logger("解鎖")
+_add_fish_log = get_logger("新增魚")
+_action_log = get_logger("操作")
+_autosave_log = get_logger("自動儲存")
+_milestone_log = get_logger("里程碑")
+_load_log = get_logger("載入")
+_metrics_log = get_logger("指標")
+_pacing_log = get_logger("幀節奏")
+_tick_log = get_logger("幀計時")
+_record_log = get_logger("錄製")
+_profile_log = get_logger("剖析")
+_memory_log = get_logger("記憶體")
+
+# 天使鬥魚吃寶箱怪飼料後的變身階段
+_CHEST_FEED_UPGRADE_STAGE = {"金條": "golden", "鑽石": "gem"}
+
+# update_fishes 的計時階段（依執行順序）
+TICK_PHASES = (
+    "feed_update",      # 飼料落下與動畫
+    "money_update",     # 金錢更新與移除過期
+    "pet_update",       # 寵物更新與寵物拾取金錢
+    "game_time",        # 遊戲時間信號（飼料計數器、投食機）
+    "shark",            # 鯊魚吃幼鬥魚與大便魚翅
+    "guppy",            # 孔雀魚碰觸金錢
+    "feed_collisions",  # 魚與飼料碰撞、移除飼料
+    "happy_buff",       # 快樂buff與遊戲時間同步到每條魚
+    "fish_update",      # 魚類更新
+    "dead_compaction",  # 移除死亡動畫結束的魚
+)
+
+
+def _write_save_snapshot(snapshot: Tuple[dict, bool]) -> bool:
+    """
+    （背景執行緒）將 _save_game_state 的快照轉為存檔字典並提交
+    
+    Args:
+        snapshot: (存檔快照, 是否壓縮為完整快照)；快照的 fishes 欄位為 Fish.snapshot() 元組列表
+        
+    Returns:
+        是否成功儲存
+    """
+    state, compact = snapshot
+    state = dict(state)
+    state["fishes"] = [fish_snapshot_to_dict(snap) for snap in state["fishes"]]
+    return commit(state, compact=compact)
 
 
 class Feed:
@@ -97,6 +208,7 @@ class Feed:
             target_position: 目標位置（拋物線終點，用於投食機自動投食）
             is_parabolic: 是否使用拋物線軌跡
         """
+        track_instance(self)
         self.position = QPointF(float(position.x()), float(position.y()))
         self.feed_frames = feed_frames
         self.feed_name = feed_name  # 飼料類型名稱
@@ -208,6 +320,8 @@ class Money:
         scale: float = 0.75,
         on_collected_callback: Optional[Callable[[], None]] = None,
     ):
+        # 帶回呼的金錢（寶箱怪產物）另外計數：回呼捕捉的物件會跟著金錢存活
+        track_instance(self, "Money(callback)" if on_collected_callback is not None else None)
         self.position = QPointF(float(position.x()), float(position.y()))
         self.money_frames = money_frames
         self.money_name = money_name  # 對應 config.MONEY_VALUE 的鍵
@@ -361,7 +475,7 @@ class FeedSelectionDialog(QDialog):
                     continue
                 # 優先使用 resource/feed/ 目錄路徑（用於動畫），如果不存在則使用單一圖片路徑
                 feed_dir = _resource_dir() / "feed" / name
-                if feed_dir.exists() and feed_dir.is_dir():
+                if resource_is_dir(feed_dir):
                     feed_list.append((name, feed_dir))
                 else:
                     feed_list.append((name, _get_chest_feed_image_path(name)))
@@ -473,8 +587,8 @@ class FeedMachineWidget(QWidget):
         """載入投食機圖片（依當前顏色），並套用縮放倍率"""
         resource_dir = _resource_dir()
         feed_machine_path = resource_dir / "feed_machine" / f"投食機_{self._feed_machine_color}.png"
-        if feed_machine_path.exists():
-            original_pixmap = QPixmap(str(feed_machine_path))
+        if resource_exists(feed_machine_path):
+            original_pixmap = load_pixmap(feed_machine_path)
             if not original_pixmap.isNull():
                 # 套用縮放倍率
                 scaled_width = int(original_pixmap.width() * FEED_MACHINE_SCALE)
@@ -484,15 +598,15 @@ class FeedMachineWidget(QWidget):
                     Qt.AspectRatioMode.KeepAspectRatio,
                     Qt.TransformationMode.SmoothTransformation
                 )
-                print(f"[投食機] 載入圖片成功: {feed_machine_path}, 原始大小: {original_pixmap.width()}x{original_pixmap.height()}, 縮放後: {scaled_width}x{scaled_height}")
+                _feed_machine_log.debug("載入圖片成功: %s, 原始大小: %sx%s, 縮放後: %sx%s", feed_machine_path, original_pixmap.width(), original_pixmap.height(), scaled_width, scaled_height)
                 # 載入圖片後更新部件大小
                 self._update_widget_size()
             else:
                 self._feed_machine_pixmap = None
-                print(f"[投食機] 圖片載入失敗（QPixmap.isNull）: {feed_machine_path}")
+                _feed_machine_log.warning("圖片載入失敗（QPixmap.isNull）: %s", feed_machine_path)
         else:
             self._feed_machine_pixmap = None
-            print(f"[投食機] 圖片檔案不存在: {feed_machine_path}")
+            _feed_machine_log.warning("圖片檔案不存在: %s", feed_machine_path)
     
     def set_feed_machine_visible(self, visible: bool) -> None:
         """設定投食機是否顯示，並更新部件位置"""
@@ -517,10 +631,10 @@ class FeedMachineWidget(QWidget):
             if hasattr(parent, 'feed_machine_area_rect'):
                 feed_area_right = parent.feed_machine_area_rect.right()
                 if widget_right > feed_area_right:
-                    print(f"[警告] 投食機部件右側 ({widget_right}) 超出左側空白區域 ({feed_area_right})，會延伸到水族箱區域！")
-                    print(f"[警告] 投食機部件位置: ({x}, {y}), 大小: {self.width()}x{self.height()}")
-                    print(f"[警告] 左側空白區域: {parent.feed_machine_area_rect}")
-                    print(f"[警告] 水族箱區域: {parent.aquarium_rect}")
+                    _feed_machine_log.warning("投食機部件右側 (%s) 超出左側空白區域 (%s)，會延伸到水族箱區域！", widget_right, feed_area_right)
+                    _feed_machine_log.warning("投食機部件位置: (%s, %s), 大小: %sx%s", x, y, self.width(), self.height())
+                    _feed_machine_log.warning("左側空白區域: %s", parent.feed_machine_area_rect)
+                    _feed_machine_log.warning("水族箱區域: %s", parent.aquarium_rect)
             
             self.setGeometry(x, y, self.width(), self.height())
             self.show()
@@ -528,7 +642,7 @@ class FeedMachineWidget(QWidget):
             # 更新主視窗遮罩（左側空白區域已包含在遮罩中）
             if parent and hasattr(parent, 'updateWindowMask'):
                 parent.updateWindowMask()
-            print(f"[投食機] 顯示投食機，位置: ({x}, {y}), 大小: {self.width()}x{self.height()}")
+            _feed_machine_log.debug("顯示投食機，位置: (%s, %s), 大小: %sx%s", x, y, self.width(), self.height())
         else:
             self.hide()
             # 更新主視窗遮罩
@@ -576,7 +690,7 @@ class FeedMachineWidget(QWidget):
                         feed_name, feed_path = selected
                         self.set_selected_feed(feed_name, feed_path)
                         self.feed_selected.emit(feed_name, feed_path)
-                        print(f"[投食機] 選擇飼料: {feed_name}")
+                        _feed_machine_log.debug("選擇飼料: %s", feed_name)
             event.accept()
             return
         
@@ -708,6 +822,8 @@ class AquariumWidget(QWidget):
     pet_duplicate_requested = pyqtSignal(str)
     # 信號：每幀更新時發出遊戲時間（秒），供主視窗更新飼料計數器等
     game_time_updated = pyqtSignal(float)
+    # 輸入錄製時的目標名稱（見 input_record）
+    INPUT_TARGET = "aquarium"
 
     def __init__(self, background_path: Optional[Path] = None, parent: Optional[QWidget] = None):
         """
@@ -730,8 +846,9 @@ class AquariumWidget(QWidget):
         # 設定背景為透明
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         
-        # 魚類列表
-        self.fishes: List[Fish] = []
+        # 魚類列表（以 fishes 屬性存取）與各魚種存活數量（加入、移除、死亡時增量更新）
+        self._fishes: List[Fish] = []
+        self.population = FishPopulation()
         
         # 飼料列表
         self.feeds: List[Feed] = []
@@ -740,6 +857,32 @@ class AquariumWidget(QWidget):
         # 寵物列表
         self.pets: List[Pet] = []
         self._game_time_sec = 0.0  # 遊戲時間（秒），用於鯊魚吃幼鬥魚／大便魚翅計時
+        # 已執行的幀數（輸入錄製以此標記輸入發生的時間點）
+        self.tick_count = 0
+        # 模擬亂數：本世界的具名串流（取代全域 random），設為作用中供魚與寵物使用
+        self.world_random = WorldRandom(SIM_RANDOM_SEED)
+        set_world_random(self.world_random)
+        # 輸入錄製器（錄製中時由主視窗設定）
+        self.input_recorder: Optional[InputRecorder] = None
+        # 每幀分段計時（找出超過 16 ms 預算的階段）
+        self.tick_profiler = TickProfiler(TICK_PHASES, TICK_BUDGET_MS, enabled=TICK_PROFILER_ENABLED)
+        # 每次重繪的耗時（與幀計時一起啟用）
+        self.paint_histogram = LatencyHistogram()
+        # 執行指標（由視窗的 MetricsExporter 啟用並定期輸出；停用時更新計數器幾乎沒有成本）
+        self.metrics = MetricsRegistry()
+        self._metric_ticks = self.metrics.counter("ticks_total", "遊戲迴圈執行的幀數")
+        self.metrics.add_rate("fps", "ticks_total", per=1.0, help_text="每秒幀數（兩次輸出之間的平均）")
+        self.metrics.add_collector(self._collect_metrics, {
+            "entities": "各類實體數量",
+            "fish_by_species": "各魚種數量（不含死亡動畫中的魚）",
+            "tick_ms": "整幀耗時百分位數（毫秒，自上次輸出以來）",
+            "tick_phase_ms": "各階段耗時百分位數（毫秒，自上次輸出以來）",
+            "tick_over_budget_total": "超過幀預算的幀數",
+            "paint_ms": "重繪耗時百分位數（毫秒，自上次輸出以來）",
+            "frame_interval_ms": "實際幀間隔與重繪間隔百分位數（毫秒，自上次輸出以來）",
+            "frame_jitter_ms": "幀間隔相對目標間隔的偏差百分位數（毫秒，自上次輸出以來）",
+            "frame_late_total": "間隔超過目標 1.5 倍的次數（掉幀）",
+        })
 
         # 拖曳視窗用（按下時的起點，用來區分點擊 vs 拖曳）
         self._drag_initial_global: Optional[QPoint] = None
@@ -749,19 +892,35 @@ class AquariumWidget(QWidget):
         # 快樂buff愛心圖示（拼布魚街頭表演時顯示在會產金錢的魚頭上）
         self._happy_buff_heart_pixmap: Optional[QPixmap] = None
         
-        
-        # 更新計時器
-        self.update_timer = QTimer(self)
-        self.update_timer.timeout.connect(self.update_fishes)
-        self.update_timer.start(16)  # 約 60 FPS
+        # 升級目錄解析快取：{(魚種, 階段): 目錄或 None}，升級當下不再做目錄存在檢查
+        self._upgrade_dir_cache: Dict[Tuple[str, str], Optional[Path]] = {}
+        # 升級動畫預載：定時檢查即將升級的魚，於背景預先解碼下一階段動畫，升級時直接命中快取
+        # {(魚種, 階段): 預載的 frames 列表}；以水族箱為使用者登記，避免在升級前被 LRU 釋放
+        self._upgrade_preloads: Dict[Tuple[str, str], Tuple[List[QPixmap], ...]] = {}
+        self._upgrade_preload_timer = QTimer(self)
+        self._upgrade_preload_timer.timeout.connect(self._preload_upcoming_upgrades)
+        self._upgrade_preload_timer.start(int(ASSET_PRELOAD_CHECK_INTERVAL_SEC * 1000))
+        
+        # 遊戲迴圈驅動（約 60 FPS；離屏逐幀執行時以 frame_driver.stop() 停止）
+        driver_mode = os.environ.get("AQUARIUM_FRAME_DRIVER", "").strip().lower() or FRAME_DRIVER
+        if driver_mode not in FRAME_DRIVERS:
+            _pacing_log.warning("未知的幀驅動方式 %s（可用: %s），改用 coarse", driver_mode, ", ".join(FRAME_DRIVERS))
+            driver_mode = "coarse"
+        self.frame_driver = FrameDriver(
+            self, self.update_fishes, driver_mode, FRAME_INTERVAL_MS, FRAME_MAX_CATCH_UP,
+            pacing_enabled=TICK_PROFILER_ENABLED,
+        )
+        # 相鄰兩次重繪開始的間隔（與幀間隔比較，看出重繪是否跟上）
+        self.paint_pacing = IntervalTracker(self.frame_driver.pacing.target_ms, enabled=TICK_PROFILER_ENABLED)
+        self.frame_driver.start()
         
         # 啟用滑鼠追蹤（用於檢測滑鼠移動到金錢物件上）
         self.setMouseTracking(True)
         
     def _load_background_pixmap(self) -> None:
         """依當前 background_path 載入背景圖"""
-        if self.background_path and self.background_path.exists():
-            self.background_pixmap = QPixmap(str(self.background_path))
+        if self.background_path and resource_exists(self.background_path):
+            self.background_pixmap = load_pixmap(self.background_path)
         else:
             self.background_pixmap = None
 
@@ -777,11 +936,50 @@ class AquariumWidget(QWidget):
         self.update()
     
 
+    @property
+    def fishes(self) -> List[Fish]:
+        return self._fishes
+
+    @fishes.setter
+    def fishes(self, fishes: List[Fish]) -> None:
+        """整批替換魚列表（重新計算 population 與素材使用登記；逐隻增減請用 add_fish、remove_fish）"""
+        loader = get_asset_loader()
+        kept = {id(fish) for fish in fishes}
+        for fish in self._fishes:
+            if id(fish) not in kept:
+                loader.detach(fish, fish.swim_frames, fish.turn_frames, fish.eat_frames)
+        self._fishes = fishes
+        for fish in fishes:
+            fish.set_death_callback(self.population.discard)
+            loader.attach(fish, fish.swim_frames, fish.turn_frames, fish.eat_frames)
+        self.population.recount(fishes)
+
     def add_fish(self, fish: Fish) -> None:
         """添加魚類到水族箱"""
         fish.set_upgrade_callback(self._on_fish_upgrade)
         fish.set_poop_callback(self._on_fish_poop)
-        self.fishes.append(fish)
+        fish.set_death_callback(self.population.discard)
+        # 登記為動畫使用者（使用中的動畫不會被素材記憶體預算釋放）
+        get_asset_loader().attach(fish, fish.swim_frames, fish.turn_frames, fish.eat_frames)
+        self._fishes.append(fish)
+        self.population.add(fish)
+
+    def add_fishes(self, fishes: List[Fish]) -> None:
+        """批次添加魚類（設定回調後一次加入列表，用於載入存檔）"""
+        loader = get_asset_loader()
+        for fish in fishes:
+            fish.set_upgrade_callback(self._on_fish_upgrade)
+            fish.set_poop_callback(self._on_fish_poop)
+            fish.set_death_callback(self.population.discard)
+            loader.attach(fish, fish.swim_frames, fish.turn_frames, fish.eat_frames)
+            self.population.add(fish)
+        self._fishes.extend(fishes)
+
+    def remove_fish(self, fish: Fish) -> None:
+        """從水族箱移除一隻魚（被吃掉、升級前的舊魚；不播死亡動畫）"""
+        self._fishes = [f for f in self._fishes if f is not fish]
+        self.population.discard(fish)
+        get_asset_loader().detach(fish, fish.swim_frames, fish.turn_frames, fish.eat_frames)
 
     def _duplicate_fish(self, fish: Fish, spawn_position: QPointF | QPoint | None = None) -> None:
         """複製一隻相同魚種、階段、成長度的魚（用於核廢料 20% 複製）。新魚出生在 spawn_position，未傳入時為原魚位置。"""
@@ -800,19 +998,14 @@ class AquariumWidget(QWidget):
                 possible_dirs.insert(0, fish_species_dir / stage_name_map[stage])
         fish_dir = None
         for d in possible_dirs:
-            if d.exists() and d.is_dir():
+            if resource_is_dir(d):
                 fish_dir = d
                 break
         if fish_dir is None:
             fish_dir = fish_species_dir
-        swim_behavior, turn_behavior, eat_behavior = get_fish_behaviors(fish.species)
-        swim_frames, turn_frames = load_swim_and_turn(fish_dir, swim_behavior, turn_behavior)
-        if not swim_frames:
+        swim_anim, turn_anim, eat_anim = get_asset_loader().load_fish_animations(fish_dir, fish.species)
+        if not swim_anim.frames:
             return
-        eat_frames = load_fish_animation(fish_dir, behavior=eat_behavior)
-        swim_copy = [QPixmap(p) for p in swim_frames]
-        turn_copy = [QPixmap(p) for p in turn_frames] if turn_frames else swim_copy[:]
-        eat_copy = [QPixmap(p) for p in eat_frames] if eat_frames else []
         # 起始位置：有傳入則用該處（核廢料位置）；否則用原魚位置
         if spawn_position is not None:
             x, y = int(spawn_position.x()), int(spawn_position.y())
@@ -827,13 +1020,13 @@ class AquariumWidget(QWidget):
             direction = 90.0
         scale = get_fish_scale(fish.species, stage)
         new_fish = Fish(
-            swim_frames=swim_copy,
-            turn_frames=turn_copy,
+            swim_frames=swim_anim.frames,
+            turn_frames=turn_anim.frames,
             position=QPoint(x, y),
             speed=fish.speed,
             direction=direction,
             scale=scale,
-            eat_frames=eat_copy if eat_copy else None,
+            eat_frames=eat_anim.frames,
             species=fish.species,
             stage=stage,
         )
@@ -885,7 +1078,7 @@ class AquariumWidget(QWidget):
             old_fish: 需要升級的魚
             next_stage: 下一個成長階段
         """
-        print(f"[升級處理] 開始處理升級: {old_fish.species} {old_fish.stage} -> {next_stage}")
+        _upgrade_log.debug("開始處理升級: %s %s -> %s", old_fish.species, old_fish.stage, next_stage)
         
         # 在移除舊魚之前，先記錄舊魚種的當前數量（用於里程碑追蹤）
         parent_window = self.window()
@@ -895,19 +1088,19 @@ class AquariumWidget(QWidget):
         # 先創建新階段的魚
         new_fish = self._create_upgraded_fish(old_fish, next_stage)
         if new_fish:
-            print(f"[升級處理] 成功創建新魚: {new_fish.species} {new_fish.stage}")
+            _upgrade_log.debug("成功創建新魚: %s %s", new_fish.species, new_fish.stage)
             # 舊魚直接從列表移除（升級不是死亡，不播死亡動畫）
             if old_fish in self.fishes:
-                self.fishes = [f for f in self.fishes if f is not old_fish]
+                self.remove_fish(old_fish)
             # 使用 add_fish 方法添加新魚（會自動設置升級回調）
             self.add_fish(new_fish)
-            print(f"[升級處理] 已添加新魚並設置升級回調: {new_fish.species} {new_fish.stage}")
+            _upgrade_log.debug("已添加新魚並設置升級回調: %s %s", new_fish.species, new_fish.stage)
             
             # 通知父視窗進行自動儲存（如果父視窗是 TransparentAquariumWindow）
             if parent_window and hasattr(parent_window, '_on_fish_upgraded'):
                 parent_window._on_fish_upgraded(new_fish)
         else:
-            print(f"[升級處理] 無法創建新魚，升級失敗")
+            _upgrade_log.warning("無法創建新魚，升級失敗")
     
     def _create_upgraded_fish(self, old_fish: Fish, next_stage: str) -> Optional[Fish]:
         """
@@ -921,65 +1114,22 @@ class AquariumWidget(QWidget):
             新魚對象，如果無法創建則返回 None
         """
         if not old_fish.species:
-            print(f"[創建升級魚] 舊魚沒有 species，無法升級")
+            _upgrade_log.warning("創建升級魚：舊魚沒有 species，無法升級")
             return None
         
-        # 構建新階段的魚目錄路徑
-        resource_dir = Path(__file__).parent / "resource"
-        fish_species_dir = resource_dir / "fish" / old_fish.species
-        
-        # 嘗試多種可能的目錄名稱格式
-        # 1. 先嘗試純階段名稱（如 medium）
-        # 2. 再嘗試帶魚種名稱的格式（如 medium_鬥魚）
-        # 3. 嘗試中文階段名稱（如 中鬥魚、成年鬥魚、天使鬥魚）
-        possible_dirs = [
-            fish_species_dir / next_stage,  # medium
-            fish_species_dir / f"{next_stage}_{old_fish.species}",  # medium_鬥魚
-        ]
-        
-        # 為鬥魚添加中文階段名稱映射
-        if old_fish.species == "鬥魚":
-            stage_name_map = {
-                "small": "幼鬥魚",
-                "medium": "中鬥魚",
-                "large": "成年鬥魚",
-                "angel": "天使鬥魚",
-                "golden": "金鬥魚",
-                "gem": "寶石鬥魚",
-            }
-            if next_stage in stage_name_map:
-                possible_dirs.insert(0, fish_species_dir / stage_name_map[next_stage])
-        
-        fish_dir = None
-        for possible_dir in possible_dirs:
-            if possible_dir.exists() and possible_dir.is_dir():
-                fish_dir = possible_dir
-                break
-        
-        print(f"[創建升級魚] 檢查路徑: {[str(d) for d in possible_dirs]}")
+        # 新階段的魚目錄（解析結果有快取，通常已由升級預載解析過）
+        fish_dir = self._resolve_upgrade_dir(old_fish.species, next_stage)
         if fish_dir is None:
-            print(f"[創建升級魚] 找不到升級目錄，嘗試的路徑都不存在")
+            _upgrade_log.warning("創建升級魚：找不到 %s %s 的升級目錄", old_fish.species, next_stage)
             return None
         
-        print(f"[創建升級魚] 找到升級目錄: {fish_dir}")
+        _upgrade_log.debug("創建升級魚：找到升級目錄: %s", fish_dir)
         
         # 載入新階段的動畫（游泳、轉向、吃飯行為與鬥魚、鯊魚、孔雀魚相同，由 config.get_fish_behaviors 取得）
-        swim_behavior, turn_behavior, eat_behavior = get_fish_behaviors(old_fish.species or "")
-        swim_frames, turn_frames = load_swim_and_turn(
-            fish_dir,
-            swim_behavior=swim_behavior,
-            turn_behavior=turn_behavior,
-        )
-        if not swim_frames:
+        swim_anim, turn_anim, eat_anim = get_asset_loader().load_fish_animations(fish_dir, old_fish.species or "")
+        if not swim_anim.frames:
             return None
         
-        eat_frames = load_fish_animation(fish_dir, behavior=eat_behavior)
-        
-        # 創建新魚，繼承舊魚的位置和狀態
-        swim_copy = [QPixmap(p) for p in swim_frames]
-        turn_copy = [QPixmap(p) for p in turn_frames] if turn_frames else swim_copy[:]
-        eat_copy = [QPixmap(p) for p in eat_frames] if eat_frames else []
-        
         # 計算方向角度（從水平/垂直方向轉換）
         h_dir = old_fish.horizontal_direction
         v_dir = old_fish.vertical_direction
@@ -1002,23 +1152,108 @@ class AquariumWidget(QWidget):
         # 使用新階段的縮放倍率
         new_fish_scale = get_fish_scale(old_fish.species or "", next_stage)
         
+        # 創建新魚，繼承舊魚的位置和狀態
         new_fish = Fish(
-            swim_frames=swim_copy,
-            turn_frames=turn_copy,
+            swim_frames=swim_anim.frames,
+            turn_frames=turn_anim.frames,
             position=QPoint(int(old_fish.position.x()), int(old_fish.position.y())),
             speed=old_fish.speed,
             direction=direction,
             scale=new_fish_scale,
-            eat_frames=eat_copy if eat_copy else None,
+            eat_frames=eat_anim.frames,
             species=old_fish.species,
             stage=next_stage,
         )
         
         # 繼承成長度
         new_fish.growth_points = old_fish.growth_points
+        # 升級視為同一隻魚（存檔日誌記錄為升級而非移除＋新增）
+        new_fish.uid = old_fish.uid
         
         return new_fish
     
+    def _resolve_upgrade_dir(self, species: str, stage: str) -> Optional[Path]:
+        """
+        解析指定魚種與階段的素材目錄（結果快取）
+        
+        嘗試順序：中文階段名稱（鬥魚：中鬥魚、成年鬥魚、天使鬥魚等）→ 純階段名稱（如 medium）→ 帶魚種名稱（如 medium_鬥魚）
+        
+        Returns:
+            素材目錄，找不到時回傳 None
+        """
+        key = (species, stage)
+        if key in self._upgrade_dir_cache:
+            return self._upgrade_dir_cache[key]
+        fish_species_dir = _resource_dir() / "fish" / species
+        possible_dirs = [
+            fish_species_dir / stage,  # medium
+            fish_species_dir / f"{stage}_{species}",  # medium_鬥魚
+        ]
+        # 為鬥魚添加中文階段名稱映射
+        if species == "鬥魚":
+            stage_name_map = {
+                "small": "幼鬥魚",
+                "medium": "中鬥魚",
+                "large": "成年鬥魚",
+                "angel": "天使鬥魚",
+                "golden": "金鬥魚",
+                "gem": "寶石鬥魚",
+            }
+            if stage in stage_name_map:
+                possible_dirs.insert(0, fish_species_dir / stage_name_map[stage])
+        fish_dir = None
+        for possible_dir in possible_dirs:
+            if resource_is_dir(possible_dir):
+                fish_dir = possible_dir
+                break
+        self._upgrade_dir_cache[key] = fish_dir
+        return fish_dir
+    
+    def _preload_upcoming_upgrades(self) -> None:
+        """
+        預載即將升級的魚之下一階段動畫（由低頻計時器在幀與幀之間呼叫）
+        
+        - 成長度達到升級閾值 ASSET_PRELOAD_UPGRADE_FRACTION 比例的魚：預載下一個成長階段
+        - 場上有金條／鑽石且有天使鬥魚時：預載金鬥魚／寶石鬥魚
+        動畫以背景執行緒解碼，升級時 _create_upgraded_fish 直接命中快取，不做任何 I/O。
+        預載的動畫以水族箱為使用者保留，直到不再是即將升級的階段（已升級或條件改變）才解除，
+        升級後由新魚持有。
+        """
+        wanted = set()
+        has_angel_betta = False
+        for fish in self.fishes:
+            if fish.is_dead or not fish.species:
+                continue
+            if fish.species == "鬥魚" and fish.stage == "angel":
+                has_angel_betta = True
+            threshold = FISH_UPGRADE_THRESHOLDS.get(fish.species, {}).get(fish.stage)
+            if not threshold or fish.growth_points < threshold * ASSET_PRELOAD_UPGRADE_FRACTION:
+                continue
+            if fish.stage in GROWTH_STAGES:
+                index = GROWTH_STAGES.index(fish.stage)
+                if index < len(GROWTH_STAGES) - 1:
+                    wanted.add((fish.species, GROWTH_STAGES[index + 1]))
+        if has_angel_betta:
+            for feed in self.feeds:
+                stage = _CHEST_FEED_UPGRADE_STAGE.get(feed.feed_name)
+                if stage and not feed.is_eaten:
+                    wanted.add(("鬥魚", stage))
+        if not wanted and not self._upgrade_preloads:
+            return
+        loader = get_asset_loader()
+        for key in [k for k in self._upgrade_preloads if k not in wanted]:
+            loader.detach(self, *self._upgrade_preloads.pop(key))
+        for species, stage in wanted:
+            if (species, stage) in self._upgrade_preloads:
+                continue
+            fish_dir = self._resolve_upgrade_dir(species, stage)
+            if fish_dir is not None:
+                frame_lists = tuple(
+                    anim.frames for anim in loader.request_fish_animations(fish_dir, species, PRIORITY_UPGRADE)
+                )
+                loader.attach(self, *frame_lists)
+                self._upgrade_preloads[(species, stage)] = frame_lists
+    
     def add_feed(self, feed: Feed) -> None:
         """添加飼料到水族箱"""
         self.feeds.append(feed)
@@ -1030,16 +1265,20 @@ class AquariumWidget(QWidget):
             win = self.window()
             if win is not None and hasattr(win, 'aquarium_rect'):
                 aquarium_rect = win.aquarium_rect
+        profiler = self.tick_profiler
+        profiler.begin()
         
         # 更新飼料（傳入水族箱矩形以便檢測是否落到底部）
         for feed in self.feeds:
             feed.update(aquarium_rect)
+        profiler.mark("feed_update")
 
         # 更新金錢（落下、動畫、過期、消失動畫）
         for money in self.moneys:
             money.update(aquarium_rect)
         # 移除已過期或已收集的金錢（消失動畫結束後 is_collected 會被設為 True）
         self.moneys = [m for m in self.moneys if not m.is_expired()]
+        profiler.mark("money_update")
         
         # 更新寵物（傳入飼料列表，供會吃飼料的寵物如拼布魚使用；金條/鑽石僅天使鬥魚會追，寵物不追；寵物也不追核廢料）
         excluded_feed_for_pet = set(CHEST_FEED_ITEMS) | {"核廢料"}
@@ -1054,26 +1293,31 @@ class AquariumWidget(QWidget):
                     money.start_collect_animation()
                     # 發送信號通知拾取金錢
                     self.money_hovered.emit(value)
+        profiler.mark("pet_update")
         
         # 遊戲時間遞增（約 60 FPS）
         self._game_time_sec += 1.0 / 60.0
         self.game_time_updated.emit(self._game_time_sec)
+        profiler.mark("game_time")
 
         # 鯊魚吃幼年鬥魚與大便魚翅（每 300 秒可吃一隻，吃後 300 秒內每 30 秒大便魚翅）
         eaten = self._check_shark_eat_betta(aquarium_rect)
         if eaten:
             shark, eaten_fish = eaten
-            self.fishes = [f for f in self.fishes if f is not eaten_fish]
+            self.remove_fish(eaten_fish)
             shark.eat_feed()
         self._update_shark_poop()
+        profiler.mark("shark")
         # 檢測孔雀魚與金錢的碰撞（每5秒追金錢，碰觸後60%機率轉換為石榴結晶）
         self._check_guppy_touch_money()
+        profiler.mark("guppy")
 
         # 檢測魚和飼料的碰撞
         self._check_feed_collisions(aquarium_rect)
         
         # 移除已過期或被吃掉的飼料
         self.feeds = [feed for feed in self.feeds if not feed.is_expired()]
+        profiler.mark("feed_collisions")
         
         # 快樂buff：拼布魚街頭表演時，會產金錢的魚大便間隔縮短50%
         from config import PATCHWORK_HAPPY_BUFF_POOP_MULTIPLIER
@@ -1085,6 +1329,7 @@ class AquariumWidget(QWidget):
         for fish in self.fishes:
             fish.happy_buff_multiplier = buff_multiplier
             fish.current_game_time_sec = self._game_time_sec
+        profiler.mark("happy_buff")
 
         # 可被鯊魚追的幼鬥魚列表（供鯊魚可進食時追逐）
         small_bettas = [
@@ -1109,16 +1354,88 @@ class AquariumWidget(QWidget):
             # 孔雀魚傳入金錢列表，其餘魚傳入 None
             moneys_for_fish = self.moneys if fish.species == "孔雀魚" else None
             fish.update(aquarium_rect, feeds=feeds_for_fish, prey=prey, moneys=moneys_for_fish)
+        profiler.mark("fish_update")
 
-        # 移除死亡動畫已結束的魚（死亡／移除效果播完後才從列表移除）
-        self.fishes = [
-            f for f in self.fishes
+        # 移除死亡動畫已結束的魚（死亡／移除效果播完後才從列表移除；死亡時已從 population 扣除）
+        self._fishes = [
+            f for f in self._fishes
             if not (getattr(f, "is_dead", False) and (f.death_timer > FISH_DEATH_ANIMATION_DURATION_SEC or f.death_opacity <= 0))
         ]
+        profiler.mark("dead_compaction")
+        profiler.end()
+        self.tick_count += 1
+        self._metric_ticks.inc()
         
         # 觸發重繪
         self.update()
     
+    def _collect_metrics(self) -> List[Sample]:
+        """輸出指標時呼叫：實體數量與幀計時百分位數"""
+        samples: List[Sample] = [
+            ("entities", {"type": "fish"}, len(self.fishes)),
+            ("entities", {"type": "feed"}, len(self.feeds)),
+            ("entities", {"type": "money"}, len(self.moneys)),
+            ("entities", {"type": "pet"}, len(self.pets)),
+        ]
+        samples += [("fish_by_species", {"species": k}, v) for k, v in self.population.species_counts().items()]
+        if self.tick_profiler.enabled:
+            # 百分位數取自上次輸出以來的區間（累計直方圖供 dump_tick_profile 使用，不會重設）
+            samples.append(("tick_over_budget_total", {}, self.tick_profiler.over_budget))
+            window = self.tick_profiler.take_window()
+            if window[TickProfiler.TOTAL]["count"]:
+                for q in ("p50", "p99", "max"):
+                    samples.append(("tick_ms", {"quantile": q}, window[TickProfiler.TOTAL][f"{q}_ms"]))
+                    for phase, phase_stats in window["phases"].items():
+                        if phase_stats["count"]:
+                            samples.append(("tick_phase_ms", {"phase": phase, "quantile": q}, phase_stats[f"{q}_ms"]))
+            paint = self.paint_histogram.take_window()
+            if paint.count:
+                summary = paint.summary()
+                samples += [("paint_ms", {"quantile": q}, summary[f"{q}_ms"]) for q in ("p50", "p99", "max")]
+            trackers = {"tick": self.frame_driver.pacing, "paint": self.paint_pacing}
+            for kind, tracker in trackers.items():
+                samples.append(("frame_late_total", {"kind": kind}, tracker.late))
+                pacing = tracker.take_window()
+                if not pacing["count"]:
+                    continue
+                for q in ("p50", "p99", "max"):
+                    samples.append(("frame_interval_ms", {"kind": kind, "quantile": q}, pacing["interval"][f"{q}_ms"]))
+                    samples.append(("frame_jitter_ms", {"kind": kind, "quantile": q}, pacing["jitter"][f"{q}_ms"]))
+        return samples
+
+    def pacing_stats(self) -> Dict[str, object]:
+        """幀節奏統計：{"driver": 驅動方式, "intervals": {"tick": 幀間隔, "paint": 重繪間隔}}（格式見 IntervalTracker.summary）"""
+        return {
+            "driver": self.frame_driver.mode,
+            "intervals": {
+                "tick": self.frame_driver.pacing.summary(),
+                "paint": self.paint_pacing.summary(),
+            },
+        }
+
+    def reset_pacing(self) -> None:
+        """清除幀間隔與重繪間隔的記錄"""
+        self.frame_driver.pacing.reset()
+        self.paint_pacing.reset()
+
+    def dump_tick_profile(self, path: Optional[Path] = None) -> Path:
+        """
+        將每幀分段計時結果寫成 JSON，文字摘要寫入記錄
+        
+        Args:
+            path: 輸出路徑；未指定時寫入存檔目錄的 TICK_PROFILER_DUMP_FILENAME
+        
+        Returns:
+            輸出路徑
+        """
+        if path is None:
+            path = get_save_path().parent / TICK_PROFILER_DUMP_FILENAME
+        pacing = self.pacing_stats()
+        self.tick_profiler.dump(path, {"pacing": pacing})
+        _tick_log.info("已寫入 %s\n%s", path, self.tick_profiler.format_report())
+        _pacing_log.info("驅動方式 %s\n%s", pacing["driver"], format_pacing_report(pacing["intervals"]))
+        return path
+    
     def try_collect_money_at(self, pos: QPoint) -> Optional[int]:
         """若點擊位置在金錢上則開始消失動畫並回傳金額，否則回傳 None；若有 on_collected_callback 則呼叫"""
         for money in self.moneys:
@@ -1144,6 +1461,22 @@ class AquariumWidget(QWidget):
                 return (money, value)
         return None
 
+    @recorded_input
+    def collect_hovered_money(self, pos: QPoint, money_info: Optional[Tuple[Money, int]] = None) -> None:
+        """
+        滑鼠移到金錢上：開始消失動畫並發送 money_hovered（傳遞金額值）
+        
+        Args:
+            pos: 滑鼠位置
+            money_info: 呼叫端已取得的 check_money_at(pos) 結果（不錄製；未傳入時重新檢查）
+        """
+        if money_info is None:
+            money_info = self.check_money_at(pos)
+        if money_info is not None:
+            money, value = money_info
+            money.start_collect_animation()
+            self.money_hovered.emit(value)
+
     def try_collect_chest_produce_at(self, pos: QPoint) -> Optional[Tuple[str, int]]:
         """若點擊位置在寶箱怪產物上則開始消失動畫並回傳 (產物類型, 金額)，否則回傳 None"""
         for pet in self.pets:
@@ -1173,7 +1506,6 @@ class AquariumWidget(QWidget):
 
     def _check_guppy_touch_money(self) -> None:
         """孔雀魚碰觸金錢：每5秒追最近金錢，碰觸後60%機率轉換為石榴結晶（紅色色調）。碰觸後5秒內無法再碰觸其他金錢。"""
-        import random
         from config import GUPPY_MONEY_COOLDOWN_SEC, GUPPY_MONEY_TRANSFORM_CHANCE
         for guppy in self.fishes:
             if guppy.species != "孔雀魚" or getattr(guppy, "is_dead", False):
@@ -1196,7 +1528,7 @@ class AquariumWidget(QWidget):
                     continue
                 if guppy_rect.intersects(money_rect):
                     # 碰觸到：60%機率轉換為石榴結晶
-                    if random.random() < GUPPY_MONEY_TRANSFORM_CHANCE:
+                    if sim_stream("world").random() < GUPPY_MONEY_TRANSFORM_CHANCE:
                         # 轉換為石榴結晶
                         money_type = money.money_name
                         # 載入原始動畫幀並調整為紅色色調
@@ -1226,7 +1558,6 @@ class AquariumWidget(QWidget):
 
     def _check_shark_eat_betta(self, aquarium_rect: QRect) -> Optional[Tuple["Fish", "Fish"]]:
         """鯊魚吃幼年鬥魚：每 300 秒可吃一隻，吃過後 300 秒內不再進食。回傳 (鯊魚, 被吃的魚) 由呼叫端移除魚並觸發鯊魚吃飯動畫，不播死亡動畫。"""
-        import random
         for shark in self.fishes:
             if shark.species != "鯊魚" or getattr(shark, "is_dead", False):
                 continue
@@ -1268,7 +1599,6 @@ class AquariumWidget(QWidget):
 
     def _check_feed_collisions(self, aquarium_rect: QRect) -> None:
         """檢測魚、會吃飼料的寵物（如拼布魚）與飼料的碰撞。孔雀魚與鯊魚不進食；核廢料僅鬥魚會吃（寵物類都不吃）；金條/鑽石僅天使鬥魚會吃，吃後變身金鬥魚/寶石鬥魚；金鬥魚/寶石鬥魚只吃一般飼料。"""
-        import random
         for fish in self.fishes:
             if fish.species == "孔雀魚" or fish.species == "鯊魚" or getattr(fish, "is_dead", False):
                 continue
@@ -1297,7 +1627,7 @@ class AquariumWidget(QWidget):
                     if fish.species != "鬥魚" or fish.stage != "angel":
                         continue
                     feed.is_eaten = True
-                    next_stage = "golden" if feed.feed_name == "金條" else "gem"
+                    next_stage = _CHEST_FEED_UPGRADE_STAGE.get(feed.feed_name, "gem")
                     self._on_fish_upgrade(fish, next_stage)
                     break
                 # 核廢料：僅鬥魚魚種會吃；進食後 80% 死亡、20% 複製（新魚在原魚位置生成）
@@ -1305,7 +1635,7 @@ class AquariumWidget(QWidget):
                     if fish.species != "鬥魚":
                         continue
                     feed.is_eaten = True
-                    if random.random() < NUCLEAR_DEATH_CHANCE:
+                    if sim_stream("world").random() < NUCLEAR_DEATH_CHANCE:
                         fish.set_dead()
                     else:
                         self._duplicate_fish(fish)
@@ -1388,6 +1718,8 @@ class AquariumWidget(QWidget):
     
     def paintEvent(self, event: QPaintEvent) -> None:
         """繪製水族箱背景和魚類"""
+        paint_start = time.perf_counter()
+        self.paint_pacing.mark(paint_start)
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
@@ -1436,6 +1768,19 @@ class AquariumWidget(QWidget):
         )
         for fish in self.fishes:
             frame = fish.get_current_frame()
+            if frame is None and fish.is_loading():
+                # 動畫幀仍在背景載入：以半透明橢圓佔位，避免啟動時等待所有素材解碼
+                ph_w = int(ASSET_PLACEHOLDER_SIZE[0] * fish.scale)
+                ph_h = int(ASSET_PLACEHOLDER_SIZE[1] * fish.scale)
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(QColor(*ASSET_PLACEHOLDER_COLOR))
+                painter.drawEllipse(
+                    int(fish.position.x()) - ph_w // 2,
+                    int(fish.position.y()) - ph_h // 2,
+                    ph_w,
+                    ph_h,
+                )
+                continue
             if frame:
                 display_rect = fish.get_display_rect()
                 if display_rect:
@@ -1457,8 +1802,8 @@ class AquariumWidget(QWidget):
             if happy_buff_active and getattr(fish, "poop_interval_sec", 0) > 0:
                 if self._happy_buff_heart_pixmap is None:
                     heart_path = _resource_dir() / "money" / "UI" / "拼布魚_愛心.png"
-                    if heart_path.exists():
-                        self._happy_buff_heart_pixmap = QPixmap(str(heart_path))
+                    if resource_exists(heart_path):
+                        self._happy_buff_heart_pixmap = load_pixmap(heart_path)
                 if self._happy_buff_heart_pixmap and not self._happy_buff_heart_pixmap.isNull():
                     fish_rect = fish.get_display_rect()
                     if fish_rect:
@@ -1512,6 +1857,9 @@ class AquariumWidget(QWidget):
                         painter.setOpacity(1.0)  # 恢復透明度
                     else:
                         painter.drawPixmap(produce_rect, produce_image)
+        if self.tick_profiler.enabled:
+            painter.end()
+            self.paint_histogram.record(time.perf_counter() - paint_start)
     
     def mousePressEvent(self, event: QMouseEvent) -> None:
         """記錄拖曳起點（左鍵）；點擊在 release 時判斷是否為純點擊"""
@@ -1538,12 +1886,10 @@ class AquariumWidget(QWidget):
         """左鍵拖曳時移動視窗，同時檢測滑鼠是否移動到金錢物件上"""
         # 檢測滑鼠是否移動到金錢物件上（自動拾取）- 無論是否錨定都應該執行
         pos = event.position().toPoint()
+        # 先檢查再呼叫（沒碰到金錢的移動不錄製），命中結果直接傳入，不重複掃描
         money_info = self.check_money_at(pos)
         if money_info is not None:
-            money, value = money_info
-            # 開始消失動畫並發送信號（傳遞金額值）
-            money.start_collect_animation()
-            self.money_hovered.emit(value)
+            self.collect_hovered_money(pos, money_info)
         
         # 處理視窗拖曳（檢查是否錨定）
         win = self.window()
@@ -1613,9 +1959,9 @@ def _get_app_icon() -> QIcon:
 def _list_backgrounds() -> List[Path]:
     """列出 resource/background 內可用的背景檔（jpg/png）"""
     bg_dir = _resource_dir() / "background"
-    if not bg_dir.exists():
+    if not resource_exists(bg_dir):
         return []
-    files = list(bg_dir.glob("*.jpg")) + list(bg_dir.glob("*.png"))
+    files = resource_files(bg_dir, ".jpg") + resource_files(bg_dir, ".png")
     return sorted(files, key=lambda p: p.stem)
 
 
@@ -1695,13 +2041,19 @@ def _load_money_frames(money_type: str) -> List[QPixmap]:
     """從 resource/money/{money_type} 載入金錢動畫幀（與飼料同樣的連續動畫），並對最外圍像素加深以增加對比。結果會快取，重複大便時不再重載。"""
     if money_type in _money_frames_cache:
         return _money_frames_cache[money_type]
+    if money_type.startswith("石榴結晶_"):
+        # 孔雀魚轉換的石榴結晶：由原金錢動畫幀調整色調（還原世界快照時使用）
+        base_frames = _load_money_frames(money_type[len("石榴結晶_"):])
+        frames = [_adjust_hue_to_pomegranate(pixmap) for pixmap in base_frames]
+        _money_frames_cache[money_type] = frames
+        return frames
     money_dir = _resource_dir() / "money" / money_type
-    if not money_dir.exists() or not money_dir.is_dir():
+    if not resource_is_dir(money_dir):
         return []
-    frame_files = sorted(money_dir.glob("*.png"))
+    frame_files = resource_files(money_dir)
     frames = []
     for path in frame_files:
-        pixmap = QPixmap(str(path))
+        pixmap = load_pixmap(path)
         if not pixmap.isNull():
             pixmap = _darken_money_edges(pixmap)
             frames.append(pixmap)
@@ -1712,13 +2064,13 @@ def _load_money_frames(money_type: str) -> List[QPixmap]:
 def _list_feeds() -> List[Tuple[str, Path]]:
     """列出 resource/feed 內可用的飼料（子目錄名與路徑），按照 config 中 FEED_GROWTH_POINTS 的順序排序"""
     feed_dir = _resource_dir() / "feed"
-    if not feed_dir.exists():
+    if not resource_exists(feed_dir):
         return []
     
     # 收集所有飼料
     feeds = []
-    for d in feed_dir.iterdir():
-        if d.is_dir():
+    for d in resource_subdirs(feed_dir):
+        if resource_is_dir(d):
             feeds.append((d.name, d))
     
     # 按照 FEED_GROWTH_POINTS 的順序排序
@@ -1739,12 +2091,12 @@ def _list_feeds() -> List[Tuple[str, Path]]:
 def _list_small_fish() -> List[Tuple[str, Path]]:
     """列出 resource/fish 內可用的魚種：以 fish 底下的資料夾當選單，回傳 (顯示名, 魚種目錄 Path)。排除僅在商店販售的魚種（如孔雀魚、鯊魚）。"""
     fish_dir = _resource_dir() / "fish"
-    if not fish_dir.exists():
+    if not resource_exists(fish_dir):
         return []
     shop_only_species = set(FISH_SHOP_CONFIG.keys())
     result = []
-    for species_dir in sorted(fish_dir.iterdir()):
-        if not species_dir.is_dir():
+    for species_dir in resource_subdirs(fish_dir):
+        if not resource_is_dir(species_dir):
             continue
         if species_dir.name in shop_only_species:
             continue
@@ -1757,17 +2109,35 @@ def _get_chest_feed_image_path(feed_name: str) -> Path:
     return _resource_dir() / "money" / "寶箱怪產物" / f"寶箱怪產物_{feed_name}.png"
 
 
+def _load_feed_frames(feed_name: str) -> List[QPixmap]:
+    """依飼料名稱載入動畫幀：resource/feed/{feed_name}/*.png，寶箱怪飼料缺少目錄時回退到單一產物圖片。"""
+    frames: List[QPixmap] = []
+    feed_dir = _resource_dir() / "feed" / feed_name
+    if resource_is_dir(feed_dir):
+        for frame_file in resource_files(feed_dir):
+            pixmap = load_pixmap(frame_file)
+            if not pixmap.isNull():
+                frames.append(pixmap)
+    if not frames and feed_name in CHEST_FEED_ITEMS:
+        chest_path = _get_chest_feed_image_path(feed_name)
+        if resource_exists(chest_path):
+            pixmap = load_pixmap(chest_path)
+            if not pixmap.isNull():
+                frames.append(pixmap)
+    return frames
+
+
 def _feed_preview_pixmap(feed_path: Path, size: int = 24) -> Optional[QPixmap]:
     """從飼料目錄或單一檔案取得第一幀作為預覽圖，縮放為指定尺寸。"""
-    if not feed_path.exists():
+    if not resource_exists(feed_path):
         return None
-    if feed_path.is_file():
-        pixmap = QPixmap(str(feed_path))
+    if resource_is_file(feed_path):
+        pixmap = load_pixmap(feed_path)
     else:
-        frame_files = sorted(feed_path.glob("*.png"))
+        frame_files = resource_files(feed_path)
         if not frame_files:
             return None
-        pixmap = QPixmap(str(frame_files[0]))
+        pixmap = load_pixmap(frame_files[0])
     if pixmap.isNull():
         return None
     return pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
@@ -1775,7 +2145,7 @@ def _feed_preview_pixmap(feed_path: Path, size: int = 24) -> Optional[QPixmap]:
 
 def _fish_preview_pixmap(species_dir: Path, size: int = 24) -> Optional[QPixmap]:
     """從魚種目錄取得第一幀游泳動畫作為預覽圖，縮放為指定尺寸（行為與鬥魚、鯊魚、孔雀魚相同）。"""
-    if not species_dir.exists() or not species_dir.is_dir():
+    if not resource_is_dir(species_dir):
         return None
     swim_behavior, _, _ = get_fish_behaviors(species_dir.name)
     frames = load_fish_animation(species_dir, swim_behavior)
@@ -1970,11 +2340,11 @@ class ShopOverlay(QFrame):
 
             if feed_name in CHEST_FEED_ITEMS:
                 feed_path = _get_chest_feed_image_path(feed_name)
-                if not feed_path.exists():
+                if not resource_exists(feed_path):
                     feed_path = None
             else:
-                feed_path = feed_dir / feed_name if feed_dir.exists() else None
-                if not feed_path or not feed_path.is_dir():
+                feed_path = feed_dir / feed_name if resource_exists(feed_dir) else None
+                if not feed_path or not resource_is_dir(feed_path):
                     feed_path = None
             preview_pixmap = _feed_preview_pixmap(feed_path, 64) if feed_path else None
 
@@ -2106,10 +2476,11 @@ class ShopOverlay(QFrame):
             fish_dir = resource_dir / "fish" / species_name
             for behavior in ("5_吃飽游泳", "6_吃飽吃", "7_吃飽轉向"):
                 anim_dir = fish_dir / behavior
-                if anim_dir.is_dir():
-                    frame_files = sorted(p for p in anim_dir.iterdir() if p.suffix == ".png" and p.is_file())
-                    if frame_files:
-                        preview_pixmap = QPixmap(str(frame_files[0]))
+                if resource_is_dir(anim_dir):
+                    # 經由素材載入器取得（啟動後已以商店優先序預先解碼，通常為快取命中）
+                    frames = get_asset_loader().load_animation(fish_dir, behavior).frames
+                    if frames:
+                        preview_pixmap = frames[0]
                         if not preview_pixmap.isNull() and preview_pixmap.width() > 0 and preview_pixmap.height() > 0:
                             scale_w = 50.0 / preview_pixmap.width()
                             scale_h = 50.0 / preview_pixmap.height()
@@ -2252,12 +2623,12 @@ class ShopOverlay(QFrame):
             preview_label.setScaledContents(False)
             pet_dir = resource_dir / "pet" / pet_name
             preview_path = pet_dir / swim_behavior
-            if not preview_path.exists():
+            if not resource_exists(preview_path):
                 preview_path = pet_dir / "1_游動"
-            if preview_path.exists():
-                frame_files = sorted(preview_path.glob("*.png"))
+            if resource_exists(preview_path):
+                frame_files = resource_files(preview_path)
                 if frame_files:
-                    preview_pixmap = QPixmap(str(frame_files[0]))
+                    preview_pixmap = load_pixmap(frame_files[0])
                     if not preview_pixmap.isNull():
                         # 計算縮放比例，確保圖片能完整顯示在 64x64 容器內
                         pixmap_width = preview_pixmap.width()
@@ -2408,8 +2779,8 @@ class ShopOverlay(QFrame):
             if tool_name == "飼料投食機":
                 feed_machine_path = resource_dir / "feed_machine" / f"投食機_{preview_color}.png"
                 preview_pixmap = None
-                if feed_machine_path.exists():
-                    preview_pixmap = QPixmap(str(feed_machine_path))
+                if resource_exists(feed_machine_path):
+                    preview_pixmap = load_pixmap(feed_machine_path)
                     if preview_pixmap.isNull():
                         preview_pixmap = None
             else:
@@ -2605,8 +2976,8 @@ class ControlPanel(QFrame):
         self._money_icon_label.setFixedSize(30, 30)
         self._money_icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self._money_icon_label.setScaledContents(False)
-        if money_icon_path.exists():
-            money_pixmap = QPixmap(str(money_icon_path))
+        if resource_exists(money_icon_path):
+            money_pixmap = load_pixmap(money_icon_path)
             if not money_pixmap.isNull():
                 scaled = money_pixmap.scaled(50, 50, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
                 self._money_icon_label.setPixmap(scaled)
@@ -2672,7 +3043,7 @@ class ControlPanel(QFrame):
                 continue
             # 優先使用 resource/feed/ 目錄路徑（用於動畫），如果不存在則使用單一圖片路徑（用於預覽圖）
             feed_dir = _resource_dir() / "feed" / name
-            if feed_dir.exists() and feed_dir.is_dir():
+            if resource_is_dir(feed_dir):
                 path = feed_dir
             else:
                 path = _get_chest_feed_image_path(name)
@@ -2748,11 +3119,11 @@ class TransparentAquariumWindow(QWidget):
         self.aquarium.pet_duplicate_requested.connect(self._on_pet_duplicate_requested)
         self.aquarium.game_time_updated.connect(self._on_game_time_updated)
 
-        # 飼料解鎖與數量計數器（待解鎖的飼料不出現在切換飼料選單）
-        self._feed_cheap_count = 0
-        self._feed_counters = {}
-        self._unlocked_feeds = ["便宜飼料"]
-        self._feed_counter_last_add = {}
+        # 飼料解鎖與數量計數器（待解鎖的飼料不出現在切換飼料選單；變更時通知選單、投食機與商店）
+        self._feed_inventory = FeedInventory(self)
+        # 自動解鎖規則（計數器變更時只判定相關規則）
+        self._unlock_rules = UnlockRules()
+        self._register_feed_unlock_rules()
 
         # 創建控制面板（水族箱外、透明視窗內）
         self.panel = ControlPanel(self)
@@ -2778,11 +3149,14 @@ class TransparentAquariumWindow(QWidget):
         # 投食機透明部件（重疊在主視窗上，掛在水族箱左側）
         self._feed_machine_widget = FeedMachineWidget(self)
         self._feed_machine_widget.feed_selected.connect(self._on_feed_machine_feed_selected)
-        self._feed_machine_widget.set_unlocked_feeds(self._unlocked_feeds, self._feed_counters)
+        self._feed_machine_widget.set_unlocked_feeds(self._feed_inventory.unlocked, self._feed_inventory.counters)
         
         # 投食機自動投食計時器
         self._feed_machine_timer = 0.0  # 秒
         self._feed_machine_interval = FEED_MACHINE_INTERVAL_SEC  # 投食間隔（從 config 讀取）
+        # 投食機選擇的飼料是否可投放（選擇飼料或庫存變更時更新，每幀只檢查這個旗標）
+        self._feed_machine_armed = False
+        self._feed_inventory.changed.connect(self._on_feed_inventory_changed)
         
         # 寵物追蹤：{pet_name: pet_instance}
         self._pets: dict = {}
@@ -2799,6 +3173,8 @@ class TransparentAquariumWindow(QWidget):
         self._saved_window_pos: Optional[QPoint] = None
         # 擊殺模式：是否啟用擊殺功能
         self._kill_mode_enabled = False
+        # 是否顯示會阻塞的提示對話框（離屏執行與重播時關閉）
+        self.modal_dialogs = True
 
         # 遮罩：水族箱 + 面板區域可接收滑鼠，其餘穿透
         # 注意：updateWindowMask() 會在創建控制按鈕後再次調用，這裡先調用以設置基本遮罩
@@ -2823,17 +3199,61 @@ class TransparentAquariumWindow(QWidget):
         # 初始不載入魚，由使用者從「投放魚」按鈕自行新增
         # 設定預設飼料為"便宜飼料"
         feed_dir = _resource_dir() / "feed" / "便宜飼料"
-        if feed_dir.exists():
+        if resource_exists(feed_dir):
             self._current_feed = ("便宜飼料", feed_dir)
         else:
             self._current_feed = None
         
+        # 自動儲存服務：合併短時間內的多次儲存請求；序列化與寫檔交給背景寫入器
+        self._save_writer = SaveWriter(_write_save_snapshot, parent=self)
+        self._autosave = AutoSaveService(self._save_game_state, parent=self, writer=self._save_writer)
+        
+        # 快捷鍵：將遊戲迴圈分段計時結果寫入存檔目錄
+        self._tick_profile_shortcut = QShortcut(QKeySequence(TICK_PROFILER_DUMP_SHORTCUT), self)
+        self._tick_profile_shortcut.activated.connect(lambda: self.aquarium.dump_tick_profile())
+        # 快捷鍵：開始/停止錄製輸入（重播見 tools/run_scenario.py --replay）
+        self.input_recorder: Optional[InputRecorder] = None
+        # 等待魚動畫解碼、尚未開始的錄製請求（見 start_input_recording）
+        self._pending_record_token: Optional[object] = None
+        self._input_record_shortcut = QShortcut(QKeySequence(INPUT_RECORD_SHORTCUT), self)
+        self._input_record_shortcut.activated.connect(self._toggle_input_recording)
+        # 快捷鍵：開始/停止執行中剖析（cProfile 或堆疊取樣），結果寫入存檔目錄
+        self.session_profiler: Optional[SessionProfiler] = None
+        self._profile_shortcut = QShortcut(QKeySequence(PROFILE_CAPTURE_SHORTCUT), self)
+        self._profile_shortcut.activated.connect(self._toggle_profile_capture)
+
+        # 執行指標：收入計數與素材快取、自動儲存、行程記憶體；啟用時定期寫入存檔目錄
+        metrics = self.aquarium.metrics
+        self._metric_money_earned = metrics.counter("money_earned_total", "拾取金錢累計獲得的金幣")
+        metrics.add_rate("money_per_minute", "money_earned_total", per=60.0, help_text="每分鐘獲得的金幣")
+        metrics.add_collector(self._collect_metrics, {
+            "asset_cache_hit_ratio": "素材快取命中率",
+            "asset_cache_bytes": "素材快取占用（位元組）",
+            "asset_pending_tasks": "排程中的素材解碼任務數",
+            "autosave_total": "自動儲存計數（依結果分類）",
+            "save_writer_total": "背景寫入器計數（依結果分類）",
+            "money": "目前金幣",
+        })
+        metrics.add_collector(collect_process_samples, PROCESS_HELP)
+        self._metrics_exporter: Optional[MetricsExporter] = None
+        self._start_metrics_exporter()
+        # 記憶體成長追蹤：在載入存檔前開始，載入的魚也會登記
+        self._memory_tracker: Optional[MemoryTracker] = None
+        self._start_memory_tracker()
+
         # 載入遊戲狀態
         self._load_game_state()
         
         # 更新工具解鎖狀態與顯示
         self._update_tool_unlocks()
         
+        record_path = os.environ.get("AQUARIUM_RECORD", "").strip()
+        if record_path:
+            self.start_input_recording(Path(record_path))
+        profile_mode = os.environ.get("AQUARIUM_PROFILE", "").strip()
+        if profile_mode:
+            self.start_profile_capture(profile_mode)
+        
         # 創建右上角隱藏按鈕（放在最右側）
         self._hide_button = QPushButton("👁", self)
         self._hide_button.setFixedSize(30, 30)
@@ -2964,6 +3384,7 @@ class TransparentAquariumWindow(QWidget):
                 "}"
             )
     
+    @recorded_input
     def _toggle_kill_mode(self) -> None:
         """切換擊殺模式"""
         self._kill_mode_enabled = not self._kill_mode_enabled
@@ -2987,14 +3408,15 @@ class TransparentAquariumWindow(QWidget):
                 "}"
             )
             # 顯示提示視窗
-            msg_box = QMessageBox(self)
-            msg_box.setWindowTitle("擊殺模式")
-            msg_box.setWindowIcon(_get_app_icon())
-            msg_box.setIcon(QMessageBox.Icon.Warning)
-            msg_box.setText("點擊魚會殺死魚喔！")
-            msg_box.setStandardButtons(QMessageBox.StandardButton.Ok)
-            msg_box.button(QMessageBox.StandardButton.Ok).setText("知道了")
-            msg_box.exec()
+            if self.modal_dialogs:
+                msg_box = QMessageBox(self)
+                msg_box.setWindowTitle("擊殺模式")
+                msg_box.setWindowIcon(_get_app_icon())
+                msg_box.setIcon(QMessageBox.Icon.Warning)
+                msg_box.setText("點擊魚會殺死魚喔！")
+                msg_box.setStandardButtons(QMessageBox.StandardButton.Ok)
+                msg_box.button(QMessageBox.StandardButton.Ok).setText("知道了")
+                msg_box.exec()
         else:
             # 擊殺模式關閉：恢復原樣
             self._kill_button.setStyleSheet(
@@ -3641,8 +4063,8 @@ class TransparentAquariumWindow(QWidget):
             self.total_money, self._unlocked_pets,
             self._pet_levels,
             self._get_fish_count_by_species(),
-            self._unlocked_feeds,
-            self._feed_cheap_count,
+            self._feed_inventory.unlocked,
+            self._feed_inventory.cheap_count,
             self._unlocked_tools,
             self._tool_colors,
         )
@@ -3653,13 +4075,14 @@ class TransparentAquariumWindow(QWidget):
         """商店覆蓋關閉後可做後續處理（目前僅隱藏）"""
         pass
     
+    @recorded_input
     def _on_pet_purchase_requested(self, pet_name: str) -> None:
         """處理寵物購買請求（含金幣解鎖與魚種解鎖）"""
         if pet_name in self._pets:
-            print(f"[寵物] {pet_name} 已存在，無法重複召喚")
+            _pet_log.info("%s 已存在，無法重複召喚", pet_name)
             return
         if pet_name not in PET_CONFIG:
-            print(f"[寵物] {pet_name} 配置不存在")
+            _pet_log.warning("%s 配置不存在", pet_name)
             return
         
         pet_config = PET_CONFIG[pet_name]
@@ -3669,20 +4092,20 @@ class TransparentAquariumWindow(QWidget):
             unlock_money = pet_config["unlock_money"]
             if pet_name not in self._unlocked_pets:
                 if self.total_money < unlock_money:
-                    print(f"[寵物] {pet_name} 未解鎖（需要 {unlock_money} 金幣）")
+                    _pet_log.info("%s 未解鎖（需要 %s 金幣）", pet_name, unlock_money)
                     return
                 self.total_money -= unlock_money
                 self._unlocked_pets.append(pet_name)
                 self.panel.set_money(self.total_money)
             self._spawn_pet(pet_name)
-            self._auto_save()
+            self._auto_save(critical=True)
             self._shop_overlay.update_items(
                 self._unlocked_species, self._pets,
                 self.total_money, self._unlocked_pets,
                 self._pet_levels,
                 self._get_fish_count_by_species(),
-                self._unlocked_feeds,
-                self._feed_cheap_count,
+                self._feed_inventory.unlocked,
+                self._feed_inventory.cheap_count,
                 self._unlocked_tools,
                 self._tool_colors,
             )
@@ -3698,23 +4121,23 @@ class TransparentAquariumWindow(QWidget):
             species = unlock_species
             key = species
         if key not in self._unlocked_species:
-            print(f"[寵物] {pet_name} 未解鎖（{unlock_species} 未達到 {unlock_count} 隻）")
+            _pet_log.info("%s 未解鎖（%s 未達到 %s 隻）", pet_name, unlock_species, unlock_count)
             return
         total_count = self._unlocked_species[key].get("total_count_reached", 0)
         max_count = self._unlocked_species[key].get("max_count_reached", 0)
         effective_count = max(total_count, max_count)
         if effective_count < unlock_count:
-            print(f"[寵物] {pet_name} 未解鎖（{unlock_species} 有效數量 {effective_count}，需要 {unlock_count} 隻）")
+            _pet_log.info("%s 未解鎖（%s 有效數量 %s，需要 %s 隻）", pet_name, unlock_species, effective_count, unlock_count)
             return
         self._spawn_pet(pet_name)
-        self._auto_save()
+        self._auto_save(critical=True)
         self._shop_overlay.update_items(
             self._unlocked_species, self._pets,
             self.total_money, self._unlocked_pets,
             self._pet_levels,
             self._get_fish_count_by_species(),
-            self._unlocked_feeds,
-            self._feed_cheap_count,
+            self._feed_inventory.unlocked,
+            self._feed_inventory.cheap_count,
             self._unlocked_tools,
             self._tool_colors,
         )
@@ -3724,77 +4147,22 @@ class TransparentAquariumWindow(QWidget):
         if pet_name in self._pets:
             return
         self._spawn_pet(pet_name)
-        self._auto_save()
+        self._auto_save(critical=True)
 
     def _on_game_time_updated(self, game_time_sec: float) -> None:
         """每幀更新：飼料數量計數器定時 +1（僅已解鎖飼料），並檢查解鎖條件。"""
-        changed = False
-        for feed_name, cfg in FEED_UNLOCK_CONFIG.items():
-            if feed_name == "便宜飼料":
-                continue
-            if feed_name not in self._unlocked_feeds:
-                continue
-            interval = get_feed_counter_interval_sec(feed_name)
-            if interval is None:
-                continue
-            # 確保計時器已初始化
-            if feed_name not in self._feed_counter_last_add:
-                self._feed_counter_last_add[feed_name] = game_time_sec
-                continue
-            last = self._feed_counter_last_add.get(feed_name, game_time_sec)
-            if game_time_sec - last >= interval:
-                self._feed_counters[feed_name] = self._feed_counters.get(feed_name, 0) + 1
-                self._feed_counter_last_add[feed_name] = game_time_sec
-                changed = True
-        if changed:
-            self._update_feed_unlocks()
-            if hasattr(self.panel, "update_feed_menu"):
-                self.panel.update_feed_menu(self._unlocked_feeds, self._feed_counters)
-        
-        # 更新投食機的已解鎖飼料列表（每次更新，確保同步）
-        if hasattr(self, '_feed_machine_widget'):
-            self._feed_machine_widget.set_unlocked_feeds(self._unlocked_feeds, self._feed_counters)
-        
-        # 投食機自動投食（依配置間隔投放5~10顆）
-        if hasattr(self, '_feed_machine_widget') and self._feed_machine_widget.isVisible():
-            selected_feed = self._feed_machine_widget.get_selected_feed()
-            if selected_feed:
-                feed_name, feed_path = selected_feed
-                # 檢查飼料是否可用
-                if feed_name in self._unlocked_feeds:
-                    if feed_name == "便宜飼料" or self._feed_counters.get(feed_name, 0) > 0:
-                        # 更新計時器（約60 FPS，每幀 1/60 秒）
-                        self._feed_machine_timer += 1.0 / 60.0
-                        if self._feed_machine_timer >= self._feed_machine_interval:
-                            # 投放飼料（5~10顆）
-                            feed_count = random.randint(5, 10)
-                            # 檢查實際可用的飼料數量
-                            can_feed = True
-                            if feed_name == "便宜飼料":
-                                # 便宜飼料：檢查是否有足夠的錢
-                                feed_cost = FEED_COST.get(feed_name, 0)
-                                if feed_cost > 0:
-                                    total_cost = feed_cost * feed_count
-                                    if self.total_money < total_cost:
-                                        # 金錢不足，計算能負擔的數量
-                                        affordable_count = self.total_money // feed_cost
-                                        if affordable_count <= 0:
-                                            # 完全無法負擔，跳過本次投餵
-                                            can_feed = False
-                                        else:
-                                            feed_count = affordable_count
-                            else:
-                                # 其他飼料：檢查實際擁有的數量
-                                available_count = self._feed_counters.get(feed_name, 0)
-                                if available_count <= 0:
-                                    # 沒有飼料，跳過本次投餵
-                                    can_feed = False
-                                elif feed_count > available_count:
-                                    # 隨機數量超過實際數量，只拋出實際擁有的數量
-                                    feed_count = available_count
-                            if can_feed:
-                                self._feed_machine_shoot_feeds(feed_name, feed_path, feed_count)
-                            self._feed_machine_timer = 0.0
+        # 數量計數器只在下一次到期時才逐一檢查；庫存變更由 _on_feed_inventory_changed 同步選單
+        added = self._feed_inventory.advance(game_time_sec)
+        if added:
+            self._unlock_rules.changed(*(feed_counter(feed_name) for feed_name in added))
+        
+        # 投食機自動投食（選擇的飼料可投放時計時，依配置間隔投放5~10顆）
+        if self._feed_machine_armed and self._feed_machine_widget.isVisible():
+            # 更新計時器（約60 FPS，每幀 1/60 秒）
+            self._feed_machine_timer += 1.0 / 60.0
+            if self._feed_machine_timer >= self._feed_machine_interval:
+                self._feed_machine_burst()
+                self._feed_machine_timer = 0.0
         
         # 檢查是否需要贈送100$（沒有魚且總金額歸0）
         fish_count = len(self.aquarium.fishes)
@@ -3807,8 +4175,53 @@ class TransparentAquariumWindow(QWidget):
         # 更新上一次的狀態
         self._last_bonus_condition_met = current_condition_met
 
+    def _feed_machine_burst(self) -> None:
+        """投食機投放一次飼料（5~10顆，依金錢或實際數量減少）"""
+        feed_name, feed_path = self._feed_machine_widget.get_selected_feed()
+        feed_count = sim_stream("feed_machine").randint(5, 10)
+        # 檢查實際可用的飼料數量
+        if feed_name == "便宜飼料":
+            # 便宜飼料：檢查是否有足夠的錢
+            feed_cost = FEED_COST.get(feed_name, 0)
+            if feed_cost > 0 and self.total_money < feed_cost * feed_count:
+                # 金錢不足，只投放能負擔的數量；完全無法負擔時跳過本次投餵
+                feed_count = self.total_money // feed_cost
+        else:
+            # 其他飼料：隨機數量超過實際數量時，只拋出實際擁有的數量
+            feed_count = min(feed_count, self._feed_inventory.count(feed_name))
+        if feed_count > 0:
+            self._feed_machine_shoot_feeds(feed_name, feed_path, feed_count)
+
+    def _update_feed_machine_armed(self) -> None:
+        """依投食機選擇的飼料與庫存，更新投食機是否持續計時"""
+        selected = self._feed_machine_widget.get_selected_feed()
+        self._feed_machine_armed = bool(selected) and self._feed_inventory.is_available(selected[0])
+
+    def _on_feed_inventory_changed(self) -> None:
+        """飼料庫存變更：同步切換飼料選單、投食機（飼料列表與是否計時），商店開啟時更新商店"""
+        self.panel.update_feed_menu(self._feed_inventory.unlocked, self._feed_inventory.counters)
+        self._feed_machine_widget.set_unlocked_feeds(self._feed_inventory.unlocked, self._feed_inventory.counters)
+        self._update_feed_machine_armed()
+        if self._shop_overlay.isVisible():
+            self._shop_overlay.update_items(
+                self._unlocked_species, self._pets,
+                self.total_money, self._unlocked_pets,
+                self._pet_levels,
+                self._get_fish_count_by_species(),
+                self._feed_inventory.unlocked,
+                self._feed_inventory.cheap_count,
+                self._unlocked_tools,
+                self._tool_colors,
+            )
+
     def _show_bonus_dialog(self) -> None:
-        """顯示贈送100$的確認對話框"""
+        """贈送100$並顯示對話框"""
+        # 先贈送再顯示對話框：對話框期間遊戲迴圈仍在執行，贈送的幀數才不受使用者何時按下影響（重播一致）
+        self.total_money += 100
+        self.panel.set_money(self.total_money)
+        self._auto_save()
+        if not self.modal_dialogs:
+            return
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle("贈送")
         msg_box.setWindowIcon(_get_app_icon())
@@ -3817,41 +4230,46 @@ class TransparentAquariumWindow(QWidget):
         msg_box.setStandardButtons(QMessageBox.StandardButton.Ok)
         msg_box.button(QMessageBox.StandardButton.Ok).setText("謝謝")
         msg_box.exec()
-        
-        # 贈送100$
-        self.total_money += 100
-        self.panel.set_money(self.total_money)
-        self._auto_save()
 
-    def _update_feed_unlocks(self) -> None:
-        """依 FEED_UNLOCK_CONFIG 與當前狀態更新 _unlocked_feeds（鯉魚飼料、藥丸；核廢料由商店解鎖按鈕）。"""
+    def _register_feed_unlock_rules(self) -> None:
+        """依 FEED_UNLOCK_CONFIG 登記自動解鎖規則（鯉魚飼料、藥丸、寶箱怪產物；核廢料由商店解鎖按鈕）。"""
         for feed_name, cfg in FEED_UNLOCK_CONFIG.items():
-            if feed_name in self._unlocked_feeds:
-                continue
             unlock_by = cfg.get("unlock_by")
             if unlock_by == "always":
-                self._unlocked_feeds.append(feed_name)
-                continue
-            if unlock_by == "feed_cheap_count":
-                if self._feed_cheap_count >= cfg.get("unlock_value", 100):
-                    self._unlocked_feeds.append(feed_name)
-                    if feed_name not in self._feed_counters:
-                        self._feed_counters[feed_name] = 0
-                    if feed_name not in self._feed_counter_last_add:
-                        self._feed_counter_last_add[feed_name] = self.aquarium._game_time_sec
+                depends, condition = (), (lambda: True)
+            elif unlock_by == "feed_cheap_count":
+                value = cfg.get("unlock_value", 100)
+                depends = (FEED_CHEAP_COUNT,)
+                condition = lambda value=value: self._feed_inventory.cheap_count >= value
             elif unlock_by == "large_betta_count":
-                key = "large_鬥魚"
-                max_count = self._unlocked_species.get(key, {}).get("max_count_reached", 0)
-                if max_count >= cfg.get("unlock_value", 10):
-                    self._unlocked_feeds.append(feed_name)
-                    if feed_name not in self._feed_counters:
-                        self._feed_counters[feed_name] = 0
-                    if feed_name not in self._feed_counter_last_add:
-                        self._feed_counter_last_add[feed_name] = self.aquarium._game_time_sec
+                value = cfg.get("unlock_value", 10)
+                depends = (max_count_counter("large_鬥魚"),)
+                condition = lambda value=value: (
+                    self._unlocked_species.get("large_鬥魚", {}).get("max_count_reached", 0) >= value
+                )
             elif unlock_by == "chest_feed_count":
-                if self._feed_counters.get(feed_name, 0) > 0:
-                    self._unlocked_feeds.append(feed_name)
+                depends = (feed_counter(feed_name),)
+                condition = lambda feed_name=feed_name: self._feed_inventory.counters.get(feed_name, 0) > 0
+            else:
+                continue
+            # 有數量計數器的飼料解鎖時開始計時
+            start_counter = unlock_by in ("feed_cheap_count", "large_betta_count")
+            self._unlock_rules.add(
+                f"feed:{feed_name}", depends, condition,
+                lambda feed_name=feed_name, start_counter=start_counter: self._unlock_feed(feed_name, start_counter),
+            )
+
+    def _unlock_feed(self, feed_name: str, start_counter: bool) -> None:
+        """解鎖規則成立時加入已解鎖飼料（start_counter 為 True 時初始化數量計數器與計時）"""
+        if self._feed_inventory.unlock(feed_name, self.aquarium._game_time_sec, start_counter):
+            _unlock_log.info("飼料解鎖：%s", feed_name)
+
+    def _reset_unlock_rules(self) -> None:
+        """載入存檔後重設解鎖規則（已解鎖的飼料不再判定）並判定一次所有規則"""
+        self._unlock_rules.reset(f"feed:{feed_name}" for feed_name in self._feed_inventory.unlocked)
+        self._unlock_rules.evaluate_all()
 
+    @recorded_input
     def _on_pet_upgrade_requested(self, pet_name: str) -> None:
         """處理寵物升級請求：扣款、更新等級、套用效果、刷新商店"""
         if pet_name not in self._pets:
@@ -3880,18 +4298,19 @@ class TransparentAquariumWindow(QWidget):
             pet.set_level(next_level)
         elif pet_name == "拼布魚":
             pet.set_level(next_level)
-        self._auto_save()
+        self._auto_save(critical=True)
         self._shop_overlay.update_items(
             self._unlocked_species, self._pets,
             self.total_money, self._unlocked_pets,
             self._pet_levels,
             self._get_fish_count_by_species(),
-            self._unlocked_feeds,
-            self._feed_cheap_count,
+            self._feed_inventory.unlocked,
+            self._feed_inventory.cheap_count,
             self._unlocked_tools,
             self._tool_colors,
         )
         
+    @recorded_input
     def _on_feed_unlock_requested(self, feed_name: str) -> None:
         """飼料解鎖請求：核廢料需犧牲 6 隻中鬥魚，解鎖時將場上 6 隻中鬥魚改為死亡效果並加入核廢料至已解鎖。"""
         if feed_name != "核廢料":
@@ -3909,27 +4328,24 @@ class TransparentAquariumWindow(QWidget):
             if fish.species == "鬥魚" and fish.stage == "medium":
                 to_remove.append(fish)
         if len(to_remove) < need_count:
-            print(f"[飼料解鎖] 核廢料需要 {need_count} 隻中鬥魚，目前僅 {len(to_remove)} 隻")
+            _unlock_log.info("飼料：核廢料需要 %s 隻中鬥魚，目前僅 %s 隻", need_count, len(to_remove))
             return
         for fish in to_remove:
             fish.set_dead()
-        self._unlocked_feeds.append(feed_name)
-        if feed_name not in self._feed_counters:
-            self._feed_counters[feed_name] = 0
-        self._feed_counter_last_add[feed_name] = self.aquarium._game_time_sec
-        self.panel.update_feed_menu(self._unlocked_feeds, self._feed_counters)
+        self._feed_inventory.unlock(feed_name, self.aquarium._game_time_sec)
         self._shop_overlay.update_items(
             self._unlocked_species, self._pets,
             self.total_money, self._unlocked_pets,
             self._pet_levels,
             self._get_fish_count_by_species(),
-            self._unlocked_feeds,
-            self._feed_cheap_count,
+            self._feed_inventory.unlocked,
+            self._feed_inventory.cheap_count,
             self._unlocked_tools,
             self._tool_colors,
         )
-        self._auto_save()
+        self._auto_save(critical=True)
 
+    @recorded_input
     def _on_fish_purchase_requested(self, species_name: str) -> None:
         """處理商店魚種購買請求：檢查解鎖與購買條件，扣除金幣或犧牲魚後在水族箱新增該魚種。"""
         if species_name not in FISH_SHOP_CONFIG:
@@ -3937,8 +4353,8 @@ class TransparentAquariumWindow(QWidget):
         cfg = FISH_SHOP_CONFIG[species_name]
         resource_dir = _resource_dir()
         fish_dir = resource_dir / "fish" / species_name
-        if not fish_dir.is_dir():
-            print(f"[商店魚種] {species_name} 資源目錄不存在: {fish_dir}")
+        if not resource_is_dir(fish_dir):
+            _unlock_log.warning("商店魚種：%s 資源目錄不存在: %s", species_name, fish_dir)
             return
         # 解鎖檢查
         is_unlocked = False
@@ -3952,7 +4368,7 @@ class TransparentAquariumWindow(QWidget):
                 max_count = self._unlocked_species[key].get("max_count_reached", 0)
                 is_unlocked = max_count >= unlock_count
         if not is_unlocked:
-            print(f"[商店魚種] {species_name} 未解鎖")
+            _unlock_log.info("商店魚種：%s 未解鎖", species_name)
             return
         # 購買條件：犧牲魚 或 金幣
         require_species = cfg.get("require_species")
@@ -3960,10 +4376,9 @@ class TransparentAquariumWindow(QWidget):
         purchase_money = cfg.get("purchase_money", 0)
         if require_species and require_count > 0:
             req_key = require_species
-            fish_counts = self._get_fish_count_by_species()
-            current = fish_counts.get(req_key, 0)
+            current = self.aquarium.population.get(req_key, 0)
             if current < require_count:
-                print(f"[商店魚種] {species_name} 需要 {require_count} 隻 {require_species}，目前 {current} 隻")
+                _unlock_log.info("商店魚種：%s 需要 %s 隻 %s，目前 %s 隻", species_name, require_count, require_species, current)
                 return
             # 犧牲魚改為死亡效果（不立即移除，由 update_fishes 在動畫結束後移除）
             to_remove = []
@@ -3979,19 +4394,19 @@ class TransparentAquariumWindow(QWidget):
                 fish.set_dead()
         if purchase_money > 0:
             if self.total_money < purchase_money:
-                print(f"[商店魚種] {species_name} 需要 {purchase_money} 金幣")
+                _unlock_log.info("商店魚種：%s 需要 %s 金幣", species_name, purchase_money)
                 return
             self.total_money -= purchase_money
             self.panel.set_money(self.total_money)
         self.on_fish_add_requested(fish_dir)
-        self._auto_save()
+        self._auto_save(critical=True)
         self._shop_overlay.update_items(
             self._unlocked_species, self._pets,
             self.total_money, self._unlocked_pets,
             self._pet_levels,
             self._get_fish_count_by_species(),
-            self._unlocked_feeds,
-            self._feed_cheap_count,
+            self._feed_inventory.unlocked,
+            self._feed_inventory.cheap_count,
             self._unlocked_tools,
             self._tool_colors,
         )
@@ -4000,8 +4415,8 @@ class TransparentAquariumWindow(QWidget):
         """召喚寵物到水族箱"""
         resource_dir = _resource_dir()
         pet_dir = resource_dir / "pet" / pet_name
-        if not pet_dir.exists():
-            print(f"[寵物] {pet_name} 資源目錄不存在: {pet_dir}")
+        if not resource_exists(pet_dir):
+            _pet_log.warning("%s 資源目錄不存在: %s", pet_name, pet_dir)
             return
         
         pet_config = PET_CONFIG.get(pet_name, {})
@@ -4010,7 +4425,7 @@ class TransparentAquariumWindow(QWidget):
         swim_frames = load_pet_animation(pet_dir, swim_behavior)
         turn_frames = load_pet_animation(pet_dir, turn_behavior) if turn_behavior else swim_frames
         if not swim_frames:
-            print(f"[寵物] {pet_name} 無法載入動畫: {swim_behavior}")
+            _pet_log.warning("%s 無法載入動畫: %s", pet_name, swim_behavior)
             return
         if not turn_frames:
             turn_frames = swim_frames
@@ -4046,8 +4461,8 @@ class TransparentAquariumWindow(QWidget):
                 chest_level=level,
             )
         elif pet_name == "拼布魚":
-            x = random.randint(aquarium_rect.left() + 60, aquarium_rect.right() - 60)
-            y = random.randint(aquarium_rect.top() + 60, aquarium_rect.bottom() - 60)
+            x = sim_stream("pet").randint(aquarium_rect.left() + 60, aquarium_rect.right() - 60)
+            y = sim_stream("pet").randint(aquarium_rect.top() + 60, aquarium_rect.bottom() - 60)
             position = QPoint(x, y)
             eat_frames = load_pet_animation(pet_dir, "6_吃飽吃") or swim_frames
             # 使用config中的拼布魚速度，而非PET_CONFIG中的speed
@@ -4066,8 +4481,8 @@ class TransparentAquariumWindow(QWidget):
             # 設置街頭表演開始回調（用於觸發全場快樂buff）
             pet.on_performance_start_callback = lambda: self._on_patchwork_performance_start()
         else:
-            x = random.randint(aquarium_rect.left() + 60, aquarium_rect.right() - 60)
-            y = random.randint(aquarium_rect.top() + 60, aquarium_rect.bottom() - 60)
+            x = sim_stream("pet").randint(aquarium_rect.left() + 60, aquarium_rect.right() - 60)
+            y = sim_stream("pet").randint(aquarium_rect.top() + 60, aquarium_rect.bottom() - 60)
             position = QPoint(x, y)
             pet = Pet(
                 swim_frames=swim_frames,
@@ -4079,44 +4494,49 @@ class TransparentAquariumWindow(QWidget):
             )
         self.aquarium.add_pet(pet)
         self._pets[pet_name] = pet
-        print(f"[寵物] 成功召喚 {pet_name}")
+        _pet_log.info("成功召喚 %s", pet_name)
 
     def _do_chest_spawn_money(self, money_name: str) -> None:
         """寶箱怪產物：在水族箱加入金錢，拾取時重置寶箱怪計時"""
         pos = QPointF(400, 300)
+        self.aquarium.add_money_with_callback(pos, money_name, self._on_chest_produce_collected)
 
-        def on_collected() -> None:
-            if "寶箱怪" in self._pets:
-                self._pets["寶箱怪"].reset_after_collect()
-
-        self.aquarium.add_money_with_callback(pos, money_name, on_collected)
+    def _on_chest_produce_collected(self) -> None:
+        """寶箱怪產物被拾取：重置寶箱怪計時"""
+        if "寶箱怪" in self._pets:
+            self._pets["寶箱怪"].reset_after_collect()
 
     def _on_patchwork_performance_start(self) -> None:
         """拼布魚街頭表演模式開始（觸發全場快樂buff）"""
         # 這裡可以實現全場快樂buff邏輯（例如減少魚的大便間隔5%）
         # 目前先記錄log
-        print(f"[拼布魚] 街頭表演模式已啟動，全場快樂buff生效")
+        _pet_log.info("拼布魚：街頭表演模式已啟動，全場快樂buff生效")
 
+    @recorded_input
     def on_background_selected(self, path: Optional[Path]) -> None:
         """使用者從清單選擇背景後切換水族箱背景"""
         self.aquarium.set_background(path)
         # 自動儲存
         self._auto_save()
 
+    @recorded_input
     def on_background_opacity_changed(self, percent: int) -> None:
         """使用者調整背景透明度後更新水族箱背景透明度"""
         self.aquarium.set_background_opacity(percent)
         # 自動儲存
         self._auto_save()
 
+    @recorded_input
     def on_feed_selected(self, feed_name: str, feed_path: Path) -> None:
         """使用者選擇飼料類型（可留給之後投放飼料時使用）"""
         self._current_feed = (feed_name, feed_path)
     
+    @recorded_input
     def _on_feed_machine_feed_selected(self, feed_name: str, feed_path: Path) -> None:
         """投食機選擇飼料時更新顯示"""
         # 更新投食機部件的顯示
         self._feed_machine_widget.set_selected_feed(feed_name, feed_path)
+        self._update_feed_machine_armed()
         # 注意：選擇飼料時不扣減數量，只有在實際發射飼料時才扣減（在 _feed_machine_shoot_feeds 中處理）
     
     def _feed_machine_shoot_feeds(self, feed_name: str, feed_path: Path, count: int) -> None:
@@ -4126,22 +4546,22 @@ class TransparentAquariumWindow(QWidget):
         if feed_name in CHEST_FEED_ITEMS:
             # 金條、鑽石：優先從 resource/feed/ 目錄載入動畫幀
             feed_dir = _resource_dir() / "feed" / feed_name
-            if feed_dir.exists() and feed_dir.is_dir():
-                frame_files = sorted(feed_dir.glob("*.png"))
+            if resource_is_dir(feed_dir):
+                frame_files = resource_files(feed_dir)
                 for frame_file in frame_files:
-                    pixmap = QPixmap(str(frame_file))
+                    pixmap = load_pixmap(frame_file)
                     if not pixmap.isNull():
                         feed_frames.append(pixmap)
             # 如果 resource/feed/ 目錄不存在，回退到單一圖片
-            if not feed_frames and feed_path.exists():
-                if feed_path.is_file():
-                    pixmap = QPixmap(str(feed_path))
+            if not feed_frames and resource_exists(feed_path):
+                if resource_is_file(feed_path):
+                    pixmap = load_pixmap(feed_path)
                     if not pixmap.isNull():
                         feed_frames.append(pixmap)
-        elif feed_path.exists() and feed_path.is_dir():
-            frame_files = sorted(feed_path.glob("*.png"))
+        elif resource_is_dir(feed_path):
+            frame_files = resource_files(feed_path)
             for frame_file in frame_files:
-                pixmap = QPixmap(str(frame_file))
+                pixmap = load_pixmap(frame_file)
                 if not pixmap.isNull():
                     feed_frames.append(pixmap)
         
@@ -4179,12 +4599,13 @@ class TransparentAquariumWindow(QWidget):
         target_x_min = aquarium_width * FEED_MACHINE_TARGET_X_MIN_RATIO
         target_x_max = aquarium_width * FEED_MACHINE_TARGET_X_MAX_RATIO
         margin = 50
+        rng = sim_stream("feed_machine")
         for _ in range(count):
-            target_x = random.uniform(
+            target_x = rng.uniform(
                 max(margin, target_x_min),
                 min(aquarium_width - margin, target_x_max)
             )
-            target_y = random.uniform(
+            target_y = rng.uniform(
                 margin,
                 aquarium_height - margin - 100  # 留出底部空間
             )
@@ -4208,9 +4629,9 @@ class TransparentAquariumWindow(QWidget):
                 self.total_money -= total_cost
                 self.panel.set_money(self.total_money)
         else:
-            self._feed_counters[feed_name] = max(0, self._feed_counters.get(feed_name, 0) - count)
-            self.panel.update_feed_menu(self._unlocked_feeds, self._feed_counters)
+            self._feed_inventory.consume(feed_name, count)
 
+    @recorded_input
     def on_fish_add_requested(self, fish_dir: Path) -> None:
         """使用者從清單選擇魚種後，在水族箱內新增一條該魚"""
         self.add_one_fish(fish_dir)
@@ -4222,7 +4643,7 @@ class TransparentAquariumWindow(QWidget):
         注意：puppy 魚種只能新增 small 階段，其他階段需透過餵飼料升級獲得
         fish_dir 可為魚種目錄 resource/fish/{species}/ 或階段目錄 resource/fish/{species}/{stage}/
         """
-        if not fish_dir.exists() or not fish_dir.is_dir():
+        if not resource_is_dir(fish_dir):
             return
         
         parts = fish_dir.parts
@@ -4237,8 +4658,8 @@ class TransparentAquariumWindow(QWidget):
             else:
                 # 僅魚種目錄：resource/fish/{species}/ → 解析出 small 變體，或直接使用魚種目錄（如孔雀魚、鯊魚）
                 species = parts[fish_index + 1]
-                for sub in sorted(fish_dir.iterdir()):
-                    if sub.is_dir():
+                for sub in resource_subdirs(fish_dir):
+                    if resource_is_dir(sub):
                         # 支援英文 "small" 或中文「幼」作為 small 階段的標識
                         sub_name_lower = sub.name.lower()
                         if "small" in sub_name_lower or "幼" in sub.name:
@@ -4281,64 +4702,56 @@ class TransparentAquariumWindow(QWidget):
                 else:
                     stage = stage_raw
         
-        print(f"[新增魚] 路徑: {fish_dir}, 提取的魚種: {species}, 原始階段: {stage_raw}, 處理後階段: {stage}")
+        _add_fish_log.debug("路徑: %s, 提取的魚種: %s, 原始階段: %s, 處理後階段: %s", fish_dir, species, stage_raw, stage)
         
         # 確保 puppy 和鬥魚魚種只能新增 small 階段
         if species in ("puppy", "鬥魚") and stage != "small":
-            print(f"[新增魚] 拒絕新增非 small 階段的 {species} (階段: {stage})")
+            _add_fish_log.info("拒絕新增非 small 階段的 %s (階段: %s)", species, stage)
             return  # 拒絕新增非 small 階段的 puppy/鬥魚
         
         # 投放幼鬥魚需要花費 20 元
         if species == "鬥魚" and stage == "small":
             if self.total_money < SMALL_BETTA_COST:
-                print(f"[新增魚] 金幣不足，無法投放幼鬥魚（需要 {SMALL_BETTA_COST} 元，目前 {self.total_money} 元）")
+                _add_fish_log.info("金幣不足，無法投放幼鬥魚（需要 %s 元，目前 %s 元）", SMALL_BETTA_COST, self.total_money)
                 return
             # 扣除金幣
             self.total_money -= SMALL_BETTA_COST
             self.panel.set_money(self.total_money)
-            print(f"[新增魚] 扣除 {SMALL_BETTA_COST} 元投放幼鬥魚，剩餘 {self.total_money} 元")
+            _add_fish_log.info("扣除 %s 元投放幼鬥魚，剩餘 %s 元", SMALL_BETTA_COST, self.total_money)
         
         # 游泳、轉向、吃飯行為與鬥魚、鯊魚相同（5_吃飽游泳、7_吃飽轉向、6_吃飽吃），由 config.get_fish_behaviors 取得
-        swim_behavior, turn_behavior, eat_behavior = get_fish_behaviors(species or "")
-        swim_frames, turn_frames = load_swim_and_turn(
-            fish_dir,
-            swim_behavior=swim_behavior,
-            turn_behavior=turn_behavior,
-        )
-        if not swim_frames:
+        swim_anim, turn_anim, eat_anim = get_asset_loader().load_fish_animations(fish_dir, species or "")
+        if not swim_anim.frames:
             return
-        eat_frames = load_fish_animation(fish_dir, behavior=eat_behavior)
         aquarium_rect = self.aquarium_rect
         fish_scale = get_fish_scale(species or "", stage)
-        x = random.randint(
+        rng = sim_stream("spawn")
+        x = rng.randint(
             aquarium_rect.left() + 60,
             aquarium_rect.right() - 60,
         )
-        y = random.randint(
+        y = rng.randint(
             aquarium_rect.top() + 60,
             aquarium_rect.bottom() - 60,
         )
-        direction = random.uniform(0, 360)
+        direction = rng.uniform(0, 360)
         speed_min, speed_max = get_fish_speed_range(species or "")
-        speed = random.uniform(speed_min, speed_max)
-        swim_copy = [QPixmap(p) for p in swim_frames]
-        turn_copy = [QPixmap(p) for p in turn_frames] if turn_frames else swim_copy[:]
-        eat_copy = [QPixmap(p) for p in eat_frames] if eat_frames else []
+        speed = rng.uniform(speed_min, speed_max)
         fish = Fish(
-            swim_frames=swim_copy,
-            turn_frames=turn_copy,
+            swim_frames=swim_anim.frames,
+            turn_frames=turn_anim.frames,
             position=QPoint(x, y),
             speed=speed,
             direction=direction,
             scale=fish_scale,
-            eat_frames=eat_copy if eat_copy else None,
+            eat_frames=eat_anim.frames,
             species=species,  # 設置魚種
             stage=stage,       # 設置階段
         )
         self.aquarium.add_fish(fish)
         
         # 更新解鎖狀態並自動儲存
-        counts = self._get_fish_count_by_species()
+        counts = self.aquarium.population
         if species:
             # 更新基本魚種解鎖狀態
             self._update_unlock_status(species, counts.get(species, 0))
@@ -4353,10 +4766,12 @@ class TransparentAquariumWindow(QWidget):
         # 金錢已經在AquariumWidget的mouseMoveEvent中被標記為已拾取
         # 這裡只需要更新金額顯示
         self.total_money += value
+        self._metric_money_earned.inc(value)
         self.panel.set_money(self.total_money)
         # 自動儲存
         self._auto_save()
     
+    @recorded_input
     def on_aquarium_clicked(self, pos: QPoint) -> None:
         """處理水族箱區域內的點擊事件：先檢查擊殺模式，再檢查是否點到寶箱怪產物，再檢查金錢，否則投放飼料"""
         # 如果擊殺模式開啟，只檢查是否點到魚，不執行其他操作（包括餵食）
@@ -4368,7 +4783,7 @@ class TransparentAquariumWindow(QWidget):
                 if display_rect and display_rect.contains(pos):
                     # 點擊到魚，觸發死亡動畫
                     fish.set_dead()
-                    print(f"[擊殺] 擊殺了 {fish.species} (階段: {fish.stage})")
+                    _action_log.info("擊殺：擊殺了 %s (階段: %s)", fish.species, fish.stage)
                 # 擊殺模式開啟時，無論是否點到魚，都不執行後續操作（包括餵食）
             return
         
@@ -4378,17 +4793,15 @@ class TransparentAquariumWindow(QWidget):
             produce_type, value = chest_result
             if produce_type in CHEST_FEED_ITEMS:
                 # 金條、鑽石：不增加總金額，改為加入飼料清單數量
-                self._feed_counters[produce_type] = self._feed_counters.get(produce_type, 0) + 1
-                if produce_type not in self._unlocked_feeds:
-                    self._unlocked_feeds.append(produce_type)
-                self.panel.update_feed_menu(self._unlocked_feeds, self._feed_counters)
-                # 同步到投食機，切換飼料對話框才會顯示金條/鑽石
-                self._feed_machine_widget.set_unlocked_feeds(self._unlocked_feeds, self._feed_counters)
-                print(f"[拾取] 拾取寶箱怪產物 {produce_type}，加入飼料清單，數量: {self._feed_counters[produce_type]}")
+                # 庫存變更會同步到投食機，切換飼料對話框才會顯示金條/鑽石；第一次拾取時由解鎖規則加入飼料清單
+                self._feed_inventory.add(produce_type)
+                self._unlock_rules.changed(feed_counter(produce_type))
+                _action_log.info("拾取：拾取寶箱怪產物 %s，加入飼料清單，數量: %s", produce_type, self._feed_inventory.count(produce_type))
             else:
                 self.total_money += value
+                self._metric_money_earned.inc(value)
                 self.panel.set_money(self.total_money)
-                print(f"[拾取] 拾取寶箱怪產物，獲得 {value} 金幣，總金額: {self.total_money}")
+                _action_log.info("拾取：拾取寶箱怪產物，獲得 %s 金幣，總金額: %s", value, self.total_money)
             # 自動儲存
             self._auto_save()
             return
@@ -4396,6 +4809,7 @@ class TransparentAquariumWindow(QWidget):
         collected = self.aquarium.try_collect_money_at(pos)
         if collected is not None:
             self.total_money += collected
+            self._metric_money_earned.inc(collected)
             self.panel.set_money(self.total_money)
             # 自動儲存
             self._auto_save()
@@ -4414,33 +4828,33 @@ class TransparentAquariumWindow(QWidget):
             return
         if self._current_feed:
             feed_name, feed_path = self._current_feed
-            if feed_name not in self._unlocked_feeds:
+            if feed_name not in self._feed_inventory.unlocked:
                 return
-            if feed_name != "便宜飼料" and feed_name not in CHEST_FEED_ITEMS and self._feed_counters.get(feed_name, 0) <= 0:
+            if feed_name != "便宜飼料" and feed_name not in CHEST_FEED_ITEMS and self._feed_inventory.counters.get(feed_name, 0) <= 0:
                 return
-            if feed_name in CHEST_FEED_ITEMS and self._feed_counters.get(feed_name, 0) <= 0:
+            if feed_name in CHEST_FEED_ITEMS and self._feed_inventory.counters.get(feed_name, 0) <= 0:
                 return
             feed_frames = []
             if feed_name in CHEST_FEED_ITEMS:
                 # 金條、鑽石：從 resource/feed/ 目錄載入動畫幀
                 feed_dir = _resource_dir() / "feed" / feed_name
-                if feed_dir.exists() and feed_dir.is_dir():
-                    frame_files = sorted(feed_dir.glob("*.png"))
+                if resource_is_dir(feed_dir):
+                    frame_files = resource_files(feed_dir)
                     for frame_file in frame_files:
-                        pixmap = QPixmap(str(frame_file))
+                        pixmap = load_pixmap(frame_file)
                         if not pixmap.isNull():
                             feed_frames.append(pixmap)
                 # 如果 resource/feed/ 目錄不存在，回退到單一圖片
                 if not feed_frames:
                     chest_path = _get_chest_feed_image_path(feed_name)
-                    if chest_path.exists():
-                        pixmap = QPixmap(str(chest_path))
+                    if resource_exists(chest_path):
+                        pixmap = load_pixmap(chest_path)
                         if not pixmap.isNull():
                             feed_frames.append(pixmap)
-            elif feed_path.exists() and feed_path.is_dir():
-                frame_files = sorted(feed_path.glob("*.png"))
+            elif resource_is_dir(feed_path):
+                frame_files = resource_files(feed_path)
                 for frame_file in frame_files:
-                    pixmap = QPixmap(str(frame_file))
+                    pixmap = load_pixmap(frame_file)
                     if not pixmap.isNull():
                         feed_frames.append(pixmap)
             if feed_frames:
@@ -4463,18 +4877,31 @@ class TransparentAquariumWindow(QWidget):
                 self.aquarium.add_feed(feed)
                 
                 if feed_name == "便宜飼料":
-                    self._feed_cheap_count += 1
+                    self._feed_inventory.record_cheap_feed()
+                    self._unlock_rules.changed(FEED_CHEAP_COUNT)
                 else:
-                    self._feed_counters[feed_name] = max(0, self._feed_counters.get(feed_name, 0) - 1)
-                self._update_feed_unlocks()
-                self.panel.update_feed_menu(self._unlocked_feeds, self._feed_counters)
+                    self._feed_inventory.consume(feed_name)
                 self._auto_save()
 
     def closeEvent(self, event) -> None:
         """
         處理視窗關閉事件，確保儲存遊戲狀態
         """
-        self._save_game_state()
+        # 關閉時寫入完整快照（壓縮存檔日誌），取代尚未寫入的自動儲存
+        self._autosave.cancel()
+        self._save_game_state(compact=True)
+        self._save_writer.wait_for_idle()
+        stats = self._autosave.stats()
+        _autosave_log.info("請求 %s 次，實際寫檔 %s 次", stats['requested'], stats['performed'])
+        if self._metrics_exporter is not None:
+            # 關閉前再輸出一次，涵蓋最後一個間隔
+            self._metrics_exporter.export()
+            self._metrics_exporter.stop()
+        self.stop_input_recording()
+        self.stop_profile_capture()
+        if self._memory_tracker is not None:
+            self._memory_tracker.check()
+            self._memory_tracker.stop()
         event.accept()
         QApplication.instance().quit()
     
@@ -4488,22 +4915,12 @@ class TransparentAquariumWindow(QWidget):
         """
         統計各魚種當前數量（包括階段_魚種格式）。僅計入存活魚（未 is_dead），
         用於解鎖判定與商店購買條件（如孔雀魚需犧牲場上 1 隻天使鬥魚）。
+        數量由 AquariumWidget.population 增量維護，這裡只複製成字典（單一數量請直接查 population）。
         
         Returns:
             字典：{species: count, "stage_species": count}
         """
-        counts = {}
-        for fish in self.aquarium.fishes:
-            if getattr(fish, "is_dead", False):
-                continue
-            if fish.species:
-                # 基本魚種計數
-                counts[fish.species] = counts.get(fish.species, 0) + 1
-                # 階段_魚種格式計數（用於寵物解鎖）
-                if fish.stage:
-                    key = f"{fish.stage}_{fish.species}"
-                    counts[key] = counts.get(key, 0) + 1
-        return counts
+        return self.aquarium.population.as_dict()
     
     def _update_unlock_status(self, species: str, count: int) -> None:
         """
@@ -4527,7 +4944,8 @@ class TransparentAquariumWindow(QWidget):
         old_total = self._unlocked_species[species].get("total_count_reached", 0)
         
         # 更新最大數量記錄（同時存在的最大數量）
-        if count > self._unlocked_species[species]["max_count_reached"]:
+        raised = count > self._unlocked_species[species]["max_count_reached"]
+        if raised:
             self._unlocked_species[species]["max_count_reached"] = count
             # 這裡可以根據解鎖條件設定 unlocked 狀態
             # 目前先設為 True（未來商店系統會使用此資訊）
@@ -4537,25 +4955,27 @@ class TransparentAquariumWindow(QWidget):
         if "large_鬥魚" in species:
             new_max = self._unlocked_species[species]["max_count_reached"]
             new_total = self._unlocked_species[species].get("total_count_reached", 0)
-            print(f"[里程碑更新] {species}: count={count}, 舊max={old_max}, 新max={new_max}, 舊total={old_total}, 新total={new_total}")
+            _milestone_log.debug("更新：%s: count=%s, 舊max=%s, 新max=%s, 舊total=%s, 新total=%s", species, count, old_max, new_max, old_total, new_total)
         
-        # 更新工具解鎖狀態（當魚種數量變更時）
-        self._update_tool_unlocks()
+        # 最大數量提高時才判定依賴它的解鎖規則（如藥丸需要 10 隻成年鬥魚）
+        if raised:
+            self._unlock_rules.changed(max_count_counter(species))
     
     def _update_tool_unlocks(self) -> None:
         """依工具配置與當前解鎖狀態更新水族箱投食機顯示（僅更新已解鎖的工具）"""
-        print(f"[工具解鎖狀態] 已解鎖工具: {self._unlocked_tools}")
+        _unlock_log.debug("工具狀態：已解鎖工具: %s", self._unlocked_tools)
         for tool_name in self._unlocked_tools:
             # 更新投食機部件顯示（僅已解鎖的工具）
             if tool_name == "飼料投食機":
-                print(f"[工具解鎖狀態] 顯示投食機")
+                _unlock_log.debug("工具狀態：顯示投食機")
                 self._feed_machine_widget.set_feed_machine_visible(True)
                 current_color = self._tool_colors.get(tool_name, FEED_MACHINE_DEFAULT_COLOR)
-                print(f"[工具解鎖狀態] 投食機顏色: {current_color}")
+                _unlock_log.debug("工具狀態：投食機顏色: %s", current_color)
                 self._feed_machine_widget.set_feed_machine_color(current_color)
                 # 更新投食機的已解鎖飼料列表
-                self._feed_machine_widget.set_unlocked_feeds(self._unlocked_feeds, self._feed_counters)
+                self._feed_machine_widget.set_unlocked_feeds(self._feed_inventory.unlocked, self._feed_inventory.counters)
     
+    @recorded_input
     def _on_tool_unlock_requested(self, tool_name: str) -> None:
         """處理工具解鎖請求：檢查解鎖條件，通過後加入解鎖列表並更新顯示"""
         if tool_name not in TOOL_CONFIG:
@@ -4577,10 +4997,10 @@ class TransparentAquariumWindow(QWidget):
             # 取兩者較大的值（向後兼容舊存檔）
             effective_count = max(total_count, max_count)
             can_unlock = effective_count >= unlock_count
-            print(f"[工具解鎖檢查] {tool_name}: key={key}, total={total_count}, max={max_count}, effective={effective_count}, 需要={unlock_count}, 可解鎖={can_unlock}")
+            _unlock_log.debug("工具檢查：%s: key=%s, total=%s, max=%s, effective=%s, 需要=%s, 可解鎖=%s", tool_name, key, total_count, max_count, effective_count, unlock_count, can_unlock)
         
         if not can_unlock:
-            print(f"[工具解鎖] {tool_name} 未達到解鎖條件")
+            _unlock_log.debug("工具：%s 未達到解鎖條件", tool_name)
             return
         
         # 解鎖工具
@@ -4598,14 +5018,15 @@ class TransparentAquariumWindow(QWidget):
             self.total_money, self._unlocked_pets,
             self._pet_levels,
             self._get_fish_count_by_species(),
-            self._unlocked_feeds,
-            self._feed_cheap_count,
+            self._feed_inventory.unlocked,
+            self._feed_inventory.cheap_count,
             self._unlocked_tools,
             self._tool_colors,
         )
         
-        self._auto_save()
+        self._auto_save(critical=True)
     
+    @recorded_input
     def _on_tool_color_changed(self, tool_name: str, color: str) -> None:
         """處理工具顏色變更請求"""
         if tool_name not in self._unlocked_tools:
@@ -4619,133 +5040,12 @@ class TransparentAquariumWindow(QWidget):
         """
         載入存檔並恢復遊戲狀態（魚類、金額、背景等）
         """
-        state = load()
-        
-        # 恢復金額
-        self.total_money = state.get("money", 0)
-        self.panel.set_money(self.total_money)
-        
-        # 初始化贈送條件追蹤（載入時重置，確保狀態變化檢測正常）
-        self._last_bonus_condition_met = False
-        
-        # 恢復解鎖狀態
-        self._unlocked_species = state.get("unlocked_species", {})
-        self._unlocked_pets = list(state.get("unlocked_pets", []))
-        self._pet_levels = dict(state.get("pet_levels", {}))
-        self._feed_cheap_count = int(state.get("feed_cheap_count", 0))
-        self._feed_counters = dict(state.get("feed_counters", {}))
-        self._unlocked_feeds = list(state.get("unlocked_feeds", ["便宜飼料"]))
-        self._feed_counter_last_add = dict(state.get("feed_counter_last_add", {}))
-        self._unlocked_tools = list(state.get("unlocked_tools", []))
-        self._tool_colors = dict(state.get("tool_colors", {}))
-        self._update_feed_unlocks()
-        # 重要：遊戲時間不會被保存，每次載入時從 0 開始
-        # 所以必須重置所有飼料計時器，避免 game_time - last 為負數導致計時器永不觸發
-        for feed_name in self._unlocked_feeds:
-            if feed_name == "便宜飼料":
-                continue
-            interval = get_feed_counter_interval_sec(feed_name)
-            if interval is None:
-                continue
-            # 如果沒有計數器記錄，初始化為0
-            if feed_name not in self._feed_counters:
-                self._feed_counters[feed_name] = 0
-            # 重置計時器為當前遊戲時間（0），確保計時器能正常運作
-            self._feed_counter_last_add[feed_name] = self.aquarium._game_time_sec
-        if hasattr(self.panel, "update_feed_menu"):
-            self.panel.update_feed_menu(self._unlocked_feeds, self._feed_counters)
-        
-        # 恢復背景
-        bg_path_str = state.get("background_path")
-        if bg_path_str:
-            # 嘗試解析為 Path
-            bg_path = Path(bg_path_str)
-            # 如果是相對路徑，從資源目錄解析
-            if not bg_path.is_absolute():
-                bg_path = _resource_dir() / bg_path
-            # 如果路徑不存在，嘗試從資源目錄查找
-            if not bg_path.exists():
-                bg_name = Path(bg_path_str).name
-                bg_path = _resource_dir() / "background" / bg_name
-            if bg_path.exists():
-                self.aquarium.set_background(bg_path)
-        
-        # 恢復背景透明度
-        opacity = state.get("background_opacity", 80)
-        self.aquarium.set_background_opacity(opacity)
-        self.panel._opacity_slider.setValue(opacity)
-        
-        # 恢復魚類
-        fishes_data = state.get("fishes", [])
-        resource_dir = _resource_dir()
-        
-        for fish_dict in fishes_data:
-            species = fish_dict.get("species")
-            stage = fish_dict.get("stage", "small")
-            
-            if not species:
-                continue
-            
-            # 構建魚類資源路徑
-            # 嘗試找到對應階段的目錄
-            fish_species_dir = resource_dir / "fish" / species
-            if not fish_species_dir.exists():
-                continue
-            
-            # 尋找對應階段的目錄
-            stage_dir = None
-            # 鬥魚使用中文階段目錄名（幼鬥魚、中鬥魚、成年鬥魚、天使鬥魚、金鬥魚、寶石鬥魚）
-            if species == "鬥魚":
-                stage_name_map = {
-                    "small": "幼鬥魚",
-                    "medium": "中鬥魚",
-                    "large": "成年鬥魚",
-                    "angel": "天使鬥魚",
-                    "golden": "金鬥魚",
-                    "gem": "寶石鬥魚",
-                }
-                stage_dir_name = stage_name_map.get(stage)
-                if stage_dir_name:
-                    stage_dir = fish_species_dir / stage_dir_name
-                    if not stage_dir.exists() or not stage_dir.is_dir():
-                        stage_dir = None
-            if not stage_dir:
-                for subdir in fish_species_dir.iterdir():
-                    if subdir.is_dir() and stage.lower() in subdir.name.lower():
-                        stage_dir = subdir
-                        break
-            # 如果找不到對應階段，嘗試使用 small 或「幼」階段
-            if not stage_dir:
-                for subdir in fish_species_dir.iterdir():
-                    if subdir.is_dir() and ("small" in subdir.name.lower() or "幼" in subdir.name):
-                        stage_dir = subdir
-                        break
-            # 仍無階段目錄時，使用魚種目錄本身（如鯊魚、孔雀魚的動畫直接在魚種目錄下，無階段子目錄）
-            if not stage_dir:
-                stage_dir = fish_species_dir
-            
-            # 游泳、轉向、吃飯行為與鬥魚、鯊魚相同，由 config.get_fish_behaviors 取得
-            swim_behavior, turn_behavior, eat_behavior = get_fish_behaviors(species)
-            swim_frames, turn_frames = load_swim_and_turn(
-                stage_dir,
-                swim_behavior=swim_behavior,
-                turn_behavior=turn_behavior,
-            )
-            if not swim_frames:
-                continue
-            
-            eat_frames = load_fish_animation(stage_dir, behavior=eat_behavior)
-            
-            # 從字典重建魚類
-            fish = Fish.from_dict(
-                fish_dict,
-                swim_frames=[QPixmap(p) for p in swim_frames],
-                turn_frames=[QPixmap(p) for p in turn_frames] if turn_frames else [QPixmap(p) for p in swim_frames],
-                eat_frames=[QPixmap(p) for p in eat_frames] if eat_frames else None,
-            )
-            
-            # 添加到水族箱（add_fish 會自動設置回調函數）
-            self.aquarium.add_fish(fish)
+        load_start = time.perf_counter()
+        # 魚資料分批取得：二進位存檔邊解壓邊解碼，每批建立後就加入水族箱，不必等整份魚列表解碼完
+        state, fish_batches = load_streaming(SAVE_LOAD_BATCH_SIZE)
+        parse_sec = time.perf_counter() - load_start
+        self._apply_saved_progress(state)
+        self._restore_saved_fishes(fish_batches, parse_sec)
         
         # 更新解鎖狀態（根據載入的魚類數量）
         counts = self._get_fish_count_by_species()
@@ -4762,7 +5062,7 @@ class TransparentAquariumWindow(QWidget):
             # 推斷：曾經的成年鬥魚數量至少 = 當前成年鬥魚 + 天使鬥魚數量
             inferred_large_count = counts.get("large_鬥魚", 0) + angel_betta_count
             if inferred_large_count > current_large_max:
-                print(f"[里程碑推斷] 根據 {angel_betta_count} 隻天使鬥魚，推斷曾經有過至少 {inferred_large_count} 隻成年鬥魚")
+                _milestone_log.info("推斷：根據 %s 隻天使鬥魚，推斷曾經有過至少 %s 隻成年鬥魚", angel_betta_count, inferred_large_count)
                 self._update_unlock_status(large_betta_key, inferred_large_count)
             # 同時更新累計總數（向後兼容舊存檔）
             if inferred_large_count > current_large_total:
@@ -4771,7 +5071,7 @@ class TransparentAquariumWindow(QWidget):
                 if "total_count_reached" not in self._unlocked_species[large_betta_key]:
                     self._unlocked_species[large_betta_key]["total_count_reached"] = 0
                 self._unlocked_species[large_betta_key]["total_count_reached"] = inferred_large_count
-                print(f"[里程碑推斷] 更新 {large_betta_key} 累計總數: {current_large_total} -> {inferred_large_count}")
+                _milestone_log.info("推斷：更新 %s 累計總數: %s -> %s", large_betta_key, current_large_total, inferred_large_count)
         
         # 更新工具解鎖狀態（載入後）
         self._update_tool_unlocks()
@@ -4779,8 +5079,8 @@ class TransparentAquariumWindow(QWidget):
         # 調試輸出：顯示當前里程碑狀態
         large_betta_max = self._unlocked_species.get('large_鬥魚', {}).get('max_count_reached', 0)
         large_betta_total = self._unlocked_species.get('large_鬥魚', {}).get('total_count_reached', 0)
-        print(f"[里程碑狀態] large_鬥魚 最大同時數量: {large_betta_max}, 累計總數: {large_betta_total}")
-        print(f"[里程碑狀態] 當前 large_鬥魚 數量: {counts.get('large_鬥魚', 0)}, angel_鬥魚 數量: {counts.get('angel_鬥魚', 0)}")
+        _milestone_log.debug("狀態：large_鬥魚 最大同時數量: %s, 累計總數: %s", large_betta_max, large_betta_total)
+        _milestone_log.debug("狀態：當前 large_鬥魚 數量: %s, angel_鬥魚 數量: %s", counts.get('large_鬥魚', 0), counts.get('angel_鬥魚', 0))
         
         # 恢復寵物（在恢復魚類和解鎖狀態之後）
         pets_data = state.get("pets", [])
@@ -4800,16 +5100,257 @@ class TransparentAquariumWindow(QWidget):
                         pet.horizontal_direction = pet_data.get("horizontal_direction", 1)
                         pet.facing_left = pet_data.get("facing_left", False)
                 except Exception as e:
-                    print(f"[載入] 無法恢復寵物 {pet_name}: {e}")
+                    _load_log.warning("無法恢復寵物 %s: %s", pet_name, e)
+        
+        # 其餘素材依優先序排入背景解碼（目前飼料 > 商店預覽 > 罕用階段）
+        self._schedule_asset_prefetch()
     
-    def _save_game_state(self) -> None:
+    def _restore_saved_fishes(self, fish_batches: Iterator[List[dict]], parse_sec: float = 0.0) -> int:
         """
-        收集當前遊戲狀態並儲存
+        恢復存檔中的魚：依 (魚種, 階段) 分組，每組只解析一次目錄、請求一次動畫，每批一次加入水族箱
+        
+        Args:
+            fish_batches: 魚字典批次的疊代器（load_streaming 的第二個回傳值）
+            parse_sec: 讀取存檔耗時（只用於載入報告）
+        
+        Returns:
+            恢復的魚數
         """
-        # 收集魚類狀態
-        fishes_data = []
-        for fish in self.aquarium.fishes:
-            fishes_data.append(fish.to_dict())
+        restore_start = time.perf_counter()
+        resource_dir = _resource_dir()
+        loader = get_asset_loader()
+        # {(species, stage): (swim, turn, eat) 或 None（魚種目錄不存在）}
+        groups: Dict[Tuple[str, str], Optional[tuple]] = {}
+        # {(species, stage): 該組的魚}，素材解碼後無游泳幀時整組移除
+        group_fishes: Dict[Tuple[str, str], List[Fish]] = {}
+        restored_count = 0
+        decode_sec = 0.0
+        resolve_sec = 0.0
+        insert_sec = 0.0
+        while True:
+            t = time.perf_counter()
+            try:
+                fishes_data = next(fish_batches, None)
+            except Exception as e:
+                # 魚記錄中途損毀：保留已恢復的魚，其餘略過
+                _load_log.warning("存檔魚資料讀取中斷，已恢復 %d 隻: %s", restored_count, e)
+                fishes_data = None
+            decode_sec += time.perf_counter() - t
+            if fishes_data is None:
+                break
+            restored: List[Fish] = []
+            for fish_dict in fishes_data:
+                species = fish_dict.get("species")
+                stage = fish_dict.get("stage") or "small"
+                
+                if not species:
+                    continue
+                
+                key = (species, stage)
+                if key not in groups:
+                    t = time.perf_counter()
+                    stage_dir = self._resolve_saved_stage_dir(resource_dir, species, stage)
+                    # 游泳、轉向、吃飯行為與鬥魚、鯊魚相同，由 config.get_fish_behaviors 取得
+                    # 動畫改為背景延遲載入：魚先以空幀列表建立（顯示佔位圖），解碼完成後就地填入
+                    groups[key] = (
+                        loader.request_fish_animations(stage_dir, species, PRIORITY_VISIBLE)
+                        if stage_dir is not None else None
+                    )
+                    group_fishes[key] = []
+                    resolve_sec += time.perf_counter() - t
+                anims = groups[key]
+                if anims is None:
+                    continue
+                swim_anim, turn_anim, eat_anim = anims
+                
+                # 從字典重建魚類（同魚種同階段共用同一組幀列表；轉向幀為空時 Fish 會自動改用游泳幀）
+                fish = Fish.from_dict(
+                    fish_dict,
+                    swim_frames=swim_anim.frames,
+                    turn_frames=turn_anim.frames,
+                    eat_frames=eat_anim.frames,
+                )
+                restored.append(fish)
+                group_fishes[key].append(fish)
+            
+            # 每批一次加入水族箱（add_fishes 會自動設置回調函數），保留存檔中的順序
+            t = time.perf_counter()
+            self.aquarium.add_fishes(restored)
+            insert_sec += time.perf_counter() - t
+            restored_count += len(restored)
+        t = time.perf_counter()
+        for key, anims in groups.items():
+            if anims is None:
+                continue
+            # 素材解碼後仍無游泳幀（素材缺失）時移除整組魚，與舊版同步載入時略過的行為一致
+            anims[0].on_ready(lambda anim, group=group_fishes[key]: self._drop_fishes_without_frames(anim, group))
+        insert_sec += time.perf_counter() - t
+        total_sec = time.perf_counter() - restore_start
+        build_sec = total_sec - decode_sec - resolve_sec - insert_sec
+        _load_log.info(
+            "讀取存檔 %.1f ms；恢復 %d 隻魚（%d 組）：解碼 %.1f ms、目錄解析與動畫請求 %.1f ms、建立 %.1f ms、加入 %.1f ms、總計 %.1f ms",
+            parse_sec * 1000, restored_count, len(groups), decode_sec * 1000, resolve_sec * 1000,
+            build_sec * 1000, insert_sec * 1000, total_sec * 1000,
+        )
+        return restored_count
+    
+    def _apply_saved_progress(self, state: dict) -> None:
+        """
+        套用存檔中的長期進度（金額、解鎖、飼料計數器、背景），不含魚類與寵物
+        
+        Args:
+            state: game_state.load() 的結果或世界快照中的 progress
+        """
+        # 恢復金額
+        self.total_money = state.get("money", 0)
+        self.panel.set_money(self.total_money)
+        
+        # 初始化贈送條件追蹤（載入時重置，確保狀態變化檢測正常）
+        self._last_bonus_condition_met = False
+        
+        # 恢復解鎖狀態
+        self._unlocked_species = state.get("unlocked_species", {})
+        self._unlocked_pets = list(state.get("unlocked_pets", []))
+        self._pet_levels = dict(state.get("pet_levels", {}))
+        self._unlocked_tools = list(state.get("unlocked_tools", []))
+        self._tool_colors = dict(state.get("tool_colors", {}))
+        # 重要：遊戲時間不會被保存，每次載入時從 0 開始
+        # 所以 load 會把有計時的飼料重置為當前遊戲時間，避免 game_time - last 為負數導致計時器永不觸發
+        self._feed_inventory.load(state, self.aquarium._game_time_sec)
+        self._reset_unlock_rules()
+        
+        # 恢復背景
+        bg_path_str = state.get("background_path")
+        if bg_path_str:
+            # 嘗試解析為 Path
+            bg_path = Path(bg_path_str)
+            # 如果是相對路徑，從資源目錄解析
+            if not bg_path.is_absolute():
+                bg_path = _resource_dir() / bg_path
+            # 如果路徑不存在，嘗試從資源目錄查找
+            if not resource_exists(bg_path):
+                bg_name = Path(bg_path_str).name
+                bg_path = _resource_dir() / "background" / bg_name
+            if resource_exists(bg_path):
+                self.aquarium.set_background(bg_path)
+        
+        # 恢復背景透明度
+        opacity = state.get("background_opacity", 80)
+        self.aquarium.set_background_opacity(opacity)
+        self.panel._opacity_slider.setValue(opacity)
+    
+    def _drop_fishes_without_frames(self, anim, fishes: List[Fish]) -> None:
+        """背景載入完成但沒有任何游泳幀時，從水族箱移除同組的魚"""
+        if anim.frames or not fishes:
+            return
+        _load_log.warning("%s (%s) 找不到游泳動畫幀，移除 %s 隻", fishes[0].species, fishes[0].stage, len(fishes))
+        drop_ids = {id(f) for f in fishes}
+        self.aquarium.fishes = [f for f in self.aquarium.fishes if id(f) not in drop_ids]
+    
+    @staticmethod
+    def _resolve_saved_stage_dir(resource_dir: Path, species: str, stage: str) -> Optional[Path]:
+        """
+        解析存檔中魚的階段素材目錄
+        
+        Args:
+            resource_dir: 資源根目錄
+            species: 魚種
+            stage: 成長階段
+        
+        Returns:
+            階段目錄；魚種目錄不存在時回傳 None
+        """
+        # 構建魚類資源路徑
+        # 嘗試找到對應階段的目錄
+        fish_species_dir = resource_dir / "fish" / species
+        if not resource_exists(fish_species_dir):
+            return None
+        
+        # 尋找對應階段的目錄
+        stage_dir = None
+        # 鬥魚使用中文階段目錄名（幼鬥魚、中鬥魚、成年鬥魚、天使鬥魚、金鬥魚、寶石鬥魚）
+        if species == "鬥魚":
+            stage_name_map = {
+                "small": "幼鬥魚",
+                "medium": "中鬥魚",
+                "large": "成年鬥魚",
+                "angel": "天使鬥魚",
+                "golden": "金鬥魚",
+                "gem": "寶石鬥魚",
+            }
+            stage_dir_name = stage_name_map.get(stage)
+            if stage_dir_name:
+                stage_dir = fish_species_dir / stage_dir_name
+                if not resource_is_dir(stage_dir):
+                    stage_dir = None
+        if not stage_dir:
+            for subdir in resource_subdirs(fish_species_dir):
+                if resource_is_dir(subdir) and stage.lower() in subdir.name.lower():
+                    stage_dir = subdir
+                    break
+        # 如果找不到對應階段，嘗試使用 small 或「幼」階段
+        if not stage_dir:
+            for subdir in resource_subdirs(fish_species_dir):
+                if resource_is_dir(subdir) and ("small" in subdir.name.lower() or "幼" in subdir.name):
+                    stage_dir = subdir
+                    break
+        # 仍無階段目錄時，使用魚種目錄本身（如鯊魚、孔雀魚的動畫直接在魚種目錄下，無階段子目錄）
+        if not stage_dir:
+            stage_dir = fish_species_dir
+        return stage_dir
+    
+    def _schedule_asset_prefetch(self) -> None:
+        """
+        將尚未使用的素材排入背景解碼佇列（存檔中的魚已在 _load_game_state 以最高優先序請求）
+        
+        順序：目前選用的飼料 → 商店魚種預覽 → 各魚種尚未出現的成長階段
+        """
+        loader = get_asset_loader()
+        if self._current_feed:
+            _, feed_path = self._current_feed
+            if resource_is_dir(feed_path):
+                loader.request_animation(feed_path, "", PRIORITY_CURRENT_FEED)
+        fish_root = _resource_dir() / "fish"
+        for species_name in FISH_SHOP_CONFIG:
+            species_dir = fish_root / species_name
+            if resource_is_dir(species_dir):
+                swim_behavior, _, _ = get_fish_behaviors(species_name)
+                loader.request_animation(species_dir, swim_behavior, PRIORITY_SHOP)
+        if not resource_is_dir(fish_root):
+            return
+        for species_dir in resource_subdirs(fish_root):
+            if not resource_is_dir(species_dir):
+                continue
+            behaviors = get_fish_behaviors(species_dir.name)
+            for stage_dir in resource_subdirs(species_dir):
+                if not resource_is_dir(stage_dir) or stage_dir.name in behaviors:
+                    continue
+                for behavior in behaviors:
+                    loader.request_animation(stage_dir, behavior, PRIORITY_RARE)
+    
+    def _save_game_state(self, compact: bool = False) -> None:
+        """
+        收集當前遊戲狀態快照並交給背景寫入器儲存
+        
+        GUI 執行緒只複製基本型別（魚類為 Fish.snapshot() 元組），
+        轉換為存檔字典、JSON 編碼與寫檔都在背景執行緒（_write_save_snapshot）完成。
+        一般自動儲存只附加差異到存檔日誌；compact 為 True 時寫入完整快照。
+        
+        Args:
+            compact: 是否寫入完整快照並清空存檔日誌
+        """
+        # 交給背景執行緒儲存
+        self._save_writer.submit((self._collect_save_state(), compact))
+    
+    def _collect_save_state(self) -> dict:
+        """
+        收集存檔狀態（只含基本型別的複本，可交給其他執行緒）
+        
+        Returns:
+            存檔字典；fishes 欄位為 Fish.snapshot() 元組列表
+        """
+        # 收集魚類狀態快照
+        fishes_data = [fish.snapshot() for fish in self.aquarium.fishes]
         
         # 收集寵物狀態
         pets_data = []
@@ -4824,15 +5365,16 @@ class TransparentAquariumWindow(QWidget):
         
         # 構建狀態字典
         state = {
-            "version": "1.0.0",  # 版本號由 game_state.save() 統一設定，這裡僅供參考
+            "version": "1.0.0",  # 版本號由 game_state.commit() 統一設定，這裡僅供參考
             "money": self.total_money,
-            "unlocked_species": self._unlocked_species.copy(),
+            # 里程碑字典會被就地更新，需複製到第二層，避免背景寫檔時被修改
+            "unlocked_species": {
+                key: dict(value) if isinstance(value, dict) else value
+                for key, value in self._unlocked_species.items()
+            },
             "unlocked_pets": list(self._unlocked_pets),
             "pet_levels": self._pet_levels.copy(),
-            "feed_cheap_count": self._feed_cheap_count,
-            "feed_counters": self._feed_counters.copy(),
-            "unlocked_feeds": list(self._unlocked_feeds),
-            "feed_counter_last_add": self._feed_counter_last_add.copy(),
+            **self._feed_inventory.to_state(),
             "unlocked_tools": list(self._unlocked_tools),
             "tool_colors": self._tool_colors.copy(),
             "fishes": fishes_data,
@@ -4852,18 +5394,388 @@ class TransparentAquariumWindow(QWidget):
             except ValueError:
                 # 如果無法轉換為相對路徑，保存檔案名稱
                 state["background_path"] = bg_path.name
+        return state
+    
+    def capture_world(self) -> dict:
+        """
+        擷取完整世界快照：長期進度 + 魚、飛行中的飼料、未拾取的金錢、寵物的即時狀態與計時器 + 遊戲時間
+        
+        只逐欄位讀取屬性並複製為基本型別，可每隔數秒呼叫；寫檔請用 world_state.dump_world。
         
-        # 儲存
-        save(state)
+        Returns:
+            世界快照字典（可 JSON 序列化）
+        """
+        aquarium = self.aquarium
+        progress = self._collect_save_state()
+        # 魚與寵物改以完整欄位記錄
+        del progress["fishes"], progress["pets"]
+        pets_data = []
+        for pet_name, pet in self._pets.items():
+            fields = PET_FIELDS + PET_EXTRA_FIELDS.get(type(pet).__name__, ())
+            pets_data.append({
+                "pet_name": pet_name,
+                "fields": list(fields),
+                "values": capture_fields(pet, fields),
+                # 寶箱怪本輪是否已產出（以 _produced 屬性存在與否標記）
+                "produced": hasattr(pet, "_produced"),
+            })
+        return {
+            "version": WORLD_SNAPSHOT_VERSION,
+            "tick": aquarium.tick_count,
+            "rng": aquarium.world_random.getstate(),
+            # 僅供重播建立相同大小的視窗；restore_world 不會改變視窗大小
+            "aquarium_size": list(self.aquarium_size),
+            "game_time_sec": aquarium._game_time_sec,
+            "feed_machine_timer": self._feed_machine_timer,
+            # 投食機選取的飼料與投食間隔（重播需從相同設定開始）
+            "feed_machine_feed": (self._feed_machine_widget.get_selected_feed() or (None,))[0],
+            "feed_machine_interval": self._feed_machine_interval,
+            "last_bonus_condition_met": self._last_bonus_condition_met,
+            "progress": progress,
+            "fish_fields": list(FISH_FIELDS),
+            "fishes": [capture_fields(fish, FISH_FIELDS) for fish in aquarium.fishes],
+            "feed_fields": list(FEED_FIELDS),
+            "feeds": [capture_fields(feed, FEED_FIELDS) for feed in aquarium.feeds],
+            "money_fields": list(MONEY_FIELDS),
+            "moneys": [capture_fields(money, MONEY_FIELDS) for money in aquarium.moneys],
+            # 拾取時需重置寶箱怪的金錢（寶箱怪產物）在 moneys 中的索引
+            "chest_produce_moneys": [
+                i for i, money in enumerate(aquarium.moneys) if money.on_collected_callback is not None
+            ],
+            "pets": pets_data,
+        }
     
-    def _auto_save(self) -> None:
+    def restore_world(self, snapshot: dict) -> None:
         """
-        觸發自動儲存（非阻塞，失敗不影響遊戲運行）
+        還原 capture_world 擷取的世界快照，取代水族箱中目前所有的魚、飼料、金錢與寵物
+        
+        Args:
+            snapshot: capture_world 或 world_state.load_world 的結果
+        
+        Raises:
+            ValueError: 快照版本不符
+        """
+        version = snapshot.get("version")
+        if version != WORLD_SNAPSHOT_VERSION:
+            raise ValueError(f"世界快照版本 {version} 與當前版本 {WORLD_SNAPSHOT_VERSION} 不同")
+        start = time.perf_counter()
+        aquarium = self.aquarium
+        # 先以快照的種子播種：建立實體時抽取的亂數（未記錄在欄位中的轉向間隔等）也與種子一致
+        if "rng" in snapshot:
+            aquarium.world_random.setstate(snapshot["rng"])
+        set_world_random(aquarium.world_random)
+        
+        # 遊戲時間與長期進度；_apply_saved_progress 會把飼料計時器重置為目前遊戲時間，之後改回快照中的值
+        aquarium._game_time_sec = float(snapshot.get("game_time_sec", 0.0))
+        progress = copy.deepcopy(snapshot.get("progress", {}))
+        self._apply_saved_progress(progress)
+        self._feed_inventory.restore_timers(progress.get("feed_counter_last_add", {}))
+        self._feed_machine_timer = float(snapshot.get("feed_machine_timer", 0.0))
+        self._last_bonus_condition_met = bool(snapshot.get("last_bonus_condition_met", False))
+        self._feed_machine_interval = float(snapshot.get("feed_machine_interval", self._feed_machine_interval))
+        machine_feed = snapshot.get("feed_machine_feed")
+        if machine_feed:
+            feed_paths = dict(_list_feeds())
+            self._feed_machine_widget.set_selected_feed(
+                machine_feed, feed_paths.get(machine_feed, _resource_dir() / "feed" / machine_feed)
+            )
+        self._update_feed_machine_armed()
+        
+        aquarium.fishes = []
+        aquarium.feeds = []
+        aquarium.moneys = []
+        aquarium.pets = []
+        self._pets = {}
+        
+        # 魚：與 _load_game_state 相同，依 (魚種, 階段) 分組請求動畫
+        fish_fields = snapshot.get("fish_fields", FISH_FIELDS)
+        species_idx = fish_fields.index("species")
+        stage_idx = fish_fields.index("stage")
+        resource_dir = _resource_dir()
+        loader = get_asset_loader()
+        groups: Dict[Tuple[str, str], Optional[tuple]] = {}
+        group_fishes: Dict[Tuple[str, str], List[Fish]] = {}
+        restored: List[Fish] = []
+        for values in snapshot.get("fishes", []):
+            species = values[species_idx]
+            stage = values[stage_idx] or "small"
+            if not species:
+                continue
+            key = (species, stage)
+            if key not in groups:
+                stage_dir = self._resolve_saved_stage_dir(resource_dir, species, stage)
+                groups[key] = (
+                    loader.request_fish_animations(stage_dir, species, PRIORITY_VISIBLE)
+                    if stage_dir is not None else None
+                )
+                group_fishes[key] = []
+            anims = groups[key]
+            if anims is None:
+                continue
+            swim_anim, turn_anim, eat_anim = anims
+            fish = Fish(
+                swim_frames=swim_anim.frames,
+                turn_frames=turn_anim.frames,
+                position=QPoint(0, 0),
+                eat_frames=eat_anim.frames,
+                species=species,
+                stage=stage,
+            )
+            restore_fields(fish, fish_fields, values)
+            if fish.is_dead:
+                # 死亡中的魚以第一幀建立死亡用幀（動畫尚在背景解碼時等就緒後再建立）
+                swim_anim.on_ready(lambda anim, dead=fish: dead._build_death_frame())
+            restored.append(fish)
+            group_fishes[key].append(fish)
+        aquarium.add_fishes(restored)
+        for key, anims in groups.items():
+            if anims is None:
+                continue
+            anims[0].on_ready(lambda anim, group=group_fishes[key]: self._drop_fishes_without_frames(anim, group))
+        
+        # 飛行中的飼料（同名飼料共用動畫幀）
+        feed_fields = snapshot.get("feed_fields", FEED_FIELDS)
+        feed_name_idx = feed_fields.index("feed_name")
+        feed_frames_by_name: Dict[str, List[QPixmap]] = {}
+        for values in snapshot.get("feeds", []):
+            feed_name = values[feed_name_idx]
+            if feed_name not in feed_frames_by_name:
+                feed_frames_by_name[feed_name] = _load_feed_frames(feed_name)
+            feed_frames = feed_frames_by_name[feed_name]
+            if not feed_frames:
+                continue
+            feed = Feed(position=QPoint(0, 0), feed_frames=feed_frames, feed_name=feed_name)
+            restore_fields(feed, feed_fields, values)
+            aquarium.add_feed(feed)
+        
+        # 未拾取的金錢（寶箱怪產物重新接上拾取回調）
+        money_fields = snapshot.get("money_fields", MONEY_FIELDS)
+        money_name_idx = money_fields.index("money_name")
+        chest_produce = set(snapshot.get("chest_produce_moneys", []))
+        for i, values in enumerate(snapshot.get("moneys", [])):
+            money_name = values[money_name_idx]
+            money_frames = _load_money_frames(money_name)
+            if not money_frames:
+                continue
+            money = Money(
+                position=QPointF(0.0, 0.0),
+                money_frames=money_frames,
+                money_name=money_name,
+                on_collected_callback=self._on_chest_produce_collected if i in chest_produce else None,
+            )
+            restore_fields(money, money_fields, values)
+            aquarium.moneys.append(money)
+        
+        # 寵物：依當前等級重新召喚後覆寫內部狀態（寶箱怪計時、拼布魚飽足度與表演計時等）
+        for pet_data in snapshot.get("pets", []):
+            pet_name = pet_data.get("pet_name")
+            if not pet_name:
+                continue
+            self._spawn_pet(pet_name)
+            pet = self._pets.get(pet_name)
+            if pet is None:
+                continue
+            restore_fields(pet, pet_data.get("fields", ()), pet_data.get("values", ()))
+            if pet_data.get("produced"):
+                pet._produced = True
+        
+        self._update_tool_unlocks()
+        self._feed_machine_widget.set_unlocked_feeds(self._feed_inventory.unlocked, self._feed_inventory.counters)
+        # 建立魚與寵物時抽取過亂數，最後再還原一次才能與擷取當下一致
+        aquarium.tick_count = int(snapshot.get("tick", 0))
+        if "rng" in snapshot:
+            aquarium.world_random.setstate(snapshot["rng"])
+        _load_log.info(
+            "世界快照：還原 %d 隻魚、%d 顆飼料、%d 個金錢、%d 隻寵物，耗時 %.1f ms",
+            len(restored), len(aquarium.feeds), len(aquarium.moneys), len(self._pets),
+            (time.perf_counter() - start) * 1000,
+        )
+    
+    def start_input_recording(self, path: Optional[Path] = None) -> Path:
         """
+        開始錄製輸入（以目前的世界快照作為錄製起點）
+        
+        魚的動畫幀影響碰撞與觸底判定，錄製起點需與重播時（載入完成後才開始）相同：
+        水族箱中的魚仍有動畫在背景解碼時，不阻塞 GUI 執行緒，等這些動畫就緒後才開始錄製。
+        
+        Args:
+            path: 錄製檔路徑；未指定時寫入存檔目錄的 INPUT_RECORD_FILENAME
+        
+        Returns:
+            錄製檔路徑
+        """
+        self.stop_input_recording()
+        if path is None:
+            path = get_save_path().parent / INPUT_RECORD_FILENAME
+        pending = get_asset_loader().pending_animations(
+            frames
+            for fish in self.aquarium.fishes
+            for frames in (fish.swim_frames, fish.turn_frames, fish.eat_frames)
+        )
+        if not pending:
+            self._begin_input_recording(path)
+            return path
+        # 以 token 辨識這次請求；之後停止或重新開始錄製時，舊請求的回調不再生效
+        token = object()
+        waiting = {id(anim) for anim in pending}
+        self._pending_record_token = token
+        _record_log.info("等待 %d 組魚動畫解碼完成後開始錄製", len(waiting))
+        
+        def on_ready(anim) -> None:
+            waiting.discard(id(anim))
+            if not waiting and self._pending_record_token is token:
+                self._pending_record_token = None
+                self._begin_input_recording(path)
+        
+        for anim in pending:
+            anim.on_ready(on_ready)
+        return path
+    
+    def _begin_input_recording(self, path: Path) -> None:
+        recorder = InputRecorder(path, self.capture_world(), lambda: self.aquarium.tick_count)
+        self.input_recorder = self.aquarium.input_recorder = recorder
+        _record_log.info("開始錄製輸入到 %s（第 %d 幀，種子 %d）", path, recorder.start_tick, self.aquarium.world_random.seed)
+    
+    def stop_input_recording(self) -> None:
+        """停止錄製輸入並寫入結束時的世界摘要（等待開始中時取消；未在錄製時不做任何事）"""
+        self._pending_record_token = None
+        recorder = self.input_recorder
+        if recorder is None:
+            return
+        self.input_recorder = self.aquarium.input_recorder = None
+        recorder.close(world_digest(self.capture_world()))
+        _record_log.info(
+            "停止錄製：%d 筆輸入，%d 幀，已寫入 %s",
+            recorder.count, self.aquarium.tick_count - recorder.start_tick, recorder.path,
+        )
+    
+    def _toggle_input_recording(self) -> None:
+        if self.input_recorder is None and self._pending_record_token is None:
+            self.start_input_recording()
+        else:
+            self.stop_input_recording()
+    
+    def start_profile_capture(self, mode: Optional[str] = None) -> None:
+        """
+        開始執行中剖析（已在剖析時不做任何事）
+        
+        Args:
+            mode: "sampling" 或 "cprofile"；未指定時使用 PROFILE_CAPTURE_MODE
+        """
+        if self.session_profiler is not None:
+            return
         try:
-            self._save_game_state()
-        except Exception as e:
-            print(f"[自動儲存] 失敗: {e}")
+            profiler = SessionProfiler(mode or PROFILE_CAPTURE_MODE, PROFILE_SAMPLE_INTERVAL_MS)
+        except ValueError as e:
+            _profile_log.warning("%s", e)
+            return
+        profiler.start()
+        self.session_profiler = profiler
+        _profile_log.info("開始剖析（%s），再按 %s 停止並寫出結果", profiler.mode, PROFILE_CAPTURE_SHORTCUT)
+    
+    def stop_profile_capture(self) -> List[Path]:
+        """
+        停止剖析並將結果寫入存檔目錄（未在剖析時不做任何事）
+        
+        Returns:
+            寫出的檔案路徑
+        """
+        profiler = self.session_profiler
+        if profiler is None:
+            return []
+        self.session_profiler = None
+        paths = profiler.stop(get_save_path().parent, PROFILE_CAPTURE_PREFIX)
+        _profile_log.info("剖析結果已寫入 %s", "、".join(str(p) for p in paths))
+        return paths
+    
+    def _toggle_profile_capture(self) -> None:
+        if self.session_profiler is None:
+            self.start_profile_capture()
+        else:
+            self.stop_profile_capture()
+    
+    def _start_memory_tracker(self) -> None:
+        """
+        依設定啟動記憶體成長追蹤（環境變數 AQUARIUM_MEMTRACK=1 可在未啟用時直接開啟）
+        """
+        env = os.environ.get("AQUARIUM_MEMTRACK", "").strip().lower()
+        if not (MEMORY_TRACKER_ENABLED or env) or env in ("0", "off", "false"):
+            return
+        aquarium = self.aquarium
+        register_size("aquarium_fishes", lambda: len(aquarium.fishes))
+        register_size("aquarium_dead_fishes", lambda: sum(1 for f in aquarium.fishes if getattr(f, "is_dead", False)))
+        register_size(
+            "fish_death_frames",
+            lambda: sum(1 for f in aquarium.fishes if getattr(f, "_death_frame", None) is not None),
+        )
+        register_size("aquarium_feeds", lambda: len(aquarium.feeds))
+        register_size("aquarium_moneys", lambda: len(aquarium.moneys))
+        register_size(
+            "aquarium_callback_moneys",
+            lambda: sum(1 for m in aquarium.moneys if m.on_collected_callback is not None),
+        )
+        register_size("money_frames_cache", lambda: sum(len(frames) for frames in _money_frames_cache.values()))
+        register_size("asset_animations", lambda: get_asset_loader().stats()["animations"])
+        path = get_save_path().parent / MEMORY_TRACKER_FILENAME
+        self._memory_tracker = MemoryTracker(
+            path,
+            MEMORY_TRACKER_INTERVAL_SEC,
+            MEMORY_TRACKER_TOP_N,
+            MEMORY_TRACKER_TRACEBACK_FRAMES,
+            GrowthDetector(MEMORY_GROWTH_CHECKS, MEMORY_GROWTH_MIN),
+            parent=self,
+        )
+        self._memory_tracker.start()
+        self.aquarium.metrics.add_collector(
+            self._memory_tracker.collect_samples,
+            {"live_instances": "記憶體追蹤期間各類別存活的實例數"},
+        )
+        _memory_log.info("每 %.0f 秒記錄記憶體成長到 %s", MEMORY_TRACKER_INTERVAL_SEC, path)
+    
+    def _start_metrics_exporter(self) -> None:
+        """
+        依設定啟動指標輸出（環境變數 AQUARIUM_METRICS=jsonl/prometheus 可在未啟用時直接開啟）
+        """
+        fmt = os.environ.get("AQUARIUM_METRICS", "").strip().lower() or (METRICS_EXPORT_FORMAT if METRICS_ENABLED else "")
+        if not fmt or fmt in ("0", "off", "false"):
+            return
+        if fmt not in EXPORT_FORMATS:
+            _metrics_log.warning("不支援的指標格式 %s（可用: %s）", fmt, ", ".join(EXPORT_FORMATS))
+            return
+        filename = METRICS_PROMETHEUS_FILENAME if fmt == "prometheus" else METRICS_JSONL_FILENAME
+        path = get_save_path().parent / filename
+        self._metrics_exporter = MetricsExporter(
+            self.aquarium.metrics, path, fmt, METRICS_EXPORT_INTERVAL_SEC, parent=self
+        )
+        self._metrics_exporter.start()
+        _metrics_log.info("每 %.0f 秒輸出指標到 %s", METRICS_EXPORT_INTERVAL_SEC, path)
+
+    def _collect_metrics(self) -> List[Sample]:
+        """輸出指標時呼叫：素材快取、自動儲存、背景寫入器與目前金幣"""
+        asset = get_asset_loader().stats()
+        lookups = asset["hits"] + asset["misses"]
+        samples: List[Sample] = [
+            ("asset_cache_hit_ratio", {}, asset["hits"] / lookups if lookups else 0.0),
+            ("asset_cache_bytes", {}, asset["total_bytes"]),
+            ("asset_pending_tasks", {}, asset["pending"]),
+            ("money", {}, self.total_money),
+        ]
+        autosave = self._autosave.stats()
+        for key in ("requested", "performed", "coalesced", "failed"):
+            samples.append(("autosave_total", {"result": key}, autosave[key]))
+        writer = self._save_writer.stats()
+        for key in ("written", "superseded", "failed"):
+            samples.append(("save_writer_total", {"result": key}, writer[key]))
+        return samples
+
+    def _auto_save(self, critical: bool = False) -> None:
+        """
+        觸發自動儲存（合併短時間內的多次請求，失敗不影響遊戲運行）
+        
+        Args:
+            critical: 是否為重要交易（購買、解鎖、升級寵物），為 True 時立即寫檔
+        """
+        self._autosave.request_save(immediate=critical)
     
     def _record_fish_milestone_before_upgrade(self, old_fish: Fish) -> None:
         """
@@ -4876,20 +5788,20 @@ class TransparentAquariumWindow(QWidget):
             return
         
         # 計算升級前的當前數量（包含即將升級的這條魚）
-        counts = self._get_fish_count_by_species()
+        counts = self.aquarium.population
         
         # 顯示升級前的詳細狀態
-        print(f"[里程碑-升級前] 魚種: {old_fish.species}, 階段: {old_fish.stage}")
-        print(f"[里程碑-升級前] 當前魚數量統計: {counts}")
+        _milestone_log.debug("升級前：魚種: %s, 階段: %s", old_fish.species, old_fish.stage)
+        _milestone_log.debug("升級前：當前魚數量統計: %s", counts)
         
         # 記錄基本魚種里程碑
         if old_fish.species:
             current_count = counts.get(old_fish.species, 0)
             old_max = self._unlocked_species.get(old_fish.species, {}).get("max_count_reached", 0)
             self._update_unlock_status(old_fish.species, current_count)
-            print(f"[里程碑-升級前] {old_fish.species}: 當前數量={current_count}, 舊里程碑={old_max}, 新里程碑={self._unlocked_species.get(old_fish.species, {}).get('max_count_reached', 0)}")
+            _milestone_log.debug("升級前：%s: 當前數量=%s, 舊里程碑=%s, 新里程碑=%s", old_fish.species, current_count, old_max, self._unlocked_species.get(old_fish.species, {}).get('max_count_reached', 0))
             if current_count > old_max:
-                print(f"[里程碑] {old_fish.species} 里程碑更新: {old_max} -> {current_count}")
+                _milestone_log.info("%s 里程碑更新: %s -> %s", old_fish.species, old_max, current_count)
         
         # 記錄階段_魚種格式里程碑（重要：記錄升級前的階段）
         if old_fish.stage:
@@ -4898,9 +5810,9 @@ class TransparentAquariumWindow(QWidget):
             old_stage_max = self._unlocked_species.get(old_stage_key, {}).get("max_count_reached", 0)
             self._update_unlock_status(old_stage_key, current_stage_count)
             new_max = self._unlocked_species.get(old_stage_key, {}).get("max_count_reached", 0)
-            print(f"[里程碑-升級前] {old_stage_key}: 當前數量={current_stage_count}, 舊里程碑={old_stage_max}, 新里程碑={new_max}")
+            _milestone_log.debug("升級前：%s: 當前數量=%s, 舊里程碑=%s, 新里程碑=%s", old_stage_key, current_stage_count, old_stage_max, new_max)
             if current_stage_count > old_stage_max:
-                print(f"[里程碑] {old_stage_key} 里程碑更新: {old_stage_max} -> {current_stage_count}")
+                _milestone_log.info("%s 里程碑更新: %s -> %s", old_stage_key, old_stage_max, current_stage_count)
     
     def _on_fish_upgraded(self, new_fish: Fish) -> None:
         """
@@ -4910,18 +5822,18 @@ class TransparentAquariumWindow(QWidget):
             new_fish: 升級後的新魚
         """
         # 更新解鎖狀態並自動儲存
-        counts = self._get_fish_count_by_species()
+        counts = self.aquarium.population
         
         # 顯示升級後的詳細狀態
-        print(f"[里程碑-升級後] 新魚種: {new_fish.species}, 新階段: {new_fish.stage}")
-        print(f"[里程碑-升級後] 當前魚數量統計: {counts}")
+        _milestone_log.debug("升級後：新魚種: %s, 新階段: %s", new_fish.species, new_fish.stage)
+        _milestone_log.debug("升級後：當前魚數量統計: %s", counts)
         
         if new_fish.species:
             # 更新基本魚種解鎖狀態
             old_max = self._unlocked_species.get(new_fish.species, {}).get("max_count_reached", 0)
             self._update_unlock_status(new_fish.species, counts.get(new_fish.species, 0))
             new_max = self._unlocked_species.get(new_fish.species, {}).get("max_count_reached", 0)
-            print(f"[里程碑-升級後] {new_fish.species}: 當前數量={counts.get(new_fish.species, 0)}, 舊里程碑={old_max}, 新里程碑={new_max}")
+            _milestone_log.debug("升級後：%s: 當前數量=%s, 舊里程碑=%s, 新里程碑=%s", new_fish.species, counts.get(new_fish.species, 0), old_max, new_max)
             
             # 更新階段_魚種格式解鎖狀態（用於寵物解鎖）
             if new_fish.stage:
@@ -4936,12 +5848,12 @@ class TransparentAquariumWindow(QWidget):
                 
                 new_stage_max = self._unlocked_species.get(stage_key, {}).get("max_count_reached", 0)
                 new_total = self._unlocked_species.get(stage_key, {}).get("total_count_reached", 0)
-                print(f"[里程碑-升級後] {stage_key}: 當前數量={counts.get(stage_key, 0)}, 舊max={old_stage_max}, 新max={new_stage_max}, 舊total={old_total}, 新total={new_total}")
+                _milestone_log.debug("升級後：%s: 當前數量=%s, 舊max=%s, 新max=%s, 舊total=%s, 新total=%s", stage_key, counts.get(stage_key, 0), old_stage_max, new_stage_max, old_total, new_total)
         
         # 顯示所有 large_鬥魚 相關的里程碑狀態
         large_betta_max = self._unlocked_species.get("large_鬥魚", {}).get("max_count_reached", 0)
         large_betta_total = self._unlocked_species.get("large_鬥魚", {}).get("total_count_reached", 0)
-        print(f"[里程碑-升級後] === large_鬥魚 最大同時數量: {large_betta_max}, 累計總數: {large_betta_total} ===")
+        _milestone_log.debug("升級後：=== large_鬥魚 最大同時數量: %s, 累計總數: %s ===", large_betta_max, large_betta_total)
         
         self._auto_save()
     
@@ -4969,11 +5881,13 @@ class TransparentAquariumWindow(QWidget):
         # 累加總數
         self._unlocked_species[species_key]["total_count_reached"] += 1
         
-        print(f"[累計里程碑] {species_key} 累計總數 +1 = {self._unlocked_species[species_key]['total_count_reached']}")
+        _milestone_log.debug("累計：%s 累計總數 +1 = %s", species_key, self._unlocked_species[species_key]['total_count_reached'])
 
 
 def main():
     """主函數"""
+    # 未捕捉例外時把最近的日誌寫入存檔目錄
+    install_crash_dump(get_save_path().parent / LOG_CRASH_DUMP_FILENAME)
     app = QApplication(sys.argv)
     
     # 設定應用程式樣式
@@ -4983,13 +5897,13 @@ def main():
     # 查找"水世界"背景圖片
     resource_dir = Path(__file__).parent / "resource" / "background"
     background_path = None
-    if resource_dir.exists():
+    if resource_exists(resource_dir):
         water_world_path = resource_dir / "水世界.jpg"
-        if water_world_path.exists():
+        if resource_exists(water_world_path):
             background_path = water_world_path
         else:
             # 如果找不到水世界，使用第一個找到的背景圖片
-            background_files = list(resource_dir.glob("*.jpg")) + list(resource_dir.glob("*.png"))
+            background_files = resource_files(resource_dir, ".jpg") + resource_files(resource_dir, ".png")
             if background_files:
                 background_path = background_files[0]
     
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+素材封裝檔模組
+
+將 resource/ 目錄下大量小型 PNG 封裝為單一檔案（預設 resource.pack），
+執行時以 mmap 唯讀映射存取，省去逐層目錄列舉與逐檔開啟的成本。
+
+檔案格式（小端序）：
+- 檔頭：magic(4 bytes, b"DFPK") + 版本(uint16) + 保留(uint16) + 索引長度(uint64)
+- 索引：UTF-8 JSON，{"files": {"相對路徑(posix)": [資料區偏移, 長度, 修改時間(ns)], ...},
+  "dirs": {"相對目錄": 修改時間(ns), ...}}
+- 資料區：各檔案原始位元組（PNG/JPG 未解碼）依索引順序串接
+
+resource_exists、resource_subdirs、resource_files、read_resource 等函式供遊戲查詢素材：
+有封裝檔時只查封裝檔索引（發行版可只附封裝檔，不附 resource/ 目錄），否則查 resource/ 目錄。
+resource/ 目錄存在且與封裝時的修改時間不符（素材已修改但未重新封裝）時不使用封裝檔。
+
+本模組不依賴 Qt，打包工具 tools/pack_assets.py 與遊戲共用同一份讀寫邏輯。
+"""
+
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import ASSET_ARCHIVE_FILENAME, ASSET_ARCHIVE_ENABLED
+from game_log import get_logger
+
+_log = get_logger("素材封裝")
+
+
+ARCHIVE_MAGIC = b"DFPK"
+ARCHIVE_VERSION = 1
+# magic, 版本, 保留, 索引長度
+_HEADER = struct.Struct("<4sHHQ")
+# 預設封裝的副檔名
+ARCHIVE_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+
+def resource_root() -> Path:
+    """專案 resource 目錄（與 aquarium_window._resource_dir 相同）"""
+    return Path(__file__).parent / "resource"
+
+
+def default_archive_path() -> Path:
+    """預設封裝檔路徑（與 resource 目錄同層）"""
+    return Path(__file__).parent / ASSET_ARCHIVE_FILENAME
+
+
+class AssetArchive:
+    """
+    素材封裝檔讀取器
+
+    以 mmap 唯讀映射整個封裝檔；索引在開啟時一次解析為字典，
+    之後的目錄查詢與讀檔都不需要任何檔案系統呼叫。讀取可在多執行緒同時進行。
+    """
+
+    def __init__(self, path: Path):
+        """
+        開啟封裝檔
+
+        Args:
+            path: 封裝檔路徑
+
+        Raises:
+            ValueError: 檔頭 magic 或版本不符
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, _, index_len = _HEADER.unpack_from(self._mmap, 0)
+            if magic != ARCHIVE_MAGIC:
+                raise ValueError(f"不是素材封裝檔: {self.path}")
+            if version != ARCHIVE_VERSION:
+                raise ValueError(f"封裝檔版本 {version} 與當前版本 {ARCHIVE_VERSION} 不同: {self.path}")
+            index_start = _HEADER.size
+            index = json.loads(bytes(self._mmap[index_start:index_start + index_len]).decode("utf-8"))
+        except Exception:
+            self._file.close()
+            raise
+        self._data_start = index_start + index_len
+        self._files: Dict[str, Tuple[int, int]] = {
+            rel: (int(entry[0]), int(entry[1])) for rel, entry in index.get("files", {}).items()
+        }
+        # 封裝時來源檔案與目錄的修改時間（ns），供 is_stale 比對
+        self._file_mtimes: Dict[str, int] = {
+            rel: int(entry[2]) for rel, entry in index.get("files", {}).items() if len(entry) > 2
+        }
+        self._dir_mtimes: Dict[str, int] = {rel: int(m) for rel, m in index.get("dirs", {}).items()}
+        # 由檔案路徑推導目錄結構：{目錄: (子檔名列表, 子目錄名集合)}
+        self._dirs: Dict[str, Tuple[List[str], set]] = {"": ([], set())}
+        for rel in self._files:
+            parent, _, name = rel.rpartition("/")
+            self._ensure_dir(parent)[0].append(name)
+        for files, _ in self._dirs.values():
+            files.sort()
+
+    def _ensure_dir(self, rel_dir: str) -> Tuple[List[str], set]:
+        entry = self._dirs.get(rel_dir)
+        if entry is None:
+            entry = ([], set())
+            self._dirs[rel_dir] = entry
+            parent, _, name = rel_dir.rpartition("/")
+            self._ensure_dir(parent)[1].add(name)
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def has_file(self, rel_path: str) -> bool:
+        """是否包含指定檔案（相對 resource 的 posix 路徑）"""
+        return rel_path in self._files
+
+    def is_dir(self, rel_dir: str) -> bool:
+        """是否包含指定目錄"""
+        return rel_dir in self._dirs
+
+    def list_files(self, rel_dir: str, suffix: str = ".png") -> List[str]:
+        """列出目錄下指定副檔名的檔名（已排序，與 sorted(Path.glob) 順序一致）"""
+        entry = self._dirs.get(rel_dir)
+        if entry is None:
+            return []
+        suffix = suffix.lower()
+        return [name for name in entry[0] if name.lower().endswith(suffix)]
+
+    def list_subdirs(self, rel_dir: str) -> List[str]:
+        """列出目錄下的子目錄名（已排序）"""
+        entry = self._dirs.get(rel_dir)
+        if entry is None:
+            return []
+        return sorted(entry[1])
+
+    def is_stale(self, resource_dir: Path) -> bool:
+        """
+        封裝檔是否與 resource 目錄不符（檔案或目錄的修改時間、檔案大小改變，或缺少修改時間記錄）
+
+        目錄的修改時間在新增、刪除、改名檔案時改變，因此不需列舉目錄也能偵測新增的素材。
+
+        Args:
+            resource_dir: 素材根目錄
+        """
+        if len(self._file_mtimes) != len(self._files) or not self._dir_mtimes:
+            return True
+        try:
+            for rel, mtime in self._dir_mtimes.items():
+                if (resource_dir / rel).stat().st_mtime_ns != mtime:
+                    return True
+            for rel, (_, length) in self._files.items():
+                st = (resource_dir / rel).stat()
+                if st.st_mtime_ns != self._file_mtimes[rel] or st.st_size != length:
+                    return True
+        except OSError:
+            return True
+        return False
+
+    def read(self, rel_path: str) -> Optional[bytes]:
+        """讀取檔案內容；不存在時回傳 None"""
+        entry = self._files.get(rel_path)
+        if entry is None:
+            return None
+        offset, length = entry
+        start = self._data_start + offset
+        return self._mmap[start:start + length]
+
+    def close(self) -> None:
+        """關閉映射與檔案"""
+        try:
+            self._mmap.close()
+        finally:
+            self._file.close()
+
+
+def to_relative(path: Path, root: Optional[Path] = None) -> Optional[str]:
+    """
+    將絕對路徑轉為封裝檔內的相對 posix 路徑
+
+    Returns:
+        相對路徑；不在 resource 目錄下時回傳 None（resource 目錄本身回傳空字串）
+    """
+    root = root or resource_root()
+    try:
+        rel = Path(path).relative_to(root)
+    except ValueError:
+        return None
+    rel_str = rel.as_posix()
+    return "" if rel_str == "." else rel_str
+
+
+def build_archive(
+    resource_dir: Path,
+    output_path: Path,
+    suffixes: Iterable[str] = ARCHIVE_SUFFIXES,
+) -> Tuple[int, int]:
+    """
+    由 resource 目錄重建封裝檔（先寫入暫存檔再取代，避免中途失敗留下損毀檔案）
+
+    Args:
+        resource_dir: 素材根目錄
+        output_path: 輸出封裝檔路徑
+        suffixes: 要封裝的副檔名
+
+    Returns:
+        (檔案數, 資料區總位元組數)
+    """
+    resource_dir = Path(resource_dir)
+    output_path = Path(output_path)
+    suffix_set = {s.lower() for s in suffixes}
+    files = sorted(
+        p for p in resource_dir.rglob("*")
+        if p.is_file() and p.suffix.lower() in suffix_set
+    )
+    index: Dict[str, List[int]] = {}
+    dirs: Dict[str, int] = {"": resource_dir.stat().st_mtime_ns}
+    offset = 0
+    for p in files:
+        st = p.stat()
+        index[p.relative_to(resource_dir).as_posix()] = [offset, st.st_size, st.st_mtime_ns]
+        offset += st.st_size
+        parent = p.parent
+        while parent != resource_dir:
+            rel_dir = parent.relative_to(resource_dir).as_posix()
+            if rel_dir in dirs:
+                break
+            dirs[rel_dir] = parent.stat().st_mtime_ns
+            parent = parent.parent
+    index_bytes = json.dumps(
+        {"files": index, "dirs": dirs}, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, 0, len(index_bytes)))
+        f.write(index_bytes)
+        for p in files:
+            f.write(p.read_bytes())
+    tmp_path.replace(output_path)
+    return len(files), offset
+
+
+_archive: Optional[AssetArchive] = None
+_archive_checked = False
+
+
+def get_asset_archive() -> Optional[AssetArchive]:
+    """
+    取得全域素材封裝檔（不存在、停用、格式錯誤或與 resource 目錄不符時回傳 None，改用 resource 目錄）
+    """
+    global _archive, _archive_checked
+    if _archive_checked:
+        return _archive
+    _archive_checked = True
+    if not ASSET_ARCHIVE_ENABLED:
+        return None
+    path = default_archive_path()
+    if not path.exists():
+        return None
+    try:
+        archive = AssetArchive(path)
+    except Exception as e:
+        _log.warning("無法開啟封裝檔，改用 resource 目錄: %s", e)
+        return None
+    root = resource_root()
+    if root.is_dir() and archive.is_stale(root):
+        _log.warning("封裝檔與 resource 目錄不符（素材已修改），改用 resource 目錄；請執行 tools/pack_assets.py 重新封裝")
+        archive.close()
+        return None
+    _archive = archive
+    _log.info("使用封裝檔: %s（%s 個檔案）", path, len(_archive))
+    return _archive
+
+
+def _archive_rel(path: Path) -> Tuple[Optional[AssetArchive], Optional[str]]:
+    """取得封裝檔與路徑在封裝檔內的相對路徑（沒有封裝檔或路徑不在 resource 下時相對路徑為 None）"""
+    archive = get_asset_archive()
+    if archive is None:
+        return None, None
+    return archive, to_relative(path)
+
+
+def _join(rel_dir: str, name: str) -> str:
+    return f"{rel_dir}/{name}" if rel_dir else name
+
+
+def resource_is_dir(path: Path) -> bool:
+    """素材目錄是否存在"""
+    archive, rel = _archive_rel(path)
+    if rel is not None:
+        return archive.is_dir(rel)
+    return Path(path).is_dir()
+
+
+def resource_is_file(path: Path) -> bool:
+    """素材檔案是否存在"""
+    archive, rel = _archive_rel(path)
+    if rel is not None:
+        return archive.has_file(rel)
+    return Path(path).is_file()
+
+
+def resource_exists(path: Path) -> bool:
+    """素材檔案或目錄是否存在"""
+    archive, rel = _archive_rel(path)
+    if rel is not None:
+        return archive.is_dir(rel) or archive.has_file(rel)
+    return Path(path).exists()
+
+
+def resource_subdirs(path: Path) -> List[Path]:
+    """列出素材目錄下的子目錄（依名稱排序；目錄不存在時為空列表）"""
+    path = Path(path)
+    archive, rel = _archive_rel(path)
+    if rel is not None:
+        return [path / name for name in archive.list_subdirs(rel)]
+    if not path.is_dir():
+        return []
+    return sorted(d for d in path.iterdir() if d.is_dir())
+
+
+def resource_files(path: Path, suffix: str = ".png") -> List[Path]:
+    """列出素材目錄下指定副檔名的檔案（依名稱排序，與 sorted(Path.glob) 相同）"""
+    path = Path(path)
+    archive, rel = _archive_rel(path)
+    if rel is not None:
+        return [path / name for name in archive.list_files(rel, suffix)]
+    return sorted(path.glob(f"*{suffix}"))
+
+
+def read_resource(path: Path) -> Optional[bytes]:
+    """讀取素材檔案內容（不存在時回傳 None）"""
+    archive, rel = _archive_rel(path)
+    if rel is not None:
+        return archive.read(rel)
+    try:
+        return Path(path).read_bytes()
+    except OSError:
+        return None
@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+"""
+素材載入模組
+
+負責魚類、飼料等動畫幀的延遲載入與快取。
+- 以 QImageReader 在執行緒池（QThreadPool）背景解碼為 QImage
+- 解碼完成後回到 GUI 執行緒轉為 QPixmap（QPixmap 只能在 GUI 執行緒建立）
+- 依優先序排程：畫面上可見的魚種與目前飼料優先，商店預覽與罕用階段最後
+- 幀尚未就緒時 AnimationFrames.frames 為空列表，完成後就地填入，
+  持有同一列表的魚會自動顯示新幀（未就緒期間由水族箱繪製佔位圖）
+- 素材來源可為 resource 目錄或素材封裝檔（asset_archive，mmap 存取），呼叫端一律傳入 resource 下的路徑
+- 記憶體預算：統計每組動畫解碼後的位元組數，超過 ASSET_MEMORY_BUDGET_MB 時依 LRU
+  釋放沒有任何魚使用的動畫，並可輸出依 (魚種, 階段, 行為) 分類的記憶體報告
+- 透明邊界裁切：逐幀裁切為不透明區域的邊界框，並記錄裁切後中心相對原圖中心的偏移
+  （FrameList.trim_offsets），繪製與碰撞改用緊貼的矩形
+"""
+
+import time
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from PyQt6.QtCore import QObject, QRect, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader, QPixmap
+
+from config import (
+    ASSET_LOADER_MAX_THREADS,
+    ASSET_MEMORY_BUDGET_MB,
+    ASSET_TRIM_TRANSPARENT,
+    ASSET_TRIM_ALPHA_THRESHOLD,
+    ASSET_TRIM_PADDING,
+    get_fish_behaviors,
+)
+from asset_archive import get_asset_archive, read_resource, resource_is_dir, resource_subdirs, to_relative
+from game_log import get_logger
+
+_log = get_logger("素材載入")
+
+
+# 載入優先序（數值越大越先解碼，直接對應 QThreadPool.start 的 priority）
+PRIORITY_VISIBLE = 30  # 畫面上可見的魚種（存檔中的魚）
+PRIORITY_UPGRADE = 25  # 即將升級的魚之下一階段（升級預載）
+PRIORITY_CURRENT_FEED = 20  # 目前選用的飼料
+PRIORITY_SHOP = 10  # 商店預覽圖
+PRIORITY_RARE = 0  # 罕用階段（尚未出現的升級階段等）
+
+
+def resolve_behavior_dir(fish_dir: Path, behavior: str) -> Optional[Path]:
+    """
+    解析行為動畫目錄
+
+    行為目錄不存在時退回魚目錄下第一個子目錄（與舊版 load_fish_animation 行為一致）；
+    behavior 為空字串時直接使用 fish_dir 本身（如飼料目錄）。
+
+    Args:
+        fish_dir: 魚種／階段目錄
+        behavior: 行為目錄名（如 "5_吃飽游泳"）
+
+    Returns:
+        行為動畫目錄，找不到時回傳 None
+    """
+    if not behavior:
+        return fish_dir if resource_is_dir(fish_dir) else None
+    behavior_dir = fish_dir / behavior
+    if resource_is_dir(behavior_dir):
+        return behavior_dir
+    behavior_dirs = resource_subdirs(fish_dir)
+    if behavior_dirs:
+        return behavior_dirs[0]
+    return None
+
+
+def load_pixmap(path: Path) -> QPixmap:
+    """
+    （GUI 執行緒）同步載入單張圖片（圖示、背景、預覽圖等；有封裝檔時從封裝檔讀取）
+
+    Args:
+        path: 圖片路徑（resource 下的路徑會查封裝檔）
+
+    Returns:
+        QPixmap；找不到或無法解碼時為空 QPixmap（isNull() 為 True）
+    """
+    pixmap = QPixmap()
+    data = read_resource(path)
+    if data is not None:
+        pixmap.loadFromData(data)
+    return pixmap
+
+
+def decode_frame_images(fish_dir: Path, behavior: str) -> List[QImage]:
+    """
+    解碼單一行為的所有幀為 QImage（可在任意執行緒呼叫）
+
+    Args:
+        fish_dir: 魚種／階段目錄
+        behavior: 行為目錄名；空字串表示 fish_dir 本身即為幀目錄
+
+    Returns:
+        依檔名排序的 QImage 列表（已轉為預乘 alpha 格式，轉 QPixmap 時不需再轉換）
+    """
+    behavior_dir = resolve_behavior_dir(fish_dir, behavior)
+    if behavior_dir is None:
+        return []
+    images = []
+    archive = get_asset_archive()
+    rel_dir = to_relative(behavior_dir) if archive is not None else None
+    if rel_dir is not None and archive.is_dir(rel_dir):
+        for name in archive.list_files(rel_dir, ".png"):
+            image = QImage.fromData(archive.read(f"{rel_dir}/{name}" if rel_dir else name))
+            if image.isNull():
+                continue
+            images.append(image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied))
+        return images
+    for frame_file in sorted(behavior_dir.glob("*.png")):
+        reader = QImageReader(str(frame_file))
+        image = reader.read()
+        if image.isNull():
+            continue
+        images.append(image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied))
+    return images
+
+
+def alpha_bbox(alpha: np.ndarray, alpha_threshold: int = 1, padding: int = 0) -> Optional[Tuple[int, int, int, int]]:
+    """
+    計算 Alpha 通道中不透明區域的邊界框
+
+    與 tools/alpha_dfs_crop.AlphaDFSCropper 的判定一致：alpha >= alpha_threshold 視為不透明，
+    邊界框為 (left, top, right, bottom)（right/bottom 不含），加上 padding 後限制在圖片範圍內。
+    此處只需整張圖的聯集邊界，因此以 numpy 向量化取代逐像素 DFS。
+
+    Args:
+        alpha: 形狀 (高, 寬) 的 Alpha 陣列
+        alpha_threshold: Alpha 閾值
+        padding: 邊界框邊距（像素）
+
+    Returns:
+        (left, top, right, bottom)，全透明時回傳 None
+    """
+    mask = alpha >= alpha_threshold
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(mask.any(axis=0))
+    height, width = alpha.shape
+    left = max(0, int(cols[0]) - padding)
+    top = max(0, int(rows[0]) - padding)
+    right = min(width, int(cols[-1]) + 1 + padding)
+    bottom = min(height, int(rows[-1]) + 1 + padding)
+    return (left, top, right, bottom)
+
+
+def _image_alpha(image: QImage) -> np.ndarray:
+    """取出 32 位元 ARGB QImage 的 Alpha 通道（唯讀檢視，不複製像素）"""
+    ptr = image.constBits()
+    ptr.setsize(image.sizeInBytes())
+    words_per_line = image.bytesPerLine() // 4
+    pixels = np.frombuffer(ptr, dtype=np.uint32).reshape(image.height(), words_per_line)
+    return (pixels[:, :image.width()] >> 24).astype(np.uint8)
+
+
+def trim_frame_images(
+    images: List[QImage],
+    alpha_threshold: int = ASSET_TRIM_ALPHA_THRESHOLD,
+    padding: int = ASSET_TRIM_PADDING,
+) -> Tuple[List[QImage], List[Tuple[float, float]]]:
+    """
+    逐幀裁切透明邊界
+
+    已經緊貼的幀（邊界框即整張圖）或全透明幀保留原圖，不另外複製像素。
+
+    Args:
+        images: 32 位元 ARGB 幀
+        alpha_threshold: Alpha 閾值
+        padding: 邊界框邊距（像素）
+
+    Returns:
+        (裁切後的幀, 各幀裁切後中心相對原圖中心的偏移 (dx, dy)，單位為原圖像素)
+    """
+    trimmed: List[QImage] = []
+    offsets: List[Tuple[float, float]] = []
+    for image in images:
+        width, height = image.width(), image.height()
+        bbox = alpha_bbox(_image_alpha(image), alpha_threshold, padding)
+        if bbox is None or bbox == (0, 0, width, height):
+            trimmed.append(image)
+            offsets.append((0.0, 0.0))
+            continue
+        left, top, right, bottom = bbox
+        trimmed.append(image.copy(QRect(left, top, right - left, bottom - top)))
+        offsets.append(((left + right - width) / 2.0, (top + bottom - height) / 2.0))
+    return trimmed, offsets
+
+
+def decode_animation(fish_dir: Path, behavior: str) -> Tuple[List[QImage], List[Tuple[float, float]]]:
+    """解碼一組動畫並依設定裁切透明邊界，回傳 (幀, 各幀裁切偏移)（可在任意執行緒呼叫）"""
+    images = decode_frame_images(fish_dir, behavior)
+    if ASSET_TRIM_TRANSPARENT and images:
+        return trim_frame_images(images)
+    return images, [(0.0, 0.0)] * len(images)
+
+
+class FrameList(list):
+    """
+    動畫幀列表（list 子類別，可直接當一般列表使用）
+
+    trim_offsets：與幀一一對應，裁切透明邊界後幀中心相對原圖中心的偏移 (dx, dy)
+    （原圖像素、素材原始朝向）。魚的顯示矩形以 位置 + 偏移 × 縮放 為中心，鏡像時 dx 取負。
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.trim_offsets: List[Tuple[float, float]] = []
+
+    def copy(self) -> "FrameList":
+        """複製列表（連同裁切偏移）"""
+        clone = FrameList(self)
+        clone.trim_offsets = list(self.trim_offsets)
+        return clone
+
+    def offset_at(self, index: int) -> Tuple[float, float]:
+        """第 index 幀的裁切偏移（未記錄時為 (0, 0)）"""
+        if 0 <= index < len(self.trim_offsets):
+            return self.trim_offsets[index]
+        return (0.0, 0.0)
+
+
+class AnimationFrames:
+    """
+    單一行為動畫的幀容器
+
+    frames 列表物件在整個生命週期內不會被替換，只會就地填入，
+    因此魚可直接持有此列表，解碼完成後即可顯示。
+    """
+
+    def __init__(self, key: Tuple[str, str]):
+        """
+        初始化幀容器
+
+        Args:
+            key: 快取鍵 (魚種／階段目錄字串, 行為目錄名)
+        """
+        self.key = key
+        self.frames: FrameList = FrameList()
+        self.ready = False
+        self.priority = PRIORITY_RARE
+        self.nbytes = 0  # 解碼後佔用的位元組數（寬 × 高 × 每像素位元組）
+        self.last_used = time.monotonic()
+        # 使用中的物件（魚）；物件被回收後自動移除，為空時才可被 LRU 釋放
+        self.users: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self._callbacks: List[Callable[["AnimationFrames"], None]] = []
+
+    def describe(self) -> Tuple[str, str, str, str]:
+        """
+        依路徑推導分類，回傳 (類別, 魚種, 階段目錄, 行為)
+
+        如 resource/fish/鬥魚/幼鬥魚 + 5_吃飽游泳 → ("fish", "鬥魚", "幼鬥魚", "5_吃飽游泳")；
+        無階段子目錄的魚種（如鯊魚）階段為 "-"。
+        """
+        dir_str, behavior = self.key
+        rel = to_relative(Path(dir_str))
+        parts = rel.split("/") if rel else [Path(dir_str).name]
+        category = parts[0] if parts else "-"
+        species = parts[1] if len(parts) > 1 else "-"
+        stage = "/".join(parts[2:]) if len(parts) > 2 else "-"
+        return category, species, stage, behavior or "-"
+
+    def on_ready(self, callback: Callable[["AnimationFrames"], None]) -> None:
+        """註冊就緒回調；已就緒時立即呼叫"""
+        if self.ready:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def _set_images(self, images: List[QImage], trim_offsets: Optional[List[Tuple[float, float]]] = None) -> None:
+        """（GUI 執行緒）將解碼結果轉為 QPixmap 並就地填入 frames"""
+        if self.ready:
+            return
+        self.frames.trim_offsets = list(trim_offsets or [])
+        self.frames[:] = [QPixmap.fromImage(img) for img in images]
+        self.nbytes = sum(img.sizeInBytes() for img in images)
+        self.ready = True
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+
+class _DecodeTask(QRunnable):
+    """背景解碼任務：解碼一組行為動畫，完成後透過信號交回 GUI 執行緒"""
+
+    def __init__(self, loader: "AssetLoader", anim: AnimationFrames, fish_dir: Path, behavior: str):
+        super().__init__()
+        self.setAutoDelete(False)
+        self._loader = loader
+        self._anim = anim
+        self._fish_dir = fish_dir
+        self._behavior = behavior
+
+    def run(self) -> None:
+        try:
+            images, offsets = decode_animation(self._fish_dir, self._behavior)
+        except Exception as e:
+            _log.error("解碼失敗 %s / %s: %s", self._fish_dir, self._behavior, e)
+            images, offsets = [], []
+        self._loader._decoded.emit(self._anim, images, offsets)
+
+
+class AssetLoader(QObject):
+    """
+    素材載入器
+
+    以 (目錄, 行為) 為鍵快取 AnimationFrames，同一組動畫只解碼一次。
+    request_animation 為非同步（背景解碼），load_animation 為同步（快取未命中時在 GUI 執行緒解碼）。
+    同魚種同階段的魚共用同一組 frames 列表（不再逐魚複製 QPixmap），
+    快取總量超過記憶體預算時，依最久未使用順序釋放沒有使用者的動畫。
+    """
+
+    # 信號：背景解碼完成（跨執行緒，以 QueuedConnection 交回 GUI 執行緒）
+    _decoded = pyqtSignal(object, object, object)
+
+    def __init__(
+        self,
+        max_threads: int = ASSET_LOADER_MAX_THREADS,
+        budget_mb: float = ASSET_MEMORY_BUDGET_MB,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(1, int(max_threads)))
+        # 依最近使用排序（最舊在前），供 LRU 釋放
+        self._cache: "OrderedDict[Tuple[str, str], AnimationFrames]" = OrderedDict()
+        # frames 列表 id → AnimationFrames，供 attach() 由魚持有的列表反查所屬動畫
+        self._by_frames_id: Dict[int, AnimationFrames] = {}
+        self._budget_bytes = int(budget_mb * 1024 * 1024)
+        self._total_bytes = 0
+        self._evicted_count = 0
+        self._hits = 0
+        self._misses = 0
+        self._tasks: Dict[Tuple[str, str], _DecodeTask] = {}
+        self._decoded.connect(self._on_decoded, Qt.ConnectionType.QueuedConnection)
+        # 於 GUI 執行緒先開啟封裝檔，避免多個解碼執行緒同時初始化
+        get_asset_archive()
+
+    @staticmethod
+    def _make_key(fish_dir: Path, behavior: str) -> Tuple[str, str]:
+        return (str(fish_dir), behavior or "")
+
+    def _get_or_create(self, key: Tuple[str, str]) -> AnimationFrames:
+        """取得快取項目（不存在時建立），並標記為最近使用"""
+        anim = self._cache.get(key)
+        if anim is None:
+            self._misses += 1
+            anim = AnimationFrames(key)
+            self._cache[key] = anim
+            self._by_frames_id[id(anim.frames)] = anim
+        else:
+            self._hits += 1
+            self._cache.move_to_end(key)
+        anim.last_used = time.monotonic()
+        return anim
+
+    def request_animation(self, fish_dir: Path, behavior: str = "", priority: int = PRIORITY_VISIBLE) -> AnimationFrames:
+        """
+        非同步請求一組動畫幀
+
+        已快取或已排程時直接回傳同一個 AnimationFrames；
+        已排程但尚未開始的任務若以更高優先序再次請求，會重新排入佇列。
+
+        Args:
+            fish_dir: 魚種／階段目錄
+            behavior: 行為目錄名；空字串表示 fish_dir 本身即為幀目錄（如飼料）
+            priority: 載入優先序（PRIORITY_*）
+
+        Returns:
+            AnimationFrames（可能尚未就緒）
+        """
+        key = self._make_key(fish_dir, behavior)
+        anim = self._get_or_create(key)
+        if anim.ready:
+            return anim
+        task = self._tasks.get(key)
+        if task is not None:
+            # 尚未開始執行時提高優先序：取出後以新優先序重新排入
+            if priority > anim.priority and self._pool.tryTake(task):
+                anim.priority = priority
+                self._pool.start(task, priority)
+            return anim
+        anim.priority = priority
+        task = _DecodeTask(self, anim, fish_dir, behavior)
+        self._tasks[key] = task
+        self._pool.start(task, priority)
+        return anim
+
+    def load_animation(self, fish_dir: Path, behavior: str = "") -> AnimationFrames:
+        """
+        同步取得一組動畫幀（快取命中時不做任何 I/O）
+
+        若該動畫已在背景排程但尚未完成，取消排程並直接在 GUI 執行緒解碼。
+
+        Args:
+            fish_dir: 魚種／階段目錄
+            behavior: 行為目錄名；空字串表示 fish_dir 本身即為幀目錄
+
+        Returns:
+            已就緒的 AnimationFrames（找不到素材時 frames 為空列表）
+        """
+        key = self._make_key(fish_dir, behavior)
+        anim = self._get_or_create(key)
+        if anim.ready:
+            return anim
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            self._pool.tryTake(task)
+        images, offsets = decode_animation(fish_dir, behavior)
+        self._store_images(anim, images, offsets)
+        return anim
+
+    def request_fish_animations(
+        self, fish_dir: Path, species: str, priority: int = PRIORITY_VISIBLE
+    ) -> Tuple[AnimationFrames, AnimationFrames, AnimationFrames]:
+        """非同步請求魚的 (游泳, 轉向, 吃) 三組動畫（行為目錄由 config.get_fish_behaviors 取得）"""
+        return tuple(
+            self.request_animation(fish_dir, behavior, priority)
+            for behavior in get_fish_behaviors(species or "")
+        )
+
+    def load_fish_animations(
+        self, fish_dir: Path, species: str
+    ) -> Tuple[AnimationFrames, AnimationFrames, AnimationFrames]:
+        """同步取得魚的 (游泳, 轉向, 吃) 三組動畫（同魚種同階段的魚共用快取中的幀列表，不逐魚複製 QPixmap）"""
+        return tuple(
+            self.load_animation(fish_dir, behavior)
+            for behavior in get_fish_behaviors(species or "")
+        )
+
+    def attach(self, owner: Any, *frame_lists: List[QPixmap]) -> None:
+        """
+        登記 owner（通常為魚）正在使用哪些 frames 列表；使用中的動畫不會被 LRU 釋放
+
+        Args:
+            owner: 使用者物件（以弱參照保存，物件回收後自動解除）
+            frame_lists: 魚持有的 frames 列表（非本載入器產生的列表會被忽略）
+        """
+        now = time.monotonic()
+        for frames in frame_lists:
+            anim = self._by_frames_id.get(id(frames))
+            if anim is not None and anim.frames is frames:
+                anim.users.add(owner)
+                anim.last_used = now
+                if anim.key in self._cache:
+                    self._cache.move_to_end(anim.key)
+
+    def detach(self, owner: Any, *frame_lists: List[QPixmap]) -> None:
+        """
+        解除 owner 對 frames 列表的使用登記（之後沒有其他使用者時可被 LRU 釋放）
+
+        Args:
+            owner: attach 時的使用者物件
+            frame_lists: frames 列表（非本載入器產生的列表會被忽略）
+        """
+        for frames in frame_lists:
+            anim = self._by_frames_id.get(id(frames))
+            if anim is not None and anim.frames is frames:
+                anim.users.discard(owner)
+
+    def pending_animations(self, frame_lists: Iterable[List[QPixmap]]) -> List[AnimationFrames]:
+        """
+        取得 frames 列表所屬、尚未就緒的動畫（不重複）
+
+        Args:
+            frame_lists: 魚持有的 frames 列表（非本載入器產生的列表會被忽略）
+
+        Returns:
+            尚未就緒的 AnimationFrames，可用 on_ready 等待
+        """
+        pending: Dict[int, AnimationFrames] = {}
+        for frames in frame_lists:
+            anim = self._by_frames_id.get(id(frames))
+            if anim is not None and anim.frames is frames and not anim.ready:
+                pending[id(anim)] = anim
+        return list(pending.values())
+
+    def _store_images(
+        self, anim: AnimationFrames, images: List[QImage], trim_offsets: Optional[List[Tuple[float, float]]] = None
+    ) -> None:
+        """
+        （GUI 執行緒）填入解碼結果、更新記憶體統計並檢查預算
+
+        剛填入的動畫視為最近使用，且不在本次檢查中釋放（請求者可能尚未 attach）。
+        """
+        if anim.ready:
+            return
+        anim._set_images(images, trim_offsets)
+        if self._cache.get(anim.key) is anim:
+            self._total_bytes += anim.nbytes
+            self._cache.move_to_end(anim.key)
+        self.trim_to_budget(keep=anim)
+
+    def _on_decoded(self, anim: AnimationFrames, images: List[QImage], trim_offsets: List[Tuple[float, float]]) -> None:
+        """（GUI 執行緒）背景解碼完成：轉為 QPixmap 並通知等待者"""
+        self._tasks.pop(anim.key, None)
+        self._store_images(anim, images, trim_offsets)
+
+    def trim_to_budget(self, keep: Optional[AnimationFrames] = None) -> int:
+        """
+        快取總量超過預算時，依最久未使用順序釋放沒有使用者的已就緒動畫
+
+        被釋放的動畫只是離開快取；仍持有其 frames 列表的物件（如飼料）不受影響，
+        之後再次請求會重新解碼。
+
+        Args:
+            keep: 本次不釋放的動畫（剛解碼完成、請求者尚未 attach 的動畫）
+
+        Returns:
+            本次釋放的動畫組數
+        """
+        if self._budget_bytes <= 0 or self._total_bytes <= self._budget_bytes:
+            return 0
+        evicted = 0
+        for key in list(self._cache.keys()):
+            if self._total_bytes <= self._budget_bytes:
+                break
+            anim = self._cache[key]
+            if anim is keep or not anim.ready or len(anim.users) > 0:
+                continue
+            del self._cache[key]
+            self._by_frames_id.pop(id(anim.frames), None)
+            self._total_bytes -= anim.nbytes
+            evicted += 1
+        self._evicted_count += evicted
+        if evicted:
+            _log.info("超過記憶體預算，釋放 %s 組動畫，目前 %.1f MB", evicted, self._total_bytes / 1024 / 1024)
+        return evicted
+
+    def set_budget_mb(self, budget_mb: float) -> None:
+        """調整記憶體預算（MB，0 表示不限制）並立即套用"""
+        self._budget_bytes = int(budget_mb * 1024 * 1024)
+        self.trim_to_budget()
+
+    def total_bytes(self) -> int:
+        """快取中已解碼動畫的總位元組數"""
+        return self._total_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """快取統計：總量、預算、動畫組數、命中／未命中、已釋放組數、排程中任務數"""
+        return {
+            "total_bytes": self._total_bytes,
+            "budget_bytes": self._budget_bytes,
+            "animations": len(self._cache),
+            "hits": self._hits,
+            "misses": self._misses,
+            "evicted": self._evicted_count,
+            "pending": len(self._tasks),
+        }
+
+    def memory_report(self) -> List[Dict[str, Any]]:
+        """
+        各組動畫的記憶體報告（依位元組數由大到小）
+
+        Returns:
+            每項包含 category, species, stage, behavior, frames, bytes, users, idle_sec
+        """
+        now = time.monotonic()
+        rows = []
+        for anim in self._cache.values():
+            if not anim.ready:
+                continue
+            category, species, stage, behavior = anim.describe()
+            rows.append({
+                "category": category,
+                "species": species,
+                "stage": stage,
+                "behavior": behavior,
+                "frames": len(anim.frames),
+                "bytes": anim.nbytes,
+                "users": len(anim.users),
+                "idle_sec": round(now - anim.last_used, 1),
+            })
+        rows.sort(key=lambda r: r["bytes"], reverse=True)
+        return rows
+
+    def format_memory_report(self) -> str:
+        """將記憶體報告整理為文字（含各魚種小計）"""
+        rows = self.memory_report()
+        per_species: Dict[Tuple[str, str], int] = {}
+        for r in rows:
+            k = (r["category"], r["species"])
+            per_species[k] = per_species.get(k, 0) + r["bytes"]
+        budget = f"{self._budget_bytes / 1024 / 1024:.0f} MB" if self._budget_bytes > 0 else "不限"
+        lines = [f"[素材記憶體] 總計 {self._total_bytes / 1024 / 1024:.1f} MB / 預算 {budget}，{len(rows)} 組動畫"]
+        for (category, species), nbytes in sorted(per_species.items(), key=lambda kv: kv[1], reverse=True):
+            lines.append(f"  {category}/{species}: {nbytes / 1024 / 1024:.2f} MB")
+        for r in rows:
+            lines.append(
+                f"    {r['category']}/{r['species']}/{r['stage']}/{r['behavior']}: "
+                f"{r['frames']} 幀 {r['bytes'] / 1024:.0f} KB，使用中 {r['users']}，閒置 {r['idle_sec']} 秒"
+            )
+        return "\n".join(lines)
+
+    def pending_count(self) -> int:
+        """尚未完成的背景解碼任務數"""
+        return len(self._tasks)
+
+    def wait_for_idle(self, timeout_ms: int = -1) -> bool:
+        """
+        等待所有背景解碼任務結束並交付結果（供啟動測試與基準測試使用）
+
+        Args:
+            timeout_ms: 等待執行緒池的逾時毫秒數（-1 表示不限）
+
+        Returns:
+            是否所有任務都已完成
+        """
+        from PyQt6.QtCore import QCoreApplication
+        done = self._pool.waitForDone(timeout_ms)
+        # 交付已排入事件佇列的解碼結果
+        QCoreApplication.processEvents()
+        return done and not self._tasks
+
+
+_asset_loader: Optional[AssetLoader] = None
+
+
+def get_asset_loader() -> AssetLoader:
+    """取得全域素材載入器（需在 QApplication 建立後呼叫）"""
+    global _asset_loader
+    if _asset_loader is None:
+        _asset_loader = AssetLoader()
+    return _asset_loader
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+自動儲存服務模組
+
+將頻繁的自動儲存請求合併為少量實際寫檔：
+- request_save() 僅標記「有未儲存變更」，並在合併視窗（預設 2 秒）結束時寫檔一次
+- 視窗內的後續請求不重新計時，因此連續操作時最多延遲一個視窗即會落盤
+- flush() 立即寫入未儲存的變更（關閉視窗、購買等重要交易時使用）
+- stats() 提供請求次數與實際寫檔次數等計數器，方便觀察合併效果
+- 搭配 SaveWriter 時，寫檔次數、失敗次數與耗時取自背景寫檔的結果；寫檔失敗時重新標記為未儲存
+
+背景寫檔（SaveWriter）：
+- GUI 執行緒只取得不可變的快照，序列化與寫檔在單一背景執行緒進行
+- 同時最多一個寫檔在進行；寫檔期間送入的新快照只保留最新一份，舊的直接捨棄
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from config import AUTOSAVE_COALESCE_WINDOW_SEC
+from game_log import get_logger
+
+_log = get_logger("自動儲存")
+
+
+class AutoSaveService(QObject):
+    """
+    合併式自動儲存服務（僅在 GUI 執行緒使用）
+    """
+
+    def __init__(
+        self,
+        save_callback: Callable[[], None],
+        window_sec: float = AUTOSAVE_COALESCE_WINDOW_SEC,
+        parent: Optional[QObject] = None,
+        writer: Optional["SaveWriter"] = None,
+    ):
+        """
+        初始化自動儲存服務
+
+        Args:
+            save_callback: 實際執行儲存的函式（例如收集遊戲狀態並寫檔）
+            window_sec: 合併視窗長度（秒）；<= 0 表示每次請求立即儲存
+            parent: Qt 父物件
+            writer: save_callback 送出快照的背景寫入器；指定時依其寫檔結果計數，失敗時重新標記未儲存
+        """
+        super().__init__(parent)
+        self._save_callback = save_callback
+        self._window_sec = max(0.0, float(window_sec))
+        self._dirty = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        # 計數器
+        self._requested = 0
+        self._flushed = 0
+        self._performed = 0
+        self._forced = 0
+        self._failed = 0
+        self._last_save_ms = 0.0
+        self._writer = writer
+        if writer is not None:
+            writer.finished.connect(self._on_write_finished)
+
+    def is_dirty(self) -> bool:
+        """是否有尚未寫入的變更"""
+        return self._dirty
+
+    def set_window(self, window_sec: float) -> None:
+        """調整合併視窗長度（秒），下一次請求起生效"""
+        self._window_sec = max(0.0, float(window_sec))
+
+    def request_save(self, immediate: bool = False) -> None:
+        """
+        請求儲存：標記有未儲存變更，於合併視窗結束時寫入
+
+        Args:
+            immediate: 是否立即寫入（重要交易，如購買、解鎖）
+        """
+        self._requested += 1
+        self._dirty = True
+        if immediate or self._window_sec <= 0:
+            if immediate:
+                self._forced += 1
+            self.flush()
+            return
+        if not self._timer.isActive():
+            self._timer.start(int(self._window_sec * 1000))
+
+    def cancel(self) -> None:
+        """捨棄尚未寫入的請求（呼叫端將自行寫入完整狀態時使用）"""
+        self._timer.stop()
+        self._dirty = False
+
+    def flush(self) -> bool:
+        """
+        立即寫入未儲存的變更（無變更時不寫檔）
+
+        Returns:
+            是否實際執行了儲存且成功（搭配背景寫入器時為快照是否已送出）
+        """
+        self._timer.stop()
+        if not self._dirty:
+            return False
+        self._dirty = False
+        start = time.perf_counter()
+        try:
+            self._save_callback()
+        except Exception as e:
+            # 變更仍未寫入，保留標記讓下一次請求或關閉時重試
+            self._dirty = True
+            self._failed += 1
+            _log.error("失敗: %s", e)
+            return False
+        self._flushed += 1
+        if self._writer is None:
+            self._performed += 1
+            self._last_save_ms = (time.perf_counter() - start) * 1000.0
+        return True
+
+    def _on_write_finished(self, ok: bool, elapsed_ms: float) -> None:
+        """背景寫入器完成一次寫檔（GUI 執行緒）：失敗時重新標記，下一次請求或關閉時重試"""
+        if not ok:
+            self._dirty = True
+
+    def stats(self) -> Dict[str, float]:
+        """
+        取得計數器
+
+        Returns:
+            {"requested": 請求次數, "performed": 完成的寫檔次數, "coalesced": 被合併省略的請求數,
+             "forced": 立即儲存請求數, "failed": 失敗次數, "pending": 是否有未寫入變更,
+             "last_save_ms": 最近一次儲存耗時（毫秒）}
+        """
+        performed, failed, last_save_ms = self._performed, self._failed, self._last_save_ms
+        if self._writer is not None:
+            writer = self._writer.stats()
+            performed = writer["written"]
+            failed += writer["failed"]
+            last_save_ms = writer["last_write_ms"]
+        return {
+            "requested": self._requested,
+            "performed": performed,
+            "coalesced": max(0, self._requested - self._flushed - (1 if self._dirty else 0)),
+            "forced": self._forced,
+            "failed": failed,
+            "pending": 1 if self._dirty else 0,
+            "last_save_ms": last_save_ms,
+        }
+
+
+class _WriteTask(QRunnable):
+    """背景寫檔工作：持續寫入最新快照，直到沒有待寫快照為止"""
+
+    def __init__(self, writer: "SaveWriter"):
+        super().__init__()
+        self._writer = writer
+
+    def run(self) -> None:
+        self._writer._drain()
+
+
+class SaveWriter(QObject):
+    """
+    背景存檔寫入器
+
+    submit() 可在 GUI 執行緒任意頻率呼叫：快照交給背景執行緒，由 write_callback
+    完成序列化與寫檔。最多一個寫檔在進行，待寫快照只保留最新的一份（latest wins）。
+    """
+
+    # 信號：每次寫檔結束時發出（是否成功, 耗時毫秒）；由背景執行緒發出，GUI 執行緒的接收端以佇列方式收到
+    finished = pyqtSignal(bool, float)
+
+    def __init__(self, write_callback: Callable[[Any], bool], parent: Optional[QObject] = None):
+        """
+        初始化背景寫入器
+
+        Args:
+            write_callback: 在背景執行緒執行的寫檔函式，參數為快照，回傳是否成功
+            parent: Qt 父物件
+        """
+        super().__init__(parent)
+        self._write_callback = write_callback
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._lock = threading.Lock()
+        self._pending: Optional[Any] = None
+        self._has_pending = False
+        self._in_flight = False
+        # 計數器（在鎖內更新）
+        self._submitted = 0
+        self._written = 0
+        self._superseded = 0
+        self._failed = 0
+        self._last_write_ms = 0.0
+
+    def submit(self, snapshot: Any) -> None:
+        """
+        送出快照等待寫入（不阻塞）
+
+        Args:
+            snapshot: 不可變的存檔快照（背景執行緒會讀取，送出後不可再修改）
+        """
+        with self._lock:
+            self._submitted += 1
+            if self._has_pending:
+                self._superseded += 1
+            self._pending = snapshot
+            self._has_pending = True
+            if self._in_flight:
+                return
+            self._in_flight = True
+        self._pool.start(_WriteTask(self))
+
+    def _drain(self) -> None:
+        """（背景執行緒）依序寫入最新快照"""
+        while True:
+            with self._lock:
+                if not self._has_pending:
+                    self._in_flight = False
+                    return
+                snapshot = self._pending
+                self._pending = None
+                self._has_pending = False
+            start = time.perf_counter()
+            try:
+                ok = bool(self._write_callback(snapshot))
+            except Exception as e:
+                _log.error("背景寫檔失敗: %s", e)
+                ok = False
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            with self._lock:
+                if ok:
+                    self._written += 1
+                else:
+                    self._failed += 1
+                self._last_write_ms = elapsed_ms
+            self.finished.emit(ok, elapsed_ms)
+
+    def is_busy(self) -> bool:
+        """是否有寫檔正在進行或等待中"""
+        with self._lock:
+            return self._in_flight or self._has_pending
+
+    def wait_for_idle(self, timeout_ms: int = -1) -> bool:
+        """
+        等待所有已送出的快照寫入完成（關閉程式前呼叫）
+
+        Args:
+            timeout_ms: 逾時毫秒數，-1 表示不限
+
+        Returns:
+            是否在逾時前完成
+        """
+        return self._pool.waitForDone(timeout_ms)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        取得計數器
+
+        Returns:
+            {"submitted": 送出快照數, "written": 寫入成功數, "superseded": 被較新快照取代而未寫入的數量,
+             "failed": 失敗次數, "last_write_ms": 最近一次背景序列化與寫檔耗時（毫秒）}
+        """
+        with self._lock:
+            return {
+                "submitted": self._submitted,
+                "written": self._written,
+                "superseded": self._superseded,
+                "failed": self._failed,
+                "last_write_ms": self._last_write_ms,
+            }
@@ -0,0 +1,10 @@
+"""
+模擬與繪製熱點的微基準測試
+
+以 QT_QPA_PLATFORM=offscreen 執行，不需要顯示器：
+
+    python -m benchmarks.run                    # 全部項目、預設實體數量
+    python -m benchmarks.run -k collisions -o before.json
+
+各項目定義於 bench_simulation.py 與 bench_rendering.py，量測流程見 harness.py。
+"""
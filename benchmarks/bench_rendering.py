@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+繪製與影像處理熱點
+
+- paint_event：AquariumWidget.paintEvent 繪製到離屏 QImage（與螢幕輸出相同的繪製路徑）
+- 逐像素處理的素材函式：實體數量參數為影像邊長（像素），素材縮放為 n x n
+"""
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPixmap
+
+from benchmarks import fixtures
+from benchmarks.harness import benchmark
+
+
+def _scaled(pixmap: QPixmap, edge: int) -> QPixmap:
+    return pixmap.scaled(edge, edge, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+
+@benchmark("paint_event", "rendering", sizes=(10, 100, 1000))
+def bench_paint_event(n: int):
+    """AquariumWidget.paintEvent：背景、n 隻魚、n/5 顆飼料與 n/5 個金錢，繪製到 800x600 QImage"""
+    widget = fixtures.make_widget()
+    widget.fishes = fixtures.make_fishes(widget, n)
+    widget.feeds = fixtures.make_feeds(widget, max(1, n // 5))
+    widget.moneys = fixtures.make_moneys(widget, max(1, n // 5))
+    image = QImage(widget.size(), QImage.Format.Format_ARGB32_Premultiplied)
+
+    def run() -> None:
+        image.fill(0)
+        widget.render(image)
+
+    return run
+
+
+@benchmark("darken_money_edges", "rendering", sizes=(32, 64, 128))
+def bench_darken_money_edges(n: int):
+    """_darken_money_edges：n x n 的金錢素材"""
+    import aquarium_window as aw
+
+    fixtures.get_app()
+    pixmap = _scaled(fixtures.money_source_pixmap(), n)
+    return lambda: aw._darken_money_edges(pixmap)
+
+
+@benchmark("adjust_hue_to_pomegranate", "rendering", sizes=(32, 64, 128))
+def bench_adjust_hue_to_pomegranate(n: int):
+    """_adjust_hue_to_pomegranate：n x n 的金錢素材"""
+    import aquarium_window as aw
+
+    fixtures.get_app()
+    pixmap = _scaled(fixtures.money_source_pixmap(), n)
+    return lambda: aw._adjust_hue_to_pomegranate(pixmap)
+
+
+@benchmark("build_death_frame", "rendering", sizes=(32, 64, 128))
+def bench_build_death_frame(n: int):
+    """Fish._build_death_frame：第一幀縮放為 n x n 的魚（每次呼叫前清除已建立的死亡幀）"""
+    widget = fixtures.make_widget(background=False)
+    fish = fixtures.make_fishes(widget, 1, mix=(("鬥魚", "large", 1),))[0]
+    fish.swim_frames = [_scaled(fish.swim_frames[0], n)]
+
+    def reset() -> None:
+        fish._death_frame = None
+
+    return fish._build_death_frame, reset
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+模擬熱點：每幀在 AquariumWidget.update_fishes 中執行的更新與碰撞檢查
+
+會改變實體狀態的項目以 world_state 的欄位列表記錄初始狀態，每次呼叫前還原並重設模擬亂數種子（不計時），
+讓每筆樣本都從相同的場景開始。
+"""
+
+from benchmarks import fixtures
+from benchmarks.harness import benchmark
+from sim_random import get_world_random
+from world_state import FEED_FIELDS, FISH_FIELDS, MONEY_FIELDS, capture_fields, restore_fields
+
+
+def _state_resetter(pairs):
+    """
+    建立還原函式
+
+    Args:
+        pairs: [(實體列表, 欄位列表), ...]
+
+    Returns:
+        將列表中每個實體還原為目前欄位值、並重設模擬亂數種子的函式
+    """
+    saved = [(entities, fields, [capture_fields(e, fields) for e in entities]) for entities, fields in pairs]
+
+    def reset() -> None:
+        for entities, fields, rows in saved:
+            for entity, row in zip(entities, rows):
+                restore_fields(entity, fields, row)
+        get_world_random().reseed(0)
+
+    return reset
+
+
+@benchmark("fish_update", "simulation", sizes=(10, 100, 1000))
+def bench_fish_update(n: int):
+    """Fish.update：n 隻魚（預設魚種組成）、20 顆飼料"""
+    widget = fixtures.make_widget(background=False)
+    fishes = fixtures.make_fishes(widget, n)
+    feeds = fixtures.make_feeds(widget, 20)
+    rect = fixtures.aquarium_rect(widget)
+    reset = _state_resetter([(fishes, FISH_FIELDS)])
+
+    def run() -> None:
+        for fish in fishes:
+            fish.update(rect, feeds=feeds)
+
+    return run, reset
+
+
+@benchmark("find_nearest_feed", "simulation", sizes=(10, 100, 1000))
+def bench_find_nearest_feed(n: int):
+    """Fish._find_nearest_feed：1 隻魚在 n 顆飼料中找最近的一顆"""
+    widget = fixtures.make_widget(background=False)
+    fish = fixtures.make_fishes(widget, 1)[0]
+    feeds = fixtures.make_feeds(widget, n)
+    return lambda: fish._find_nearest_feed(feeds)
+
+
+@benchmark("feed_collisions", "simulation", sizes=(10, 100, 1000))
+def bench_feed_collisions(n: int):
+    """AquariumWidget._check_feed_collisions：n 隻魚、n/2 顆飼料（部分重疊而被吃掉）"""
+    widget = fixtures.make_widget(background=False)
+    widget.fishes = fixtures.make_fishes(widget, n)
+    widget.feeds = fixtures.make_feeds(widget, max(1, n // 2))
+    rect = fixtures.aquarium_rect(widget)
+    reset = _state_resetter([(widget.fishes, FISH_FIELDS), (widget.feeds, FEED_FIELDS)])
+    return lambda: widget._check_feed_collisions(rect), reset
+
+
+@benchmark("guppy_touch_money", "simulation", sizes=(10, 100, 1000))
+def bench_guppy_touch_money(n: int):
+    """AquariumWidget._check_guppy_touch_money：10 隻孔雀魚、n 個金錢（碰觸時可能轉換為石榴結晶）"""
+    widget = fixtures.make_widget(background=False)
+    widget.fishes = fixtures.make_fishes(widget, 10, mix=(("孔雀魚", "small", 1),))
+    moneys = fixtures.make_moneys(widget, n)
+    restore = _state_resetter([(widget.fishes, FISH_FIELDS), (moneys, MONEY_FIELDS)])
+
+    def reset() -> None:
+        restore()
+        # 轉換出的石榴結晶會加入列表，每次從原本的金錢開始
+        widget.moneys = list(moneys)
+
+    return widget._check_guppy_touch_money, reset
+
+
+@benchmark("shark_eat_betta", "simulation", sizes=(10, 100, 1000))
+def bench_shark_eat_betta(n: int):
+    """AquariumWidget._check_shark_eat_betta：5 隻可進食的鯊魚、n 隻幼鬥魚"""
+    widget = fixtures.make_widget(background=False)
+    sharks = fixtures.make_fishes(widget, 5, seed=3, mix=(("鯊魚", "small", 1),))
+    widget.fishes = sharks + fixtures.make_fishes(widget, n, mix=(("鬥魚", "small", 1),))
+    rect = fixtures.aquarium_rect(widget)
+    reset = _state_resetter([(sharks, FISH_FIELDS)])
+    return lambda: widget._check_shark_eat_betta(rect), reset
+
+
+@benchmark("money_update", "simulation", sizes=(10, 100, 1000))
+def bench_money_update(n: int):
+    """Money.update：n 個落下中的金錢"""
+    widget = fixtures.make_widget(background=False)
+    moneys = fixtures.make_moneys(widget, n)
+    rect = fixtures.aquarium_rect(widget)
+    reset = _state_resetter([(moneys, MONEY_FIELDS)])
+
+    def run() -> None:
+        for money in moneys:
+            money.update(rect)
+
+    return run, reset
+
+
+@benchmark("feed_update", "simulation", sizes=(10, 100, 1000))
+def bench_feed_update(n: int):
+    """Feed.update：n 顆落下中的飼料"""
+    widget = fixtures.make_widget(background=False)
+    feeds = fixtures.make_feeds(widget, n)
+    rect = fixtures.aquarium_rect(widget)
+    reset = _state_resetter([(feeds, FEED_FIELDS)])
+
+    def run() -> None:
+        for feed in feeds:
+            feed.update(rect)
+
+    return run, reset
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+效能回歸檢查：比較基準測試結果與已提交的基準線
+
+    python -m benchmarks.compare --run                      # 重新執行基準線中的項目並比較
+    python -m benchmarks.compare after.json                 # 比較已有的結果
+    python -m benchmarks.compare before.json after.json     # 比較兩份結果
+    python -m benchmarks.compare --run --update-baseline    # 以本次結果取代基準線
+
+判定方式（每個項目、每個實體數量）：
+- 中位數變慢超過門檻（預設 10%，可依項目覆寫），且
+- 單尾 Mann-Whitney U 檢定顯著（預設 p < 0.01；樣本不受常態假設影響，對偶發的慢樣本不敏感）
+兩者都成立才判定為回歸；結果缺少樣本時改以標準差判斷（差距需超過兩者標準差之和的兩倍）。
+比較前先以兩次執行的參考工作量（meta.reference_us，整次執行分散量測的中位數）比例校正本次樣本，
+抵銷機器速度的飄移；所有項目使用同一個係數（--no-normalize 可關閉）。
+使用 --run 時，判定為回歸的項目會重新量測（--confirm 次，預設 2），每次都仍為回歸才算數，
+排除量測期間短暫的其他負載。
+有回歸時結束碼為 1，可作為合併前的檢查。
+
+基準線與機器相關：換機器或大幅變更環境後，請以 --update-baseline 重新產生。
+"""
+
+import json
+import math
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_ALPHA = 0.01
+
+STATUS_REGRESSION = "回歸"
+STATUS_IMPROVED = "改善"
+STATUS_UNCHANGED = "持平"
+STATUS_NOISY = "不顯著"
+STATUS_NEW = "新增"
+STATUS_MISSING = "缺少"
+
+
+def mann_whitney_greater(baseline: Sequence[float], current: Sequence[float]) -> float:
+    """
+    單尾 Mann-Whitney U 檢定：current 的耗時是否顯著大於 baseline
+
+    使用常態近似（含同值修正與連續性修正），樣本數各 5 筆以上時即有足夠的檢定力。
+
+    Returns:
+        p 值（越小越能確定 current 較慢）；任一組沒有樣本時為 1
+    """
+    n_a, n_b = len(baseline), len(current)
+    if n_a == 0 or n_b == 0:
+        return 1.0
+    combined = sorted([(v, 0) for v in baseline] + [(v, 1) for v in current])
+    n = n_a + n_b
+    rank_sum_b = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        avg_rank = (i + j) / 2.0 + 1.0
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        rank_sum_b += avg_rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 1)
+        i = j + 1
+    u_b = rank_sum_b - n_b * (n_b + 1) / 2.0
+    mean = n_a * n_b / 2.0
+    variance = n_a * n_b / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u_b - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2.0))
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    """
+    讀取 benchmarks.run 輸出的結果
+
+    Raises:
+        ValueError: 檔案格式不符
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or not isinstance(data.get("results"), list):
+        raise ValueError(f"{path} 不是基準測試結果（缺少 results）")
+    return data
+
+
+def _index(report: Dict[str, Any]) -> Dict[Tuple[str, int], Dict[str, Any]]:
+    return {(r["name"], int(r["size"])): r for r in report["results"]}
+
+
+def run_reference(report: Dict[str, Any]) -> Optional[float]:
+    """
+    整次執行的參考工作量耗時（微秒）
+
+    Returns:
+        meta.reference_us；缺少時為 None
+    """
+    return report.get("meta", {}).get("reference_us") or None
+
+
+def speed_factor(baseline: Dict[str, Any], current: Dict[str, Any]) -> float:
+    """本次執行相對於基準線的機器速度係數（兩次參考工作量耗時比；缺少參考值時為 1）"""
+    base_ref, cur_ref = run_reference(baseline), run_reference(current)
+    if not base_ref or not cur_ref:
+        return 1.0
+    return cur_ref / base_ref
+
+
+def compare_record(
+    base: Dict[str, Any],
+    cur: Dict[str, Any],
+    threshold: float,
+    alpha: float,
+    factor: float = 1.0,
+) -> Dict[str, Any]:
+    """
+    比較單一項目的兩筆結果
+
+    Args:
+        base: 基準線記錄
+        cur: 本次記錄
+        threshold: 門檻比例
+        alpha: 顯著水準
+        factor: 機器速度係數（speed_factor；本次數字除以此係數後再比較）
+
+    Returns:
+        {"current_us": 校正後的本次中位數, "speed_factor": 機器速度係數, "change_pct": 中位數變化百分比,
+         "p_slower": 變慢的 p 值, "p_faster": 變快的 p 值, "status": 判定}
+    """
+    base_median, cur_median = base["median_us"], cur["median_us"] / factor
+    ratio = cur_median / base_median if base_median > 0 else 1.0
+    base_samples = base.get("samples_us")
+    cur_samples = [v / factor for v in cur.get("samples_us") or []]
+    if base_samples and cur_samples:
+        p_slower = mann_whitney_greater(base_samples, cur_samples)
+        p_faster = mann_whitney_greater(cur_samples, base_samples)
+        slower_significant = p_slower < alpha
+        faster_significant = p_faster < alpha
+    else:
+        # 沒有樣本：差距需超過雜訊範圍（兩者標準差之和的兩倍）
+        p_slower = p_faster = None
+        noise = 2.0 * (base.get("stdev_us", 0.0) + cur.get("stdev_us", 0.0) / factor)
+        slower_significant = cur_median - base_median > noise
+        faster_significant = base_median - cur_median > noise
+
+    if ratio > 1.0 + threshold:
+        status = STATUS_REGRESSION if slower_significant else STATUS_NOISY
+    elif ratio < 1.0 / (1.0 + threshold) and faster_significant:
+        status = STATUS_IMPROVED
+    else:
+        status = STATUS_UNCHANGED
+    return {
+        "current_us": round(cur_median, 3),
+        "speed_factor": round(factor, 3),
+        "change_pct": round((ratio - 1.0) * 100.0, 2),
+        "p_slower": p_slower,
+        "p_faster": p_faster,
+        "status": status,
+    }
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+    case_thresholds: Optional[Dict[str, float]] = None,
+    normalize: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    比較兩份結果（依基準線順序，基準線沒有的項目列在最後）
+
+    Args:
+        baseline: 基準線結果
+        current: 本次結果
+        threshold: 中位數變慢超過此比例才可能判定為回歸（0.1 = 10%）
+        alpha: 檢定的顯著水準
+        case_thresholds: 依項目名稱覆寫門檻
+        normalize: 是否以參考工作量校正本次數字
+
+    Returns:
+        每個 (項目, 實體數量) 一筆比較記錄
+    """
+    case_thresholds = case_thresholds or {}
+    factor = speed_factor(baseline, current) if normalize else 1.0
+    base_index, cur_index = _index(baseline), _index(current)
+    rows = []
+    for key in list(base_index) + [k for k in cur_index if k not in base_index]:
+        name, size = key
+        base, cur = base_index.get(key), cur_index.get(key)
+        row: Dict[str, Any] = {
+            "name": name,
+            "size": size,
+            "baseline_us": base["median_us"] if base else None,
+            "current_us": cur["median_us"] if cur else None,
+        }
+        if base is None:
+            row["status"] = STATUS_NEW
+        elif cur is None:
+            row["status"] = STATUS_MISSING
+        else:
+            row.update(compare_record(base, cur, case_thresholds.get(name, threshold), alpha, factor))
+        rows.append(row)
+    return rows
+
+
+def confirm_regressions(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    rows: List[Dict[str, Any]],
+    attempts: int,
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+    case_thresholds: Optional[Dict[str, float]] = None,
+    normalize: bool = True,
+) -> None:
+    """
+    重新量測判定為回歸的項目；任一次不再是回歸時，以該次結果取代（rows 與 current 直接更新）
+
+    Args:
+        baseline: 基準線結果
+        current: 本次結果
+        rows: compare_reports 的結果
+        attempts: 每個回歸項目最多重新量測的次數
+        其餘參數同 compare_reports
+    """
+    from benchmarks.run import run_plan
+
+    case_thresholds = case_thresholds or {}
+    # 重新量測只有單一項目，參考量測次數太少，沿用整次執行的速度係數
+    factor = speed_factor(baseline, current) if normalize else 1.0
+    base_index, cur_index = _index(baseline), _index(current)
+    meta = baseline.get("meta", {})
+    for row in rows:
+        if row["status"] != STATUS_REGRESSION:
+            continue
+        key = (row["name"], row["size"])
+        for attempt in range(1, attempts + 1):
+            record = run_plan([key], meta.get("warmup", 3), meta.get("repeat", 15))["results"][0]
+            result = compare_record(base_index[key], record, case_thresholds.get(row["name"], threshold), alpha, factor)
+            row["confirm_runs"] = attempt
+            if result["status"] != STATUS_REGRESSION:
+                row.update(result)
+                cur_index[key].clear()
+                cur_index[key].update(record)
+                break
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    """以文字表格呈現比較結果"""
+    def fmt_us(value: Optional[float]) -> str:
+        return f"{value:,.2f}" if value is not None else "-"
+
+    def fmt_p(value: Optional[float]) -> str:
+        return f"{value:.4f}" if value is not None else "-"
+
+    lines = [f"{'項目':<26}{'n':>7}{'基準線 µs':>15}{'本次 µs':>15}{'速度係數':>10}{'變化':>10}{'p(變慢)':>10}  判定"]
+    for row in rows:
+        change = f"{row['change_pct']:+.1f}%" if "change_pct" in row else "-"
+        factor = f"{row['speed_factor']:.2f}" if "speed_factor" in row else "-"
+        lines.append(
+            f"{row['name']:<26}{row['size']:>7}{fmt_us(row['baseline_us']):>15}{fmt_us(row['current_us']):>15}"
+            f"{factor:>10}{change:>10}{fmt_p(row.get('p_slower')):>10}  {row['status']}"
+        )
+    counts: Dict[str, int] = {}
+    for row in rows:
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+    lines.append("，".join(f"{status} {count}" for status, count in counts.items()))
+    return "\n".join(lines)
+
+
+def _parse_case_thresholds(values: Sequence[str]) -> Dict[str, float]:
+    result = {}
+    for value in values:
+        name, _, ratio = value.partition("=")
+        if not name or not ratio:
+            raise ValueError(f"項目門檻格式應為 名稱=比例: {value}")
+        result[name.strip()] = float(ratio)
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='比較基準測試結果與基準線，有顯著回歸時結束碼為 1')
+    parser.add_argument('reports', nargs='*',
+                       help='結果 JSON：一個時與基準線比較；兩個時比較前者（基準）與後者')
+    parser.add_argument('-b', '--baseline', type=str, default=str(DEFAULT_BASELINE),
+                       help='基準線 JSON（預設: benchmarks/baseline.json）')
+    parser.add_argument('--run', action='store_true',
+                       help='以基準線的項目、實體數量與樣本數重新執行基準測試後比較')
+    parser.add_argument('-t', '--threshold', type=float, default=DEFAULT_THRESHOLD,
+                       help='中位數變慢超過此比例才可能判定為回歸（預設: 0.10）')
+    parser.add_argument('--case-threshold', action='append', default=[], metavar='名稱=比例',
+                       help='依項目覆寫門檻，可重複指定（如 paint_event=0.2）')
+    parser.add_argument('-a', '--alpha', type=float, default=DEFAULT_ALPHA,
+                       help='Mann-Whitney U 檢定的顯著水準（預設: 0.01）')
+    parser.add_argument('--confirm', type=int, default=2,
+                       help='使用 --run 時，回歸項目重新量測確認的次數（預設: 2，0 表示不確認）')
+    parser.add_argument('--no-normalize', action='store_true',
+                       help='不以參考工作量校正機器速度差異')
+    parser.add_argument('--update-baseline', action='store_true',
+                       help='比較後以本次結果取代基準線')
+    parser.add_argument('-o', '--output', type=str, default=None,
+                       help='比較結果 JSON 輸出路徑')
+    args = parser.parse_args(argv)
+
+    try:
+        case_thresholds = _parse_case_thresholds(args.case_threshold)
+        if len(args.reports) == 2:
+            baseline_path, current = Path(args.reports[0]), load_report(Path(args.reports[1]))
+            baseline = load_report(baseline_path)
+        else:
+            baseline_path = Path(args.baseline)
+            baseline = load_report(baseline_path) if baseline_path.exists() else None
+            if args.run:
+                from benchmarks.run import run_benchmarks, run_plan
+                if baseline is not None:
+                    # 與基準線相同的項目、實體數量、暖身與樣本數
+                    meta = baseline.get("meta", {})
+                    plan = [(r["name"], int(r["size"])) for r in baseline["results"]]
+                    current = run_plan(plan, meta.get("warmup", 3), meta.get("repeat", 15))
+                else:
+                    current = run_benchmarks()
+            elif len(args.reports) == 1:
+                current = load_report(Path(args.reports[0]))
+            else:
+                parser.error("請指定結果 JSON 或使用 --run")
+                return 2
+    except (OSError, ValueError) as e:
+        print(f"錯誤: {e}", file=sys.stderr)
+        return 2
+
+    if baseline is None:
+        if not args.update_baseline:
+            print(f"錯誤: 找不到基準線 {baseline_path}（可使用 --run --update-baseline 建立）", file=sys.stderr)
+            return 2
+        rows = []
+    else:
+        base_platform = baseline.get("meta", {}).get("platform")
+        cur_platform = current.get("meta", {}).get("platform")
+        if base_platform and cur_platform and base_platform != cur_platform:
+            print(f"警告: 基準線平台 {base_platform} 與本次 {cur_platform} 不同，數字可能無法直接比較", file=sys.stderr)
+        rows = compare_reports(baseline, current, args.threshold, args.alpha, case_thresholds, not args.no_normalize)
+        if args.run and args.confirm > 0:
+            confirm_regressions(
+                baseline, current, rows, args.confirm, args.threshold, args.alpha, case_thresholds, not args.no_normalize
+            )
+        print(format_table(rows))
+
+    if args.output:
+        meta = {"baseline": (baseline or {}).get("meta"), "current": current.get("meta")}
+        Path(args.output).write_text(json.dumps({"meta": meta, "rows": rows}, ensure_ascii=False, indent=2), encoding='utf-8')
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(current, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"基準線已更新: {baseline_path}", file=sys.stderr)
+        return 0
+    return 1 if any(row["status"] == STATUS_REGRESSION for row in rows) else 0
+
+
+if __name__ == '__main__':
+    # 讓 `python benchmarks/compare.py` 也能匯入 benchmarks 套件
+    sys.path.insert(0, str(ROOT))
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+基準測試用的水族箱場景
+
+建立獨立的 AquariumWidget（不含主視窗與存檔），以實際素材填入指定數量的魚、飼料與金錢。
+魚不設定升級與大便回調，量測期間不會載入新素材或產生新實體。
+相同的 seed 產生相同的場景，方便比較不同提交的數字。
+"""
+
+import os
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# 讓基準測試可從專案根目錄或 benchmarks/ 目錄執行
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PyQt6.QtCore import QPoint, QPointF, QRect
+from PyQt6.QtGui import QPixmap
+from PyQt6.QtWidgets import QApplication
+
+AQUARIUM_SIZE = (800, 600)
+# 預設魚種組成：(魚種, 階段, 權重)
+DEFAULT_FISH_MIX: Sequence[Tuple[str, str, int]] = (
+    ("鬥魚", "small", 4),
+    ("鬥魚", "medium", 3),
+    ("鬥魚", "large", 2),
+    ("鬥魚", "angel", 1),
+    ("孔雀魚", "small", 1),
+    ("鯊魚", "small", 1),
+)
+
+_app: Optional[QApplication] = None
+_frames_cache: Dict[Tuple[str, str], Tuple[list, list, list]] = {}
+
+
+def get_app() -> QApplication:
+    """取得（或建立）QApplication"""
+    global _app
+    _app = QApplication.instance() or QApplication(sys.argv)
+    return _app
+
+
+def make_widget(size: Tuple[int, int] = AQUARIUM_SIZE, background: bool = True):
+    """
+    建立獨立的水族箱部件（停止遊戲迴圈與升級預載計時器）
+
+    Args:
+        size: 部件尺寸
+        background: 是否載入預設背景圖（繪製量測需要）
+    """
+    get_app()
+    import aquarium_window as aw
+
+    background_path = None
+    if background:
+        backgrounds = aw._list_backgrounds()
+        background_path = backgrounds[0] if backgrounds else None
+    widget = aw.AquariumWidget(background_path=background_path)
+    widget.frame_driver.stop()
+    widget._upgrade_preload_timer.stop()
+    widget.resize(*size)
+    return widget
+
+
+def aquarium_rect(widget) -> QRect:
+    return QRect(0, 0, widget.width(), widget.height())
+
+
+def load_frames(widget, species: str, stage: str) -> Tuple[list, list, list]:
+    """同步載入指定魚種與階段的游泳、轉向、吃飯動畫幀（結果快取）"""
+    key = (species, stage)
+    if key not in _frames_cache:
+        import aquarium_window as aw
+        from asset_loader import get_asset_loader
+        # 商店魚種（孔雀魚、鯊魚）沒有階段目錄，與 _duplicate_fish 相同回退到魚種目錄
+        fish_dir = widget._resolve_upgrade_dir(species, stage) or aw._resource_dir() / "fish" / species
+        if not fish_dir.is_dir():
+            raise FileNotFoundError(f"找不到素材目錄: {species} {stage}")
+        swim, turn, eat = get_asset_loader().load_fish_animations(fish_dir, species)
+        _frames_cache[key] = (swim.frames, turn.frames, eat.frames)
+    return _frames_cache[key]
+
+
+def make_fish(widget, species: str, stage: str, rng: random.Random):
+    """在水族箱內隨機位置建立一隻魚"""
+    from fish import Fish
+    from config import get_fish_scale
+
+    swim, turn, eat = load_frames(widget, species, stage)
+    rect = aquarium_rect(widget)
+    return Fish(
+        swim_frames=swim,
+        turn_frames=turn,
+        position=QPoint(rng.randint(60, rect.width() - 60), rng.randint(60, rect.height() - 60)),
+        speed=rng.uniform(0.4, 0.8),
+        direction=rng.uniform(0.0, 360.0),
+        scale=get_fish_scale(species, stage),
+        eat_frames=eat,
+        species=species,
+        stage=stage,
+    )
+
+
+def make_fishes(widget, count: int, seed: int = 0, mix: Sequence[Tuple[str, str, int]] = DEFAULT_FISH_MIX) -> list:
+    """依魚種組成權重建立 count 隻魚"""
+    rng = random.Random(seed)
+    pool: List[Tuple[str, str]] = [(species, stage) for species, stage, weight in mix for _ in range(weight)]
+    return [make_fish(widget, *pool[i % len(pool)], rng) for i in range(count)]
+
+
+def make_feeds(widget, count: int, seed: int = 1, feed_name: str = "便宜飼料") -> list:
+    """在水族箱內隨機位置建立 count 顆飼料"""
+    import aquarium_window as aw
+
+    rng = random.Random(seed)
+    frames = aw._load_feed_frames(feed_name)
+    rect = aquarium_rect(widget)
+    return [
+        aw.Feed(QPoint(rng.randint(20, rect.width() - 20), rng.randint(20, rect.height() - 80)), frames, feed_name)
+        for _ in range(count)
+    ]
+
+
+def make_moneys(widget, count: int, seed: int = 2, money_names: Sequence[str] = ("銅幣", "銀幣", "金幣")) -> list:
+    """在水族箱內隨機位置建立 count 個金錢"""
+    import aquarium_window as aw
+
+    rng = random.Random(seed)
+    rect = aquarium_rect(widget)
+    moneys = []
+    for i in range(count):
+        name = money_names[i % len(money_names)]
+        position = QPointF(rng.uniform(20, rect.width() - 20), rng.uniform(20, rect.height() - 80))
+        moneys.append(aw.Money(position, aw._load_money_frames(name), name))
+    return moneys
+
+
+def money_source_pixmap(money_name: str = "金幣") -> QPixmap:
+    """讀取金錢素材的第一幀原圖（未經 _darken_money_edges 處理）"""
+    import aquarium_window as aw
+
+    files = sorted((aw._resource_dir() / "money" / money_name).glob("*.png"))
+    if not files:
+        raise FileNotFoundError(f"找不到金錢素材: {money_name}")
+    return QPixmap(str(files[0]))
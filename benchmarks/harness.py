@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+微基準測試量測流程
+
+每個項目以 @benchmark 登記一個 setup(n) 函式，回傳要量測的函式：
+- 回傳 fn：無狀態或可重複執行的操作。先校準每輪呼叫次數（使每輪至少 min_time 秒），
+  再以「每輪總耗時 / 次數」作為一筆樣本，降低計時器解析度的影響
+- 回傳 (fn, reset)：會改變狀態的操作（如碰撞後飼料被吃掉）。每次呼叫前執行 reset（不計時），
+  每次呼叫各為一筆樣本
+
+暖身呼叫不列入統計；結果以微秒表示（中位數、平均、標準差、最小/最大、p95），
+並保留每筆樣本（samples_us），供 compare.py 做統計檢定。
+
+固定的參考工作量（measure_reference）反映當下的機器速度（CPU 降頻、其他行程搶占等）。
+run.py 在整次執行中分散量測多次、取中位數作為該次的 reference_us；compare.py 以兩次執行的
+參考值比例校正所有項目，降低跨次執行的飄移（單次參考量測本身的雜訊可達數成，不逐項目校正）。
+"""
+
+import gc
+import math
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+SetupResult = Any  # Callable[[], Any] 或 (Callable[[], Any], Callable[[], Any])
+
+
+class BenchmarkCase:
+    """一個基準測試項目"""
+
+    def __init__(self, name: str, group: str, setup: Callable[[int], SetupResult], sizes: Sequence[int], description: str):
+        """
+        Args:
+            name: 項目名稱（用於 -k 篩選與結果比對）
+            group: 分組（simulation、rendering）
+            setup: 依實體數量準備資料並回傳要量測的函式
+            sizes: 預設的實體數量
+            description: 說明（量測的函式與實體數量的意義）
+        """
+        self.name = name
+        self.group = group
+        self.setup = setup
+        self.sizes = list(sizes)
+        self.description = description
+
+
+_REGISTRY: Dict[str, BenchmarkCase] = {}
+
+
+def benchmark(name: str, group: str, sizes: Sequence[int], description: str = "") -> Callable:
+    """登記基準測試項目的裝飾器（套用在 setup 函式上）"""
+    def decorator(setup: Callable[[int], SetupResult]) -> Callable[[int], SetupResult]:
+        if name in _REGISTRY:
+            raise ValueError(f"基準測試項目名稱重複: {name}")
+        _REGISTRY[name] = BenchmarkCase(name, group, setup, sizes, description or (setup.__doc__ or "").strip())
+        return setup
+    return decorator
+
+
+def get_cases(keyword: Optional[str] = None) -> List[BenchmarkCase]:
+    """
+    取得已登記的項目（依登記順序）
+
+    Args:
+        keyword: 只回傳名稱或分組包含此字串的項目（逗號分隔多個）
+    """
+    cases = list(_REGISTRY.values())
+    if keyword:
+        words = [w.strip() for w in keyword.split(",") if w.strip()]
+        cases = [c for c in cases if any(w in c.name or w == c.group for w in words)]
+    return cases
+
+
+def summarize(samples_sec: Sequence[float]) -> Dict[str, float]:
+    """
+    將耗時樣本（秒）整理為統計摘要（微秒）
+
+    Returns:
+        {"samples", "median_us", "mean_us", "stdev_us", "min_us", "max_us", "p95_us", "rsd_pct"}
+    """
+    us = sorted(s * 1_000_000.0 for s in samples_sec)
+    mean = statistics.fmean(us)
+    stdev = statistics.stdev(us) if len(us) > 1 else 0.0
+    p95 = us[min(len(us) - 1, max(0, int(math.ceil(len(us) * 0.95)) - 1))]
+    return {
+        "samples": len(us),
+        "median_us": round(statistics.median(us), 3),
+        "mean_us": round(mean, 3),
+        "stdev_us": round(stdev, 3),
+        "min_us": round(us[0], 3),
+        "max_us": round(us[-1], 3),
+        "p95_us": round(p95, 3),
+        "rsd_pct": round(stdev / mean * 100.0, 2) if mean > 0 else 0.0,
+    }
+
+
+def _reference_workload() -> float:
+    """固定的純 Python 工作量（浮點運算、屬性存取、串列操作，與模擬程式相近）"""
+    total = 0.0
+    points = [(float(i), float(i * 2)) for i in range(200)]
+    for _ in range(20):
+        for x, y in points:
+            dx, dy = x - 100.0, y - 50.0
+            total += math.sqrt(dx * dx + dy * dy)
+        points = [(y, x) for x, y in points]
+    return total
+
+
+def measure_reference(repeat: int = 7) -> float:
+    """量測參考工作量的中位數耗時（微秒）"""
+    _reference_workload()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _reference_workload()
+        times.append(time.perf_counter() - start)
+    return round(statistics.median(times) * 1_000_000.0, 3)
+
+
+def _split_setup(prepared: SetupResult) -> Tuple[Callable[[], Any], Optional[Callable[[], Any]]]:
+    if isinstance(prepared, tuple):
+        return prepared[0], prepared[1]
+    return prepared, None
+
+
+def run_case(
+    case: BenchmarkCase,
+    size: int,
+    warmup: int = 3,
+    repeat: int = 15,
+    min_time: float = 0.02,
+) -> Dict[str, Any]:
+    """
+    量測單一項目在指定實體數量下的耗時
+
+    Args:
+        case: 基準測試項目
+        size: 實體數量
+        warmup: 暖身呼叫次數（不列入統計）
+        repeat: 樣本數
+        min_time: 無 reset 的項目每輪至少執行的秒數（用於校準每輪呼叫次數）
+
+    Returns:
+        {"name", "group", "size", "loops", ...summarize 的欄位, "samples_us": 每筆樣本（微秒）}
+    """
+    fn, reset = _split_setup(case.setup(size))
+    for _ in range(max(0, warmup)):
+        if reset is not None:
+            reset()
+        fn()
+
+    samples: List[float] = []
+    loops = 1
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        if reset is None:
+            # 校準：逐步加倍呼叫次數，直到一輪耗時超過 min_time
+            while True:
+                start = time.perf_counter()
+                for _ in range(loops):
+                    fn()
+                elapsed = time.perf_counter() - start
+                if elapsed >= min_time or loops >= 1_000_000:
+                    break
+                loops *= 2
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                for _ in range(loops):
+                    fn()
+                samples.append((time.perf_counter() - start) / loops)
+        else:
+            for _ in range(max(1, repeat)):
+                reset()
+                start = time.perf_counter()
+                fn()
+                samples.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        "name": case.name,
+        "group": case.group,
+        "size": size,
+        "loops": loops,
+        **summarize(samples),
+        "samples_us": [round(s * 1_000_000.0, 3) for s in samples],
+    }
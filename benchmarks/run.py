@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+執行微基準測試並輸出 JSON 結果
+
+    python -m benchmarks.run                          # 全部項目
+    python -m benchmarks.run -k simulation            # 只跑模擬分組
+    python -m benchmarks.run -k paint_event,fish_update -n 100,2000 -o after.json
+
+結果包含環境資訊與 git 提交（若可取得），供不同提交之間比較；meta.reference_us 為整次執行
+分散量測的參考工作量中位數，compare.py 以它校正機器速度。
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# 讓 `python benchmarks/run.py` 與 `python -m benchmarks.run` 都能匯入專案模組
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks import bench_simulation, bench_rendering  # noqa: F401  登記項目
+from benchmarks.harness import get_cases, measure_reference, run_case
+
+
+def _git_revision() -> Optional[str]:
+    """目前的 git 提交（含未提交變更時加上 -dirty），無法取得時為 None"""
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+        if not rev:
+            return None
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+        return rev + ("-dirty" if dirty else "")
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_plan(
+    plan: Sequence[Tuple[str, int]],
+    warmup: int = 3,
+    repeat: int = 15,
+    min_time: float = 0.02,
+) -> Dict[str, Any]:
+    """
+    依序執行指定的 (項目名稱, 實體數量)
+
+    Args:
+        plan: 要執行的 (項目名稱, 實體數量) 列表
+        warmup: 暖身呼叫次數
+        repeat: 樣本數
+        min_time: 無 reset 的項目每輪至少執行的秒數
+
+    Returns:
+        {"meta": 環境資訊（含 reference_us）, "results": [結果記錄...]}
+
+    Raises:
+        ValueError: 項目名稱不存在
+    """
+    cases = {case.name: case for case in get_cases()}
+    for name, _ in plan:
+        if name not in cases:
+            raise ValueError(f"沒有名為 {name!r} 的基準測試項目")
+    results = []
+    # 參考工作量在每個項目前與全部結束後各量測一次，取中位數作為整次執行的機器速度
+    references = []
+    for name, size in plan:
+        references.append(measure_reference(3))
+        record = run_case(cases[name], size, warmup=warmup, repeat=repeat, min_time=min_time)
+        results.append(record)
+        print(
+            f"[基準] {name:<26} n={size:<6} 中位數 {record['median_us']:>12.2f} µs"
+            f"（p95 {record['p95_us']:.2f}，±{record['rsd_pct']:.1f}%）",
+            file=sys.stderr,
+        )
+    references.append(measure_reference(3))
+    from PyQt6.QtCore import QT_VERSION_STR
+    return {
+        "meta": {
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "warmup": warmup,
+            "repeat": repeat,
+            "reference_us": round(statistics.median(references), 3),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def run_benchmarks(
+    keyword: Optional[str] = None,
+    sizes: Optional[List[int]] = None,
+    warmup: int = 3,
+    repeat: int = 15,
+    min_time: float = 0.02,
+) -> Dict[str, Any]:
+    """
+    執行符合條件的項目
+
+    Args:
+        keyword: 名稱或分組篩選（逗號分隔）
+        sizes: 覆寫各項目預設的實體數量
+        warmup: 暖身呼叫次數
+        repeat: 樣本數
+        min_time: 無 reset 的項目每輪至少執行的秒數
+
+    Returns:
+        {"meta": 環境資訊, "results": [結果記錄...]}
+    """
+    cases = get_cases(keyword)
+    if not cases:
+        raise ValueError(f"沒有符合 {keyword!r} 的基準測試項目")
+    plan = [(case.name, size) for case in cases for size in (sizes or case.sizes)]
+    return run_plan(plan, warmup, repeat, min_time)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='模擬與繪製熱點的微基準測試（離屏執行）')
+    parser.add_argument('-k', '--keyword', type=str, default=None,
+                       help='只執行名稱包含此字串或屬於此分組的項目，逗號分隔（如 simulation、paint_event）')
+    parser.add_argument('-n', '--sizes', type=str, default=None,
+                       help='覆寫實體數量，逗號分隔（預設使用各項目的設定）')
+    parser.add_argument('-w', '--warmup', type=int, default=3,
+                       help='暖身呼叫次數（預設: 3）')
+    parser.add_argument('-r', '--repeat', type=int, default=15,
+                       help='每個項目的樣本數（預設: 15）')
+    parser.add_argument('--min-time', type=float, default=0.02,
+                       help='可重複呼叫的項目每個樣本至少執行的秒數（預設: 0.02）')
+    parser.add_argument('-l', '--list', action='store_true',
+                       help='列出所有項目後結束')
+    parser.add_argument('-o', '--output', type=str, default=None,
+                       help='結果 JSON 輸出路徑（未指定時輸出到標準輸出）')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for case in get_cases(args.keyword):
+            print(f"{case.name:<26} {case.group:<11} {','.join(map(str, case.sizes)):<14} {case.description}")
+        return 0
+
+    sizes = [int(n) for n in args.sizes.split(',') if n.strip()] if args.sizes else None
+    try:
+        report = run_benchmarks(args.keyword, sizes, args.warmup, args.repeat, args.min_time)
+    except ValueError as e:
+        print(f"錯誤: {e}", file=sys.stderr)
+        return 1
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding='utf-8')
+        print(f"完成！結果已寫入 {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
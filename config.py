@@ -558,3 +558,105 @@ TOOL_CONFIG = {
 
 
 
+
+# ---------------------------------------------------------------------------
+# 素材載入（背景解碼執行緒與優先序）
+# ---------------------------------------------------------------------------
+# 背景解碼執行緒數（QImageReader 於執行緒池解碼為 QImage，GUI 執行緒再轉 QPixmap）
+ASSET_LOADER_MAX_THREADS = 2
+# 動畫幀尚未載入完成時，魚以半透明佔位圖顯示的原始尺寸（寬, 高，像素；實際會乘上魚的 scale）
+ASSET_PLACEHOLDER_SIZE = (48, 32)
+# 佔位圖顏色 (R, G, B, A)
+ASSET_PLACEHOLDER_COLOR = (200, 220, 255, 90)
+# 素材封裝檔（由 tools/pack_assets.py 產生，與 resource 目錄同層）；存在時優先以 mmap 讀取，否則使用 resource 目錄
+ASSET_ARCHIVE_FILENAME = "resource.pack"
+ASSET_ARCHIVE_ENABLED = True  # 設為 False 可強制使用 resource 目錄（開發時修改素材用）
+# 已解碼動畫的記憶體預算（MB）；超過時依 LRU 釋放沒有魚使用的動畫（0 表示不限制）
+ASSET_MEMORY_BUDGET_MB = 256
+# 升級動畫預載：成長度達到升級閾值的此比例時，於背景預先解碼下一階段動畫（升級當下不做 I/O）
+ASSET_PRELOAD_UPGRADE_FRACTION = 0.8
+ASSET_PRELOAD_CHECK_INTERVAL_SEC = 1.0  # 檢查間隔（秒）
+# 透明邊界裁切：載入動畫時逐幀裁切為不透明區域並記錄中心偏移（繪製像素更少、碰撞框更貼合）
+ASSET_TRIM_TRANSPARENT = True
+ASSET_TRIM_ALPHA_THRESHOLD = 1  # Alpha 閾值（與 tools/alpha_dfs_crop 預設一致）
+ASSET_TRIM_PADDING = 1  # 裁切邊距（像素），避免平滑縮放時邊緣被截斷
+
+# ---------------------------------------------------------------------------
+# 自動儲存
+# ---------------------------------------------------------------------------
+# 合併視窗（秒）：視窗內的多次自動儲存請求只寫檔一次；<= 0 表示每次請求立即寫檔
+AUTOSAVE_COALESCE_WINDOW_SEC = 2.0
+
+# ---------------------------------------------------------------------------
+# 存檔日誌
+# ---------------------------------------------------------------------------
+SAVE_JOURNAL_COMPACT_ENTRIES = 200  # 日誌筆數超過時壓縮為完整快照
+SAVE_JOURNAL_COMPACT_BYTES = 256 * 1024  # 日誌大小（位元組）超過時壓縮為完整快照
+SAVE_JOURNAL_FSYNC = True  # 附加日誌後 fsync（單行附加，成本遠低於重寫整個存檔）
+# 快照格式："json"（save.json，便於除錯）或 "binary"（save.bin，struct 記錄 + 字串表 + 壓縮，大型水族箱檔案小、解析快）
+# 二進位格式與 JSON 可無損互轉（tools/convert_save.py --check 驗證），預設仍為 JSON
+SAVE_FILE_FORMAT = "json"
+SAVE_BINARY_COMPRESSION = "zlib"  # 二進位存檔壓縮方式："zlib"、"lzma"、"none"
+SAVE_LOAD_BATCH_SIZE = 256  # 載入存檔時每批恢復的魚數量（二進位存檔邊解碼邊恢復）
+
+# ---------------------------------------------------------------------------
+# 效能分析
+# ---------------------------------------------------------------------------
+# 遊戲迴圈分段計時（tick_profiler）：每幀各階段耗時記入固定大小直方圖，成本約每階段一次 perf_counter
+TICK_PROFILER_ENABLED = True
+TICK_BUDGET_MS = 1000.0 / 60.0  # 每幀預算（毫秒），整幀超過時計入 over_budget
+TICK_PROFILER_DUMP_SHORTCUT = "Ctrl+Shift+T"  # 將分段計時結果寫入存檔目錄的快捷鍵
+TICK_PROFILER_DUMP_FILENAME = "tick_profile.json"  # 輸出檔名（位於存檔目錄）
+# 遊戲迴圈驅動方式（frame_pacing）：幀間隔與重繪間隔的抖動與幀計時一起記錄（環境變數 AQUARIUM_FRAME_DRIVER 可覆寫）
+# "coarse"：預設計時器（間隔誤差可達約 5%）；"precise"：精確計時器；"vsync"：跟隨顯示更新，以固定 1/60 秒步長推進模擬
+FRAME_DRIVER = "coarse"
+FRAME_INTERVAL_MS = 16  # 計時器模式的間隔（毫秒）
+FRAME_MAX_CATCH_UP = 4  # vsync 模式單次顯示更新最多補執行的幀數
+# 執行中剖析（session_profiler）：快捷鍵開始/停止，停止時將結果寫入存檔目錄（環境變數 AQUARIUM_PROFILE=模式 可在啟動時直接開始）
+PROFILE_CAPTURE_SHORTCUT = "Ctrl+Shift+P"
+PROFILE_CAPTURE_MODE = "sampling"  # "sampling"（取樣呼叫堆疊，輸出 .collapsed）或 "cprofile"（輸出 .pstats，成本較高）
+PROFILE_SAMPLE_INTERVAL_MS = 5.0  # sampling 模式的取樣間隔（毫秒）
+PROFILE_CAPTURE_PREFIX = "profile"  # 輸出檔名前綴（檔名另含開始時間與模式）
+# 記憶體成長追蹤（memory_tracker）：定期取 tracemalloc 快照與各類別存活實例數，持續成長時警告（環境變數 AQUARIUM_MEMTRACK=1 可直接開啟）
+MEMORY_TRACKER_ENABLED = False  # tracemalloc 會使 Python 配置變慢，只在診斷時開啟
+MEMORY_TRACKER_INTERVAL_SEC = 60.0  # 檢查間隔（秒）
+MEMORY_TRACKER_TOP_N = 10  # 每次記錄成長最多的配置位置數
+MEMORY_TRACKER_TRACEBACK_FRAMES = 1  # tracemalloc 記錄的堆疊層數
+MEMORY_GROWTH_CHECKS = 5  # 連續成長多少次檢查才警告
+MEMORY_GROWTH_MIN = 100  # 警告前累計至少成長的數量（過濾小幅波動）
+MEMORY_TRACKER_FILENAME = "memory_track.jsonl"  # 輸出檔名（位於存檔目錄）
+
+# ---------------------------------------------------------------------------
+# 日誌
+# ---------------------------------------------------------------------------
+# 主控台輸出等級："DEBUG"、"INFO"、"WARNING"、"ERROR"；預設只顯示警告（環境變數 AQUARIUM_LOG_LEVEL 可覆寫）
+LOG_LEVEL = "WARNING"
+# 個別分類的等級（分類即訊息開頭 [] 內的文字），例如 {"升級檢查": "DEBUG"}
+LOG_CATEGORY_LEVELS = {}
+# 主控台限流：每個分類每秒最多輸出筆數與瞬間可累積筆數（WARNING 以上不限流；<= 0 表示不限流）
+LOG_RATE_LIMIT_PER_SEC = 5.0
+LOG_RATE_LIMIT_BURST = 20
+# 環形緩衝：保留最近的記錄（不限流），程式當機時寫入存檔目錄
+LOG_RING_BUFFER_SIZE = 2000
+LOG_RING_BUFFER_LEVEL = "INFO"
+LOG_CRASH_DUMP_FILENAME = "crash_log.txt"
+
+# ---------------------------------------------------------------------------
+# 執行指標
+# ---------------------------------------------------------------------------
+# 長時間測試用的本機指標輸出（metrics）：FPS、各階段幀耗時、實體數量、記憶體、素材快取命中率、自動儲存次數、每分鐘收入
+# 未啟用時也可以環境變數 AQUARIUM_METRICS=jsonl 或 AQUARIUM_METRICS=prometheus 開啟
+METRICS_ENABLED = False
+METRICS_EXPORT_FORMAT = "jsonl"  # "jsonl"（每次附加一行 JSON）或 "prometheus"（textfile collector 格式，每次整檔取代）
+METRICS_EXPORT_INTERVAL_SEC = 10.0  # 輸出間隔（秒）
+METRICS_JSONL_FILENAME = "metrics.jsonl"  # 輸出檔名（位於存檔目錄）
+METRICS_PROMETHEUS_FILENAME = "aquarium.prom"
+
+# ---------------------------------------------------------------------------
+# 決定性重播
+# ---------------------------------------------------------------------------
+# 模擬亂數種子（sim_random）：None 表示每次啟動隨機產生（實際種子仍記錄在世界快照與錄製檔中）
+SIM_RANDOM_SEED = None
+# 輸入錄製（input_record）：快捷鍵開始/停止錄製到存檔目錄；環境變數 AQUARIUM_RECORD=檔案路徑 可在啟動時直接錄製
+INPUT_RECORD_SHORTCUT = "Ctrl+Shift+R"
+INPUT_RECORD_FILENAME = "input_record.jsonl"  # 輸出檔名（位於存檔目錄）
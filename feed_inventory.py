@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+飼料庫存模組
+
+集中管理已解鎖的飼料、各飼料數量、累計投餵便宜飼料次數與數量計數器的計時，
+內容變更時發出 changed 信號，由控制面板的切換飼料選單、投食機與商店訂閱，不需每幀同步。
+
+數量計數器（已解鎖且有 counter_interval_sec 的飼料每隔一段遊戲時間 +1）預先算出下一次到期的遊戲時間，
+每幀只比較一次時間，到期時才逐一檢查。
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from config import get_feed_counter_interval_sec
+
+CHEAP_FEED = "便宜飼料"
+
+
+class FeedInventory(QObject):
+    """飼料庫存（unlocked、counters、cheap_count、last_add 供讀取，變更請用方法）"""
+
+    # 信號：已解鎖飼料、數量或便宜飼料投餵次數變更時發出
+    changed = pyqtSignal()
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.cheap_count = 0
+        self.counters: Dict[str, int] = {}
+        self.unlocked: List[str] = [CHEAP_FEED]
+        # 各飼料數量計數器上次 +1 的遊戲時間
+        self.last_add: Dict[str, float] = {}
+        self._next_due = math.inf
+
+    def count(self, feed_name: str) -> int:
+        return self.counters.get(feed_name, 0)
+
+    def is_unlocked(self, feed_name: str) -> bool:
+        return feed_name in self.unlocked
+
+    def is_available(self, feed_name: str) -> bool:
+        """是否可投放（已解鎖，且為便宜飼料或數量大於 0；便宜飼料的金錢在投放時另外檢查）"""
+        return feed_name in self.unlocked and (feed_name == CHEAP_FEED or self.counters.get(feed_name, 0) > 0)
+
+    def record_cheap_feed(self) -> None:
+        """累計投餵便宜飼料一次"""
+        self.cheap_count += 1
+        self.changed.emit()
+
+    def add(self, feed_name: str, amount: int = 1) -> None:
+        """增加飼料數量（寶箱怪產物等）"""
+        self.counters[feed_name] = self.counters.get(feed_name, 0) + amount
+        self.changed.emit()
+
+    def consume(self, feed_name: str, amount: int = 1) -> None:
+        """扣除飼料數量（不低於 0）"""
+        self.counters[feed_name] = max(0, self.counters.get(feed_name, 0) - amount)
+        self.changed.emit()
+
+    def unlock(self, feed_name: str, game_time_sec: float, start_counter: bool = True) -> bool:
+        """
+        解鎖飼料
+
+        Args:
+            feed_name: 飼料名稱
+            game_time_sec: 目前遊戲時間（數量計數器從這時開始計時）
+            start_counter: 是否初始化數量與計時（寶箱怪產物沒有計時）
+
+        Returns:
+            是否為新解鎖
+        """
+        if feed_name in self.unlocked:
+            return False
+        self.unlocked.append(feed_name)
+        if start_counter:
+            self.counters.setdefault(feed_name, 0)
+            self.last_add.setdefault(feed_name, game_time_sec)
+        self._reschedule()
+        self.changed.emit()
+        return True
+
+    def load(self, state: Dict[str, Any], game_time_sec: float) -> None:
+        """
+        從存檔狀態載入（遊戲時間不會被保存，有計時的飼料從目前遊戲時間重新計時）
+
+        Args:
+            state: game_state.load() 的結果或世界快照中的 progress
+            game_time_sec: 目前遊戲時間
+        """
+        self.cheap_count = int(state.get("feed_cheap_count", 0))
+        self.counters = dict(state.get("feed_counters", {}))
+        self.unlocked = list(state.get("unlocked_feeds", [CHEAP_FEED]))
+        self.last_add = dict(state.get("feed_counter_last_add", {}))
+        for feed_name in self.unlocked:
+            if feed_name == CHEAP_FEED or get_feed_counter_interval_sec(feed_name) is None:
+                continue
+            self.counters.setdefault(feed_name, 0)
+            self.last_add[feed_name] = game_time_sec
+        self._reschedule()
+        self.changed.emit()
+
+    def restore_timers(self, last_add: Dict[str, float]) -> None:
+        """還原數量計數器的計時（世界快照記錄的遊戲時間）"""
+        self.last_add = dict(last_add)
+        self._reschedule()
+
+    def to_state(self) -> Dict[str, Any]:
+        """存檔用的狀態（複本）"""
+        return {
+            "feed_cheap_count": self.cheap_count,
+            "feed_counters": self.counters.copy(),
+            "unlocked_feeds": list(self.unlocked),
+            "feed_counter_last_add": self.last_add.copy(),
+        }
+
+    def _reschedule(self) -> None:
+        """重新計算下一次數量計數器到期的遊戲時間（尚未計時的飼料立即到期）"""
+        next_due = math.inf
+        for feed_name in self.unlocked:
+            if feed_name == CHEAP_FEED:
+                continue
+            interval = get_feed_counter_interval_sec(feed_name)
+            if interval is None:
+                continue
+            last = self.last_add.get(feed_name)
+            if last is None:
+                next_due = -math.inf
+                break
+            next_due = min(next_due, last + interval)
+        self._next_due = next_due
+
+    def advance(self, game_time_sec: float) -> List[str]:
+        """
+        推進數量計數器（每幀呼叫；未到期時只比較一次時間）
+
+        Args:
+            game_time_sec: 目前遊戲時間
+
+        Returns:
+            本次 +1 的飼料名稱
+        """
+        # 到期時間以加法算出，與逐一檢查的減法可能有捨入誤差，提前一點進入逐一檢查
+        if game_time_sec < self._next_due - 1e-9:
+            return []
+        added = []
+        for feed_name in self.unlocked:
+            if feed_name == CHEAP_FEED:
+                continue
+            interval = get_feed_counter_interval_sec(feed_name)
+            if interval is None:
+                continue
+            # 確保計時器已初始化
+            if feed_name not in self.last_add:
+                self.last_add[feed_name] = game_time_sec
+                continue
+            if game_time_sec - self.last_add[feed_name] >= interval:
+                self.counters[feed_name] = self.counters.get(feed_name, 0) + 1
+                self.last_add[feed_name] = game_time_sec
+                added.append(feed_name)
+        self._reschedule()
+        if added:
+            self.changed.emit()
+        return added
@@ -33,6 +33,12 @@ from config import (
     GUPPY_MONEY_CHASE_SPEED_MULTIPLIER,
     GUPPY_MONEY_COOLDOWN_SEC,
 )
+from asset_loader import get_asset_loader
+from sim_random import stream as sim_stream
+from memory_tracker import track_instance
+from game_log import get_logger
+
+_upgrade_log = get_logger("升級檢查")
 
 
 class Fish:
@@ -69,9 +75,11 @@ class Fish:
             species: 魚種名稱（如 "puppy"）
             stage: 成長階段（"small", "medium", "large"）
         """
+        track_instance(self)
         self.swim_frames = swim_frames
         self.turn_frames = turn_frames
-        self.eat_frames = eat_frames if eat_frames else []
+        # 注意：以 is not None 判斷，保留呼叫端傳入的列表物件（延遲載入時列表稍後才會被就地填入）
+        self.eat_frames = eat_frames if eat_frames is not None else []
         # 使用 QPointF 儲存位置，避免每幀小數位移被 int() 截斷導致魚不移動
         self.position = QPointF(float(position.x()), float(position.y()))
         self.speed = speed
@@ -89,13 +97,14 @@ class Fish:
         self.vertical_direction = self._quantize_direction(sin_val)     # -1=上, 0=靜止, 1=下
         
         # 確保至少有一個方向
+        rng = sim_stream("fish")
         if self.horizontal_direction == 0 and self.vertical_direction == 0:
-            self.horizontal_direction = random.choice([-1, 1])
+            self.horizontal_direction = rng.choice([-1, 1])
         
         # 頭部朝向：根據水平方向決定
         # 如果純垂直移動，隨機決定初始朝向
         if self.horizontal_direction == 0:
-            self.facing_left = random.choice([True, False])
+            self.facing_left = rng.choice([True, False])
         else:
             self.facing_left = self.horizontal_direction < 0
 
@@ -111,7 +120,7 @@ class Fish:
 
         # 方向變更計時器
         self.direction_timer = 0
-        self.direction_change_interval = random.randint(180, 400)
+        self.direction_change_interval = rng.randint(180, 400)
 
         self.boundary_margin = 50
         
@@ -132,6 +141,7 @@ class Fish:
         self.stage = stage  # 當前成長階段（"small", "medium", "large"）
         self.growth_points = 0  # 當前成長度
         self.on_upgrade_callback: Optional[Callable] = None  # 升級回調函數
+        self.on_death_callback: Optional[Callable[["Fish"], None]] = None  # 死亡回調函數（只在第一次死亡時呼叫）
 
         # 大便行為（各階段鬥魚定時排出金錢）
         poop_key = f"{stage}_{species}" if species else ""
@@ -141,7 +151,7 @@ class Fish:
             if isinstance(interval_range, tuple) and len(interval_range) == 2:
                 min_interval, max_interval = interval_range
                 # 隨機選擇一個間隔時間，避免同時大便造成卡頓
-                self.poop_interval_sec = random.uniform(float(min_interval), float(max_interval))
+                self.poop_interval_sec = rng.uniform(float(min_interval), float(max_interval))
             else:
                 # 向後兼容：單一數值
                 self.poop_interval_sec = float(interval_range)
@@ -157,6 +167,9 @@ class Fish:
         self.last_eat_betta_time: Optional[float] = None  # 上次吃幼鬥魚的時間（秒）
         self.next_poop_at: Optional[float] = None  # 下次大便魚翅的時間（秒）
 
+        # 存檔識別碼：存檔日誌以此辨識同一隻魚（升級時沿用舊魚的識別碼）
+        self.uid: str = new_fish_uid()
+
         # 死亡／移除效果：第一幀反轉 xy、灰階，往上緩慢移動並逐漸消失
         self.is_dead = False
         self.death_timer = 0.0  # 秒
@@ -313,7 +326,7 @@ class Fish:
                     # 每次大便後重新隨機選擇間隔時間，避免同時大便造成卡頓
                     if isinstance(interval_range, tuple) and len(interval_range) == 2:
                         min_interval, max_interval = interval_range
-                        self.poop_interval_sec = random.uniform(float(min_interval), float(max_interval))
+                        self.poop_interval_sec = sim_stream("fish").uniform(float(min_interval), float(max_interval))
                 self.poop_timer = 0.0
 
     def _update_swim_state(self) -> None:
@@ -338,12 +351,16 @@ class Fish:
         if self.direction_timer >= self.direction_change_interval:
             self._random_direction_change()
             self.direction_timer = 0
-            self.direction_change_interval = random.randint(180, 400)
+            self.direction_change_interval = sim_stream("fish").randint(180, 400)
+
+    def _turn_animation(self) -> List[QPixmap]:
+        """轉向時播放的幀（沒有轉向素材時用游泳幀代替；背景載入的幀列表可能在建立魚之後才填入，因此每次取用時判斷）"""
+        return self.turn_frames or self.swim_frames
 
     def _update_turning_state(self) -> None:
         """更新轉向狀態"""
         self.turn_progress += 0.15
-        if self.turn_progress >= len(self.turn_frames):
+        if self.turn_progress >= len(self._turn_animation()):
             # 轉向完成
             self.state = "swim"
             self.facing_left = self.turning_to_left
@@ -400,6 +417,8 @@ class Fish:
 
     def set_dead(self) -> None:
         """標記為死亡／移除，並建立死亡用幀（第一幀反轉 xy、灰階）。"""
+        if not self.is_dead and self.on_death_callback:
+            self.on_death_callback(self)
         self.is_dead = True
         self.death_timer = 0.0
         self.death_opacity = 1.0
@@ -633,8 +652,8 @@ class Fish:
 
     def _start_turning(self, turn_to_left: bool) -> None:
         """開始轉向動畫"""
-        if not self.turn_frames:
-            # 沒有轉向素材，直接改變朝向
+        if not self._turn_animation():
+            # 沒有轉向與游泳素材（幀尚未載入），直接改變朝向
             self.facing_left = turn_to_left
             return
         
@@ -646,47 +665,57 @@ class Fish:
         """隨機改變移動方向"""
         # 隨機選擇新的水平和垂直方向
         # 有較高機率保持當前方向
+        rng = sim_stream("fish")
         
         # 水平方向變更
-        if random.random() < 0.6:  # 60% 機率改變
-            new_h = random.choice([-1, 0, 1])
+        if rng.random() < 0.6:  # 60% 機率改變
+            new_h = rng.choice([-1, 0, 1])
             # 避免兩個方向都是靜止
             if new_h == 0 and self.vertical_direction == 0:
-                new_h = random.choice([-1, 1])
+                new_h = rng.choice([-1, 1])
             self._change_horizontal_direction(new_h)
         
         # 垂直方向變更
-        if random.random() < 0.5:  # 50% 機率改變
-            self.vertical_direction = random.choice([-1, 0, 1])
+        if rng.random() < 0.5:  # 50% 機率改變
+            self.vertical_direction = rng.choice([-1, 0, 1])
         
         # 確保至少有一個方向在移動
         if self.horizontal_direction == 0 and self.vertical_direction == 0:
-            if random.random() < 0.5:
+            if rng.random() < 0.5:
                 # 注意：不要先設定 horizontal_direction 再呼叫 _change_horizontal_direction
-                new_h = random.choice([-1, 1])
+                new_h = rng.choice([-1, 1])
                 self._change_horizontal_direction(new_h)
             else:
-                self.vertical_direction = random.choice([-1, 1])
+                self.vertical_direction = rng.choice([-1, 1])
+
+    def _current_frames_and_index(self) -> Tuple[Optional[List[QPixmap]], int]:
+        """當前狀態使用的幀列表與幀索引（不含死亡幀）；無幀時回傳 (None, 0)。"""
+        if self.state == "eating" and self.eat_frames:
+            return self.eat_frames, min(int(self.eat_progress), len(self.eat_frames) - 1)
+        turn_frames = self._turn_animation() if self.state == "turning" else None
+        if turn_frames:
+            return turn_frames, min(int(self.turn_progress), len(turn_frames) - 1)
+        if self.swim_frames:
+            return self.swim_frames, int(self.animation_timer) % len(self.swim_frames)
+        return None, 0
 
     def _get_current_frame_raw(self) -> Optional[QPixmap]:
         """取得當前要畫的幀（不考慮鏡像）。"""
         if self.is_dead and self._death_frame is not None:
             return self._death_frame
-        if self.state == "eating" and self.eat_frames:
-            idx = min(int(self.eat_progress), len(self.eat_frames) - 1)
-            return self.eat_frames[idx]
-        if self.state == "turning" and self.turn_frames:
-            idx = min(int(self.turn_progress), len(self.turn_frames) - 1)
-            return self.turn_frames[idx]
-        if self.swim_frames:
-            idx = int(self.animation_timer) % len(self.swim_frames)
-            return self.swim_frames[idx]
-        return None
+        frames, idx = self._current_frames_and_index()
+        if frames is None:
+            return None
+        return frames[idx]
 
     def get_current_frame(self) -> Optional[QPixmap]:
         """給繪製用的當前幀。"""
         return self._get_current_frame_raw()
 
+    def is_loading(self) -> bool:
+        """動畫幀是否仍在背景載入中（此時由水族箱繪製佔位圖）。"""
+        return not self.swim_frames and not self.is_dead
+
     def get_should_mirror(self) -> bool:
         """
         當前幀是否要水平鏡像。
@@ -708,14 +737,37 @@ class Fish:
             return self.turning_to_left
         return False
 
+    def _get_current_frame_offset(self) -> Tuple[float, float]:
+        """
+        當前幀的裁切偏移（幀中心相對原圖中心，已依鏡像調整，單位為原圖像素）。
+        
+        幀列表由素材載入器裁切透明邊界時可查詢各幀偏移；一般列表視為無偏移。
+        死亡幀為游泳第一幀反轉 xy，偏移兩軸皆取負。
+        """
+        if self.is_dead and self._death_frame is not None:
+            dx, dy = self._frame_offset(self.swim_frames, 0)
+            return -dx, -dy
+        frames, idx = self._current_frames_and_index()
+        dx, dy = self._frame_offset(frames, idx)
+        if self.get_should_mirror():
+            dx = -dx
+        return dx, dy
+
+    @staticmethod
+    def _frame_offset(frames: Optional[List[QPixmap]], idx: int) -> Tuple[float, float]:
+        offset_at = getattr(frames, "offset_at", None)
+        return offset_at(idx) if offset_at else (0.0, 0.0)
+
     def get_display_rect(self) -> Optional[QRect]:
-        """取得繪製矩形（已含縮放）。"""
+        """取得繪製矩形（已含縮放；素材已裁切透明邊界時為緊貼魚身的矩形，繪製與碰撞共用）。"""
         frame = self._get_current_frame_raw()
         if not frame:
             return None
         w = int(frame.width() * self.scale)
         h = int(frame.height() * self.scale)
-        cx, cy = int(self.position.x()), int(self.position.y())
+        dx, dy = self._get_current_frame_offset()
+        cx = int(self.position.x() + dx * self.scale)
+        cy = int(self.position.y() + dy * self.scale)
         return QRect(
             cx - w // 2,
             cy - h // 2,
@@ -763,22 +815,22 @@ class Fish:
     def _check_upgrade(self) -> None:
         """檢查是否需要升級，如果需要則觸發升級回調"""
         if not self.species:
-            print(f"[升級檢查] 魚沒有設置 species，跳過升級檢查")
+            _upgrade_log.debug("魚沒有設置 species，跳過升級檢查")
             return
         
         if not self.on_upgrade_callback:
-            print(f"[升級檢查] 魚種 {self.species} 階段 {self.stage} 沒有設置升級回調函數，跳過升級檢查")
+            _upgrade_log.debug("魚種 %s 階段 %s 沒有設置升級回調函數，跳過升級檢查", self.species, self.stage)
             return
         
         # 獲取該魚種的升級閾值
         thresholds = FISH_UPGRADE_THRESHOLDS.get(self.species)
         if not thresholds:
-            print(f"[升級檢查] 魚種 {self.species} 沒有配置升級閾值")
+            _upgrade_log.debug("魚種 %s 沒有配置升級閾值", self.species)
             return
         
         # 檢查當前階段是否需要升級
         current_threshold = thresholds.get(self.stage)
-        print(f"[升級檢查] 魚種: {self.species}, 階段: {self.stage}, 成長度: {self.growth_points}, 閾值: {current_threshold}")
+        _upgrade_log.debug("魚種: %s, 階段: %s, 成長度: %s, 閾值: %s", self.species, self.stage, self.growth_points, current_threshold)
         
         if current_threshold and self.growth_points >= current_threshold:
             # 找到下一個階段
@@ -786,20 +838,20 @@ class Fish:
                 current_index = GROWTH_STAGES.index(self.stage)
                 if current_index < len(GROWTH_STAGES) - 1:
                     next_stage = GROWTH_STAGES[current_index + 1]
-                    print(f"[升級檢查] 觸發升級: {self.species} {self.stage} -> {next_stage}")
+                    _upgrade_log.info("觸發升級: %s %s -> %s", self.species, self.stage, next_stage)
                     # 觸發升級回調
                     self.on_upgrade_callback(self, next_stage)
                 else:
-                    print(f"[升級檢查] 已經是最高階段，無法升級")
+                    _upgrade_log.debug("已經是最高階段，無法升級")
             except ValueError:
                 # 當前階段不在 GROWTH_STAGES 中，不處理
-                print(f"[升級檢查] 階段 {self.stage} 不在 GROWTH_STAGES 中")
+                _upgrade_log.debug("階段 %s 不在 GROWTH_STAGES 中", self.stage)
                 pass
         else:
             if current_threshold:
-                print(f"[升級檢查] 成長度 {self.growth_points} < 閾值 {current_threshold}，尚未達到升級條件")
+                _upgrade_log.debug("成長度 %s < 閾值 %s，尚未達到升級條件", self.growth_points, current_threshold)
             else:
-                print(f"[升級檢查] 階段 {self.stage} 沒有配置升級閾值")
+                _upgrade_log.debug("階段 %s 沒有配置升級閾值", self.stage)
     
     def set_upgrade_callback(self, callback: Callable) -> None:
         """設置升級回調函數"""
@@ -808,7 +860,37 @@ class Fish:
     def set_poop_callback(self, callback: Callable[[str, QPointF], None]) -> None:
         """設置大便回調函數（各階段鬥魚定時排出金錢時呼叫，參數：money_type, position）"""
         self.on_poop_callback = callback
+
+    def set_death_callback(self, callback: Callable[["Fish"], None]) -> None:
+        """設置死亡回調函數（set_dead 第一次呼叫時呼叫，參數：魚本身；用於更新魚種數量統計）"""
+        self.on_death_callback = callback
     
+    def snapshot(self) -> Tuple[Any, ...]:
+        """
+        取得存檔用的不可變快照（僅複製基本型別，成本極低，可在 GUI 執行緒大量呼叫）
+        
+        快照可交給背景執行緒以 fish_snapshot_to_dict 轉為存檔字典。
+        
+        Returns:
+            (species, stage, growth_points, x, y, horizontal_direction, vertical_direction,
+             facing_left, speed, scale, last_eat_betta_time, next_poop_at, uid)
+        """
+        return (
+            self.species,
+            self.stage,
+            self.growth_points,
+            float(self.position.x()),
+            float(self.position.y()),
+            self.horizontal_direction,
+            self.vertical_direction,
+            self.facing_left,
+            self.speed,
+            self.scale,
+            self.last_eat_betta_time,
+            self.next_poop_at,
+            self.uid,
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         """
         將 Fish 實例轉換為字典（用於儲存）
@@ -816,54 +898,7 @@ class Fish:
         Returns:
             包含魚類狀態的字典
         """
-        # 從水平和垂直方向計算角度（度數）
-        # horizontal_direction: -1=左, 0=靜止, 1=右
-        # vertical_direction: -1=上, 0=靜止, 1=下
-        # 角度定義：0°=右, 90°=下, 180°=左, 270°=上
-        if self.horizontal_direction == 0 and self.vertical_direction == 0:
-            # 如果沒有方向，使用 facing_left 決定
-            direction = 180.0 if self.facing_left else 0.0
-        else:
-            # 計算角度
-            if self.horizontal_direction == 0:
-                # 純垂直移動
-                direction = 90.0 if self.vertical_direction > 0 else 270.0
-            elif self.vertical_direction == 0:
-                # 純水平移動
-                direction = 180.0 if self.horizontal_direction < 0 else 0.0
-            else:
-                # 對角移動
-                dx = self.horizontal_direction
-                dy = self.vertical_direction
-                # atan2(y, x) 計算角度，但需要轉換為我們的座標系統
-                # 我們的座標：X 向右為正，Y 向下為正
-                # atan2 的座標：X 向右為正，Y 向上為正
-                # 所以需要將 dy 取負
-                angle_rad = math.atan2(-dy, dx)
-                direction = math.degrees(angle_rad)
-                # 確保角度在 0-360 範圍內
-                if direction < 0:
-                    direction += 360.0
-        
-        d = {
-            "species": self.species,
-            "stage": self.stage,
-            "growth_points": self.growth_points,
-            "position": {
-                "x": float(self.position.x()),
-                "y": float(self.position.y()),
-            },
-            "direction": direction,
-            "facing_left": self.facing_left,
-            "speed": self.speed,
-            "scale": self.scale,
-        }
-        if self.species == "鯊魚":
-            if self.last_eat_betta_time is not None:
-                d["last_eat_betta_time"] = self.last_eat_betta_time
-            if self.next_poop_at is not None:
-                d["next_poop_at"] = self.next_poop_at
-        return d
+        return fish_snapshot_to_dict(self.snapshot())
     
     @classmethod
     def from_dict(
@@ -912,6 +947,10 @@ class Fish:
         
         # 恢復成長度
         fish.growth_points = growth_points
+
+        # 恢復存檔識別碼（舊存檔沒有時沿用新產生的）
+        if fish_dict.get("id"):
+            fish.uid = str(fish_dict["id"])
         
         # 恢復 facing_left（因為 __init__ 可能會根據 direction 重新計算）
         if "facing_left" in fish_dict:
@@ -925,23 +964,82 @@ class Fish:
         return fish
 
 
-def load_fish_animation(fish_dir: Path, behavior: str = "5_吃飽游泳") -> List[QPixmap]:
-    """載入單一行為的動畫幀。"""
-    behavior_dir = fish_dir / behavior
-    if not behavior_dir.exists():
-        behavior_dirs = [d for d in fish_dir.iterdir() if d.is_dir()]
-        if behavior_dirs:
-            behavior_dir = behavior_dirs[0]
+# 存檔識別碼專用的亂數產生器（以系統亂數播種一次；uuid4 每次呼叫 os.urandom，大量建立魚時過慢，
+# 且不受遊戲亂數種子影響）
+_uid_rng = random.Random()
+
+
+def new_fish_uid() -> str:
+    """產生魚的存檔識別碼（12 位十六進位隨機字串）。"""
+    return f"{_uid_rng.getrandbits(48):012x}"
+
+
+def fish_snapshot_to_dict(snap: Tuple[Any, ...]) -> Dict[str, Any]:
+    """
+    將 Fish.snapshot() 的快照轉換為存檔字典（不存取 Fish 物件，可在背景執行緒呼叫）
+    
+    Args:
+        snap: Fish.snapshot() 回傳的快照
+        
+    Returns:
+        包含魚類狀態的字典
+    """
+    (species, stage, growth_points, x, y, horizontal_direction, vertical_direction,
+     facing_left, speed, scale, last_eat_betta_time, next_poop_at, uid) = snap
+    # 從水平和垂直方向計算角度（度數）
+    # horizontal_direction: -1=左, 0=靜止, 1=右
+    # vertical_direction: -1=上, 0=靜止, 1=下
+    # 角度定義：0°=右, 90°=下, 180°=左, 270°=上
+    if horizontal_direction == 0 and vertical_direction == 0:
+        # 如果沒有方向，使用 facing_left 決定
+        direction = 180.0 if facing_left else 0.0
+    else:
+        # 計算角度
+        if horizontal_direction == 0:
+            # 純垂直移動
+            direction = 90.0 if vertical_direction > 0 else 270.0
+        elif vertical_direction == 0:
+            # 純水平移動
+            direction = 180.0 if horizontal_direction < 0 else 0.0
         else:
-            return []
+            # 對角移動
+            dx = horizontal_direction
+            dy = vertical_direction
+            # atan2(y, x) 計算角度，但需要轉換為我們的座標系統
+            # 我們的座標：X 向右為正，Y 向下為正
+            # atan2 的座標：X 向右為正，Y 向上為正
+            # 所以需要將 dy 取負
+            angle_rad = math.atan2(-dy, dx)
+            direction = math.degrees(angle_rad)
+            # 確保角度在 0-360 範圍內
+            if direction < 0:
+                direction += 360.0
+    
+    d = {
+        "id": uid,
+        "species": species,
+        "stage": stage,
+        "growth_points": growth_points,
+        "position": {
+            "x": x,
+            "y": y,
+        },
+        "direction": direction,
+        "facing_left": facing_left,
+        "speed": speed,
+        "scale": scale,
+    }
+    if species == "鯊魚":
+        if last_eat_betta_time is not None:
+            d["last_eat_betta_time"] = last_eat_betta_time
+        if next_poop_at is not None:
+            d["next_poop_at"] = next_poop_at
+    return d
 
-    frame_files = sorted(behavior_dir.glob("*.png"))
-    frames = []
-    for frame_file in frame_files:
-        pixmap = QPixmap(str(frame_file))
-        if not pixmap.isNull():
-            frames.append(pixmap)
-    return frames
+
+def load_fish_animation(fish_dir: Path, behavior: str = "5_吃飽游泳") -> List[QPixmap]:
+    """載入單一行為的動畫幀（經由素材載入器快取，同一組動畫只解碼一次）。"""
+    return get_asset_loader().load_animation(fish_dir, behavior).frames.copy()
 
 
 def load_swim_and_turn(
@@ -953,5 +1051,5 @@ def load_swim_and_turn(
     swim = load_fish_animation(fish_dir, swim_behavior)
     turn = load_fish_animation(fish_dir, turn_behavior)
     if not turn and swim:
-        turn = swim[:]  # 沒有轉向素材時用游泳代替
+        turn = swim.copy()  # 沒有轉向素材時用游泳代替
     return swim, turn
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+幀節奏模組
+
+量測遊戲迴圈實際的幀間隔（不是每幀耗時，而是相鄰兩幀開始的時間差）與重繪間隔，
+並提供三種驅動遊戲迴圈的方式：
+- "coarse"：QTimer 預設的 CoarseTimer，每次逾時執行一幀（間隔誤差可達約 5%，原本的行為）
+- "precise"：QTimer 的 PreciseTimer，每次逾時執行一幀（間隔以毫秒精度維持）
+- "vsync"：以 QWindow.requestUpdate 驅動，每次顯示更新時依實際經過時間以固定 1/60 秒步長執行 0~N 幀
+  （累加器），模擬速度不受顯示更新率影響，重繪與顯示更新對齊。macOS 與 Wayland 的顯示更新與垂直同步一致；
+  其他平台 Qt 以約 5 ms 的閒置計時器模擬，仍以固定步長推進模擬，只在有執行幀的那次更新重繪
+
+IntervalTracker 以 LatencyHistogram 記錄間隔與「相對目標間隔的偏差」（抖動），
+另外統計明顯延遲（超過目標 1.5 倍，通常代表掉幀）的次數。
+"""
+
+import time
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtCore import QEvent, QObject, Qt, QTimer
+from PyQt6.QtWidgets import QWidget
+
+from tick_profiler import LatencyHistogram
+
+FRAME_DRIVERS = ("coarse", "precise", "vsync")
+
+# 超過目標間隔多少倍視為延遲（掉幀）
+LATE_FACTOR = 1.5
+
+
+class IntervalTracker:
+    """記錄相鄰事件的間隔與相對目標間隔的抖動"""
+
+    __slots__ = ("target_ms", "enabled", "intervals", "jitter", "late", "_last", "_sum_ms", "_sum_sq_ms")
+
+    def __init__(self, target_ms: float, enabled: bool = True):
+        """
+        Args:
+            target_ms: 目標間隔（毫秒）
+            enabled: 是否啟用；停用時 mark 直接返回
+        """
+        self.target_ms = float(target_ms)
+        self.enabled = enabled
+        self.intervals = LatencyHistogram(min_us=50.0)
+        self.jitter = LatencyHistogram(min_us=10.0)
+        self.late = 0
+        self._last: Optional[float] = None
+        self._sum_ms = 0.0
+        self._sum_sq_ms = 0.0
+
+    def mark(self, now: Optional[float] = None) -> None:
+        """記錄一次事件（第一次只記下時間）"""
+        if not self.enabled:
+            return
+        if now is None:
+            now = time.perf_counter()
+        last, self._last = self._last, now
+        if last is None:
+            return
+        interval = now - last
+        interval_ms = interval * 1000.0
+        self.intervals.record(interval)
+        self.jitter.record(abs(interval_ms - self.target_ms) / 1000.0)
+        self._sum_ms += interval_ms
+        self._sum_sq_ms += interval_ms * interval_ms
+        if interval_ms > self.target_ms * LATE_FACTOR:
+            self.late += 1
+
+    def restart(self) -> None:
+        """下一次 mark 重新開始計算間隔（保留已記錄的統計；暫停驅動後呼叫，避免把暫停時間算成一個間隔）"""
+        self._last = None
+
+    def reset(self) -> None:
+        """清除所有記錄"""
+        self.intervals.reset()
+        self.jitter.reset()
+        self.late = 0
+        self._last = None
+        self._sum_ms = 0.0
+        self._sum_sq_ms = 0.0
+
+    def take_window(self) -> Dict[str, object]:
+        """
+        取出自上次呼叫以來的區間統計（供定期輸出指標；不影響 summary 的累計結果）
+
+        Returns:
+            {"count", "interval": 間隔統計, "jitter": |間隔 - 目標| 統計}
+        """
+        intervals = self.intervals.take_window()
+        return {
+            "count": intervals.count,
+            "interval": intervals.summary(),
+            "jitter": self.jitter.take_window().summary(),
+        }
+
+    def summary(self) -> Dict[str, object]:
+        """
+        Returns:
+            {"count", "target_ms", "stddev_ms", "late", "interval": 間隔統計, "jitter": |間隔 - 目標| 統計}；
+            統計格式見 LatencyHistogram.summary
+        """
+        n = self.intervals.count
+        stddev = 0.0
+        if n > 1:
+            mean = self._sum_ms / n
+            stddev = max(0.0, self._sum_sq_ms / n - mean * mean) ** 0.5
+        return {
+            "count": n,
+            "target_ms": round(self.target_ms, 4),
+            "stddev_ms": round(stddev, 4),
+            "late": self.late,
+            "interval": self.intervals.summary(),
+            "jitter": self.jitter.summary(),
+        }
+
+
+def format_pacing_report(rows: Dict[str, Dict[str, object]]) -> str:
+    """以文字表格呈現多個 IntervalTracker.summary（每項一行：間隔百分位數、標準差、抖動 p99、延遲次數）"""
+    lines = [f"{'間隔':<16}{'目標':>8}{'p50':>8}{'p99':>8}{'最大':>8}{'標準差':>8}{'抖動p99':>9}{'延遲':>7}  (ms)"]
+    for name, s in rows.items():
+        interval, jitter = s["interval"], s["jitter"]
+        lines.append(
+            f"{name:<16}{s['target_ms']:>8.2f}{interval['p50_ms']:>8.2f}{interval['p99_ms']:>8.2f}"
+            f"{interval['max_ms']:>8.2f}{s['stddev_ms']:>8.2f}{jitter['p99_ms']:>9.2f}{s['late']:>7}"
+        )
+    return "\n".join(lines)
+
+
+class FrameDriver(QObject):
+    """以指定方式定期呼叫遊戲迴圈的單幀更新，並記錄實際的幀間隔"""
+
+    def __init__(
+        self,
+        widget: QWidget,
+        step: Callable[[], None],
+        mode: str = "coarse",
+        interval_ms: int = 16,
+        max_catch_up: int = 4,
+        pacing_enabled: bool = True,
+    ):
+        """
+        Args:
+            widget: 要驅動的部件（vsync 模式使用其頂層視窗的 QWindow）
+            step: 執行一幀的函式
+            mode: "coarse"、"precise" 或 "vsync"
+            interval_ms: 計時器模式的間隔；vsync 模式的固定步長為 1/60 秒
+            max_catch_up: vsync 模式單次顯示更新最多補執行的幀數（卡頓後不會一次追太多幀）
+            pacing_enabled: 是否記錄幀間隔
+
+        Raises:
+            ValueError: 未知的驅動方式
+        """
+        super().__init__(widget)
+        if mode not in FRAME_DRIVERS:
+            raise ValueError(f"未知的幀驅動方式 {mode!r}（可用: {', '.join(FRAME_DRIVERS)}）")
+        self.mode = mode
+        self._widget = widget
+        self._step = step
+        self._step_sec = 1.0 / 60.0
+        self._max_catch_up = max_catch_up
+        self._running = False
+        self._window_handle = None
+        self._accumulator = 0.0
+        self._last_frame: Optional[float] = None
+        target_ms = self._step_sec * 1000.0 if mode == "vsync" else float(interval_ms)
+        # 相鄰兩次執行幀的間隔（vsync 模式下單次更新補執行的幀不計入）
+        self.pacing = IntervalTracker(target_ms, enabled=pacing_enabled)
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(interval_ms))
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer if mode == "precise" else Qt.TimerType.CoarseTimer)
+        self.timer.timeout.connect(self._on_timeout)
+
+    def is_active(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        """開始驅動（已在執行時不做任何事）"""
+        if self._running:
+            return
+        self._running = True
+        self.pacing.restart()
+        if self.mode != "vsync":
+            self.timer.start()
+            return
+        self._accumulator = 0.0
+        self._last_frame = None
+        self._request_frame()
+
+    def stop(self) -> None:
+        """停止驅動（離屏逐幀執行、基準測試時呼叫）"""
+        self._running = False
+        self.timer.stop()
+
+    def _request_frame(self) -> None:
+        """請求頂層視窗的下一次顯示更新（視窗尚未顯示、沒有 QWindow 時稍後重試）"""
+        if not self._running:
+            return
+        handle = self._widget.window().windowHandle()
+        if handle is None:
+            QTimer.singleShot(self.timer.interval(), self._request_frame)
+            return
+        if handle is not self._window_handle:
+            if self._window_handle is not None:
+                self._window_handle.removeEventFilter(self)
+            handle.installEventFilter(self)
+            self._window_handle = handle
+        handle.requestUpdate()
+
+    def _on_timeout(self) -> None:
+        self.pacing.mark()
+        self._step()
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.UpdateRequest and obj is self._window_handle and self._running:
+            stepped = self._on_frame()
+            obj.requestUpdate()
+            # 有執行幀時事件照常交給視窗（同步重繪這一幀）；沒有時略過，不在兩幀之間重繪相同的畫面
+            # （其他原因的重繪最多延後到下一個執行幀）
+            return not stepped
+        return False
+
+    def _on_frame(self) -> bool:
+        """依經過時間執行 0~N 幀，回傳是否有執行"""
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            self._accumulator += min(now - self._last_frame, self._step_sec * self._max_catch_up)
+        else:
+            self._accumulator = self._step_sec
+        self._last_frame = now
+        if self._accumulator < self._step_sec:
+            return False
+        self.pacing.mark(now)
+        while self._accumulator >= self._step_sec:
+            self._step()
+            self._accumulator -= self._step_sec
+        return True
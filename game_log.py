@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+遊戲日誌模組
+
+以標準 logging 取代散落各處的 print()，輸出格式維持原本的「[分類] 訊息」：
+- 分類：get_logger("升級檢查") 對應 logger "aquarium.升級檢查"，可個別調整等級（config.LOG_CATEGORY_LEVELS）
+- 延遲格式化：呼叫端使用 log.debug("成長度 %s", value)，等級未啟用時不會組字串
+- 分類限流：主控台輸出每個分類以 token bucket 限制速率，被略過的筆數附在下一筆訊息後
+- 預設安靜：主控台只輸出 WARNING 以上（環境變數 AQUARIUM_LOG_LEVEL 可覆寫，如 DEBUG）
+- 環形緩衝：最近的 INFO 以上記錄保留在記憶體（不限流、不預先格式化），
+  程式未捕捉例外時寫入存檔目錄，供事後追查
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import (
+    LOG_LEVEL,
+    LOG_CATEGORY_LEVELS,
+    LOG_RATE_LIMIT_PER_SEC,
+    LOG_RATE_LIMIT_BURST,
+    LOG_RING_BUFFER_SIZE,
+    LOG_RING_BUFFER_LEVEL,
+)
+
+ROOT_LOGGER_NAME = "aquarium"
+LOG_LEVEL_ENV = "AQUARIUM_LOG_LEVEL"
+
+_configured = False
+_configure_lock = threading.Lock()
+_ring_handler: Optional["RingBufferHandler"] = None
+
+
+def _category(record: logging.LogRecord) -> str:
+    """由 logger 名稱取出分類（去掉 "aquarium." 前綴）"""
+    name = record.name
+    prefix = ROOT_LOGGER_NAME + "."
+    return name[len(prefix):] if name.startswith(prefix) else name
+
+
+class CategoryFormatter(logging.Formatter):
+    """輸出「[分類] 訊息」，限流略過的筆數附在訊息後"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = f"[{_category(record)}] {record.getMessage()}"
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f"（已略過 {suppressed} 筆）"
+        if record.exc_info:
+            text += "\n" + self.formatException(record.exc_info)
+        return text
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    每個分類一個 token bucket：每秒補充 rate 筆、最多累積 burst 筆
+
+    WARNING 以上不受限制；被略過的筆數記在下一筆通過的記錄（record.suppressed）。
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int):
+        super().__init__()
+        self._rate = float(rate_per_sec)
+        self._burst = float(max(1, burst))
+        self._lock = threading.Lock()
+        # {分類: [剩餘額度, 上次補充時間, 已略過筆數]}
+        self._buckets: Dict[str, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self._rate <= 0 or record.levelno >= logging.WARNING:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [self._burst, now, 0]
+            tokens = min(self._burst, bucket[0] + (now - bucket[1]) * self._rate)
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return False
+            bucket[0] = tokens - 1.0
+            record.suppressed = bucket[2]
+            bucket[2] = 0
+        return True
+
+
+class RingBufferHandler(logging.Handler):
+    """保留最近 capacity 筆記錄（只存 LogRecord，寫出時才格式化）"""
+
+    def __init__(self, capacity: int, level: int = logging.INFO):
+        super().__init__(level)
+        self._records: deque = deque(maxlen=max(1, capacity))
+        self.setFormatter(CategoryFormatter())
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._records.append(record)
+
+    def records(self) -> List[logging.LogRecord]:
+        """目前緩衝中的記錄（舊到新）"""
+        with self.lock:
+            return list(self._records)
+
+    def clear(self) -> None:
+        with self.lock:
+            self._records.clear()
+
+    def format_lines(self) -> List[str]:
+        """將緩衝中的記錄格式化為「時間 等級 [分類] 訊息」"""
+        lines = []
+        for record in self.records():
+            stamp = time.strftime("%H:%M:%S", time.localtime(record.created))
+            lines.append(f"{stamp}.{int(record.msecs):03d} {record.levelname:<7} {self.format(record)}")
+        return lines
+
+    def dump(self, path: Path) -> Path:
+        """將緩衝中的記錄寫入文字檔"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(self.format_lines()) + "\n", encoding="utf-8")
+        return path
+
+
+def _parse_level(value: object, default: int) -> int:
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(str(value).upper())
+    return level if isinstance(level, int) else default
+
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """
+    設定日誌輸出（重複呼叫時只調整主控台等級）
+
+    Args:
+        level: 主控台等級（"DEBUG"、"INFO"、"WARNING"...）；未指定時依環境變數 AQUARIUM_LOG_LEVEL，再依 config.LOG_LEVEL
+    """
+    global _configured, _ring_handler
+    with _configure_lock:
+        console_level = _parse_level(level or os.environ.get(LOG_LEVEL_ENV) or LOG_LEVEL, logging.WARNING)
+        ring_level = _parse_level(LOG_RING_BUFFER_LEVEL, logging.INFO)
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        if not _configured:
+            console = logging.StreamHandler(sys.stdout)
+            console.setFormatter(CategoryFormatter())
+            console.addFilter(RateLimitFilter(LOG_RATE_LIMIT_PER_SEC, LOG_RATE_LIMIT_BURST))
+            root.addHandler(console)
+            _ring_handler = RingBufferHandler(LOG_RING_BUFFER_SIZE, ring_level)
+            root.addHandler(_ring_handler)
+            root.propagate = False
+            _configured = True
+        for handler in root.handlers:
+            if not isinstance(handler, RingBufferHandler):
+                handler.setLevel(console_level)
+        # logger 等級取兩個輸出中較低者，低於此等級的呼叫在 isEnabledFor 即返回
+        root.setLevel(min(console_level, ring_level))
+        for category, category_level in LOG_CATEGORY_LEVELS.items():
+            logging.getLogger(f"{ROOT_LOGGER_NAME}.{category}").setLevel(_parse_level(category_level, console_level))
+
+
+def get_logger(category: str) -> logging.Logger:
+    """
+    取得分類 logger（第一次呼叫時自動設定輸出）
+
+    Args:
+        category: 分類名稱，即輸出中 [] 內的文字
+
+    Returns:
+        logging.Logger
+    """
+    if not _configured:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{category}")
+
+
+def get_ring_buffer() -> Optional[RingBufferHandler]:
+    """取得環形緩衝 handler（尚未設定時為 None）"""
+    return _ring_handler
+
+
+def dump_recent_logs(path: Path) -> Optional[Path]:
+    """將環形緩衝中的最近記錄寫入檔案，回傳路徑（尚未設定時為 None）"""
+    if _ring_handler is None:
+        return None
+    return _ring_handler.dump(path)
+
+
+def install_crash_dump(path: Path) -> None:
+    """
+    安裝未捕捉例外的處理：把例外附加到環形緩衝並寫入 path，再交給原本的 excepthook 輸出
+
+    Args:
+        path: 輸出路徑
+    """
+    previous_hook = sys.excepthook
+
+    def _hook(exc_type, exc_value, exc_tb):
+        try:
+            if _ring_handler is not None:
+                # 只寫入環形緩衝，主控台的 traceback 由原本的 excepthook 輸出
+                logger = get_logger("當機")
+                record = logger.makeRecord(
+                    logger.name, logging.CRITICAL, __file__, 0, "未捕捉的例外", None,
+                    (exc_type, exc_value, exc_tb),
+                )
+                _ring_handler.handle(record)
+            dumped = dump_recent_logs(path)
+            if dumped is not None:
+                print(f"[當機] 最近的日誌已寫入 {dumped}", file=sys.stderr)
+        except Exception:
+            pass
+        previous_hook(exc_type, exc_value, exc_tb)
+
+    sys.excepthook = _hook
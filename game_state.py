@@ -4,14 +4,36 @@
 
 負責遊戲狀態的序列化、反序列化、儲存與載入。
 使用 JSON 格式儲存，支援版本號機制確保向後相容。
+
+防當機寫入：
+- 完整快照（save.json）先寫入暫存檔並 fsync，再以 os.replace 原子取代，寫到一半當機不會損毀舊存檔
+- 快照之間的自動儲存只把與上次提交的差異（金錢增減、魚新增/移除/升級、飼料計數變化等）
+  以一行 JSON 附加到日誌檔（save.journal），載入時依序重播
+- 日誌超過筆數或大小上限時壓縮為新的完整快照並清空日誌
+
+快照格式由 config.SAVE_FILE_FORMAT 決定：JSON（save.json）或二進位（save.bin，見 save_binary）。
+載入時讀取兩者中較新的一份，切換格式後舊存檔仍可讀取。load_streaming 分批取得魚資料，
+二進位存檔邊解壓邊解碼，呼叫端可每取得一批就先還原。
 """
 
 import json
 import os
+import uuid
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
+
+from config import (
+    INITIAL_MONEY,
+    SAVE_JOURNAL_COMPACT_ENTRIES,
+    SAVE_JOURNAL_COMPACT_BYTES,
+    SAVE_JOURNAL_FSYNC,
+    SAVE_FILE_FORMAT,
+    SAVE_BINARY_COMPRESSION,
+)
+from save_binary import BinarySaveReader, encode_state, decode_state
+from game_log import get_logger
 
-from config import INITIAL_MONEY
+_log = get_logger("存檔")
 
 
 # 存檔格式版本號
@@ -41,6 +63,50 @@ def get_save_path() -> Path:
     return save_dir / "save.json"
 
 
+def get_binary_save_path() -> Path:
+    """
+    取得二進位存檔檔案路徑（與 JSON 存檔同目錄）
+    
+    Returns:
+        二進位存檔檔案路徑
+    """
+    return get_save_path().with_name("save.bin")
+
+
+def _find_snapshot_path() -> Optional[Path]:
+    """回傳 JSON 與二進位存檔中較新的一份；都不存在時回傳 None"""
+    candidates = [p for p in (get_save_path(), get_binary_save_path()) if p.exists()]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda p: p.stat().st_mtime_ns)
+
+
+def read_snapshot(path: Path) -> Any:
+    """
+    讀取快照檔案（依副檔名判斷 JSON 或二進位格式）
+    
+    Args:
+        path: 快照路徑
+        
+    Returns:
+        解析結果（正常為遊戲狀態字典）
+    """
+    if path.suffix == ".bin":
+        return decode_state(path.read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def get_journal_path() -> Path:
+    """
+    取得存檔日誌檔案路徑（與存檔同目錄）
+    
+    Returns:
+        日誌檔案路徑
+    """
+    return get_save_path().with_name("save.journal")
+
+
 def get_default_state() -> Dict[str, Any]:
     """
     取得預設遊戲狀態
@@ -65,6 +131,51 @@ def get_default_state() -> Dict[str, Any]:
     }
 
 
+def _normalize_state(state: Dict[str, Any]) -> None:
+    """
+    檢查版本並補上缺失欄位、修正型別錯誤的欄位（就地修改）
+    
+    Args:
+        state: 從快照載入並重播日誌後的狀態
+    """
+    # 檢查版本號
+    version = state.get("version", "unknown")
+    if version != SAVE_FORMAT_VERSION:
+        _log.info("存檔版本 %s 與當前版本 %s 不同，嘗試載入...", version, SAVE_FORMAT_VERSION)
+        # 未來可在此處實作版本遷移邏輯
+    
+    # 確保必要欄位存在，缺失欄位使用預設值
+    default_state = get_default_state()
+    for key, default_value in default_state.items():
+        if key not in state:
+            _log.info("缺失欄位 %s，使用預設值", key)
+            state[key] = default_value
+    
+    # 驗證欄位類型
+    if not isinstance(state.get("money"), (int, float)):
+        state["money"] = 0
+    if not isinstance(state.get("unlocked_species"), dict):
+        state["unlocked_species"] = {}
+    if not isinstance(state.get("fishes"), list):
+        state["fishes"] = []
+    if not isinstance(state.get("unlocked_pets"), list):
+        state["unlocked_pets"] = []
+    if not isinstance(state.get("background_opacity"), (int, float)):
+        state["background_opacity"] = 80
+    if not isinstance(state.get("feed_cheap_count"), (int, float)):
+        state["feed_cheap_count"] = 0
+    if not isinstance(state.get("feed_counters"), dict):
+        state["feed_counters"] = {}
+    if not isinstance(state.get("unlocked_feeds"), list):
+        state["unlocked_feeds"] = ["便宜飼料"]
+    if not isinstance(state.get("feed_counter_last_add"), dict):
+        state["feed_counter_last_add"] = {}
+    if not isinstance(state.get("unlocked_tools"), list):
+        state["unlocked_tools"] = []
+    if not isinstance(state.get("tool_colors"), dict):
+        state["tool_colors"] = {}
+
+
 def load() -> Dict[str, Any]:
     """
     從檔案載入遊戲狀態
@@ -75,76 +186,116 @@ def load() -> Dict[str, Any]:
     Returns:
         遊戲狀態字典
     """
-    save_path = get_save_path()
+    save_path = _find_snapshot_path()
     
     # 檔案不存在時回傳預設狀態
-    if not save_path.exists():
-        print(f"[存檔] 存檔檔案不存在，使用預設狀態: {save_path}")
+    if save_path is None:
+        _log.info("存檔檔案不存在，使用預設狀態: %s", get_save_path())
         return get_default_state()
     
     try:
-        # 讀取並解析 JSON
-        with open(save_path, 'r', encoding='utf-8') as f:
-            state = json.load(f)
+        # 讀取並解析快照（JSON 或二進位）
+        state = read_snapshot(save_path)
         
         # 驗證基本結構
         if not isinstance(state, dict):
-            print(f"[存檔] 存檔格式錯誤：根物件不是字典")
+            _log.warning("存檔格式錯誤：根物件不是字典")
             return get_default_state()
         
-        # 檢查版本號
-        version = state.get("version", "unknown")
-        if version != SAVE_FORMAT_VERSION:
-            print(f"[存檔] 存檔版本 {version} 與當前版本 {SAVE_FORMAT_VERSION} 不同，嘗試載入...")
-            # 未來可在此處實作版本遷移邏輯
-        
-        # 確保必要欄位存在，缺失欄位使用預設值
-        default_state = get_default_state()
-        for key, default_value in default_state.items():
-            if key not in state:
-                print(f"[存檔] 缺失欄位 {key}，使用預設值")
-                state[key] = default_value
-        
-        # 驗證欄位類型
-        if not isinstance(state.get("money"), (int, float)):
-            state["money"] = 0
-        if not isinstance(state.get("unlocked_species"), dict):
-            state["unlocked_species"] = {}
-        if not isinstance(state.get("fishes"), list):
-            state["fishes"] = []
-        if not isinstance(state.get("unlocked_pets"), list):
-            state["unlocked_pets"] = []
-        if not isinstance(state.get("background_opacity"), (int, float)):
-            state["background_opacity"] = 80
-        if not isinstance(state.get("feed_cheap_count"), (int, float)):
-            state["feed_cheap_count"] = 0
-        if not isinstance(state.get("feed_counters"), dict):
-            state["feed_counters"] = {}
-        if not isinstance(state.get("unlocked_feeds"), list):
-            state["unlocked_feeds"] = ["便宜飼料"]
-        if not isinstance(state.get("feed_counter_last_add"), dict):
-            state["feed_counter_last_add"] = {}
-        if not isinstance(state.get("unlocked_tools"), list):
-            state["unlocked_tools"] = []
-        if not isinstance(state.get("tool_colors"), dict):
-            state["tool_colors"] = {}
-        
-        print(f"[存檔] 成功載入存檔: {save_path}")
+        # 重播快照之後的日誌
+        replay_journal(state, get_journal_path())
+        _normalize_state(state)
+        _log.info("成功載入存檔: %s", save_path)
         return state
         
-    except json.JSONDecodeError as e:
-        print(f"[存檔] JSON 解析錯誤: {e}")
-        print(f"[存檔] 使用預設狀態")
+    except (json.JSONDecodeError, ValueError) as e:
+        _log.warning("存檔解析錯誤: %s", e)
+        _log.warning("使用預設狀態")
         return get_default_state()
     except Exception as e:
-        print(f"[存檔] 載入失敗: {e}")
-        print(f"[存檔] 使用預設狀態")
+        _log.warning("載入失敗: %s", e)
+        _log.warning("使用預設狀態")
         return get_default_state()
 
 
+def _batched(items: List[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    for start in range(0, len(items), batch_size):
+        yield items[start:start + batch_size]
+
+
+def _replayed_batches(
+    batches: Iterable[List[Dict[str, Any]]],
+    replay: "_FishJournalReplay",
+) -> Iterator[List[Dict[str, Any]]]:
+    """套用日誌中的魚操作後依序產生各批魚，最後一批為日誌新增的魚"""
+    for batch in batches:
+        batch = replay.apply(batch)
+        if batch:
+            yield batch
+    added = replay.added()
+    if added:
+        yield added
+
+
+def load_streaming(batch_size: int = 256) -> Tuple[Dict[str, Any], Iterator[List[Dict[str, Any]]]]:
+    """
+    從檔案載入遊戲狀態，魚資料改為分批取得
+    
+    二進位存檔只先解析魚以外的欄位，魚記錄在疊代時邊解壓邊解碼；JSON 存檔整份解析後分批。
+    快照之後的日誌照常重播（魚的操作在各批魚上套用，日誌新增的魚在最後一批）。
+    開頭的讀取或解析失敗時回傳預設狀態；疊代途中魚記錄損毀時拋出例外，已取得的批次仍有效。
+    
+    Args:
+        batch_size: 每批魚數量
+        
+    Returns:
+        (不含 fishes 的遊戲狀態字典, 魚字典批次的疊代器)
+    """
+    save_path = _find_snapshot_path()
+    if save_path is None:
+        _log.info("存檔檔案不存在，使用預設狀態: %s", get_save_path())
+        state = get_default_state()
+        return state, _batched(state.pop("fishes"), batch_size)
+    
+    try:
+        reader: Optional[BinarySaveReader] = None
+        if save_path.suffix == ".bin":
+            reader = BinarySaveReader(save_path.read_bytes())
+            state = dict(reader.state)
+        else:
+            state = read_snapshot(save_path)
+        if not isinstance(state, dict):
+            _log.warning("存檔格式錯誤：根物件不是字典")
+            state = get_default_state()
+            return state, _batched(state.pop("fishes"), batch_size)
+        
+        ops = read_journal_ops(state, get_journal_path())
+        apply_ops(state, [op for op in ops if not op[0].startswith("fish_")])
+        replay = _FishJournalReplay(ops)
+        if reader is not None and reader.has_fish_list:
+            # 二進位存檔的 fishes 一定是列表；先放入空列表通過檢查，魚由讀取器分批解碼
+            state["fishes"] = []
+            _normalize_state(state)
+            source: Iterable[List[Dict[str, Any]]] = reader.iter_fish_batches(batch_size)
+        else:
+            _normalize_state(state)
+            source = _batched(state["fishes"], batch_size)
+        state.pop("fishes")
+        _log.info("成功載入存檔: %s（魚資料分批讀取）", save_path)
+        return state, _replayed_batches(source, replay)
+    
+    except (json.JSONDecodeError, ValueError) as e:
+        _log.warning("存檔解析錯誤: %s", e)
+    except Exception as e:
+        _log.warning("載入失敗: %s", e)
+    _log.warning("使用預設狀態")
+    state = get_default_state()
+    return state, _batched(state.pop("fishes"), batch_size)
+
+
 def save(state_dict: Dict[str, Any]) -> bool:
     """
-    將遊戲狀態寫入檔案
+    將遊戲狀態寫入完整快照並清空日誌（原子取代，寫到一半當機不會損毀舊存檔）
     
     Args:
         state_dict: 遊戲狀態字典
@@ -152,22 +303,392 @@ def save(state_dict: Dict[str, Any]) -> bool:
     Returns:
         是否成功儲存
     """
-    save_path = get_save_path()
+    return _default_store.commit(state_dict, compact=True)
+
+
+def commit(state_dict: Dict[str, Any], compact: bool = False) -> bool:
+    """
+    提交遊戲狀態：與上次提交的差異附加到日誌；需要時壓縮為完整快照
     
-    try:
-        # 確保版本號正確
-        state_dict["version"] = SAVE_FORMAT_VERSION
-        
-        # 確保目錄存在
-        save_path.parent.mkdir(parents=True, exist_ok=True)
+    Args:
+        state_dict: 遊戲狀態字典（fishes 需含 id 欄位）
+        compact: 是否強制寫入完整快照（例如關閉程式時）
         
-        # 寫入 JSON（使用縮排格式化，便於除錯）
-        with open(save_path, 'w', encoding='utf-8') as f:
-            json.dump(state_dict, f, indent=2, ensure_ascii=False)
+    Returns:
+        是否成功儲存
+    """
+    return _default_store.commit(state_dict, compact=compact)
+
+
+def journal_stats() -> Dict[str, int]:
+    """取得存檔日誌計數器（快照次數、日誌附加次數、目前日誌筆數與大小）"""
+    return _default_store.stats()
+
+
+def _write_bytes_atomic(path: Path, data: bytes) -> None:
+    """
+    以暫存檔 + fsync + os.replace 原子寫入
+    
+    Args:
+        path: 目標檔案路徑
+        data: 要寫入的內容
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def write_snapshot(path: Path, state_dict: Dict[str, Any]) -> None:
+    """
+    原子寫入快照檔案（依副檔名決定 JSON 或二進位格式）
+    
+    Args:
+        path: 快照路徑
+        state_dict: 遊戲狀態字典
+    """
+    if path.suffix == ".bin":
+        data = encode_state(state_dict, SAVE_BINARY_COMPRESSION)
+    else:
+        # 使用縮排格式化，便於除錯
+        data = json.dumps(state_dict, indent=2, ensure_ascii=False).encode('utf-8')
+    _write_bytes_atomic(path, data)
+
+
+# ---------------------------------------------------------------------------
+# 存檔日誌
+# ---------------------------------------------------------------------------
+# 日誌第一行為 {"base": 快照代號}，之後每行為 {"ops": [...]}；
+# 快照中的 journal_base 與日誌 base 不同時（壓縮途中當機）忽略整份日誌。
+# 操作格式：
+#   ["money", 增減量]
+#   ["fish_add", 魚字典]
+#   ["fish_remove", 魚 id]
+#   ["fish_upgrade", 魚 id, {變更欄位}]   （species/stage 改變）
+#   ["fish_update", 魚 id, {變更欄位}]    （成長度等其他欄位改變）
+#   ["feed_counter", 飼料名稱, 數量]
+#   ["set", 欄位, 值]                     （其他頂層欄位）
+
+# 不寫入日誌的瞬時欄位（位置與朝向只在完整快照中更新）
+_TRANSIENT_FIELDS = ("position", "direction", "facing_left", "horizontal_direction")
+
+
+def _strip_transient(item: Any) -> Any:
+    """移除字典中的瞬時欄位（用於比較魚與寵物是否有實質變更）"""
+    if isinstance(item, dict):
+        return {k: v for k, v in item.items() if k not in _TRANSIENT_FIELDS}
+    return item
+
+
+def diff_states(old: Dict[str, Any], new: Dict[str, Any]) -> List[list]:
+    """
+    計算兩份遊戲狀態之間的日誌操作（忽略位置、朝向等瞬時欄位）
+    
+    Args:
+        old: 上次提交的狀態
+        new: 新狀態
         
-        print(f"[存檔] 成功儲存存檔: {save_path}")
-        return True
+    Returns:
+        日誌操作列表；無實質變更時為空列表
+    """
+    ops: List[list] = []
+    old_money = old.get("money", 0)
+    new_money = new.get("money", 0)
+    if new_money != old_money:
+        ops.append(["money", new_money - old_money])
+
+    old_counters = old.get("feed_counters") or {}
+    new_counters = new.get("feed_counters") or {}
+    for name in sorted(set(old_counters) | set(new_counters)):
+        value = new_counters.get(name, 0)
+        if old_counters.get(name, 0) != value:
+            ops.append(["feed_counter", name, value])
+
+    old_fishes = {f.get("id"): f for f in old.get("fishes", [])}
+    new_ids = set()
+    for fish in new.get("fishes", []):
+        fid = fish.get("id")
+        new_ids.add(fid)
+        prev = old_fishes.get(fid)
+        if prev is None:
+            ops.append(["fish_add", fish])
+            continue
+        changed = {
+            k: v for k, v in fish.items()
+            if k not in _TRANSIENT_FIELDS and prev.get(k) != v
+        }
+        if changed:
+            op = "fish_upgrade" if ("stage" in changed or "species" in changed) else "fish_update"
+            ops.append([op, fid, changed])
+    for fid in old_fishes:
+        if fid not in new_ids:
+            ops.append(["fish_remove", fid])
+
+    skip = {"version", "money", "feed_counters", "fishes", "journal_base"}
+    for key in sorted(set(old) | set(new)):
+        if key in skip:
+            continue
+        old_value = old.get(key)
+        new_value = new.get(key)
+        if isinstance(new_value, list) and isinstance(old_value, list):
+            if [_strip_transient(v) for v in old_value] == [_strip_transient(v) for v in new_value]:
+                continue
+        elif old_value == new_value:
+            continue
+        ops.append(["set", key, new_value])
+    return ops
+
+
+def apply_ops(state: Dict[str, Any], ops: List[list]) -> None:
+    """
+    將日誌操作套用到遊戲狀態（就地修改）
+    
+    Args:
+        state: 遊戲狀態字典
+        ops: diff_states 產生的操作列表
+    """
+    for op in ops:
+        kind = op[0]
+        if kind == "money":
+            state["money"] = state.get("money", 0) + op[1]
+        elif kind == "feed_counter":
+            state.setdefault("feed_counters", {})[op[1]] = op[2]
+        elif kind == "fish_add":
+            state.setdefault("fishes", []).append(dict(op[1]))
+        elif kind == "fish_remove":
+            state["fishes"] = [f for f in state.get("fishes", []) if f.get("id") != op[1]]
+        elif kind in ("fish_upgrade", "fish_update"):
+            for fish in state.get("fishes", []):
+                if fish.get("id") == op[1]:
+                    fish.update(op[2])
+                    break
+        elif kind == "set":
+            state[op[1]] = op[2]
+
+
+def read_journal_ops(state: Dict[str, Any], journal_path: Path) -> List[list]:
+    """
+    讀取快照之後的日誌操作
+    
+    日誌代號與快照不符時忽略；最後一行不完整（附加途中當機）時捨棄該行。
+    
+    Args:
+        state: 從快照載入的狀態（只讀取 journal_base）
+        journal_path: 日誌檔案路徑
         
+    Returns:
+        依序的日誌操作
+    """
+    if not journal_path.exists():
+        return []
+    try:
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
     except Exception as e:
-        print(f"[存檔] 儲存失敗: {e}")
-        return False
+        _log.warning("無法讀取存檔日誌: %s", e)
+        return []
+    if not lines:
+        return []
+    try:
+        header = json.loads(lines[0])
+    except json.JSONDecodeError:
+        _log.warning("存檔日誌檔頭損毀，忽略日誌")
+        return []
+    if header.get("base") != state.get("journal_base"):
+        return []
+    ops: List[list] = []
+    entries = 0
+    for line in lines[1:]:
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            _log.warning("存檔日誌最後一筆不完整，已捨棄")
+            break
+        ops.extend(entry.get("ops", []))
+        entries += 1
+    if entries:
+        _log.info("已重播 %s 筆存檔日誌", entries)
+    return ops
+
+
+def replay_journal(state: Dict[str, Any], journal_path: Path) -> int:
+    """
+    將日誌重播到快照狀態上（就地修改）
+    
+    Args:
+        state: 從快照載入的狀態
+        journal_path: 日誌檔案路徑
+        
+    Returns:
+        重播的日誌操作數
+    """
+    ops = read_journal_ops(state, journal_path)
+    apply_ops(state, ops)
+    return len(ops)
+
+
+class _FishJournalReplay:
+    """
+    將日誌中的魚操作套用到分批讀入的快照魚（結果與 apply_ops 相同，前提是魚 id 不重複）
+    
+    移除的快照魚略過、更新依序套用；日誌新增的魚（含之後的更新與移除）另外保存，由 added 取得。
+    """
+    
+    def __init__(self, ops: List[list]):
+        self._removed: set = set()
+        self._updates: Dict[Any, List[Dict[str, Any]]] = {}
+        self._added: List[Dict[str, Any]] = []
+        for op in ops:
+            kind = op[0]
+            if kind == "fish_add":
+                self._added.append(dict(op[1]))
+            elif kind == "fish_remove":
+                self._removed.add(op[1])
+                self._added = [f for f in self._added if f.get("id") != op[1]]
+            elif kind in ("fish_upgrade", "fish_update"):
+                target = next((f for f in self._added if f.get("id") == op[1]), None)
+                if target is not None:
+                    target.update(op[2])
+                elif op[1] not in self._removed:
+                    self._updates.setdefault(op[1], []).append(op[2])
+    
+    def apply(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not self._removed and not self._updates:
+            return batch
+        result = []
+        for fish in batch:
+            fid = fish.get("id")
+            if fid in self._removed:
+                continue
+            for changes in self._updates.get(fid, ()):
+                fish.update(changes)
+            result.append(fish)
+        return result
+    
+    def added(self) -> List[Dict[str, Any]]:
+        return self._added
+
+
+class SaveStore:
+    """
+    快照 + 日誌存檔
+    
+    每個執行階段的第一次提交寫入完整快照，之後只附加與上次提交的差異；
+    日誌筆數或大小超過上限時壓縮為新快照。commit 只應由單一執行緒呼叫（背景寫入器）。
+    """
+    
+    def __init__(
+        self,
+        save_path: Optional[Path] = None,
+        journal_path: Optional[Path] = None,
+        compact_entries: int = SAVE_JOURNAL_COMPACT_ENTRIES,
+        compact_bytes: int = SAVE_JOURNAL_COMPACT_BYTES,
+        fsync: bool = SAVE_JOURNAL_FSYNC,
+    ):
+        """
+        初始化存檔
+        
+        Args:
+            save_path: 快照路徑（None 時依 SAVE_FILE_FORMAT 使用 get_save_path() 或 get_binary_save_path()）
+            journal_path: 日誌路徑（None 時使用 get_journal_path()）
+            compact_entries: 日誌筆數上限
+            compact_bytes: 日誌大小上限（位元組）
+            fsync: 附加日誌後是否 fsync
+        """
+        self._save_path = save_path
+        self._journal_path = journal_path
+        self.compact_entries = compact_entries
+        self.compact_bytes = compact_bytes
+        self.fsync = fsync
+        # 上次提交的狀態（日誌差異的基準）；None 表示本執行階段尚未寫入快照
+        self._base: Optional[Dict[str, Any]] = None
+        self._base_id: Optional[str] = None
+        self._journal_entries = 0
+        self._journal_bytes = 0
+        self._snapshots = 0
+        self._appends = 0
+    
+    def _paths(self) -> Tuple[Path, Path]:
+        save_path = self._save_path
+        if save_path is None:
+            save_path = get_binary_save_path() if SAVE_FILE_FORMAT == "binary" else get_save_path()
+        journal_path = self._journal_path or save_path.with_name("save.journal")
+        return save_path, journal_path
+    
+    def commit(self, state_dict: Dict[str, Any], compact: bool = False) -> bool:
+        """
+        提交遊戲狀態
+        
+        Args:
+            state_dict: 遊戲狀態字典（提交後由存檔持有，呼叫端不可再修改）
+            compact: 是否強制寫入完整快照
+            
+        Returns:
+            是否成功儲存
+        """
+        state_dict["version"] = SAVE_FORMAT_VERSION
+        needs_snapshot = (
+            compact
+            or self._base is None
+            or self._journal_entries >= self.compact_entries
+            or self._journal_bytes >= self.compact_bytes
+        )
+        try:
+            if needs_snapshot:
+                self._write_snapshot(state_dict)
+            else:
+                self._append(state_dict)
+            return True
+        except Exception as e:
+            _log.error("儲存失敗: %s", e)
+            # 狀態不確定，下次提交改寫完整快照
+            self._base = None
+            return False
+    
+    def _write_snapshot(self, state_dict: Dict[str, Any]) -> None:
+        save_path, journal_path = self._paths()
+        base_id = uuid.uuid4().hex
+        state_dict["journal_base"] = base_id
+        write_snapshot(save_path, state_dict)
+        # 快照已落盤後才重置日誌；兩步之間當機時舊日誌代號不符，載入時會被忽略
+        header = json.dumps({"base": base_id}) + "\n"
+        with open(journal_path, 'w', encoding='utf-8') as f:
+            f.write(header)
+        self._base = state_dict
+        self._base_id = base_id
+        self._journal_entries = 0
+        self._journal_bytes = len(header.encode('utf-8'))
+        self._snapshots += 1
+        _log.debug("成功儲存存檔: %s", save_path)
+    
+    def _append(self, state_dict: Dict[str, Any]) -> None:
+        state_dict["journal_base"] = self._base_id
+        ops = diff_states(self._base, state_dict)
+        self._base = state_dict
+        if not ops:
+            return
+        _, journal_path = self._paths()
+        line = json.dumps({"ops": ops}, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self._journal_entries += 1
+        self._journal_bytes += len(line.encode('utf-8'))
+        self._appends += 1
+    
+    def stats(self) -> Dict[str, int]:
+        """取得計數器"""
+        return {
+            "snapshots": self._snapshots,
+            "journal_appends": self._appends,
+            "journal_entries": self._journal_entries,
+            "journal_bytes": self._journal_bytes,
+        }
+
+
+_default_store = SaveStore()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+輸入錄製與重播模組
+
+錄製使用者對模擬有影響的輸入（點擊、滑過金錢拾取、購買與解鎖、飼料選擇、擊殺模式、背景），
+每筆標記發生時已執行的幀數（AquariumWidget.tick_count）。重播時從錄製開始時的世界快照
+（含 sim_random 串流狀態）還原，在相同幀數呼叫相同的處理方法，得到逐位元相同的模擬結果，
+讓效能分析可以精確比較同一段遊玩。
+
+錄製檔為 JSON lines：
+- 第一行：{"version", "tick": 開始幀數, "timestamp", "world": capture_world 的結果}
+- 之後每筆輸入：{"tick", "target": "window" 或 "aquarium", "input": 方法名稱, "args": [...]}
+- 結束行：{"tick", "end": true, "digest": 結束時的 world_digest}
+每筆輸入寫入後立即 flush，程式當機時已錄製的部分仍可重播（沒有結束行時重播到最後一筆輸入）。
+
+處理方法以 @recorded_input 標記；巢狀呼叫（如購買魚時再呼叫投放魚）只記錄最外層。
+"""
+
+import functools
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QPoint, QPointF
+
+INPUT_RECORD_VERSION = 1
+
+_PROJECT_DIR = Path(__file__).resolve().parent
+
+
+def _encode_arg(value: Any) -> Any:
+    """將處理方法的參數轉為可 JSON 序列化的值（座標、路徑以標記物件表示）"""
+    if isinstance(value, QPoint):
+        return {"point": [value.x(), value.y()]}
+    if isinstance(value, QPointF):
+        return {"pointf": [value.x(), value.y()]}
+    if isinstance(value, Path):
+        # 專案內的路徑記錄為相對路徑，錄製檔可在其他機器重播
+        try:
+            return {"path": Path(value).resolve().relative_to(_PROJECT_DIR).as_posix()}
+        except ValueError:
+            return {"path": str(value)}
+    return value
+
+
+def _decode_arg(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "point" in value:
+            return QPoint(*value["point"])
+        if "pointf" in value:
+            return QPointF(*value["pointf"])
+        if "path" in value:
+            path = Path(value["path"])
+            return path if path.is_absolute() else _PROJECT_DIR / path
+    return value
+
+
+def recorded_input(method: Callable) -> Callable:
+    """
+    標記輸入處理方法：物件的 input_recorder 正在錄製時記錄 (幀數, 目標, 方法名稱, 參數)
+
+    只傳入方法宣告的參數個數（Qt 信號可能多傳如 clicked 的 checked）。
+    有預設值的參數不錄製（供呼叫端傳入已算好的結果，重播時以預設值重新計算）。
+    目標名稱取自物件的 INPUT_TARGET 屬性（預設 "window"）。
+    """
+    name = method.__name__
+    nargs = method.__code__.co_argcount - 1
+    nrecorded = nargs - len(method.__defaults__ or ())
+
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        args = args[:nargs]
+        recorder: Optional[InputRecorder] = getattr(self, "input_recorder", None)
+        if recorder is None:
+            return method(self, *args)
+        if recorder.depth == 0:
+            recorder.record(getattr(self, "INPUT_TARGET", "window"), name, args[:nrecorded])
+        recorder.depth += 1
+        try:
+            return method(self, *args)
+        finally:
+            recorder.depth -= 1
+
+    return wrapper
+
+
+class InputRecorder:
+    """將輸入寫入錄製檔"""
+
+    def __init__(self, path: Path, world: Dict[str, Any], tick_source: Callable[[], int]):
+        """
+        開始錄製（寫入開頭行）
+
+        Args:
+            path: 錄製檔路徑
+            world: 錄製開始時的世界快照（capture_world 的結果）
+            tick_source: 回傳目前幀數的函式
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tick_source = tick_source
+        self._file = open(self.path, "w", encoding="utf-8")
+        self.depth = 0
+        self.count = 0
+        self.start_tick = tick_source()
+        self._write({
+            "version": INPUT_RECORD_VERSION,
+            "tick": self.start_tick,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "world": world,
+        })
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def record(self, target: str, name: str, args: Tuple[Any, ...]) -> None:
+        """記錄一筆輸入（標記目前幀數）"""
+        self._write({"tick": self._tick_source(), "target": target, "input": name, "args": [_encode_arg(a) for a in args]})
+        self.count += 1
+
+    def close(self, digest: Optional[str] = None) -> None:
+        """寫入結束行並關閉檔案"""
+        if self._file.closed:
+            return
+        self._write({"tick": self._tick_source(), "end": True, "digest": digest})
+        self._file.close()
+
+
+def load_recording(path: Path) -> Tuple[Dict[str, Any], List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    讀取錄製檔
+
+    Returns:
+        (開頭行, 輸入列表, 結束行或 None)
+
+    Raises:
+        ValueError: 檔案格式或版本不符
+    """
+    lines = [line for line in Path(path).read_text(encoding="utf-8").splitlines() if line.strip()]
+    if not lines:
+        raise ValueError(f"錄製檔 {path} 是空的")
+    try:
+        records = [json.loads(line) for line in lines]
+    except json.JSONDecodeError as e:
+        raise ValueError(f"錄製檔 {path} 格式錯誤: {e}") from e
+    header = records[0]
+    if header.get("version") != INPUT_RECORD_VERSION or "world" not in header:
+        raise ValueError(f"錄製檔版本 {header.get('version')} 與當前版本 {INPUT_RECORD_VERSION} 不同")
+    end = records[-1] if len(records) > 1 and records[-1].get("end") else None
+    events = records[1:-1] if end is not None else records[1:]
+    return header, events, end
+
+
+class InputReplayer:
+    """依幀數把錄製的輸入交給視窗與水族箱的處理方法"""
+
+    def __init__(self, window, events: List[Dict[str, Any]]):
+        """
+        Args:
+            window: TransparentAquariumWindow（已還原錄製開頭的世界快照）
+            events: load_recording 的輸入列表（依幀數排序）
+        """
+        self._targets = {"window": window, "aquarium": window.aquarium}
+        self._events = events
+        self._next = 0
+
+    @property
+    def remaining(self) -> int:
+        """尚未交付的輸入數"""
+        return len(self._events) - self._next
+
+    def dispatch(self, tick: int) -> int:
+        """
+        交付所有標記在此幀數（含之前遺漏）的輸入
+
+        Returns:
+            交付的輸入數
+        """
+        count = 0
+        while self._next < len(self._events) and self._events[self._next]["tick"] <= tick:
+            event = self._events[self._next]
+            self._next += 1
+            handler = getattr(self._targets[event["target"]], event["input"])
+            handler(*[_decode_arg(a) for a in event["args"]])
+            count += 1
+        return count
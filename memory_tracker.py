@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+記憶體成長追蹤模組
+
+長時間執行才會出現的洩漏（帶回呼的 Money、等待淡出的死魚、金錢動畫幀快取、每隻魚的死亡幀複本等）
+在短時間測試中看不出來。診斷模式啟用時：
+- 實體類別在建構時呼叫 track_instance，以 weakref.WeakSet 計算各類別存活的實例數（停用時只做一次旗標判斷）
+- register_size 登記快取大小等數值（如 _money_frames_cache 的項目數），只在檢查時才呼叫
+- MemoryTracker 以 QTimer 定期取 tracemalloc 快照，與上一次及啟動時比較成長最多的配置位置，
+  連同存活實例數與各項數值寫成 JSON lines
+- GrowthDetector：某項數值連續多次檢查都成長且累計成長超過門檻時發出警告；
+  同一項目之後成長到警告時的兩倍才再次警告，避免每次檢查都重複
+"""
+
+import _weakrefset
+import json
+import time
+import tracemalloc
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from PyQt6.QtCore import QObject, QTimer
+
+from game_log import get_logger
+
+_log = get_logger("記憶體")
+
+_tracking = False
+_registries: Dict[str, "weakref.WeakSet"] = {}
+_sizes: Dict[str, Callable[[], int]] = {}
+
+# tracemalloc 快照中排除的配置位置（追蹤本身、實例登記用的 WeakSet 與匯入機制）
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, _weakrefset.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def track_instance(obj: Any, kind: Optional[str] = None) -> None:
+    """
+    登記一個存活實例（追蹤停用時不做任何事）
+
+    Args:
+        obj: 實例（需可建立弱參照）
+        kind: 分類名稱；未指定時為類別名稱
+    """
+    if not _tracking:
+        return
+    name = kind or type(obj).__name__
+    registry = _registries.get(name)
+    if registry is None:
+        registry = _registries[name] = weakref.WeakSet()
+    registry.add(obj)
+
+
+def live_counts() -> Dict[str, int]:
+    """各分類目前存活的實例數（只計入開始追蹤後建立的實例）"""
+    return {name: len(registry) for name, registry in sorted(_registries.items())}
+
+
+def register_size(name: str, func: Callable[[], int]) -> None:
+    """
+    登記檢查時要記錄的數值（快取項目數、列表長度等）
+
+    Args:
+        name: 名稱（重複登記時取代）
+        func: 回傳目前數值的函式
+    """
+    _sizes[name] = func
+
+
+def sizes() -> Dict[str, int]:
+    """呼叫所有登記的數值函式（單一函式失敗時略過）"""
+    result = {}
+    for name, func in _sizes.items():
+        try:
+            result[name] = int(func())
+        except Exception as e:
+            _log.debug("數值 %s 取得失敗: %s", name, e)
+    return result
+
+
+def set_tracking(enabled: bool) -> None:
+    """啟用/停用實例登記（停用時清除已登記的實例）"""
+    global _tracking
+    _tracking = enabled
+    if not enabled:
+        _registries.clear()
+
+
+class GrowthDetector:
+    """偵測持續成長的數值"""
+
+    def __init__(self, checks: int = 5, min_growth: int = 100):
+        """
+        Args:
+            checks: 連續成長多少次檢查才警告
+            min_growth: 這段期間累計至少成長多少才警告（過濾小幅波動）
+        """
+        self.checks = checks
+        self.min_growth = min_growth
+        self._history: Dict[str, List[int]] = {}
+        self._alerted_at: Dict[str, int] = {}
+
+    def update(self, values: Dict[str, int]) -> List[Dict[str, Any]]:
+        """
+        加入一次檢查的數值
+
+        Returns:
+            本次新發出的警告：[{"name", "value", "growth", "checks"}]
+        """
+        alerts = []
+        for name, value in values.items():
+            history = self._history.setdefault(name, [])
+            history.append(value)
+            del history[:-(self.checks + 1)]
+            if len(history) <= self.checks:
+                continue
+            if any(b <= a for a, b in zip(history, history[1:])):
+                continue
+            growth = history[-1] - history[0]
+            if growth < self.min_growth:
+                continue
+            alerted = self._alerted_at.get(name)
+            if alerted is not None and value < alerted * 2:
+                continue
+            self._alerted_at[name] = value
+            alerts.append({"name": name, "value": value, "growth": growth, "checks": self.checks})
+        return alerts
+
+
+def _top_diffs(snapshot: tracemalloc.Snapshot, other: tracemalloc.Snapshot, limit: int) -> List[Dict[str, Any]]:
+    """與另一個快照比較，依配置位置回傳成長最多的項目"""
+    rows = []
+    for stat in snapshot.compare_to(other, "lineno")[:limit]:
+        if stat.size_diff <= 0:
+            break
+        frame = stat.traceback[0]
+        rows.append({
+            "where": f"{Path(frame.filename).name}:{frame.lineno}",
+            "size_diff": stat.size_diff,
+            "count_diff": stat.count_diff,
+            "size": stat.size,
+        })
+    return rows
+
+
+class MemoryTracker(QObject):
+    """定期取 tracemalloc 快照與存活實例數，寫入 JSON lines 並警告持續成長的項目"""
+
+    def __init__(
+        self,
+        path: Path,
+        interval_sec: float = 60.0,
+        top_n: int = 10,
+        traceback_frames: int = 1,
+        detector: Optional[GrowthDetector] = None,
+        parent: Optional[QObject] = None,
+    ):
+        """
+        Args:
+            path: 輸出檔案路徑（每次檢查附加一行）
+            interval_sec: 檢查間隔（秒）
+            top_n: 每次記錄成長最多的配置位置數
+            traceback_frames: tracemalloc 記錄的堆疊層數（越多越慢、越耗記憶體）
+            detector: 成長偵測器；未指定時使用預設門檻
+            parent: 父物件
+        """
+        super().__init__(parent)
+        self.path = Path(path)
+        self.top_n = top_n
+        self.traceback_frames = traceback_frames
+        self.detector = detector or GrowthDetector()
+        self.checks = 0
+        self._started_tracing = False
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._start_time = 0.0
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, int(interval_sec * 1000)))
+        self._timer.timeout.connect(self.check)
+
+    def start(self) -> None:
+        """開始追蹤（啟動 tracemalloc 與實例登記，取基準快照）"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.traceback_frames)
+            self._started_tracing = True
+        set_tracking(True)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._baseline = self._previous = self._snapshot()
+        self._start_time = time.monotonic()
+        self._timer.start()
+
+    def stop(self) -> None:
+        """停止追蹤（只停止本物件啟動的 tracemalloc）"""
+        self._timer.stop()
+        set_tracking(False)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._baseline = self._previous = None
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+    def check(self) -> Dict[str, Any]:
+        """
+        立即檢查一次並寫入一行結果
+
+        Returns:
+            本次的記錄（counts、sizes、top_since_last、top_since_start、alerts 等）
+        """
+        start = time.perf_counter()
+        snapshot = self._snapshot()
+        counts = live_counts()
+        values = sizes()
+        record = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "elapsed_sec": round(time.monotonic() - self._start_time, 1),
+            "traced_bytes": tracemalloc.get_traced_memory()[0],
+            "counts": counts,
+            "sizes": values,
+            "top_since_last": _top_diffs(snapshot, self._previous, self.top_n) if self._previous else [],
+            "top_since_start": _top_diffs(snapshot, self._baseline, self.top_n) if self._baseline else [],
+        }
+        alerts = self.detector.update({**counts, **values})
+        for alert in alerts:
+            top = record["top_since_start"][:3]
+            _log.warning(
+                "%s 連續 %d 次檢查持續成長（+%d，目前 %d），可能洩漏；啟動以來成長最多: %s",
+                alert["name"], alert["checks"], alert["growth"], alert["value"],
+                "、".join(f"{row['where']} +{row['size_diff'] // 1024} KiB" for row in top) or "無",
+            )
+        record["alerts"] = alerts
+        record["check_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        self._previous = snapshot
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.checks += 1
+        return record
+
+    def collect_samples(self) -> List[Any]:
+        """指標樣本：各分類存活實例數（供 MetricsRegistry.add_collector）"""
+        return [("live_instances", {"class": name}, float(count)) for name, count in live_counts().items()]
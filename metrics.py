@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+執行指標模組
+
+長時間測試（soak test）用的本機指標收集與輸出，不需要網路：
+- MetricsRegistry：計數器（Counter）與量表（Gauge）由遊戲迴圈直接更新；
+  成本較高或需要彙整的數值（幀計時、實體數量、記憶體、素材快取等）以收集函式登記，只在輸出時才呼叫
+- 停用時 Counter.inc / Gauge.set 只做一次屬性判斷即返回（約 0.1 µs），可留在每幀執行的程式中
+- MetricsExporter：以 QTimer 定期輸出，格式為 JSON lines（每次附加一行）或
+  Prometheus textfile collector 格式（每次整檔取代，供 node_exporter 讀取）
+- 計數器可登記為速率（每秒 / 每分鐘），由兩次輸出之間的差值計算，例如 FPS、每分鐘收入
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, QTimer
+
+# 單一樣本：(名稱, 標籤, 值)；標籤為 {標籤名稱: 值}，無標籤時為空字典
+Sample = Tuple[str, Dict[str, str], float]
+
+EXPORT_FORMATS = ("jsonl", "prometheus")
+
+
+class Counter:
+    """只增不減的計數器（停用時 inc 直接返回）"""
+
+    __slots__ = ("name", "help", "value", "_registry")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help_text: str = ""):
+        self._registry = registry
+        self.name = name
+        self.help = help_text
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """增加計數"""
+        if self._registry.enabled:
+            self.value += amount
+
+
+class Gauge:
+    """可任意設定的量表（停用時 set 直接返回）"""
+
+    __slots__ = ("name", "help", "value", "_registry")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help_text: str = ""):
+        self._registry = registry
+        self.name = name
+        self.help = help_text
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        """設定數值"""
+        if self._registry.enabled:
+            self.value = value
+
+
+class MetricsRegistry:
+    """
+    指標登記處
+
+    用法：
+        registry.counter("money_earned_total").inc(value)   # 遊戲迴圈中直接更新
+        registry.add_collector(lambda: [("entities", {"type": "fish"}, len(fishes))])  # 輸出時才呼叫
+        registry.add_rate("money_per_minute", "money_earned_total", per=60.0)
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        初始化登記處
+
+        Args:
+            enabled: 是否啟用；停用時計數器與量表不更新（MetricsExporter.start 會啟用）
+        """
+        self.enabled = enabled
+        self._counters: Dict[str, Counter] = {}
+        self._gauges: Dict[str, Gauge] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        # {速率名稱: (計數器名稱, 時間單位秒, 說明)}
+        self._rates: Dict[str, Tuple[str, float, str]] = {}
+        self._help: Dict[str, str] = {}
+        self._last_counts: Dict[str, float] = {}
+        self._last_time: Optional[float] = None
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        """取得（或建立）計數器"""
+        counter = self._counters.get(name)
+        if counter is None:
+            counter = self._counters[name] = Counter(self, name, help_text)
+            self._help[name] = help_text
+        return counter
+
+    def gauge(self, name: str, help_text: str = "") -> Gauge:
+        """取得（或建立）量表"""
+        gauge = self._gauges.get(name)
+        if gauge is None:
+            gauge = self._gauges[name] = Gauge(self, name, help_text)
+            self._help[name] = help_text
+        return gauge
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]], help_texts: Optional[Dict[str, str]] = None) -> None:
+        """
+        登記收集函式（輸出時呼叫）
+
+        Args:
+            collector: 回傳樣本列表 [(名稱, 標籤, 值), ...] 的函式
+            help_texts: {名稱: 說明}，用於 Prometheus 的 # HELP
+        """
+        self._collectors.append(collector)
+        if help_texts:
+            self._help.update(help_texts)
+
+    def add_rate(self, name: str, counter_name: str, per: float = 1.0, help_text: str = "") -> None:
+        """
+        登記由計數器差值計算的速率
+
+        Args:
+            name: 速率名稱
+            counter_name: 計數器名稱
+            per: 時間單位（秒），1 為每秒、60 為每分鐘
+            help_text: 說明
+        """
+        self.counter(counter_name)
+        self._rates[name] = (counter_name, float(per), help_text)
+        self._help[name] = help_text
+
+    def help_text(self, name: str) -> str:
+        """指標說明（未登記時為空字串）"""
+        return self._help.get(name, "")
+
+    def collect(self, now: Optional[float] = None) -> List[Sample]:
+        """
+        收集所有樣本（計數器、量表、速率、收集函式）
+
+        速率以上次 collect 至今的差值計算，第一次呼叫時為 0。
+        收集函式拋出例外時略過該函式，不影響其他指標。
+
+        Args:
+            now: 目前時間（time.monotonic()），測試時可指定
+
+        Returns:
+            樣本列表
+        """
+        now = time.monotonic() if now is None else now
+        samples: List[Sample] = [(c.name, {}, c.value) for c in self._counters.values()]
+        samples += [(g.name, {}, g.value) for g in self._gauges.values()]
+        elapsed = now - self._last_time if self._last_time is not None else 0.0
+        for name, (counter_name, per, _) in self._rates.items():
+            value = self._counters[counter_name].value
+            delta = value - self._last_counts.get(counter_name, value)
+            samples.append((name, {}, delta * per / elapsed if elapsed > 0 else 0.0))
+        self._last_counts = {name: c.value for name, c in self._counters.items()}
+        self._last_time = now
+        for collector in self._collectors:
+            try:
+                samples.extend(collector())
+            except Exception:
+                continue
+        return samples
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    目前行程的常駐記憶體（RSS，位元組）
+
+    Linux 讀取 /proc/self/statm；Windows 呼叫 GetProcessMemoryInfo；
+    其他平台以 getrusage 的峰值代替；都無法取得時為 None。
+    """
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/statm", "rb") as f:
+                pages = int(f.read().split()[1])
+            return pages * os.sysconf("SC_PAGE_SIZE")
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            class _Counters(ctypes.Structure):
+                _fields_ = [
+                    ("cb", wintypes.DWORD),
+                    ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t),
+                    ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t),
+                    ("PeakPagefileUsage", ctypes.c_size_t),
+                ]
+
+            counters = _Counters()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return int(counters.WorkingSetSize)
+            return None
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 單位為位元組，其他 BSD 為 KB
+        return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+    except Exception:
+        return None
+
+
+def collect_process_samples() -> List[Sample]:
+    """行程層級的樣本：RSS、Python 配置的記憶體區塊數、tracemalloc 追蹤量（啟用時）"""
+    samples: List[Sample] = [("python_allocated_blocks", {}, float(sys.getallocatedblocks()))]
+    rss = current_rss_bytes()
+    if rss is not None:
+        samples.append(("process_rss_bytes", {}, float(rss)))
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        samples.append(("python_heap_bytes", {}, float(current)))
+        samples.append(("python_heap_peak_bytes", {}, float(peak)))
+    return samples
+
+
+PROCESS_HELP = {
+    "python_allocated_blocks": "Python 物件配置器目前配置的記憶體區塊數",
+    "process_rss_bytes": "行程常駐記憶體（位元組）",
+    "python_heap_bytes": "tracemalloc 追蹤中的 Python 記憶體（位元組）",
+    "python_heap_peak_bytes": "tracemalloc 追蹤期間的 Python 記憶體峰值（位元組）",
+}
+
+
+def format_json_line(samples: Iterable[Sample], timestamp: Optional[float] = None) -> str:
+    """
+    將樣本轉為一行 JSON
+
+    無標籤的指標為 {"名稱": 值}；有標籤的指標依標籤值逐層分組，例如
+    {"entities": {"fish": 12, "feed": 3}}、{"tick_phase_ms": {"fish_update": {"p99": 2.1}}}。
+    """
+    metrics: Dict[str, object] = {}
+    for name, labels, value in samples:
+        if not labels:
+            metrics[name] = value
+            continue
+        keys = [str(v) for v in labels.values()]
+        group = metrics.setdefault(name, {})
+        for key in keys[:-1]:
+            if not isinstance(group, dict):
+                break
+            group = group.setdefault(key, {})
+        if isinstance(group, dict):
+            group[keys[-1]] = value
+    timestamp = time.time() if timestamp is None else timestamp
+    record = {
+        "ts": round(timestamp, 3),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(timestamp)),
+        "metrics": metrics,
+    }
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    """整數值不使用科學記號（位元組數等大數值保留完整精度）"""
+    value = float(value)
+    if value.is_integer() and abs(value) < 1e18:
+        return str(int(value))
+    return repr(value)
+
+
+def format_prometheus(
+    samples: Iterable[Sample],
+    prefix: str = "aquarium_",
+    help_lookup: Optional[Callable[[str], str]] = None,
+) -> str:
+    """
+    將樣本轉為 Prometheus 文字格式（所有指標皆以 gauge 輸出，同名樣本集中在一起）
+
+    Args:
+        samples: 樣本
+        prefix: 指標名稱前綴
+        help_lookup: 取得指標說明的函式（輸出為 # HELP）
+    """
+    grouped: Dict[str, List[Tuple[Dict[str, str], float]]] = {}
+    for name, labels, value in samples:
+        grouped.setdefault(name, []).append((labels, value))
+    lines = []
+    for name, rows in grouped.items():
+        full_name = prefix + name
+        help_text = help_lookup(name) if help_lookup else ""
+        if help_text:
+            lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} gauge")
+        for labels, value in rows:
+            label_text = ""
+            if labels:
+                label_text = "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items()) + "}"
+            lines.append(f"{full_name}{label_text} {_format_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter(QObject):
+    """
+    定期將登記處的指標寫入本機檔案
+
+    - jsonl：每次附加一行到檔案（長時間測試後可直接以 pandas 等工具讀取）
+    - prometheus：每次寫暫存檔再取代，node_exporter 的 textfile collector 不會讀到寫到一半的檔案
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        path: Path,
+        fmt: str = "jsonl",
+        interval_sec: float = 10.0,
+        parent: Optional[QObject] = None,
+    ):
+        """
+        初始化輸出器
+
+        Args:
+            registry: 指標登記處
+            path: 輸出檔案路徑
+            fmt: "jsonl" 或 "prometheus"
+            interval_sec: 輸出間隔（秒）
+            parent: 父物件
+
+        Raises:
+            ValueError: 不支援的格式
+        """
+        super().__init__(parent)
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"不支援的指標格式: {fmt}")
+        self.registry = registry
+        self.path = Path(path)
+        self.format = fmt
+        self.exports = 0
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, int(interval_sec * 1000)))
+        self._timer.timeout.connect(self.export)
+
+    def start(self) -> None:
+        """啟用登記處並開始定期輸出（先收集一次作為速率的起點）"""
+        self.registry.enabled = True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.registry.collect()
+        self._timer.start()
+
+    def stop(self) -> None:
+        """停止定期輸出並停用登記處"""
+        self._timer.stop()
+        self.registry.enabled = False
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def export(self) -> Path:
+        """
+        立即收集並輸出一次
+
+        Returns:
+            輸出路徑
+        """
+        samples = self.registry.collect()
+        if self.format == "prometheus":
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(format_prometheus(samples, help_lookup=self.registry.help_text), encoding="utf-8")
+            tmp_path.replace(self.path)
+        else:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(format_json_line(samples) + "\n")
+        self.exports += 1
+        return self.path
@@ -6,7 +6,6 @@
 寵物素材預設頭部朝左；轉向素材為由左往右（左面轉到右面）。
 """
 
-import random
 import math
 from pathlib import Path
 from typing import Callable, List, Optional, Tuple
@@ -27,6 +26,14 @@ from config import (
     MONEY_COLLECT_ANIMATION_DURATION_SEC,
     MONEY_COLLECT_VELOCITY_Y,
 )
+from asset_archive import resource_exists, resource_files
+from asset_loader import load_pixmap
+from game_log import get_logger
+from sim_random import stream as sim_stream
+from memory_tracker import track_instance
+
+_chest_log = get_logger("寶箱怪")
+_patchwork_log = get_logger("拼布魚")
 
 
 def load_pet_animation(pet_dir: Path, behavior: str) -> List[QPixmap]:
@@ -41,13 +48,13 @@ def load_pet_animation(pet_dir: Path, behavior: str) -> List[QPixmap]:
         動畫幀列表
     """
     behavior_dir = pet_dir / behavior
-    if not behavior_dir.exists():
+    if not resource_exists(behavior_dir):
         return []
     
-    frame_files = sorted(behavior_dir.glob("*.png"))
+    frame_files = resource_files(behavior_dir)
     frames = []
     for frame_file in frame_files:
-        pixmap = QPixmap(str(frame_file))
+        pixmap = load_pixmap(frame_file)
         if not pixmap.isNull():
             frames.append(pixmap)
     return frames
@@ -85,10 +92,11 @@ class Pet:
         self.position = QPointF(float(position.x()), float(position.y()))
         self.speed = speed
         self.scale = scale
+        track_instance(self)
         self.pet_name = pet_name
         
         # 方向：-1=左, 1=右
-        self.horizontal_direction = random.choice([-1, 1])
+        self.horizontal_direction = sim_stream("pet").choice([-1, 1])
         self.facing_left = self.horizontal_direction < 0
         
         # 行為狀態
@@ -243,16 +251,16 @@ class ChestMonsterPet(Pet):
         all_produce_types = ["珍珠", "金條", "鑽石"]
         pet_file = Path(__file__)
         resource_dir = pet_file.parent / "resource" / "money" / "寶箱怪產物"
-        if not resource_dir.exists():
-            print(f"[寶箱怪] 產物目錄不存在: {resource_dir}")
+        if not resource_exists(resource_dir):
+            _chest_log.warning("產物目錄不存在: %s", resource_dir)
             return
         for produce_type in all_produce_types:
             image_path = resource_dir / f"寶箱怪產物_{produce_type}.png"
-            if image_path.exists():
-                pixmap = QPixmap(str(image_path))
+            if resource_exists(image_path):
+                pixmap = load_pixmap(image_path)
                 if not pixmap.isNull():
                     self._produce_images[produce_type] = pixmap
-        print(f"[寶箱怪] 產物圖片載入完成，共 {len(self._produce_images)} 張")
+        _chest_log.debug("產物圖片載入完成，共 %s 張", len(self._produce_images))
 
     def _update_movement(self, aquarium_rect: QRect, feeds: Optional[List] = None) -> None:
         """寶箱怪不移動，位置固定"""
@@ -284,10 +292,10 @@ class ChestMonsterPet(Pet):
             elapsed = self.timer_frames - CHEST_OPENING_START_FRAMES
             step = elapsed // 60  # 每秒一幀
             if step == 6 and not hasattr(self, "_produced"):  # 006幀時產出
-                name = random.choice(self._produce_types)
+                name = sim_stream("pet").choice(self._produce_types)
                 self._current_produce_type = name
-                print(f"[寶箱怪] 在006幀產出產物: {name}, 當前產物類型: {self._current_produce_type}")
-                print(f"[寶箱怪] 產物圖片字典: {list(self._produce_images.keys())}")
+                _chest_log.debug("在006幀產出產物: %s, 當前產物類型: %s", name, self._current_produce_type)
+                _chest_log.debug("產物圖片字典: %s", list(self._produce_images.keys()))
                 self.spawn_money_cb(name)
                 self._produced = True
             # 到達009幀時進入等待拾取狀態
@@ -313,7 +321,7 @@ class ChestMonsterPet(Pet):
         if self.state_chest == "waiting_collect" and self._current_produce_type:
             raw_image = self._produce_images.get(self._current_produce_type)
             if raw_image is None:
-                print(f"[寶箱怪] 警告：waiting_collect狀態但找不到產物圖片: {self._current_produce_type}")
+                _chest_log.warning("警告：waiting_collect狀態但找不到產物圖片: %s", self._current_produce_type)
         # 在opening狀態且step >= 6時也顯示
         elif self.state_chest == "opening":
             elapsed = self.timer_frames - CHEST_OPENING_START_FRAMES
@@ -321,7 +329,7 @@ class ChestMonsterPet(Pet):
             if step >= 6 and self._current_produce_type:
                 raw_image = self._produce_images.get(self._current_produce_type)
                 if raw_image is None:
-                    print(f"[寶箱怪] 警告：opening狀態step={step}但找不到產物圖片: {self._current_produce_type}")
+                    _chest_log.warning("警告：opening狀態step=%s但找不到產物圖片: %s", step, self._current_produce_type)
         
         # 應用縮放
         if raw_image:
@@ -338,7 +346,7 @@ class ChestMonsterPet(Pet):
                 #print(f"[寶箱怪] 產物圖片縮放: {raw_image.width()}x{raw_image.height()} -> {scaled_width}x{scaled_height} (scale={scale})")
                 return scaled
             else:
-                print(f"[寶箱怪] 警告：縮放後尺寸無效: {scaled_width}x{scaled_height}")
+                _chest_log.warning("警告：縮放後尺寸無效: %sx%s", scaled_width, scaled_height)
         return None
 
     def get_produce_position(self) -> QPointF:
@@ -510,14 +518,15 @@ class PatchworkFishPet(Pet):
         self.eat_frames = eat_frames if eat_frames else swim_frames
         self.state = "swim"  # "swim" | "turning" | "eating"
         self.eat_progress = 0.0
-        self.vertical_direction = random.choice([-1, 0, 1])
+        rng = sim_stream("pet")
+        self.vertical_direction = rng.choice([-1, 0, 1])
         if self.horizontal_direction == 0 and self.vertical_direction == 0:
-            self.vertical_direction = random.choice([-1, 1])
+            self.vertical_direction = rng.choice([-1, 1])
         self._speed_multiplier = 1.0
         self.feed_detection_range = 300.0
         self.feed_cooldown_timer = 0.0
         self.direction_timer = 0
-        self.direction_change_interval = random.randint(180, 400)
+        self.direction_change_interval = rng.randint(180, 400)
         self.boundary_margin = 50
         # 飽足度系統
         self.satiation = 0  # 當前飽足度
@@ -564,7 +573,7 @@ class PatchworkFishPet(Pet):
             self.performance_timer -= 1.0
             if self.performance_timer <= 0:
                 self.performance_timer = 0.0
-                print(f"[拼布魚] 街頭表演模式結束")
+                _patchwork_log.info("街頭表演模式結束")
 
     def _update_swim_state(self) -> None:
         if self.horizontal_direction != 0:
@@ -580,7 +589,7 @@ class PatchworkFishPet(Pet):
         if self.direction_timer >= self.direction_change_interval:
             self._random_direction_change()
             self.direction_timer = 0
-            self.direction_change_interval = random.randint(180, 400)
+            self.direction_change_interval = sim_stream("pet").randint(180, 400)
 
     def _update_turning_state(self) -> None:
         """更新轉向狀態（與Fish邏輯一致）"""
@@ -706,18 +715,19 @@ class PatchworkFishPet(Pet):
         self.turning_to_left = turn_to_left
 
     def _random_direction_change(self) -> None:
-        if random.random() < 0.6:
-            new_h = random.choice([-1, 0, 1])
+        rng = sim_stream("pet")
+        if rng.random() < 0.6:
+            new_h = rng.choice([-1, 0, 1])
             if new_h == 0 and self.vertical_direction == 0:
-                new_h = random.choice([-1, 1])
+                new_h = rng.choice([-1, 1])
             self._change_horizontal_direction(new_h)
-        if random.random() < 0.5:
-            self.vertical_direction = random.choice([-1, 0, 1])
+        if rng.random() < 0.5:
+            self.vertical_direction = rng.choice([-1, 0, 1])
         if self.horizontal_direction == 0 and self.vertical_direction == 0:
-            if random.random() < 0.5:
-                self._change_horizontal_direction(random.choice([-1, 1]))
+            if rng.random() < 0.5:
+                self._change_horizontal_direction(rng.choice([-1, 1]))
             else:
-                self.vertical_direction = random.choice([-1, 1])
+                self.vertical_direction = rng.choice([-1, 1])
 
     def get_current_frame(self) -> Optional[QPixmap]:
         if self.state == "eating" and self.eat_frames:
@@ -742,7 +752,7 @@ class PatchworkFishPet(Pet):
             growth_points = FEED_GROWTH_POINTS.get(feed_name, 1)  # 預設為1
             old_satiation = self.satiation
             self.satiation = min(self.satiation + growth_points, self.max_satiation)
-            print(f"[拼布魚] 吃到飼料({feed_name})，成長度+{growth_points}，飽足度: {old_satiation} -> {self.satiation}/{self.max_satiation}")
+            _patchwork_log.debug("吃到飼料(%s)，成長度+%s，飽足度: %s -> %s/%s", feed_name, growth_points, old_satiation, self.satiation, self.max_satiation)
             # 檢查是否達到滿飽足度，觸發街頭表演
             if self.satiation >= self.max_satiation:
                 self._trigger_performance()
@@ -750,7 +760,7 @@ class PatchworkFishPet(Pet):
             # 沒有飼料對象時，預設+1
             if self.satiation < self.max_satiation:
                 self.satiation += 1
-                print(f"[拼布魚] 吃到飼料（未知類型），飽足度: {self.satiation}/{self.max_satiation}")
+                _patchwork_log.debug("吃到飼料（未知類型），飽足度: %s/%s", self.satiation, self.max_satiation)
                 if self.satiation >= self.max_satiation:
                     self._trigger_performance()
 
@@ -763,7 +773,7 @@ class PatchworkFishPet(Pet):
             growth_points = FEED_GROWTH_POINTS.get(feed_name, 1)  # 預設為1
             old_satiation = self.satiation
             self.satiation = min(self.satiation + growth_points, self.max_satiation)
-            print(f"[拼布魚] 消耗飼料({feed_name})，成長度+{growth_points}，飽足度: {old_satiation} -> {self.satiation}/{self.max_satiation}")
+            _patchwork_log.debug("消耗飼料(%s)，成長度+%s，飽足度: %s -> %s/%s", feed_name, growth_points, old_satiation, self.satiation, self.max_satiation)
             # 檢查是否達到滿飽足度，觸發街頭表演
             if self.satiation >= self.max_satiation:
                 self._trigger_performance()
@@ -771,7 +781,7 @@ class PatchworkFishPet(Pet):
             # 沒有飼料對象時，預設+1
             if self.satiation < self.max_satiation:
                 self.satiation += 1
-                print(f"[拼布魚] 消耗飼料（未知類型），飽足度: {self.satiation}/{self.max_satiation}")
+                _patchwork_log.debug("消耗飼料（未知類型），飽足度: %s/%s", self.satiation, self.max_satiation)
                 if self.satiation >= self.max_satiation:
                     self._trigger_performance()
 
@@ -780,7 +790,7 @@ class PatchworkFishPet(Pet):
         self.performance_timer = float(self._performance_duration_frames)
         self.satiation = 0  # 重置飽足度
         remaining_sec = int(self.performance_timer / 60)
-        print(f"[拼布魚] 街頭表演模式啟動！剩餘時間: {remaining_sec} 秒")
+        _patchwork_log.info("街頭表演模式啟動！剩餘時間: %s 秒", remaining_sec)
         if self.on_performance_start_callback:
             self.on_performance_start_callback()
 
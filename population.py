@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+魚群數量統計模組
+
+解鎖判定、里程碑與商店需要各魚種（及「階段_魚種」）的存活數量。原本每次查詢都走訪所有魚並組字串，
+大型水族箱中一次購買或升級就會掃描數次。FishPopulation 在魚加入、移除、死亡時增量更新：
+- 以 (魚種, 階段) 元組為鍵（字串經 sys.intern，元組與「階段_魚種」標籤快取重用），查詢為 O(1)
+- 只計入存活的魚（is_dead 為 False）；已登記的魚記在集合中，重複加入或移除不會重複計數
+- 整批替換魚列表時以 recount 重新計算（載入存檔、還原世界快照、基準測試）
+"""
+
+import sys
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+PopulationKey = Tuple[str, Optional[str]]
+
+
+class FishPopulation:
+    """各魚種與各 (魚種, 階段) 的存活魚數量"""
+
+    def __init__(self):
+        self._members: Set[object] = set()
+        self._by_key: Dict[PopulationKey, int] = {}
+        self._by_species: Dict[str, int] = {}
+        # 「階段_魚種」標籤的數量（與 _by_species 共同組成舊有的計數字典格式）
+        self._by_label: Dict[str, int] = {}
+        self._keys: Dict[PopulationKey, Tuple[PopulationKey, Optional[str]]] = {}
+
+    def _key(self, species: str, stage: Optional[str]) -> Tuple[PopulationKey, Optional[str]]:
+        """取得 (魚種, 階段) 的共用鍵與「階段_魚種」標籤"""
+        cached = self._keys.get((species, stage))
+        if cached is None:
+            species = sys.intern(species)
+            stage = sys.intern(stage) if stage else None
+            label = sys.intern(f"{stage}_{species}") if stage else None
+            cached = self._keys[(species, stage)] = ((species, stage), label)
+        return cached
+
+    def _change(self, fish, delta: int) -> None:
+        key, label = self._key(fish.species, fish.stage)
+        self._by_key[key] = self._by_key.get(key, 0) + delta
+        self._by_species[key[0]] = self._by_species.get(key[0], 0) + delta
+        if label is not None:
+            self._by_label[label] = self._by_label.get(label, 0) + delta
+
+    def add(self, fish) -> None:
+        """登記一隻魚（死亡、沒有魚種或已登記時不做任何事）"""
+        if not fish.species or getattr(fish, "is_dead", False) or fish in self._members:
+            return
+        self._members.add(fish)
+        self._change(fish, 1)
+
+    def discard(self, fish) -> None:
+        """移除一隻魚（死亡、離開水族箱、升級前的舊魚；未登記時不做任何事）"""
+        if fish not in self._members:
+            return
+        self._members.remove(fish)
+        self._change(fish, -1)
+
+    def recount(self, fishes: Iterable) -> None:
+        """依魚列表重新計算"""
+        self._members.clear()
+        self._by_key.clear()
+        self._by_species.clear()
+        self._by_label.clear()
+        for fish in fishes:
+            self.add(fish)
+
+    @property
+    def total(self) -> int:
+        """存活魚總數"""
+        return len(self._members)
+
+    def count(self, species: str, stage: Optional[str] = None) -> int:
+        """指定魚種（未指定階段時為所有階段合計）的存活數量"""
+        if stage is None:
+            return self._by_species.get(species, 0)
+        return self._by_key.get(self._key(species, stage)[0], 0)
+
+    def get(self, label: str, default: int = 0) -> int:
+        """以舊有的計數鍵查詢：魚種名稱或「階段_魚種」"""
+        value = self._by_species.get(label)
+        if value is None:
+            value = self._by_label.get(label, default)
+        return value
+
+    def species_counts(self) -> Dict[str, int]:
+        """各魚種的存活數量 {魚種: 數量}（不含數量為 0 的魚種）"""
+        return {k: v for k, v in self._by_species.items() if v}
+
+    def as_dict(self) -> Dict[str, int]:
+        """舊有的計數字典格式 {魚種: 數量, "階段_魚種": 數量}（不含數量為 0 的項目）"""
+        counts = {k: v for k, v in self._by_species.items() if v}
+        counts.update((k, v) for k, v in self._by_label.items() if v)
+        return counts
+
+    def __str__(self) -> str:
+        return str(self.as_dict())
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+二進位存檔格式模組
+
+與 JSON 存檔內容等價、可互相轉換的緊湊格式，適合魚數量很多的水族箱：
+- 魚以固定長度的 struct 記錄儲存，魚種、階段等字串集中為字串表，記錄中只存索引
+- 魚以外的欄位（金錢、解鎖狀態等）以 JSON 儲存於檔頭之後
+- 整個內容以標準函式庫 zlib 或 lzma 壓縮；讀取時邊解壓邊解碼，可分批取得魚資料
+
+檔案格式（小端序）：
+- 檔頭：magic(4 bytes, b"DFSV") + 版本(uint16) + 壓縮方式(uint8) + 檔頭旗標(uint8)
+- 壓縮內容：
+  - 其他欄位 JSON 長度(uint32) + UTF-8 JSON
+  - 字串表數量(uint32) + 每個字串 [長度(uint32) + UTF-8]
+  - 魚數量(uint32) + 魚記錄 × 數量（_FISH_RECORD）
+
+魚記錄以存在欄位標示哪些鍵有值，不存在的鍵、None 與其他型別的值都能原樣還原：
+JSON -> 二進位 -> JSON 的結果與原字典相等（check_round_trip）。
+
+本模組不依賴 Qt。
+"""
+
+import json
+import lzma
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+BINARY_SAVE_MAGIC = b"DFSV"
+BINARY_SAVE_VERSION = 1
+
+# 壓縮方式
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_LZMA = 2
+_COMPRESSION_NAMES = {"none": COMPRESSION_NONE, "zlib": COMPRESSION_ZLIB, "lzma": COMPRESSION_LZMA}
+
+_HEADER = struct.Struct("<4sHBB")
+_U32 = struct.Struct("<I")
+# 檔頭旗標
+_HEADER_HAS_FISH_LIST = 0x01  # 狀態中有 fishes 列表（否則 fishes 不存在或不是列表，原值放在其他欄位 JSON）
+
+# 魚記錄：id(6 bytes) 魚種 階段 額外欄位（字串表索引） 存在欄位 旗標 成長度 x y 方向 速度 縮放 上次吃幼鬥魚 下次大便
+_FISH_RECORD = struct.Struct("<6sIIIHBdddddddd")
+
+# 存在欄位：記錄中有值的欄位（不存在、為 None 或型別無法以記錄原樣還原的欄位改放額外 JSON，或整個省略）
+_HAS_ID = 0x0001
+_HAS_SPECIES = 0x0002
+_HAS_STAGE = 0x0004
+_HAS_GROWTH = 0x0008
+_HAS_POSITION = 0x0010
+_HAS_DIRECTION = 0x0020
+_HAS_FACING_LEFT = 0x0040
+_HAS_SPEED = 0x0080
+_HAS_SCALE = 0x0100
+_HAS_LAST_EAT = 0x0200
+_HAS_NEXT_POOP = 0x0400
+_HAS_EXTRA = 0x0800  # 有記錄無法容納的欄位：以 JSON 放在字串表
+
+# 魚記錄旗標
+_FLAG_FACING_LEFT = 0x01
+_FLAG_GROWTH_FLOAT = 0x02  # growth_points 原為 float（否則為 int）
+_FLAG_ID_IN_TABLE = 0x10  # id 不是 12 位小寫十六進位：前 4 bytes 為字串表索引
+
+# 記錄中的浮點欄位：(鍵, 存在位元)
+_FLOAT_FIELDS = (
+    ("direction", _HAS_DIRECTION),
+    ("speed", _HAS_SPEED),
+    ("scale", _HAS_SCALE),
+    ("last_eat_betta_time", _HAS_LAST_EAT),
+    ("next_poop_at", _HAS_NEXT_POOP),
+)
+
+
+def compression_from_name(name: str) -> int:
+    """
+    將壓縮方式名稱轉為代碼
+
+    Raises:
+        ValueError: 未知的壓縮方式
+    """
+    try:
+        return _COMPRESSION_NAMES[name]
+    except KeyError:
+        raise ValueError(f"未知的壓縮方式: {name}（可用: {', '.join(_COMPRESSION_NAMES)}）")
+
+
+def is_binary_save(data: bytes) -> bool:
+    """資料開頭是否為二進位存檔 magic"""
+    return data[:4] == BINARY_SAVE_MAGIC
+
+
+class _StringTable:
+    """寫入用字串表（相同字串只存一次）"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self.strings.append(value)
+            self._index[value] = idx
+        return idx
+
+
+def _pack_fish(fish: Dict[str, Any], table: _StringTable) -> bytes:
+    """
+    將一隻魚的存檔字典打包為固定長度記錄
+
+    只有型別可原樣還原的值放進記錄（字串、bool、float，int 的成長度另以旗標標示）；
+    其餘值（None、int 座標、其他型別）連同未知欄位以 JSON 放在字串表，不存在的欄位不寫入，
+    還原後的字典與原字典相等。
+    """
+    present = 0
+    flags = 0
+    extra: Dict[str, Any] = {}
+    raw_id = b"\0" * 6
+    species_idx = stage_idx = 0
+    growth = x = y = 0.0
+    floats = [0.0] * len(_FLOAT_FIELDS)
+    for key, value in fish.items():
+        kind = type(value)
+        if key == "id" and kind is str:
+            present |= _HAS_ID
+            try:
+                packed = bytes.fromhex(value) if len(value) == 12 else None
+            except ValueError:
+                packed = None
+            if packed is not None and packed.hex() == value:
+                raw_id = packed
+            else:
+                flags |= _FLAG_ID_IN_TABLE
+                raw_id = _U32.pack(table.intern(value)) + b"\0\0"
+        elif key == "species" and kind is str:
+            present |= _HAS_SPECIES
+            species_idx = table.intern(value)
+        elif key == "stage" and kind is str:
+            present |= _HAS_STAGE
+            stage_idx = table.intern(value)
+        elif key == "growth_points" and (kind is float or (kind is int and abs(value) < 2 ** 53)):
+            present |= _HAS_GROWTH
+            if kind is float:
+                flags |= _FLAG_GROWTH_FLOAT
+            growth = float(value)
+        elif (
+            key == "position" and kind is dict and len(value) == 2
+            and type(value.get("x")) is float and type(value.get("y")) is float
+        ):
+            present |= _HAS_POSITION
+            x, y = value["x"], value["y"]
+        elif key == "facing_left" and kind is bool:
+            present |= _HAS_FACING_LEFT
+            if value:
+                flags |= _FLAG_FACING_LEFT
+        else:
+            for i, (name, bit) in enumerate(_FLOAT_FIELDS):
+                if key == name and kind is float:
+                    present |= bit
+                    floats[i] = value
+                    break
+            else:
+                extra[key] = value
+    extra_idx = 0
+    if extra:
+        present |= _HAS_EXTRA
+        extra_idx = table.intern(json.dumps(extra, ensure_ascii=False, separators=(",", ":")))
+    return _FISH_RECORD.pack(raw_id, species_idx, stage_idx, extra_idx, present, flags, growth, x, y, *floats)
+
+
+def _unpack_fish(record: Tuple[Any, ...], strings: List[str]) -> Dict[str, Any]:
+    """將固定長度記錄還原為與 JSON 存檔相同的魚字典"""
+    (raw_id, species_idx, stage_idx, extra_idx, present, flags, growth, x, y,
+     direction, speed, scale, last_eat, next_poop) = record
+    fish: Dict[str, Any] = {}
+    if present & _HAS_ID:
+        if flags & _FLAG_ID_IN_TABLE:
+            fish["id"] = strings[_U32.unpack_from(raw_id)[0]]
+        else:
+            fish["id"] = raw_id.hex()
+    if present & _HAS_SPECIES:
+        fish["species"] = strings[species_idx]
+    if present & _HAS_STAGE:
+        fish["stage"] = strings[stage_idx]
+    if present & _HAS_GROWTH:
+        fish["growth_points"] = growth if flags & _FLAG_GROWTH_FLOAT else int(growth)
+    if present & _HAS_POSITION:
+        fish["position"] = {"x": x, "y": y}
+    if present & _HAS_DIRECTION:
+        fish["direction"] = direction
+    if present & _HAS_FACING_LEFT:
+        fish["facing_left"] = bool(flags & _FLAG_FACING_LEFT)
+    if present & _HAS_SPEED:
+        fish["speed"] = speed
+    if present & _HAS_SCALE:
+        fish["scale"] = scale
+    if present & _HAS_LAST_EAT:
+        fish["last_eat_betta_time"] = last_eat
+    if present & _HAS_NEXT_POOP:
+        fish["next_poop_at"] = next_poop
+    if present & _HAS_EXTRA:
+        fish.update(json.loads(strings[extra_idx]))
+    return fish
+
+
+def encode_state(state: Dict[str, Any], compression: str = "zlib") -> bytes:
+    """
+    將遊戲狀態字典編碼為二進位存檔
+
+    Args:
+        state: 遊戲狀態字典（與 JSON 存檔相同結構）
+        compression: 壓縮方式（"zlib"、"lzma"、"none"）
+
+    Returns:
+        二進位存檔內容
+    """
+    method = compression_from_name(compression)
+    table = _StringTable()
+    fishes = state.get("fishes")
+    header_flags = 0
+    if isinstance(fishes, list):
+        header_flags |= _HEADER_HAS_FISH_LIST
+        records = [_pack_fish(fish, table) for fish in fishes]
+        others = {k: v for k, v in state.items() if k != "fishes"}
+    else:
+        # fishes 不存在或不是列表：原樣放在其他欄位 JSON
+        records = []
+        others = state
+    others_bytes = json.dumps(others, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    parts = [_U32.pack(len(others_bytes)), others_bytes, _U32.pack(len(table.strings))]
+    for value in table.strings:
+        encoded = value.encode("utf-8")
+        parts.append(_U32.pack(len(encoded)))
+        parts.append(encoded)
+    parts.append(_U32.pack(len(records)))
+    parts.extend(records)
+    payload = b"".join(parts)
+    if method == COMPRESSION_ZLIB:
+        payload = zlib.compress(payload, 6)
+    elif method == COMPRESSION_LZMA:
+        payload = lzma.compress(payload)
+    return _HEADER.pack(BINARY_SAVE_MAGIC, BINARY_SAVE_VERSION, method, header_flags) + payload
+
+
+class BinarySaveReader:
+    """
+    二進位存檔串流讀取器
+
+    建立時只解壓並解析魚以外的欄位與字串表；魚記錄在 iter_fish_batches 時
+    邊解壓邊解碼，呼叫端可每取得一批就先還原，不必等整份存檔解析完。
+    """
+
+    _CHUNK = 64 * 1024
+
+    def __init__(self, data: bytes):
+        """
+        Args:
+            data: 二進位存檔內容
+
+        Raises:
+            ValueError: magic、版本或壓縮方式不符
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("二進位存檔過短")
+        magic, version, method, header_flags = _HEADER.unpack_from(data, 0)
+        if magic != BINARY_SAVE_MAGIC:
+            raise ValueError("不是二進位存檔")
+        if version != BINARY_SAVE_VERSION:
+            raise ValueError(f"二進位存檔版本 {version} 與當前版本 {BINARY_SAVE_VERSION} 不同")
+        # 狀態中是否有 fishes 列表（否則 iter_fish_batches 不產生任何批次，read_all 不加入 fishes）
+        self.has_fish_list = bool(header_flags & _HEADER_HAS_FISH_LIST)
+        self._data = memoryview(data)[_HEADER.size:]
+        self._pos = 0
+        if method == COMPRESSION_ZLIB:
+            self._decompressor = zlib.decompressobj()
+        elif method == COMPRESSION_LZMA:
+            self._decompressor = lzma.LZMADecompressor()
+        elif method == COMPRESSION_NONE:
+            self._decompressor = None
+        else:
+            raise ValueError(f"未知的壓縮方式代碼: {method}")
+        self._buffer = bytearray()
+        others_len = _U32.unpack(self._read(_U32.size))[0]
+        self.state: Dict[str, Any] = json.loads(bytes(self._read(others_len)).decode("utf-8"))
+        count = _U32.unpack(self._read(_U32.size))[0]
+        self.strings: List[str] = []
+        for _ in range(count):
+            length = _U32.unpack(self._read(_U32.size))[0]
+            self.strings.append(bytes(self._read(length)).decode("utf-8"))
+        self.fish_count: int = _U32.unpack(self._read(_U32.size))[0]
+        self._fish_read = 0
+
+    def _read(self, size: int) -> bytes:
+        """讀取解壓後的 size 位元組"""
+        while len(self._buffer) < size:
+            if self._pos >= len(self._data):
+                raise ValueError("二進位存檔內容不完整")
+            chunk = self._data[self._pos:self._pos + self._CHUNK]
+            self._pos += len(chunk)
+            if self._decompressor is None:
+                self._buffer += chunk
+            else:
+                self._buffer += self._decompressor.decompress(chunk)
+        result = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return result
+
+    def iter_fish_batches(self, batch_size: int = 256) -> Iterator[List[Dict[str, Any]]]:
+        """
+        分批解碼魚資料
+
+        Args:
+            batch_size: 每批魚數量
+
+        Yields:
+            魚字典列表（與 JSON 存檔中的魚字典相同）
+        """
+        batch_size = max(1, batch_size)
+        strings = self.strings
+        record = _FISH_RECORD
+        while self._fish_read < self.fish_count:
+            n = min(batch_size, self.fish_count - self._fish_read)
+            raw = self._read(n * record.size)
+            self._fish_read += n
+            yield [_unpack_fish(values, strings) for values in record.iter_unpack(raw)]
+
+    def read_all(self) -> Dict[str, Any]:
+        """解碼剩餘的魚並回傳完整遊戲狀態字典"""
+        fishes: List[Dict[str, Any]] = []
+        for batch in self.iter_fish_batches(4096):
+            fishes.extend(batch)
+        state = dict(self.state)
+        if self.has_fish_list:
+            state["fishes"] = fishes
+        return state
+
+
+def check_round_trip(state: Dict[str, Any], compression: str = "zlib") -> bool:
+    """JSON 相容的遊戲狀態轉為二進位再還原後是否與原狀態相等"""
+    return decode_state(encode_state(state, compression)) == state
+
+
+def decode_state(data: bytes) -> Dict[str, Any]:
+    """將二進位存檔解碼為遊戲狀態字典"""
+    return BinarySaveReader(data).read_all()
+
+
+def convert_file(src: Path, dst: Path, compression: str = "zlib") -> Tuple[int, int]:
+    """
+    在 JSON 與二進位存檔之間轉換（依來源內容自動判斷方向；目的檔先寫暫存檔再取代）
+
+    Args:
+        src: 來源存檔
+        dst: 目的存檔
+        compression: 轉為二進位時的壓縮方式
+
+    Returns:
+        (來源大小, 目的大小)，單位位元組
+    """
+    data = Path(src).read_bytes()
+    if is_binary_save(data):
+        out = json.dumps(decode_state(data), indent=2, ensure_ascii=False).encode("utf-8")
+    else:
+        out = encode_state(json.loads(data.decode("utf-8")), compression)
+    dst = Path(dst)
+    tmp = dst.with_name(dst.name + ".tmp")
+    tmp.write_bytes(out)
+    tmp.replace(dst)
+    return len(data), len(out)
+
+
+def load_file(path: Path) -> Optional[Dict[str, Any]]:
+    """讀取二進位存檔為遊戲狀態字典（檔案不存在時回傳 None）"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    return decode_state(path.read_bytes())
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+壓力測試情境模組
+
+以 JSON 情境檔描述要重現的水族箱（魚種與數量、投食機飼料、地上的金錢、寵物等），
+直接轉為世界快照（world_state 格式）交給 TransparentAquariumWindow.restore_world 建立，
+不需實際遊玩數小時累積。相同的情境與種子產生相同的初始世界。
+
+情境檔格式（除 fishes 外皆可省略）：
+
+    {
+      "name": "heavy_tank",
+      "seed": 0,
+      "aquarium_size": [800, 600],
+      "money": 100000,
+      "fishes": [
+        {"species": "鬥魚", "stage": "small", "count": 800},
+        {"species": "鬥魚", "stage": "angel", "count": 40},
+        {"species": "鯊魚", "count": 3},
+        {"species": "孔雀魚", "count": 20}
+      ],
+      "feed_machine": {"feed": "核廢料", "stock": 100000, "interval_sec": 5},
+      "feeds": [{"feed": "便宜飼料", "count": 30}],
+      "moneys": [{"money": "金幣", "count": 200, "on_floor": true, "keep": true}],
+      "pets": ["龍蝦", "寶箱怪"],
+      "pet_levels": {"龍蝦": 2},
+      "unlocked_feeds": ["鯉魚飼料"],
+      "background": "水世界.jpg"
+    }
+
+- fishes：stage 省略時為 small；商店魚種（孔雀魚、鯊魚）只有 small
+- feed_machine：解鎖投食機並選擇飼料，stock 為該飼料的庫存（便宜飼料改扣金錢）
+- moneys：on_floor 為 true 時直接放在水族箱底部；keep 為 true 時執行期間不會消失（維持固定負載）
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import (
+    FEED_UNLOCK_CONFIG,
+    FISH_SHOP_CONFIG,
+    GROWTH_STAGES,
+    MONEY_VALUE,
+    PET_CONFIG,
+)
+from world_state import WORLD_SNAPSHOT_VERSION
+
+DEFAULT_AQUARIUM_SIZE = (800, 600)
+DEFAULT_FEED_MACHINE_STOCK = 100000
+BETTA_STAGES = GROWTH_STAGES + ["golden", "gem"]
+# keep 為 true 的飼料與金錢使用的存在時間（幀數，約 115 天）
+KEEP_LIFETIME_FRAMES = 600_000_000
+
+_FISH_FIELDS = ("species", "stage", "position", "speed", "horizontal_direction", "vertical_direction", "facing_left")
+_FEED_FIELDS = ("feed_name", "position", "max_lifetime")
+_MONEY_FIELDS = ("money_name", "position", "bottom_time", "max_lifetime", "bottom_lifetime")
+
+
+def _require(condition: bool, message: str) -> None:
+    if not condition:
+        raise ValueError(message)
+
+
+def _check_count(entry: Dict[str, Any], where: str) -> int:
+    count = entry.get("count", 1)
+    _require(isinstance(count, int) and count >= 0, f"{where}: count 必須為非負整數")
+    return count
+
+
+def validate_scenario(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    檢查情境內容並補上預設值
+
+    Args:
+        scenario: 情境字典（load_scenario 讀入的 JSON）
+
+    Returns:
+        補上預設值的情境字典（新物件）
+
+    Raises:
+        ValueError: 欄位型別錯誤或名稱不存在（魚種、階段、飼料、金錢、寵物）
+    """
+    _require(isinstance(scenario, dict), "情境必須是 JSON 物件")
+    result = dict(scenario)
+    result.setdefault("name", "scenario")
+    result.setdefault("seed", 0)
+    size = result.setdefault("aquarium_size", list(DEFAULT_AQUARIUM_SIZE))
+    _require(
+        isinstance(size, (list, tuple)) and len(size) == 2 and all(isinstance(v, int) and v >= 200 for v in size),
+        "aquarium_size 必須為 [寬, 高]，且各至少 200",
+    )
+
+    fishes = result.setdefault("fishes", [])
+    _require(isinstance(fishes, list), "fishes 必須是列表")
+    for i, entry in enumerate(fishes):
+        where = f"fishes[{i}]"
+        species = entry.get("species")
+        stage = entry.setdefault("stage", "small")
+        _check_count(entry, where)
+        if species == "鬥魚":
+            _require(stage in BETTA_STAGES, f"{where}: 鬥魚沒有階段 {stage!r}（可用: {', '.join(BETTA_STAGES)}）")
+        else:
+            _require(species in FISH_SHOP_CONFIG, f"{where}: 未知的魚種 {species!r}")
+            _require(stage == "small", f"{where}: {species} 只有 small 階段")
+
+    machine = result.get("feed_machine")
+    if machine is not None:
+        _require(machine.get("feed") in FEED_UNLOCK_CONFIG, f"feed_machine: 未知的飼料 {machine.get('feed')!r}")
+        stock = machine.setdefault("stock", DEFAULT_FEED_MACHINE_STOCK)
+        _require(isinstance(stock, int) and stock >= 0, "feed_machine: stock 必須為非負整數")
+
+    for i, entry in enumerate(result.setdefault("feeds", [])):
+        _require(entry.get("feed") in FEED_UNLOCK_CONFIG, f"feeds[{i}]: 未知的飼料 {entry.get('feed')!r}")
+        _check_count(entry, f"feeds[{i}]")
+    for i, entry in enumerate(result.setdefault("moneys", [])):
+        _require(entry.get("money") in MONEY_VALUE, f"moneys[{i}]: 未知的金錢 {entry.get('money')!r}")
+        _check_count(entry, f"moneys[{i}]")
+    for pet_name in result.setdefault("pets", []):
+        _require(pet_name in PET_CONFIG, f"pets: 未知的寵物 {pet_name!r}")
+    for feed_name in result.setdefault("unlocked_feeds", []):
+        _require(feed_name in FEED_UNLOCK_CONFIG, f"unlocked_feeds: 未知的飼料 {feed_name!r}")
+    return result
+
+
+def load_scenario(path: Path) -> Dict[str, Any]:
+    """
+    讀取並檢查情境檔
+
+    Raises:
+        ValueError: 檔案不是合法 JSON 或內容不符格式
+    """
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"情境檔 {path} 不是合法的 JSON: {e}") from e
+    return validate_scenario(data)
+
+
+def fish_total(scenario: Dict[str, Any]) -> int:
+    """情境中魚的總數"""
+    return sum(entry.get("count", 1) for entry in scenario.get("fishes", []))
+
+
+def build_world_snapshot(scenario: Dict[str, Any], seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    將情境轉為世界快照（可直接交給 restore_world）
+
+    實體只記錄與初始位置、方向有關的欄位，其餘保留建構時的預設值。
+
+    Args:
+        scenario: validate_scenario 的結果
+        seed: 覆寫情境中的種子（決定位置、速度與方向，以及模擬亂數串流）
+
+    Returns:
+        世界快照字典
+    """
+    seed = scenario["seed"] if seed is None else seed
+    rng = random.Random(seed)
+    width, height = scenario["aquarium_size"]
+
+    fishes: List[List[Any]] = []
+    for entry in scenario["fishes"]:
+        for _ in range(entry.get("count", 1)):
+            horizontal = rng.choice((-1, 1))
+            fishes.append([
+                entry["species"], entry["stage"],
+                [rng.uniform(60, width - 60), rng.uniform(60, height - 60)],
+                rng.uniform(0.4, 0.8), horizontal, rng.choice((-1, 0, 1)), horizontal < 0,
+            ])
+
+    feeds: List[List[Any]] = []
+    for entry in scenario["feeds"]:
+        lifetime = KEEP_LIFETIME_FRAMES if entry.get("keep") else 600
+        for _ in range(entry.get("count", 1)):
+            feeds.append([entry["feed"], [rng.uniform(20, width - 20), rng.uniform(20, height - 80)], lifetime])
+
+    moneys: List[List[Any]] = []
+    for entry in scenario["moneys"]:
+        on_floor = bool(entry.get("on_floor"))
+        lifetime = KEEP_LIFETIME_FRAMES if entry.get("keep") else 600
+        for _ in range(entry.get("count", 1)):
+            y = height - 40 if on_floor else rng.uniform(20, height - 80)
+            moneys.append([
+                entry["money"], [rng.uniform(20, width - 20), y], 0 if on_floor else -1, lifetime, lifetime,
+            ])
+
+    unlocked_feeds = ["便宜飼料"] + [f for f in scenario["unlocked_feeds"] if f != "便宜飼料"]
+    feed_counters: Dict[str, int] = {}
+    machine = scenario.get("feed_machine")
+    if machine is not None:
+        if machine["feed"] not in unlocked_feeds:
+            unlocked_feeds.append(machine["feed"])
+        if machine["feed"] != "便宜飼料":
+            feed_counters[machine["feed"]] = machine["stock"]
+    background = scenario.get("background")
+    progress = {
+        "money": scenario.get("money", 0),
+        "unlocked_species": {},
+        "unlocked_pets": list(scenario["pets"]),
+        "pet_levels": dict(scenario.get("pet_levels", {})),
+        "feed_cheap_count": 0,
+        "feed_counters": feed_counters,
+        "unlocked_feeds": unlocked_feeds,
+        "unlocked_tools": ["飼料投食機"] if machine is not None else [],
+        "tool_colors": {},
+        "background_path": f"background/{background}" if background else None,
+    }
+    return {
+        "version": WORLD_SNAPSHOT_VERSION,
+        # 模擬亂數也由情境種子決定（sim_random）
+        "rng": {"seed": seed, "streams": {}},
+        "aquarium_size": [width, height],
+        "game_time_sec": float(scenario.get("game_time_sec", 0.0)),
+        "feed_machine_timer": 0.0,
+        "last_bonus_condition_met": False,
+        "progress": progress,
+        "fish_fields": list(_FISH_FIELDS),
+        "fishes": fishes,
+        "feed_fields": list(_FEED_FIELDS),
+        "feeds": feeds,
+        "money_fields": list(_MONEY_FIELDS),
+        "moneys": moneys,
+        "chest_produce_moneys": [],
+        "pets": [{"pet_name": name, "fields": [], "values": []} for name in scenario["pets"]],
+    }
+
+
+def apply_scenario(window, scenario: Dict[str, Any], seed: Optional[int] = None) -> None:
+    """
+    在視窗中建立情境描述的世界（取代目前所有實體），並設定投食機
+
+    Args:
+        window: TransparentAquariumWindow
+        scenario: validate_scenario 的結果
+        seed: 覆寫情境中的種子
+    """
+    window.restore_world(build_world_snapshot(scenario, seed))
+    machine = scenario.get("feed_machine")
+    if machine is None:
+        return
+    import aquarium_window as aw
+
+    feed_paths = dict(aw._list_feeds())
+    feed_path = feed_paths.get(machine["feed"], aw._resource_dir() / "feed" / machine["feed"])
+    window._on_feed_machine_feed_selected(machine["feed"], feed_path)
+    if "interval_sec" in machine:
+        window._feed_machine_interval = float(machine["interval_sec"])
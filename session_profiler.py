@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+執行中效能剖析模組
+
+在實際桌面上重現「玩了一小時後變卡」時，不需除錯器即可收集剖析結果：
+- "sampling"：背景執行緒每隔固定時間讀取 GUI 執行緒的呼叫堆疊（sys._current_frames），
+  成本低、不改變被測程式的執行速度；輸出 collapsed stacks（flamegraph.pl、speedscope 可直接開啟）
+- "cprofile"：在 GUI 執行緒啟用 cProfile，記錄每個函式的呼叫次數與耗時（成本較高，約使 Python 程式碼慢 1~2 倍）；
+  輸出 .pstats（python -m pstats、snakeviz 可開啟）
+
+兩種模式都另外輸出文字摘要（最耗時的函式）。GUI 執行緒停在 Qt 事件迴圈（閒置）時，
+取樣的最上層是呼叫 app.exec() 的那一行。
+"""
+
+import cProfile
+import io
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROFILE_MODES = ("sampling", "cprofile")
+# 取樣期間的直譯器執行緒切換間隔（秒）
+SAMPLING_SWITCH_INTERVAL_SEC = 0.0002
+
+# 堆疊中的一層：(檔案路徑, 函式名稱, 函式開始行號)
+_FrameKey = Tuple[str, str, int]
+
+
+def _frame_label(key: _FrameKey) -> str:
+    """collapsed stacks 的一層名稱：模組檔名:函式名稱:行號（分號與空白是格式保留字元）"""
+    filename, name, lineno = key
+    label = f"{Path(filename).name}:{name}:{lineno}"
+    return label.replace(";", ",").replace(" ", "_")
+
+
+class StackSampler:
+    """背景執行緒定期取樣指定執行緒的 Python 呼叫堆疊"""
+
+    def __init__(self, thread_id: int, interval_sec: float = 0.005, max_depth: int = 128):
+        """
+        Args:
+            thread_id: 被取樣的執行緒（threading.get_ident() 的值）
+            interval_sec: 取樣間隔（秒）
+            max_depth: 每次取樣最多記錄的堆疊層數（由最內層往外）
+        """
+        self._thread_id = thread_id
+        self._interval_sec = interval_sec
+        self._max_depth = max_depth
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._saved_switch_interval: Optional[float] = None
+        # 以程式碼物件記錄（取樣時不做字串處理），輸出時再轉為名稱
+        self._stacks: Counter = Counter()
+        self.samples = 0
+        self.elapsed_sec = 0.0
+
+    def start(self) -> None:
+        # 取樣執行緒要等 GIL 釋放才能讀堆疊；預設 5 ms 的切換間隔下，短於此的 Python 工作（單幀更新、重繪）
+        # 幾乎總在取樣前就結束，結果會偏向閒置。取樣期間縮短切換間隔，讓忙碌時也能取到堆疊
+        self._saved_switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._saved_switch_interval, SAMPLING_SWITCH_INTERVAL_SEC))
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._saved_switch_interval is not None:
+            sys.setswitchinterval(self._saved_switch_interval)
+            self._saved_switch_interval = None
+
+    def _run(self) -> None:
+        start = time.perf_counter()
+        # 間隔加入 ±50% 抖動，避免與 16 ms 的幀計時器同相位而總是取到同一段
+        jitter = random.Random()
+        while not self._stop.wait(self._interval_sec * jitter.uniform(0.5, 1.5)):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                break
+            codes = []
+            while frame is not None and len(codes) < self._max_depth:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            del frame
+            self._stacks[tuple(reversed(codes))] += 1
+            self.samples += 1
+        self.elapsed_sec = time.perf_counter() - start
+
+    def collapsed(self) -> Dict[Tuple[_FrameKey, ...], int]:
+        """取樣結果：{由外而內的堆疊: 次數}"""
+        result: Counter = Counter()
+        for codes, count in self._stacks.items():
+            result[tuple((c.co_filename, c.co_name, c.co_firstlineno) for c in codes)] += count
+        return result
+
+    def write_collapsed(self, path: Path) -> None:
+        """寫出 collapsed stacks（每行「外層;...;內層 次數」）"""
+        lines = [
+            ";".join(_frame_label(key) for key in stack) + f" {count}"
+            for stack, count in sorted(self.collapsed().items(), key=lambda item: -item[1])
+        ]
+        Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    def format_report(self, limit: int = 30) -> str:
+        """文字摘要：每個函式在最內層（自身）與整個堆疊中（含子呼叫）出現的取樣比例"""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.collapsed().items():
+            if not stack:
+                continue
+            own[stack[-1]] += count
+            for key in set(stack):
+                total[key] += count
+        n = max(1, self.samples)
+        lines = [
+            f"取樣 {self.samples} 次，{self.elapsed_sec:.1f} 秒（間隔 {self._interval_sec * 1000:.1f} ms）",
+            f"{'自身%':>7}{'累計%':>7}  函式",
+        ]
+        for key, count in own.most_common(limit):
+            lines.append(f"{count * 100.0 / n:>7.1f}{total[key] * 100.0 / n:>7.1f}  {_frame_label(key)}  {key[0]}")
+        return "\n".join(lines)
+
+
+class SessionProfiler:
+    """開始/停止一段剖析，停止時把結果寫入指定目錄"""
+
+    def __init__(self, mode: str = "sampling", interval_ms: float = 5.0):
+        """
+        Args:
+            mode: "sampling" 或 "cprofile"
+            interval_ms: sampling 模式的取樣間隔（毫秒）
+
+        Raises:
+            ValueError: 未知的模式
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"未知的剖析模式 {mode!r}（可用: {', '.join(PROFILE_MODES)}）")
+        self.mode = mode
+        self._interval_sec = interval_ms / 1000.0
+        self._sampler: Optional[StackSampler] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._started_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._started_at is not None
+
+    def start(self) -> None:
+        """
+        開始剖析（需在被剖析的執行緒，也就是 GUI 執行緒呼叫；已在剖析時不做任何事）
+        """
+        if self.running:
+            return
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = StackSampler(threading.get_ident(), self._interval_sec)
+            self._sampler.start()
+        self._started_at = time.perf_counter()
+
+    def stop(self, out_dir: Path, prefix: str = "profile") -> List[Path]:
+        """
+        停止剖析並寫出結果（檔名含開始時間，不覆寫先前的結果）
+
+        Args:
+            out_dir: 輸出目錄
+            prefix: 檔名前綴
+
+        Returns:
+            寫出的檔案路徑（未在剖析時為空列表）
+        """
+        if not self.running:
+            return []
+        elapsed = time.perf_counter() - self._started_at
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        base = out_dir / f"{prefix}_{stamp}_{self.mode}"
+        paths: List[Path] = []
+        if self._profile is not None:
+            self._profile.disable()
+            stats_path = base.with_suffix(".pstats")
+            self._profile.dump_stats(str(stats_path))
+            buffer = io.StringIO()
+            buffer.write(f"cProfile {elapsed:.1f} 秒\n")
+            pstats.Stats(self._profile, stream=buffer).sort_stats("cumulative").print_stats(40)
+            report = buffer.getvalue()
+            paths.append(stats_path)
+            self._profile = None
+        else:
+            self._sampler.stop()
+            collapsed_path = base.with_suffix(".collapsed")
+            self._sampler.write_collapsed(collapsed_path)
+            report = self._sampler.format_report()
+            paths.append(collapsed_path)
+            self._sampler = None
+        report_path = base.with_suffix(".txt")
+        report_path.write_text(report, encoding="utf-8")
+        paths.append(report_path)
+        self._started_at = None
+        return paths
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+模擬亂數模組
+
+每個水族箱世界擁有一組以種子產生的具名亂數串流，取代全域 random 模組：
+- fish：魚的游動方向、轉向間隔、大便間隔
+- pet：寵物的游動方向、召喚位置、寶箱怪產物
+- world：水族箱規則（核廢料致死、孔雀魚轉換石榴結晶）
+- feed_machine：投食機投放數量與落點
+- spawn：投放新魚的位置、方向與速度
+
+各串流由「種子:串流名稱」獨立播種，某個子系統多抽或少抽一次亂數不會影響其他子系統。
+相同種子、相同初始世界與相同輸入（見 input_record）會產生逐位元相同的模擬結果。
+
+魚的存檔識別碼（fish.new_fish_uid）刻意不使用這裡的串流，避免固定種子時不同次執行產生重複識別碼。
+"""
+
+import random
+from typing import Any, Dict, List, Optional
+
+STREAMS = ("fish", "pet", "world", "feed_machine", "spawn")
+
+
+def _encode_state(state: tuple) -> List[Any]:
+    """random.getstate() 的結果轉為可 JSON 序列化的列表"""
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def _decode_state(data: List[Any]) -> tuple:
+    version, internal, gauss_next = data
+    return (version, tuple(internal), gauss_next)
+
+
+class WorldRandom:
+    """一個世界的具名亂數串流"""
+
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Args:
+            seed: 種子；None 時以系統亂數產生（仍記錄在 seed 屬性，供錄製與重播使用）
+        """
+        self.seed = int(seed) if seed is not None else random.SystemRandom().getrandbits(32)
+        self._streams: Dict[str, random.Random] = {}
+
+    def stream(self, name: str) -> random.Random:
+        """取得（必要時建立）指定名稱的串流"""
+        rng = self._streams.get(name)
+        if rng is None:
+            # 以字串播種：跨行程、跨平台穩定（不受 PYTHONHASHSEED 影響）
+            rng = self._streams[name] = random.Random(f"{self.seed}:{name}")
+        return rng
+
+    def reseed(self, seed: int) -> None:
+        """以新種子重新開始所有串流"""
+        self.seed = int(seed)
+        self._streams = {}
+
+    def getstate(self) -> Dict[str, Any]:
+        """取得種子與所有已使用串流的狀態（可 JSON 序列化，存入世界快照）"""
+        return {
+            "seed": self.seed,
+            "streams": {name: _encode_state(rng.getstate()) for name, rng in self._streams.items()},
+        }
+
+    def setstate(self, state: Dict[str, Any]) -> None:
+        """還原 getstate 的結果；快照中沒有的串流之後重新由種子建立"""
+        self.reseed(state["seed"])
+        for name, data in state.get("streams", {}).items():
+            self.stream(name).setstate(_decode_state(data))
+
+
+_active = WorldRandom()
+
+
+def get_world_random() -> WorldRandom:
+    """目前作用中的世界亂數"""
+    return _active
+
+
+def set_world_random(world_random: WorldRandom) -> None:
+    """切換作用中的世界亂數（AquariumWidget 建立時呼叫）"""
+    global _active
+    _active = world_random
+
+
+def stream(name: str) -> random.Random:
+    """作用中世界的指定串流（模擬程式碼以此取代全域 random）"""
+    return _active.stream(name)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+遊戲迴圈分段計時模組
+
+AquariumWidget.update_fishes 每幀依序呼叫 mark(階段名稱)，記錄與上一個標記之間的耗時，
+找出是哪一段吃掉 16 ms 的幀預算：
+- 每個階段一個固定大小的對數直方圖（記憶體不隨執行時間成長），可查詢 p50/p95/p99/max
+- 每幀只多出一次 perf_counter 與一次直方圖累加 / 階段，關閉時幾乎沒有成本
+- stats() 供程式查詢，dump() 將結果寫成 JSON 檔
+- take_window() 取出自上次取出以來的區間統計（指標輸出用，不影響累計結果）
+"""
+
+import copy
+import json
+import math
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+
+class LatencyHistogram:
+    """
+    固定大小的對數刻度耗時直方圖
+
+    區間以 2 的 1/buckets_per_octave 次方遞增（預設每倍 8 格，相對誤差約 9%），
+    百分位數回傳所在區間的上界（不超過實際最大值）。
+    除累計記錄外另記下上次 take_window 時的位置，可取出兩次之間的區間記錄。
+    """
+
+    __slots__ = (
+        "_min_us", "_scale", "_counts", "count", "total_sec", "max_sec",
+        "_window_counts", "_window_count", "_window_total_sec", "_window_max_sec",
+    )
+
+    def __init__(self, min_us: float = 1.0, max_us: float = 1_000_000.0, buckets_per_octave: int = 8):
+        """
+        初始化直方圖
+
+        Args:
+            min_us: 第一個區間的上界（微秒），更短的耗時都歸入第一格
+            max_us: 最後一個區間的下界（微秒），更長的耗時都歸入最後一格
+            buckets_per_octave: 每倍耗時的區間數
+        """
+        self._min_us = float(min_us)
+        self._scale = float(buckets_per_octave)
+        size = int(math.ceil(math.log2(max_us / min_us) * buckets_per_octave)) + 2
+        self._counts = [0] * size
+        self.count = 0
+        self.total_sec = 0.0
+        self.max_sec = 0.0
+        self._start_window()
+
+    def _start_window(self) -> None:
+        """以目前的累計記錄作為下一個區間的起點"""
+        self._window_counts = list(self._counts)
+        self._window_count = self.count
+        self._window_total_sec = self.total_sec
+        self._window_max_sec = 0.0
+
+    def record(self, elapsed_sec: float) -> None:
+        """記錄一次耗時（秒）"""
+        us = elapsed_sec * 1_000_000.0
+        if us <= self._min_us:
+            idx = 0
+        else:
+            idx = min(len(self._counts) - 1, int(math.log2(us / self._min_us) * self._scale) + 1)
+        self._counts[idx] += 1
+        self.count += 1
+        self.total_sec += elapsed_sec
+        if elapsed_sec > self.max_sec:
+            self.max_sec = elapsed_sec
+        if elapsed_sec > self._window_max_sec:
+            self._window_max_sec = elapsed_sec
+
+    def _bucket_upper_ms(self, idx: int) -> float:
+        return self._min_us * (2.0 ** (idx / self._scale)) / 1000.0
+
+    def percentile(self, q: float) -> float:
+        """
+        取得百分位數（毫秒）
+
+        Args:
+            q: 0~100
+
+        Returns:
+            所在區間的上界（毫秒），無資料時為 0
+        """
+        if self.count == 0:
+            return 0.0
+        target = max(1, int(math.ceil(self.count * q / 100.0)))
+        running = 0
+        for idx, n in enumerate(self._counts):
+            running += n
+            if running >= target:
+                return min(self._bucket_upper_ms(idx), self.max_sec * 1000.0)
+        return self.max_sec * 1000.0
+
+    def summary(self) -> Dict[str, float]:
+        """{"count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"}"""
+        mean_ms = self.total_sec * 1000.0 / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(mean_ms, 4),
+            "p50_ms": round(self.percentile(50), 4),
+            "p95_ms": round(self.percentile(95), 4),
+            "p99_ms": round(self.percentile(99), 4),
+            "max_ms": round(self.max_sec * 1000.0, 4),
+        }
+
+    def take_window(self) -> "LatencyHistogram":
+        """
+        取出自上次呼叫（或建立、reset）以來的記錄，並開始新的區間；累計記錄不受影響
+
+        Returns:
+            只含此區間記錄的直方圖（summary、percentile 與一般直方圖相同）
+        """
+        window = copy.copy(self)
+        window._counts = [n - start for n, start in zip(self._counts, self._window_counts)]
+        window.count = self.count - self._window_count
+        window.total_sec = self.total_sec - self._window_total_sec
+        window.max_sec = self._window_max_sec
+        self._start_window()
+        return window
+
+    def reset(self) -> None:
+        """清除所有記錄"""
+        self._counts = [0] * len(self._counts)
+        self.count = 0
+        self.total_sec = 0.0
+        self.max_sec = 0.0
+        self._start_window()
+
+
+class TickProfiler:
+    """
+    每幀分段計時器
+
+    用法（每幀）：begin() → mark("階段A") → mark("階段B") → ... → end()
+    mark 記錄的是「上一個標記（或 begin）到現在」的耗時，歸入該階段。
+    """
+
+    TOTAL = "tick"
+
+    def __init__(self, phases: Sequence[str], budget_ms: float, enabled: bool = True):
+        """
+        初始化計時器
+
+        Args:
+            phases: 階段名稱（依執行順序，stats 與 dump 會保留此順序）
+            budget_ms: 每幀預算（毫秒），整幀超過時計入 over_budget
+            enabled: 是否啟用；停用時 begin/mark/end 直接返回
+        """
+        self.enabled = enabled
+        self.budget_ms = float(budget_ms)
+        self._phases: List[str] = list(phases)
+        self._hists: Dict[str, LatencyHistogram] = {name: LatencyHistogram() for name in self._phases}
+        self._total = LatencyHistogram()
+        self._tick_start = 0.0
+        self._last = 0.0
+        self._active = False
+        self.ticks = 0
+        self.over_budget = 0
+
+    def begin(self) -> None:
+        """開始一幀"""
+        if not self.enabled:
+            return
+        self._tick_start = self._last = time.perf_counter()
+        self._active = True
+
+    def mark(self, phase: str) -> None:
+        """結束一個階段（記錄與上一個標記之間的耗時）"""
+        if not self._active:
+            return
+        now = time.perf_counter()
+        hist = self._hists.get(phase)
+        if hist is None:
+            hist = self._hists[phase] = LatencyHistogram()
+            self._phases.append(phase)
+        hist.record(now - self._last)
+        self._last = now
+
+    def end(self) -> None:
+        """結束一幀"""
+        if not self._active:
+            return
+        self._active = False
+        elapsed = time.perf_counter() - self._tick_start
+        self._total.record(elapsed)
+        self.ticks += 1
+        if elapsed * 1000.0 > self.budget_ms:
+            self.over_budget += 1
+
+    def reset(self) -> None:
+        """清除所有記錄"""
+        for hist in self._hists.values():
+            hist.reset()
+        self._total.reset()
+        self.ticks = 0
+        self.over_budget = 0
+
+    def stats(self) -> Dict[str, object]:
+        """
+        取得統計結果
+
+        Returns:
+            {"ticks": 幀數, "over_budget": 超過預算的幀數, "budget_ms": 預算,
+             "tick": 整幀統計, "phases": {階段: 統計}}；統計格式見 LatencyHistogram.summary
+        """
+        return {
+            "ticks": self.ticks,
+            "over_budget": self.over_budget,
+            "budget_ms": self.budget_ms,
+            self.TOTAL: self._total.summary(),
+            "phases": {name: self._hists[name].summary() for name in self._phases},
+        }
+
+    def take_window(self) -> Dict[str, object]:
+        """
+        取出自上次呼叫以來的區間統計（供定期輸出指標；不影響 stats 與 dump 的累計結果）
+
+        Returns:
+            {"tick": 整幀統計, "phases": {階段: 統計}}；統計格式見 LatencyHistogram.summary
+        """
+        return {
+            self.TOTAL: self._total.take_window().summary(),
+            "phases": {name: self._hists[name].take_window().summary() for name in self._phases},
+        }
+
+    def slowest_phase(self, percentile: float = 99.0) -> Optional[str]:
+        """指定百分位數耗時最高的階段（無資料時為 None）"""
+        best_name, best_ms = None, -1.0
+        for name in self._phases:
+            hist = self._hists[name]
+            if hist.count == 0:
+                continue
+            value = hist.percentile(percentile)
+            if value > best_ms:
+                best_name, best_ms = name, value
+        return best_name
+
+    def format_report(self) -> str:
+        """以文字表格呈現統計結果（每階段一行）"""
+        stats = self.stats()
+        lines = [
+            f"[幀計時] {stats['ticks']} 幀，超過 {self.budget_ms:.1f} ms 預算 {stats['over_budget']} 幀",
+            f"{'階段':<16}{'平均':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'最大':>9}  (ms)",
+        ]
+        rows = list(stats["phases"].items()) + [(self.TOTAL, stats[self.TOTAL])]
+        for name, s in rows:
+            lines.append(
+                f"{name:<16}{s['mean_ms']:>9.3f}{s['p50_ms']:>9.3f}{s['p95_ms']:>9.3f}"
+                f"{s['p99_ms']:>9.3f}{s['max_ms']:>9.3f}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path: Path, extra: Optional[Dict[str, object]] = None) -> Path:
+        """
+        將統計結果寫成 JSON 檔
+
+        Args:
+            path: 輸出路徑
+            extra: 一併寫入的其他欄位（如幀節奏統計）
+
+        Returns:
+            輸出路徑
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), **self.stats(), **(extra or {})}
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+存檔/讀檔效能基準測試
+
+以合成存檔（所有魚種與成長階段平均分布）量測各階段耗時與記憶體峰值：
+- snapshot: GUI 執行緒收集 Fish.snapshot()
+- to_dict: 快照轉為存檔字典（fish_snapshot_to_dict，等同 Fish.to_dict）
+- encode / write: 依存檔格式序列化、原子寫檔（game_state.write_snapshot 的兩個步驟）
+- read / parse: 讀檔、解析（JSON 或二進位）
+- from_dict: Fish.from_dict 重建魚（不含動畫幀）
+- restore: 視窗 _load_game_state 完整載入流程（--restore 時，需要 PyQt6）
+- restore_grouped / restore_per_fish: 只恢復魚（不含讀檔）——目前依 (魚種, 階段) 分組的
+  _restore_saved_fishes，與舊版逐隻解析目錄、請求動畫、add_fish 的流程，用於比較改版前後
+
+結果以 JSON 輸出（--output），方便比較不同存檔格式或實作的數字。
+執行期間 HOME / APPDATA 指向暫存目錄，不會動到實際存檔。
+"""
+
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 讓工具可從專案根目錄或 tools/ 目錄執行
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+DEFAULT_SIZES = [10, 1000, 10000, 100000]
+FORMATS = ["json", "binary"]
+
+
+def _species_stages() -> List[Tuple[str, str]]:
+    """所有魚種與成長階段組合（鬥魚全部階段 + 商店魚種）"""
+    from config import FISH_SHOP_CONFIG, GROWTH_STAGES
+    pairs = [("鬥魚", stage) for stage in GROWTH_STAGES + ["golden", "gem"]]
+    pairs += [(species, "small") for species in FISH_SHOP_CONFIG]
+    return pairs
+
+
+def make_fishes(count: int, seed: int = 0) -> List[Any]:
+    """
+    產生合成魚（不含動畫幀）
+
+    Args:
+        count: 魚的數量
+        seed: 隨機種子（相同種子產生相同的魚）
+
+    Returns:
+        Fish 列表
+    """
+    from PyQt6.QtCore import QPoint
+    from fish import Fish
+
+    rng = random.Random(seed)
+    pairs = _species_stages()
+    fishes = []
+    for i in range(count):
+        species, stage = pairs[i % len(pairs)]
+        fish = Fish(
+            swim_frames=[],
+            turn_frames=[],
+            position=QPoint(rng.randint(50, 750), rng.randint(50, 550)),
+            speed=rng.uniform(0.4, 0.8),
+            scale=rng.uniform(0.2, 1.0),
+            species=species,
+            stage=stage,
+        )
+        fish.growth_points = rng.randint(0, 200)
+        if species == "鯊魚":
+            fish.last_eat_betta_time = rng.uniform(0, 3600)
+            fish.next_poop_at = rng.uniform(0, 3600)
+        fishes.append(fish)
+    return fishes
+
+
+def make_state(fish_dicts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """以預設狀態為底建立含指定魚的存檔字典"""
+    from game_state import get_default_state
+    state = get_default_state()
+    state["fishes"] = fish_dicts
+    return state
+
+
+def _measure(
+    phase: str,
+    func: Callable[[], Any],
+    repeat: int,
+    measure_memory: bool,
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    重複執行並記錄耗時，另外執行一次量測記憶體峰值
+
+    Args:
+        phase: 階段名稱
+        func: 要量測的函式
+        repeat: 計時次數
+        measure_memory: 是否以 tracemalloc 量測峰值（會另外多執行一次）
+
+    Returns:
+        (最後一次的回傳值, 結果記錄)
+    """
+    times = []
+    result = None
+    for _ in range(max(1, repeat)):
+        result = None
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        times.append((time.perf_counter() - start) * 1000.0)
+    record: Dict[str, Any] = {
+        "phase": phase,
+        "median_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "runs": len(times),
+    }
+    if measure_memory:
+        gc.collect()
+        tracemalloc.start()
+        base, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        record["peak_kb"] = round((peak - base) / 1024.0, 1)
+    return result, record
+
+
+class _RestoreHarness:
+    """建立一次視窗，之後每次將存檔寫入暫存的存檔路徑並重新執行 _load_game_state"""
+
+    def __init__(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtWidgets import QApplication
+        import aquarium_window
+
+        self._app = QApplication.instance() or QApplication(sys.argv)
+        self.window = aquarium_window.TransparentAquariumWindow()
+        # 停止遊戲迴圈，避免計時期間更新魚
+        self.window.aquarium.frame_driver.stop()
+
+    def prepare(self, state: Dict[str, Any], fmt: str) -> None:
+        """寫入指定格式的存檔，移除其他格式與存檔日誌"""
+        import game_state
+        json_path = game_state.get_save_path()
+        bin_path = game_state.get_binary_save_path()
+        for path in (json_path, bin_path, game_state.get_journal_path()):
+            if path.exists():
+                path.unlink()
+        game_state.write_snapshot(bin_path if fmt == "binary" else json_path, state)
+
+    def restore(self) -> int:
+        """清空水族箱後重新載入存檔，回傳恢復的魚數"""
+        window = self.window
+        window.aquarium.fishes = []
+        window._load_game_state()
+        return len(window.aquarium.fishes)
+
+    def restore_grouped(self, fish_dicts: List[Dict[str, Any]]) -> int:
+        """清空水族箱後以 _restore_saved_fishes（依魚種、階段分組）恢復魚，回傳恢復的魚數"""
+        from config import SAVE_LOAD_BATCH_SIZE
+        window = self.window
+        window.aquarium.fishes = []
+        batches = (fish_dicts[i:i + SAVE_LOAD_BATCH_SIZE] for i in range(0, len(fish_dicts), SAVE_LOAD_BATCH_SIZE))
+        return window._restore_saved_fishes(batches)
+
+    def restore_per_fish(self, fish_dicts: List[Dict[str, Any]]) -> int:
+        """清空水族箱後以舊版流程恢復魚（每隻魚各自解析目錄、請求動畫並 add_fish），回傳恢復的魚數"""
+        import aquarium_window
+        from asset_loader import PRIORITY_VISIBLE, get_asset_loader
+        from fish import Fish
+        window = self.window
+        window.aquarium.fishes = []
+        resource_dir = aquarium_window._resource_dir()
+        loader = get_asset_loader()
+        for fish_dict in fish_dicts:
+            species = fish_dict.get("species")
+            stage = fish_dict.get("stage") or "small"
+            if not species:
+                continue
+            stage_dir = window._resolve_saved_stage_dir(resource_dir, species, stage)
+            if stage_dir is None:
+                continue
+            swim_anim, turn_anim, eat_anim = loader.request_fish_animations(stage_dir, species, PRIORITY_VISIBLE)
+            fish = Fish.from_dict(
+                fish_dict,
+                swim_frames=swim_anim.frames,
+                turn_frames=turn_anim.frames,
+                eat_frames=eat_anim.frames,
+            )
+            window.aquarium.add_fish(fish)
+            swim_anim.on_ready(lambda anim, f=fish: window._drop_fishes_without_frames(anim, [f]))
+        return len(window.aquarium.fishes)
+
+    def close(self) -> None:
+        """等待背景素材解碼結束（結束程式時仍在解碼會存取已刪除的載入器）"""
+        from asset_loader import get_asset_loader
+        get_asset_loader().wait_for_idle()
+
+
+def run_benchmarks(
+    sizes: List[int],
+    formats: List[str],
+    repeat: int = 3,
+    measure_memory: bool = True,
+    restore: bool = False,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    執行所有基準測試
+
+    Args:
+        sizes: 魚的數量列表
+        formats: 存檔格式（json、binary）
+        repeat: 每個階段的計時次數
+        measure_memory: 是否量測記憶體峰值
+        restore: 是否量測視窗完整載入流程（需要 PyQt6 與顯示平台，預設使用 offscreen）
+        seed: 合成存檔的隨機種子
+
+    Returns:
+        {"meta": 環境資訊, "results": [結果記錄...]}
+    """
+    from fish import Fish, fish_snapshot_to_dict
+    from game_state import _write_bytes_atomic
+    from save_binary import decode_state, encode_state
+    from config import SAVE_BINARY_COMPRESSION
+
+    harness = _RestoreHarness() if restore else None
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_save_"))
+    results: List[Dict[str, Any]] = []
+
+    def add(record: Dict[str, Any], count: int, fmt: Optional[str], size_bytes: Optional[int] = None) -> None:
+        record = {"fish": count, "format": fmt, **record}
+        if size_bytes is not None:
+            record["bytes"] = size_bytes
+        results.append(record)
+        size_text = f"  {size_bytes / 1024:.1f} KB" if size_bytes is not None else ""
+        peak_text = f"  峰值 {record['peak_kb']:.0f} KB" if "peak_kb" in record else ""
+        print(
+            f"[基準] {count:>7} 隻 {fmt or '-':<6} {record['phase']:<16} "
+            f"{record['median_ms']:>10.2f} ms（最小 {record['min_ms']:.2f}）{peak_text}{size_text}",
+            file=sys.stderr,
+        )
+
+    for count in sizes:
+        fishes = make_fishes(count, seed)
+        snaps, rec = _measure("snapshot", lambda: [f.snapshot() for f in fishes], repeat, measure_memory)
+        add(rec, count, None)
+        fish_dicts, rec = _measure(
+            "to_dict", lambda: [fish_snapshot_to_dict(s) for s in snaps], repeat, measure_memory
+        )
+        add(rec, count, None)
+        _, rec = _measure(
+            "from_dict",
+            lambda: [Fish.from_dict(d, swim_frames=[], turn_frames=[]) for d in fish_dicts],
+            repeat,
+            measure_memory,
+        )
+        add(rec, count, None)
+        del fishes, snaps
+
+        state = make_state(fish_dicts)
+        for fmt in formats:
+            if fmt == "binary":
+                encode = lambda: encode_state(state, SAVE_BINARY_COMPRESSION)
+                parse = decode_state
+                path = work_dir / f"save_{count}.bin"
+            else:
+                # 與 game_state.write_snapshot 相同的 JSON 參數
+                encode = lambda: json.dumps(state, indent=2, ensure_ascii=False).encode("utf-8")
+                parse = lambda raw: json.loads(raw.decode("utf-8"))
+                path = work_dir / f"save_{count}.json"
+            data, rec = _measure("encode", encode, repeat, measure_memory)
+            add(rec, count, fmt, len(data))
+            _, rec = _measure("write", lambda: _write_bytes_atomic(path, data), repeat, False)
+            add(rec, count, fmt, len(data))
+            raw, rec = _measure("read", path.read_bytes, repeat, measure_memory)
+            add(rec, count, fmt)
+            _, rec = _measure("parse", lambda: parse(raw), repeat, measure_memory)
+            add(rec, count, fmt)
+            path.unlink()
+            if harness is not None:
+                harness.prepare(state, fmt)
+                # 素材背景載入與快取會影響後續次數，只量測一次；記憶體只含 Python 物件
+                restored, rec = _measure("restore", harness.restore, 1, measure_memory)
+                rec["restored"] = restored
+                add(rec, count, fmt)
+        if harness is not None:
+            # 只恢復魚：同一份魚字典分別以分組與舊版逐隻流程恢復（素材已由 restore 載入快取，兩者條件相同）
+            for phase, func in (("restore_grouped", harness.restore_grouped), ("restore_per_fish", harness.restore_per_fish)):
+                restored, rec = _measure(phase, lambda: func(fish_dicts), repeat, measure_memory)
+                rec["restored"] = restored
+                add(rec, count, None)
+        del state, fish_dicts
+
+    if harness is not None:
+        harness.close()
+    work_dir.rmdir()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "binary_compression": SAVE_BINARY_COMPRESSION,
+            "repeat": repeat,
+            "seed": seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='量測存檔/讀檔各階段耗時與記憶體峰值（合成存檔）'
+    )
+    parser.add_argument('-n', '--sizes', type=str, default=','.join(str(n) for n in DEFAULT_SIZES),
+                       help='魚的數量，逗號分隔（預設: 10,1000,10000,100000）')
+    parser.add_argument('-f', '--formats', type=str, default=','.join(FORMATS),
+                       help='存檔格式，逗號分隔（json、binary，預設: 兩者）')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                       help='每個階段的計時次數，取中位數（預設: 3）')
+    parser.add_argument('--no-memory', action='store_true',
+                       help='不量測記憶體峰值（tracemalloc 會讓每個階段多執行一次）')
+    parser.add_argument('--restore', action='store_true',
+                       help='另外量測視窗 _load_game_state 完整載入流程（需要 PyQt6）')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='合成存檔的隨機種子（預設: 0）')
+    parser.add_argument('-o', '--output', type=str, default=None,
+                       help='結果 JSON 輸出路徑（未指定時輸出到標準輸出）')
+
+    args = parser.parse_args()
+
+    sizes = [int(n) for n in args.sizes.split(',') if n.strip()]
+    formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        print(f"錯誤: 不支援的存檔格式 {unknown}", file=sys.stderr)
+        sys.exit(1)
+
+    # 存檔路徑指向暫存目錄，避免覆寫實際存檔
+    home_dir = tempfile.mkdtemp(prefix="bench_save_home_")
+    os.environ["HOME"] = home_dir
+    os.environ["APPDATA"] = home_dir
+
+    report = run_benchmarks(
+        sizes,
+        formats,
+        repeat=args.repeat,
+        measure_memory=not args.no_memory,
+        restore=args.restore,
+        seed=args.seed,
+    )
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding='utf-8')
+        print(f"完成！結果已寫入 {args.output}", file=sys.stderr)
+    else:
+        print(text)
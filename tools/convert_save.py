@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+存檔格式轉換工具
+
+在 JSON 存檔（save.json）與二進位存檔（save.bin，格式見 save_binary.py）之間轉換，
+方向依輸入檔內容自動判斷。二進位存檔不便直接閱讀，除錯時可先轉回 JSON。
+--check 只檢查 JSON 存檔轉為二進位再轉回是否無損（未指定輸入時檢查各版本存檔的魚欄位形式）。
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+# 讓工具可從專案根目錄或 tools/ 目錄執行
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fish import fish_snapshot_to_dict
+from game_state import get_default_state
+from save_binary import check_round_trip, convert_file, decode_state, encode_state, is_binary_save
+
+
+def _sample_states() -> dict:
+    """各版本存檔中出現過的魚欄位形式（以 fish_snapshot_to_dict 產生的魚字典為基礎，加上缺欄位、None、整數成長值、未知欄位等）"""
+    # 快照欄位順序與 Fish.snapshot() 相同
+    fish = fish_snapshot_to_dict(("鬥魚", "small", 12.5, 10.0, 20.0, 1, 1, False, 2.0, 1.0, None, None, "0123456789ab"))
+    shark = fish_snapshot_to_dict(("鯊魚", "small", 40, 30.5, 8.0, -1, 0, True, 1.5, 0.8, 1234.5, 1250.25, "00000000beef"))
+    legacy = {"species": "孔雀魚", "position": {"x": 5, "y": 6}}
+    return {
+        "預設狀態": get_default_state(),
+        "完整魚欄位": {**get_default_state(), "fishes": [fish]},
+        "鯊魚（上次吃幼鬥魚、下次大便時間）": {**get_default_state(), "fishes": [shark, fish]},
+        "舊版魚（無 id、階段、整數座標）": {**get_default_state(), "fishes": [legacy]},
+        "階段為 None、整數成長值": {**get_default_state(), "fishes": [{**fish, "stage": None, "growth_points": 3}]},
+        "鯊魚時間為 None": {**get_default_state(), "fishes": [{**shark, "next_poop_at": None}]},
+        "未知欄位與非 hex id": {**get_default_state(), "fishes": [{**fish, "id": "fish-1", "note": [1, 2]}]},
+        "fishes 為 None": {**get_default_state(), "fishes": None},
+        "無 fishes 欄位": {"money": 10},
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='在 JSON 與二進位存檔格式之間轉換'
+    )
+    parser.add_argument('-i', '--input', type=str,
+                       help='輸入存檔（JSON 或二進位）')
+    parser.add_argument('-o', '--output', type=str,
+                       help='輸出存檔路徑')
+    parser.add_argument('-c', '--compression', type=str, default='zlib',
+                       choices=['zlib', 'lzma', 'none'],
+                       help='轉為二進位時的壓縮方式（預設: zlib）')
+    parser.add_argument('--verify', action='store_true',
+                       help='轉換後確認兩種格式內容一致（round-trip）')
+    parser.add_argument('--check', action='store_true',
+                       help='只檢查 JSON 存檔能否無損轉為二進位（不寫檔；未指定 -i 時檢查內建範例）')
+
+    args = parser.parse_args()
+
+    if args.check:
+        if args.input:
+            data = Path(args.input).read_bytes()
+            states = {args.input: decode_state(data) if is_binary_save(data) else json.loads(data.decode('utf-8'))}
+        else:
+            states = _sample_states()
+        failed = [name for name, state in states.items() if not check_round_trip(state, args.compression)]
+        for name in states:
+            print(f"{'失敗' if name in failed else '通過'}: {name}")
+        sys.exit(1 if failed else 0)
+    if not args.input or not args.output:
+        parser.error('轉換需要 -i 與 -o')
+
+    input_path = Path(args.input)
+    output_path = Path(args.output)
+    if not input_path.is_file():
+        print(f"錯誤: 找不到存檔 {input_path}", file=sys.stderr)
+        sys.exit(1)
+
+    start = time.perf_counter()
+    src_size, dst_size = convert_file(input_path, output_path, args.compression)
+    elapsed = time.perf_counter() - start
+    print(f"完成！{src_size / 1024:.1f} KB -> {dst_size / 1024:.1f} KB（{elapsed:.2f} 秒）: {output_path}")
+
+    if args.verify:
+        src = input_path.read_bytes()
+        dst = output_path.read_bytes()
+        if is_binary_save(src):
+            original = decode_state(src)
+            converted = json.loads(dst.decode('utf-8'))
+        else:
+            original = json.loads(src.decode('utf-8'))
+            converted = decode_state(dst)
+        # 再轉一次，確認二進位 -> JSON -> 二進位也一致
+        if converted != original or decode_state(encode_state(converted, args.compression)) != original:
+            print("驗證失敗：轉換前後內容不一致", file=sys.stderr)
+            sys.exit(1)
+        print("驗證通過")
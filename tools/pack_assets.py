@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+素材封裝工具
+
+將 resource/ 目錄下的圖片封裝為單一檔案 resource.pack（格式見 asset_archive.py），
+遊戲啟動時若偵測到封裝檔會以 mmap 讀取，省去大量目錄列舉與檔案開啟。
+修改 resource/ 內素材後需重新執行本工具（封裝檔過期時遊戲會改讀 resource/ 目錄）。
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# 讓工具可從專案根目錄或 tools/ 目錄執行
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from asset_archive import AssetArchive, build_archive, default_archive_path, resource_root
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='將 resource 目錄封裝為單一素材封裝檔'
+    )
+    parser.add_argument('-i', '--input', type=str, default=str(resource_root()),
+                       help='素材根目錄（預設: 專案 resource/）')
+    parser.add_argument('-o', '--output', type=str, default=str(default_archive_path()),
+                       help='輸出封裝檔路徑（預設: 專案根目錄 resource.pack）')
+    parser.add_argument('--verify', action='store_true',
+                       help='封裝後逐檔比對內容')
+
+    args = parser.parse_args()
+
+    input_dir = Path(args.input)
+    output_path = Path(args.output)
+    if not input_dir.is_dir():
+        print(f"錯誤: 找不到素材目錄 {input_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    start = time.perf_counter()
+    count, total_bytes = build_archive(input_dir, output_path)
+    elapsed = time.perf_counter() - start
+    print(f"完成！封裝 {count} 個檔案，共 {total_bytes / 1024 / 1024:.1f} MB -> {output_path}（{elapsed:.2f} 秒）")
+
+    if args.verify:
+        archive = AssetArchive(output_path)
+        mismatched = 0
+        for p in sorted(input_dir.rglob("*")):
+            if not p.is_file():
+                continue
+            rel = p.relative_to(input_dir).as_posix()
+            if archive.has_file(rel) and archive.read(rel) != p.read_bytes():
+                mismatched += 1
+                print(f"內容不符: {rel}", file=sys.stderr)
+        archive.close()
+        if mismatched:
+            sys.exit(1)
+        print("驗證通過")
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+壓力測試情境執行工具
+
+讀取情境檔（格式見 scenario.py），建立對應的水族箱後：
+- 預設：離屏執行指定的模擬秒數（每幀呼叫 update_fishes 並同步重繪，不等待 16 ms 計時器），
+  輸出幀計時、重繪耗時與每秒的實體數量
+- --window：在視窗中開啟，照常遊玩或觀察，關閉視窗時輸出同樣的統計，以及實際幀間隔與重繪間隔的抖動
+  （--frame-driver 可比較 coarse、precise、vsync 三種驅動方式）
+- --record：同時錄製輸入（見 input_record.py），關閉視窗或離屏執行結束時寫入結束摘要
+- --replay：不讀情境檔，從錄製檔開頭的世界快照還原，依幀數重播輸入到錄製結束的幀，
+  比對結束時的世界摘要（不一致時回傳 1）
+
+執行期間存檔路徑指向暫存目錄，不會覆寫實際存檔。
+"""
+
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# 讓工具可從專案根目錄或 tools/ 目錄執行
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def _entity_counts(aquarium) -> Dict[str, int]:
+    return {
+        "fish": len(aquarium.fishes),
+        "feed": len(aquarium.feeds),
+        "money": len(aquarium.moneys),
+        "pet": len(aquarium.pets),
+    }
+
+
+def _new_window(aquarium_size):
+    import aquarium_window as aw
+
+    backgrounds = aw._list_backgrounds()
+    window = aw.TransparentAquariumWindow(
+        aquarium_size=tuple(aquarium_size),
+        background_path=backgrounds[0] if backgrounds else None,
+    )
+    # 離屏執行與重播時不能停在對話框上；獎勵等效果照常套用
+    window.modal_dialogs = False
+    # 建立與等待素材解碼期間不推進模擬，相同種子的執行才會從相同幀數開始
+    window.aquarium.frame_driver.stop()
+    return window
+
+
+def _finish_setup(window) -> None:
+    from asset_loader import get_asset_loader
+
+    get_asset_loader().wait_for_idle()
+    window.aquarium.tick_profiler.enabled = True
+    window.aquarium.tick_profiler.reset()
+    window.aquarium.paint_histogram.reset()
+    window.aquarium.reset_pacing()
+
+
+def create_window(scenario: Dict[str, Any], seed: Optional[int] = None):
+    """
+    建立視窗並套用情境（等待魚的動畫解碼完成，清除建立期間的計時記錄）
+
+    模擬亂數（sim_random）也由情境種子決定，相同情境與種子的執行結果相同。
+
+    Args:
+        scenario: scenario.validate_scenario 的結果
+        seed: 覆寫情境中的種子
+
+    Returns:
+        TransparentAquariumWindow（模擬計時器已停止）
+    """
+    from scenario import apply_scenario
+
+    window = _new_window(scenario["aquarium_size"])
+    apply_scenario(window, scenario, seed)
+    _finish_setup(window)
+    return window
+
+
+def create_replay_window(header: Dict[str, Any]):
+    """
+    建立視窗並還原錄製開頭的世界快照
+
+    Args:
+        header: input_record.load_recording 的開頭行
+
+    Returns:
+        TransparentAquariumWindow
+    """
+    world = header["world"]
+    window = _new_window(world.get("aquarium_size") or (800, 600))
+    window.restore_world(world)
+    _finish_setup(window)
+    return window
+
+
+def run_headless(
+    window,
+    seconds: float,
+    paint: bool = True,
+    before_tick: Optional[Callable[[int], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    離屏執行指定的模擬秒數（每秒 60 幀）
+
+    Args:
+        window: create_window 的結果（已顯示）
+        seconds: 模擬秒數
+        paint: 每幀是否同步重繪水族箱
+        before_tick: 每幀更新前呼叫，傳入目前的 tick_count（重播輸入用）
+
+    Returns:
+        {"ticks", "wall_sec", "speedup": 模擬時間 / 實際時間, "timeline": [每秒的實體數量與幀耗時]}
+    """
+    from PyQt6.QtCore import QCoreApplication
+
+    aquarium = window.aquarium
+    aquarium.frame_driver.stop()
+    profiler = aquarium.tick_profiler
+    ticks = int(round(seconds * 60))
+    timeline: List[Dict[str, Any]] = []
+    second_start = start = time.perf_counter()
+    for tick in range(1, ticks + 1):
+        if before_tick is not None:
+            before_tick(aquarium.tick_count)
+        aquarium.update_fishes()
+        if paint:
+            aquarium.repaint()
+        # 交付素材解碼結果、自動儲存等排入事件佇列的工作
+        QCoreApplication.processEvents()
+        if tick % 60 == 0:
+            now = time.perf_counter()
+            timeline.append({
+                "t": tick // 60,
+                **_entity_counts(aquarium),
+                "money_total": window.total_money,
+                "mean_frame_ms": round((now - second_start) * 1000.0 / 60, 3),
+            })
+            second_start = now
+    wall_sec = time.perf_counter() - start
+    return {
+        "ticks": profiler.ticks,
+        "wall_sec": round(wall_sec, 3),
+        "speedup": round(ticks / 60.0 / wall_sec, 2) if wall_sec > 0 else None,
+        "timeline": timeline,
+    }
+
+
+def build_report(window, scenario: Dict[str, Any], seed: Optional[int], run: Dict[str, Any]) -> Dict[str, Any]:
+    """整理輸出結果：情境、環境、幀計時與重繪統計、最後的實體數量與世界摘要"""
+    from PyQt6.QtCore import QT_VERSION_STR
+    from world_state import world_digest
+
+    aquarium = window.aquarium
+    return {
+        "scenario": scenario["name"],
+        "seed": scenario["seed"] if seed is None else seed,
+        "meta": {
+            "python": platform.python_version(),
+            "qt": QT_VERSION_STR,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        **run,
+        "tick": aquarium.tick_profiler.stats(),
+        "paint": aquarium.paint_histogram.summary(),
+        "pacing": aquarium.pacing_stats(),
+        "entities": _entity_counts(aquarium),
+        # 相同情境、種子與秒數（且沒有輸入）的執行應得到相同摘要
+        "world_digest": world_digest(window.capture_world()),
+    }
+
+
+def replay(window, events: List[Dict[str, Any]], end: Optional[Dict[str, Any]], paint: bool = True):
+    """
+    離屏重播錄製的輸入，並比對結束時的世界摘要
+
+    Args:
+        window: create_replay_window 的結果（已顯示）
+        events: load_recording 的輸入列表
+        end: load_recording 的結束行；None 時重播到最後一筆輸入所在的幀
+        paint: 每幀是否同步重繪水族箱
+
+    Returns:
+        (run_headless 的結果, 重播結束時的世界摘要)
+    """
+    from input_record import InputReplayer
+    from world_state import world_digest
+
+    aquarium = window.aquarium
+    replayer = InputReplayer(window, events)
+    if end is not None:
+        end_tick = end["tick"]
+    else:
+        end_tick = events[-1]["tick"] if events else aquarium.tick_count
+    run = run_headless(window, (end_tick - aquarium.tick_count) / 60.0, paint=paint, before_tick=replayer.dispatch)
+    # 錄製結束的那一幀之前（更新前）送出的輸入
+    replayer.dispatch(aquarium.tick_count)
+    return run, world_digest(window.capture_world())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='依情境檔建立大型水族箱，離屏執行或開啟視窗並記錄幀計時與重繪耗時')
+    parser.add_argument('scenario', type=str, nargs='?', default=None,
+                       help='情境檔路徑（JSON，格式見 scenario.py；使用 --replay 時省略）')
+    parser.add_argument('-s', '--seconds', type=float, default=30.0,
+                       help='離屏執行的模擬秒數（預設: 30）')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='覆寫情境中的種子')
+    parser.add_argument('--window', action='store_true',
+                       help='在視窗中開啟（關閉視窗時輸出統計），不離屏執行')
+    parser.add_argument('--frame-driver', choices=('coarse', 'precise', 'vsync'), default=None,
+                       help='視窗模式的遊戲迴圈驅動方式（覆寫 config.FRAME_DRIVER，見 frame_pacing.py）')
+    parser.add_argument('--no-paint', action='store_true',
+                       help='離屏執行時不重繪（只量測模擬）')
+    parser.add_argument('--record', type=str, default=None,
+                       help='錄製輸入到此路徑（input_record 格式，搭配 --window 實際遊玩）')
+    parser.add_argument('--replay', type=str, default=None,
+                       help='離屏重播此錄製檔並比對結束時的世界摘要（取代情境檔）')
+    parser.add_argument('--dump-world', type=str, default=None,
+                       help='將建立的世界快照寫入此路徑（world_state.dump_world 格式）')
+    parser.add_argument('-o', '--output', type=str, default=None,
+                       help='結果 JSON 輸出路徑（未指定時只輸出文字摘要）')
+    args = parser.parse_args(argv)
+    if (args.scenario is None) == (args.replay is None):
+        parser.error('需指定情境檔或 --replay 其中之一')
+    if args.replay and (args.window or args.record):
+        parser.error('--replay 不能與 --window、--record 同時使用')
+
+    if not args.window:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if args.frame_driver:
+        os.environ["AQUARIUM_FRAME_DRIVER"] = args.frame_driver
+    # 存檔路徑指向暫存目錄，避免覆寫實際存檔
+    home_dir = tempfile.mkdtemp(prefix="scenario_home_")
+    os.environ["HOME"] = home_dir
+    os.environ["APPDATA"] = home_dir
+
+    from input_record import load_recording
+    from scenario import fish_total, load_scenario
+    try:
+        if args.replay:
+            header, events, end = load_recording(Path(args.replay))
+            world = header["world"]
+            scenario = {"name": Path(args.replay).stem, "seed": world.get("rng", {}).get("seed")}
+        else:
+            scenario = load_scenario(Path(args.scenario))
+    except (OSError, ValueError) as e:
+        print(f"錯誤: {e}", file=sys.stderr)
+        return 1
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    app.setStyle('Fusion')
+
+    start = time.perf_counter()
+    if args.replay:
+        print(
+            f"[重播] {args.replay}：{len(world['fishes'])} 隻魚、{len(events)} 筆輸入"
+            f"{'' if end is not None else '（沒有結束行）'}...",
+            file=sys.stderr,
+        )
+        window = create_replay_window(header)
+    else:
+        print(f"[情境] {scenario['name']}：建立 {fish_total(scenario)} 隻魚...", file=sys.stderr)
+        window = create_window(scenario, args.seed)
+    print(f"[情境] 建立完成，耗時 {(time.perf_counter() - start) * 1000:.0f} ms", file=sys.stderr)
+    if args.dump_world:
+        from world_state import dump_world
+        size = dump_world(window.capture_world(), Path(args.dump_world))
+        print(f"[情境] 世界快照已寫入 {args.dump_world}（{size} 位元組）", file=sys.stderr)
+
+    window.show()
+    if args.record:
+        window.start_input_recording(Path(args.record))
+    matched = True
+    if args.replay:
+        run, digest = replay(window, events, end, paint=not args.no_paint)
+        if end is not None:
+            matched = digest == end.get("digest")
+            run["digest"] = {"recorded": end.get("digest"), "replayed": digest, "match": matched}
+    elif args.window:
+        wall_start = time.perf_counter()
+        window.aquarium.frame_driver.start()
+        app.exec()
+        run = {"ticks": window.aquarium.tick_profiler.ticks, "wall_sec": round(time.perf_counter() - wall_start, 3)}
+    else:
+        run = run_headless(window, args.seconds, paint=not args.no_paint)
+    # 視窗模式在 closeEvent 已停止錄製
+    window.stop_input_recording()
+    report = build_report(window, scenario, args.seed, run)
+
+    print(window.aquarium.tick_profiler.format_report())
+    paint = report["paint"]
+    if paint["count"]:
+        print(
+            f"{'paint':<16}{paint['mean_ms']:>9.3f}{paint['p50_ms']:>9.3f}{paint['p95_ms']:>9.3f}"
+            f"{paint['p99_ms']:>9.3f}{paint['max_ms']:>9.3f}"
+        )
+    if args.window:
+        from frame_pacing import format_pacing_report
+        print(f"[幀節奏] 驅動方式 {report['pacing']['driver']}")
+        print(format_pacing_report(report["pacing"]["intervals"]))
+    if "speedup" in run:
+        print(f"[情境] 模擬 {run['ticks'] / 60.0:g} 秒，實際 {run['wall_sec']:.1f} 秒（{run['speedup']}x）")
+    if "digest" in run:
+        status = "一致" if matched else "不一致"
+        print(f"[重播] 世界摘要{status}：錄製 {run['digest']['recorded']}，重播 {run['digest']['replayed']}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"完成！結果已寫入 {args.output}", file=sys.stderr)
+    return 0 if matched else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+解鎖規則模組
+
+解鎖條件（便宜飼料投餵次數、魚種最大同時數量、飼料數量等）各自宣告依賴的計數器名稱。
+計數器變更時呼叫 UnlockRules.changed，只重新判定依賴該計數器且尚未解鎖的規則；
+條件第一次成立時執行一次解鎖動作，之後不再判定。規則不直接更新畫面，
+由呼叫端依回傳的解鎖清單決定是否需要刷新選單（只在實際有解鎖時）。
+
+計數器名稱：
+- "feed_cheap_count"：累計投餵便宜飼料次數
+- "max_count:<魚種或階段_魚種>"：同時存在的最大數量（里程碑）
+- "feed_counter:<飼料>"：飼料數量
+"""
+
+from typing import Callable, Dict, Iterable, List, Tuple
+
+FEED_CHEAP_COUNT = "feed_cheap_count"
+
+
+def max_count_counter(species_key: str) -> str:
+    """魚種（或階段_魚種）最大同時數量的計數器名稱"""
+    return f"max_count:{species_key}"
+
+
+def feed_counter(feed_name: str) -> str:
+    """飼料數量的計數器名稱"""
+    return f"feed_counter:{feed_name}"
+
+
+class UnlockRule:
+    """一條解鎖規則"""
+
+    __slots__ = ("name", "depends", "condition", "on_unlock", "pending")
+
+    def __init__(self, name: str, depends: Tuple[str, ...], condition: Callable[[], bool], on_unlock: Callable[[], None]):
+        self.name = name
+        self.depends = depends
+        self.condition = condition
+        self.on_unlock = on_unlock
+        self.pending = True
+
+
+class UnlockRules:
+    """依計數器索引的解鎖規則集合"""
+
+    def __init__(self):
+        self._rules: Dict[str, UnlockRule] = {}
+        self._by_counter: Dict[str, List[UnlockRule]] = {}
+        # 條件判定次數（診斷用）
+        self.evaluations = 0
+
+    def add(
+        self,
+        name: str,
+        depends: Iterable[str],
+        condition: Callable[[], bool],
+        on_unlock: Callable[[], None],
+    ) -> None:
+        """
+        登記規則
+
+        Args:
+            name: 規則名稱（如 "feed:鯉魚飼料"；重複登記時取代）
+            depends: 依賴的計數器名稱；沒有依賴的規則只在 evaluate_all 時判定
+            condition: 回傳條件是否成立
+            on_unlock: 條件第一次成立時呼叫
+        """
+        if name in self._rules:
+            self.remove(name)
+        rule = UnlockRule(name, tuple(depends), condition, on_unlock)
+        self._rules[name] = rule
+        for counter in rule.depends:
+            self._by_counter.setdefault(counter, []).append(rule)
+
+    def remove(self, name: str) -> None:
+        rule = self._rules.pop(name, None)
+        if rule is None:
+            return
+        for counter in rule.depends:
+            rules = self._by_counter.get(counter, [])
+            if rule in rules:
+                rules.remove(rule)
+
+    def is_pending(self, name: str) -> bool:
+        """規則是否仍未解鎖（未登記的規則視為已解鎖）"""
+        rule = self._rules.get(name)
+        return rule is not None and rule.pending
+
+    def reset(self, unlocked: Iterable[str] = ()) -> None:
+        """
+        重設所有規則為未解鎖（載入存檔時呼叫）
+
+        Args:
+            unlocked: 已解鎖的規則名稱（不再判定，也不執行解鎖動作）
+        """
+        done = set(unlocked)
+        for rule in self._rules.values():
+            rule.pending = rule.name not in done
+
+    def _evaluate(self, rules: Iterable[UnlockRule]) -> List[str]:
+        unlocked = []
+        for rule in rules:
+            if not rule.pending:
+                continue
+            self.evaluations += 1
+            if rule.condition():
+                rule.pending = False
+                rule.on_unlock()
+                unlocked.append(rule.name)
+        return unlocked
+
+    def changed(self, *counters: str) -> List[str]:
+        """
+        通知計數器已變更，判定依賴它們且尚未解鎖的規則
+
+        Returns:
+            本次解鎖的規則名稱
+        """
+        if len(counters) == 1:
+            return self._evaluate(self._by_counter.get(counters[0], ()))
+        seen: Dict[int, UnlockRule] = {}
+        for counter in counters:
+            for rule in self._by_counter.get(counter, ()):
+                seen.setdefault(id(rule), rule)
+        return self._evaluate(seen.values())
+
+    def evaluate_all(self) -> List[str]:
+        """
+        判定所有尚未解鎖的規則（載入存檔後呼叫）
+
+        Returns:
+            本次解鎖的規則名稱
+        """
+        return self._evaluate(list(self._rules.values()))
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+世界快照模組
+
+擷取與還原整個模擬狀態（魚、飛行中的飼料、未拾取的金錢、寵物內部計時器、遊戲時間等），
+與只保存長期進度的存檔（game_state）互補：
+- 快速重啟：關閉前擷取、啟動後還原，畫面與計時器完全接續
+- 效能測試素材：直接載入上萬個實體的世界，不需逐一模擬產生
+- 決定性重播的起點
+
+每種實體以「欄位名稱列表 + 值列表」記錄（只含基本型別，QPointF 轉為 [x, y]），
+擷取成本為逐欄位讀取屬性，可每隔數秒呼叫。欄位名稱隨快照一起保存，
+之後新增欄位時舊快照仍可還原（缺少的欄位保留建構時的預設值）。
+
+本模組只處理實體屬性；建立實體（載入動畫幀、設定回調）由 aquarium_window 負責。
+"""
+
+import hashlib
+import json
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from PyQt6.QtCore import QPointF
+
+
+WORLD_SNAPSHOT_VERSION = 1
+
+# 魚：不含動畫幀、回調與追蹤中的金錢物件參照（還原後重新選擇目標）
+FISH_FIELDS = (
+    "uid", "species", "stage", "growth_points", "position", "speed", "scale",
+    "horizontal_direction", "vertical_direction", "facing_left",
+    "state", "turn_progress", "turning_to_left", "eat_progress", "animation_timer",
+    "direction_timer", "direction_change_interval", "_speed_multiplier",
+    "feed_count", "feed_cooldown_timer", "poop_interval_sec", "poop_timer", "happy_buff_multiplier",
+    "last_eat_betta_time", "next_poop_at",
+    "is_dead", "death_timer", "death_opacity",
+    "money_chase_timer", "money_chase_interval", "money_touch_cooldown_until", "current_game_time_sec",
+)
+
+FEED_FIELDS = (
+    "feed_name", "position", "scale", "animation_timer", "lifetime", "max_lifetime",
+    "fall_speed", "is_eaten", "is_parabolic", "target_position", "parabolic_progress",
+    "parabolic_speed", "start_position", "parabolic_height",
+)
+
+MONEY_FIELDS = (
+    "money_name", "position", "scale", "animation_timer", "lifetime", "max_lifetime",
+    "fall_speed", "is_collected", "bottom_time", "is_collecting", "collect_timer", "collect_opacity",
+)
+
+PET_FIELDS = (
+    "position", "speed", "scale", "horizontal_direction", "facing_left",
+    "state", "turn_progress", "turning_to_left", "animation_timer",
+)
+
+# 寵物子類別的額外欄位（依類別名稱）
+PET_EXTRA_FIELDS = {
+    "ChestMonsterPet": (
+        "timer_frames", "state_chest", "_current_produce_type", "is_produce_collecting",
+        "produce_collect_timer", "produce_collect_opacity", "produce_collect_position",
+    ),
+    "PatchworkFishPet": (
+        "eat_progress", "vertical_direction", "_speed_multiplier", "feed_cooldown_timer",
+        "direction_timer", "direction_change_interval", "satiation", "performance_timer",
+    ),
+}
+
+
+def _encode_value(value: Any) -> Any:
+    """將屬性值轉為可 JSON 序列化的基本型別"""
+    if isinstance(value, QPointF):
+        return [value.x(), value.y()]
+    return value
+
+
+def capture_fields(obj: Any, fields: Sequence[str]) -> List[Any]:
+    """
+    讀取物件的指定欄位
+
+    Args:
+        obj: 實體物件
+        fields: 欄位名稱
+
+    Returns:
+        與 fields 對應的值列表（QPointF 轉為 [x, y]）
+    """
+    return [_encode_value(getattr(obj, name, None)) for name in fields]
+
+
+def restore_fields(obj: Any, fields: Sequence[str], values: Sequence[Any]) -> None:
+    """
+    將 capture_fields 的結果寫回物件
+
+    原本為 QPointF 的欄位（或值為 [x, y] 而原值為 None 的座標欄位）還原為新的 QPointF。
+
+    Args:
+        obj: 實體物件
+        fields: 欄位名稱（來自快照）
+        values: 欄位值
+    """
+    for name, value in zip(fields, values):
+        current = getattr(obj, name, None)
+        if isinstance(value, (list, tuple)) and len(value) == 2 and (
+            isinstance(current, QPointF) or (current is None and name.endswith("position"))
+        ):
+            value = QPointF(float(value[0]), float(value[1]))
+        setattr(obj, name, value)
+
+
+def rows_to_records(fields: Sequence[str], rows: Sequence[Sequence[Any]]) -> List[Dict[str, Any]]:
+    """將快照中的實體列轉為 {欄位: 值} 字典列表（除錯與測試用）"""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def world_digest(snapshot: Dict[str, Any]) -> str:
+    """
+    世界快照的摘要（比對兩次模擬結果是否逐位元相同）
+
+    不含魚的存檔識別碼（uid 以系統亂數產生，與模擬無關）；浮點數以 repr 精度比較。
+
+    Args:
+        snapshot: capture_world 的結果
+
+    Returns:
+        SHA-256 十六進位字串的前 16 字元
+    """
+    data = dict(snapshot)
+    fish_fields = list(data.get("fish_fields", ()))
+    if "uid" in fish_fields:
+        uid_idx = fish_fields.index("uid")
+        data["fishes"] = [row[:uid_idx] + row[uid_idx + 1:] for row in data.get("fishes", [])]
+        data["fish_fields"] = fish_fields[:uid_idx] + fish_fields[uid_idx + 1:]
+    text = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def dump_world(snapshot: Dict[str, Any], path: Path) -> int:
+    """
+    將世界快照寫入檔案（緊湊 JSON + zlib，先寫暫存檔再取代）
+
+    Args:
+        snapshot: capture_world 的結果
+        path: 輸出路徑
+
+    Returns:
+        寫入的位元組數
+    """
+    data = zlib.compress(
+        json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 1
+    )
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+    return len(data)
+
+
+def load_world(path: Path) -> Dict[str, Any]:
+    """
+    讀取 dump_world 寫入的世界快照
+
+    Raises:
+        ValueError: 快照版本不符
+    """
+    snapshot = json.loads(zlib.decompress(Path(path).read_bytes()).decode("utf-8"))
+    version = snapshot.get("version")
+    if version != WORLD_SNAPSHOT_VERSION:
+        raise ValueError(f"世界快照版本 {version} 與當前版本 {WORLD_SNAPSHOT_VERSION} 不同")
+    return snapshot